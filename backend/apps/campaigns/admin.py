@@ -2,7 +2,16 @@
 
 from django.contrib import admin
 
-from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.models import (
+    Campaign,
+    CampaignHeadState,
+    CampaignSummary,
+    CanonicalCampaignState,
+    RollRecord,
+    RollStats,
+    TurnEvent,
+    TurnJob,
+)
 
 
 @admin.register(Campaign)
@@ -30,7 +39,87 @@ class TurnEventAdmin(admin.ModelAdmin):
 class CanonicalCampaignStateAdmin(admin.ModelAdmin):
     """Admin for campaign state snapshots."""
 
-    list_display = ("campaign", "turn_index", "created_at")
-    list_filter = ("created_at",)
+    list_display = ("campaign", "turn_index", "is_keyframe", "encoding", "created_at")
+    list_filter = ("is_keyframe", "encoding", "created_at")
+    search_fields = ("campaign__title",)
+    readonly_fields = ("id", "keyframe", "state_blob", "created_at")
+
+
+@admin.register(CampaignHeadState)
+class CampaignHeadStateAdmin(admin.ModelAdmin):
+    """Admin for materialized campaign head states."""
+
+    list_display = (
+        "campaign",
+        "turn_index",
+        "last_snapshot_turn",
+        "turns_since_snapshot",
+        "patch_bytes_since_snapshot",
+        "updated_at",
+    )
     search_fields = ("campaign__title",)
+    readonly_fields = ("state_hash", "updated_at")
+
+
+@admin.register(TurnJob)
+class TurnJobAdmin(admin.ModelAdmin):
+    """Admin for queued turns."""
+
+    list_display = ("campaign", "sequence", "status", "created_at", "completed_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("campaign__title", "user_input")
+    readonly_fields = (
+        "id",
+        "result_json",
+        "turn_event",
+        "created_at",
+        "started_at",
+        "completed_at",
+    )
+    ordering = ("campaign", "sequence")
+
+
+@admin.register(RollRecord)
+class RollRecordAdmin(admin.ModelAdmin):
+    """Admin for dice log entries."""
+
+    list_display = (
+        "campaign",
+        "roll_number",
+        "turn_index",
+        "roll_type",
+        "ability",
+        "total",
+        "success",
+    )
+    list_filter = ("roll_type", "ability", "success", "is_critical", "is_fumble")
+    search_fields = ("campaign__title", "roll_id")
     readonly_fields = ("id", "created_at")
+    ordering = ("campaign", "roll_number")
+
+
+@admin.register(RollStats)
+class RollStatsAdmin(admin.ModelAdmin):
+    """Admin for dice log statistics."""
+
+    list_display = (
+        "campaign",
+        "roll_type",
+        "ability",
+        "rolls",
+        "successes",
+        "criticals",
+        "fumbles",
+    )
+    list_filter = ("roll_type", "ability")
+    search_fields = ("campaign__title",)
+
+
+@admin.register(CampaignSummary)
+class CampaignSummaryAdmin(admin.ModelAdmin):
+    """Admin for campaign story summaries."""
+
+    list_display = ("campaign", "level", "index", "start_turn", "end_turn", "updated_at")
+    list_filter = ("level",)
+    search_fields = ("campaign__title",)
+    ordering = ("campaign", "start_turn", "level")
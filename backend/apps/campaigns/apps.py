@@ -5,3 +5,6 @@ class CampaignsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.campaigns"
     verbose_name = "Campaigns"
+
+    def ready(self):
+        from apps.campaigns import signals  # noqa: F401
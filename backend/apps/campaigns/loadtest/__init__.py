@@ -0,0 +1,39 @@
+"""
+Load testing for the turn pipeline.
+
+Deterministic stand-ins for the paid and networked dependencies of a turn,
+and a harness that plays many campaigns at once:
+- FakeLLMServer: local OpenAI-compatible server with scripted DM responses
+- InMemoryChromaClient: in-process Chroma-compatible lore store
+- LoadTestHarness: concurrent campaigns, p50/p95/p99 latency and throughput
+
+Run it with ``python manage.py loadtest_turns``.
+"""
+
+from .fake_chroma import HashingEmbeddingFunction, InMemoryChromaClient, InMemoryCollection
+from .fake_llm import DMScript, FakeLLMConfig, FakeLLMServer
+from .harness import (
+    LoadTestConfig,
+    LoadTestHarness,
+    LoadTestReport,
+    TurnSample,
+    create_campaigns,
+    delete_campaigns,
+    percentile,
+)
+
+__all__ = [
+    "DMScript",
+    "FakeLLMConfig",
+    "FakeLLMServer",
+    "HashingEmbeddingFunction",
+    "InMemoryChromaClient",
+    "InMemoryCollection",
+    "LoadTestConfig",
+    "LoadTestHarness",
+    "LoadTestReport",
+    "TurnSample",
+    "create_campaigns",
+    "delete_campaigns",
+    "percentile",
+]
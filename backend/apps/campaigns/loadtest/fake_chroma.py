@@ -0,0 +1,179 @@
+"""
+In-Memory Chroma Stand-In.
+
+Implements the subset of the chromadb client and collection API that
+ChromaClientService uses, entirely in process, so lore storage and retrieval
+can run under load without a Chroma server:
+
+    client = InMemoryChromaClient()
+    service = ChromaClientService(
+        client=client, embedding_function=client.embedding_function
+    )
+
+Pass the client's embedding function so query embeddings computed by the
+service (ChromaClientService.embed_query) match the stored documents.
+
+Documents are embedded as hashed bag-of-words term counts and ranked by
+cosine distance; good enough to exercise retrieval, not to judge its
+relevance. An optional per-query latency simulates a remote server.
+"""
+
+import math
+import re
+import threading
+import time
+import zlib
+
+from apps.lore.services.vector_store import matches_where
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbeddingFunction:
+    """Chroma-compatible embedding function hashing terms into a fixed-size vector."""
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+
+    def __call__(self, input: list[str]) -> list[list[float]]:  # noqa: A002 - chromadb's name
+        return [self._embed(text) for text in input]
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for term in _WORD_RE.findall(text.lower()):
+            vector[zlib.crc32(term.encode()) % self.dimensions] += 1.0
+        return vector
+
+
+def _cosine_distance(a: list[float], b: list[float]) -> float:
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))
+    if not norm:
+        return 1.0
+    return 1.0 - sum(x * y for x, y in zip(a, b, strict=True)) / norm
+
+
+class InMemoryCollection:
+    """A Chroma-compatible collection held in a dict."""
+
+    def __init__(
+        self,
+        name: str,
+        metadata: dict | None = None,
+        query_latency: float = 0.0,
+        embedding_function: HashingEmbeddingFunction | None = None,
+    ):
+        self.name = name
+        self.metadata = metadata or {}
+        self.query_latency = query_latency
+        self.embedding_function = embedding_function or HashingEmbeddingFunction()
+        self._documents: dict[str, tuple[str, dict, list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def count(self) -> int:
+        return len(self._documents)
+
+    def _rows(self, ids, documents, metadatas, embeddings):
+        documents = documents or [""] * len(ids)
+        metadatas = metadatas or [{}] * len(ids)
+        embeddings = embeddings or self.embedding_function(documents)
+        return zip(ids, documents, metadatas, embeddings, strict=True)
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        rows = self._rows(ids, documents, metadatas, embeddings)
+        with self._lock:
+            for doc_id, text, metadata, embedding in rows:
+                # chromadb ignores adds of existing ids
+                if doc_id not in self._documents:
+                    self._documents[doc_id] = (text, dict(metadata or {}), list(embedding))
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        rows = self._rows(ids, documents, metadatas, embeddings)
+        with self._lock:
+            for doc_id, text, metadata, embedding in rows:
+                self._documents[doc_id] = (text, dict(metadata or {}), list(embedding))
+
+    def _select(self, ids=None, where=None) -> list[tuple[str, tuple[str, dict, list[float]]]]:
+        with self._lock:
+            items = list(self._documents.items())
+        if ids is not None:
+            wanted = set(ids)
+            items = [item for item in items if item[0] in wanted]
+        return [item for item in items if matches_where(item[1][1], where)]
+
+    def get(self, ids=None, where=None, limit=None, include=None) -> dict:
+        items = self._select(ids, where)[:limit]
+        return {
+            "ids": [doc_id for doc_id, _ in items],
+            "documents": [text for _, (text, _, _) in items],
+            "metadatas": [metadata for _, (_, metadata, _) in items],
+        }
+
+    def query(
+        self, query_texts=None, query_embeddings=None, n_results=10, where=None, include=None
+    ) -> dict:
+        if self.query_latency:
+            time.sleep(self.query_latency)
+        if query_embeddings is None:
+            query_embeddings = self.embedding_function(query_texts)
+        items = self._select(where=where)
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query_embedding in query_embeddings:
+            ranked = sorted(
+                (
+                    (_cosine_distance(query_embedding, embedding), doc_id, text, metadata)
+                    for doc_id, (text, metadata, embedding) in items
+                ),
+                key=lambda entry: (entry[0], entry[1]),
+            )[:n_results]
+            result["ids"].append([entry[1] for entry in ranked])
+            result["documents"].append([entry[2] for entry in ranked])
+            result["metadatas"].append([entry[3] for entry in ranked])
+            result["distances"].append([entry[0] for entry in ranked])
+        return result
+
+    def delete(self, ids=None, where=None) -> None:
+        doomed = [doc_id for doc_id, _ in self._select(ids, where)]
+        with self._lock:
+            for doc_id in doomed:
+                self._documents.pop(doc_id, None)
+
+
+class InMemoryChromaClient:
+    """A Chroma-compatible client whose collections live in this process."""
+
+    def __init__(
+        self,
+        query_latency: float = 0.0,
+        embedding_function: HashingEmbeddingFunction | None = None,
+    ):
+        self.query_latency = query_latency
+        self.embedding_function = embedding_function or HashingEmbeddingFunction()
+        self._collections: dict[str, InMemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def heartbeat(self) -> int:
+        return time.time_ns()
+
+    def get_or_create_collection(self, name: str, metadata: dict | None = None):
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = InMemoryCollection(
+                    name, metadata, self.query_latency, self.embedding_function
+                )
+            return collection
+
+    def get_collection(self, name: str) -> InMemoryCollection:
+        with self._lock:
+            if name not in self._collections:
+                raise ValueError(f"Collection {name} does not exist.")
+            return self._collections[name]
+
+    def list_collections(self) -> list[InMemoryCollection]:
+        with self._lock:
+            return list(self._collections.values())
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            if self._collections.pop(name, None) is None:
+                raise ValueError(f"Collection {name} does not exist.")
@@ -0,0 +1,307 @@
+"""
+Fake LLM Server.
+
+A local OpenAI-compatible chat completions server for load testing the turn
+pipeline without a paid provider:
+- Scripted DM_TEXT/DM_JSON responses: proposals (some with roll requests)
+  and final narrations after rolls
+- Configurable time to first token and token rate, for both plain and
+  streamed (SSE) completions
+- Error injection: a configurable share of requests fail with a status code
+
+Responses and injected errors are chosen from a seeded RNG keyed on the
+request's messages (and how many times that request was seen), so a run is
+reproducible however concurrent requests interleave.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Rough characters per token; only used for timing and usage reporting
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class DMScript:
+    """One scripted DM response."""
+
+    dm_text: str
+    dm_json: dict
+
+    def render(self) -> str:
+        return f"DM_TEXT:\n{self.dm_text}\n\nDM_JSON:\n{json.dumps(self.dm_json)}"
+
+
+PROPOSAL_SCRIPTS = [
+    DMScript(
+        "The tavern is warm and loud. A bard tunes her lute by the fire while the "
+        "innkeeper wipes down the bar and eyes you with idle curiosity.",
+        {
+            "roll_requests": [],
+            "patches": [{"op": "add", "path": "/world/global_flags/visited_tavern", "value": True}],
+            "lore_deltas": [],
+        },
+    ),
+    DMScript(
+        "You ease along the wall toward the guard post, keeping to the shadows "
+        "cast by the torches.",
+        {
+            "roll_requests": [
+                {
+                    "id": "stealth_1",
+                    "type": "ability_check",
+                    "ability": "dex",
+                    "skill": "stealth",
+                    "dc": 12,
+                    "reason": "Sneak past the guard",
+                }
+            ],
+            "patches": [],
+            "lore_deltas": [],
+        },
+    ),
+    DMScript(
+        "The road bends north into the pines. Somewhere ahead a wolf howls, and "
+        "the wind carries the smell of woodsmoke.",
+        {
+            "roll_requests": [],
+            "patches": [{"op": "add", "path": "/world/global_flags/road_north", "value": True}],
+            "lore_deltas": [
+                {
+                    "type": "soft_lore",
+                    "text": "Wolves have been heard on the north road.",
+                    "tags": ["wolves", "north_road"],
+                }
+            ],
+        },
+    ),
+]
+
+NARRATION_SCRIPTS = [
+    DMScript(
+        "The guard yawns and turns away just as you slip past. The corridor beyond is empty.",
+        {"patches": [], "lore_deltas": []},
+    ),
+    DMScript(
+        "A loose stone skitters underfoot. The guard squints into the dark, "
+        "shrugs, and returns to his dice game.",
+        {"patches": [], "lore_deltas": []},
+    ),
+]
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def split_tokens(text: str) -> list[str]:
+    """Split text into token-sized pieces for streaming."""
+    return [text[i : i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour of the fake server."""
+
+    seed: int = 0
+    # Time to first token
+    latency: float = 0.0
+    # Output tokens per second; 0 means instant
+    tokens_per_second: float = 0.0
+    # Share of requests (0-1) answered with error_status instead of a completion
+    error_rate: float = 0.0
+    error_status: int = 503
+    proposal_scripts: list[DMScript] = field(default_factory=lambda: list(PROPOSAL_SCRIPTS))
+    narration_scripts: list[DMScript] = field(default_factory=lambda: list(NARRATION_SCRIPTS))
+
+
+class FakeLLMServer:
+    """
+    OpenAI-compatible chat completions server running in a background thread.
+
+    Usage:
+        with FakeLLMServer(FakeLLMConfig(latency=0.2, tokens_per_second=50)) as server:
+            config = LLMClientConfig(
+                provider=LLMProvider.OPENAI, api_key="fake", model="fake-dm",
+                base_url=server.base_url,
+            )
+    """
+
+    def __init__(self, config: FakeLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeLLMConfig()
+        self._httpd = ThreadingHTTPServer((host, port), _FakeLLMHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._seen: dict[str, int] = {}
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-llm", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def plan(self, messages: list[dict]) -> tuple[DMScript | None, random.Random]:
+        """
+        Decide how to answer a request.
+
+        Returns:
+            (script, rng) - script is None when an error should be injected
+        """
+        key = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+        with self._lock:
+            attempt = self._seen.get(key, 0)
+            self._seen[key] = attempt + 1
+            self.requests += 1
+
+        rng = random.Random(f"{self.config.seed}:{key}:{attempt}")
+        if rng.random() < self.config.error_rate:
+            with self._lock:
+                self.errors += 1
+            return None, rng
+
+        # Final narration requests carry the resolved rolls
+        is_narration = any("[Roll Results]" in m.get("content", "") for m in messages)
+        scripts = self.config.narration_scripts if is_narration else self.config.proposal_scripts
+        return rng.choice(scripts), rng
+
+    def completion_delay(self, output_tokens: int) -> float:
+        """Time to produce a whole completion."""
+        delay = self.config.latency
+        if self.config.tokens_per_second > 0:
+            delay += output_tokens / self.config.tokens_per_second
+        return delay
+
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    @property
+    def fake(self) -> FakeLLMServer:
+        return self.server.fake
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "fake-dm", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        messages = body.get("messages") or []
+        script, _ = self.fake.plan(messages)
+        if script is None:
+            time.sleep(self.fake.config.latency)
+            status = self.fake.config.error_status
+            self._send_json(status, {"error": {"message": f"Injected error ({status})"}})
+            return
+
+        content = script.render()
+        usage = {
+            "prompt_tokens": sum(count_tokens(m.get("content", "")) for m in messages),
+            "completion_tokens": count_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        model = body.get("model") or "fake-dm"
+
+        if body.get("stream"):
+            self._stream(content, usage, model, body.get("stream_options") or {})
+            return
+
+        time.sleep(self.fake.completion_delay(usage["completion_tokens"]))
+        self._send_json(
+            200,
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _stream(self, content: str, usage: dict, model: str, stream_options: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(payload) -> None:
+            data = payload if isinstance(payload, str) else json.dumps(payload)
+            self.wfile.write(f"data: {data}\n\n".encode())
+            self.wfile.flush()
+
+        def chunk(delta: dict, finish_reason: str | None = None) -> dict:
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        rate = self.fake.config.tokens_per_second
+        time.sleep(self.fake.config.latency)
+        for token in split_tokens(content):
+            send(chunk({"content": token}))
+            if rate > 0:
+                time.sleep(1 / rate)
+        send(chunk({}, finish_reason="stop"))
+        if stream_options.get("include_usage"):
+            send({"id": "chatcmpl-fake", "model": model, "choices": [], "usage": usage})
+        send("[DONE]")
@@ -0,0 +1,296 @@
+"""
+Turn Load-Test Harness.
+
+Drives N concurrent campaigns through turn submission and reports latency
+percentiles and throughput. Each campaign plays its turns in order (as a
+player would); campaigns run concurrently, on a thread pool for TurnEngine
+or as tasks on one event loop for AsyncTurnEngine.
+
+Point it at FakeLLMServer and InMemoryChromaClient to load test the
+pipeline itself, or at a real endpoint and Chroma server to measure them.
+"""
+
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.async_turn_engine import AsyncTurnEngine
+from apps.campaigns.services.llm_client import LLMClientConfig
+from apps.campaigns.services.turn_engine import TurnEngine, TurnPhase, TurnRequest, TurnResult
+from apps.characters.models import CharacterSheet
+from apps.lore.services.chroma_client import ChromaClientService
+from apps.universes.models import Universe
+
+ENGINES = ("sync", "async")
+
+PLAYER_ACTIONS = [
+    "I look around the tavern and listen for rumours.",
+    "I sneak past the guard toward the back door.",
+    "I follow the north road into the forest.",
+    "I ask the innkeeper about the missing caravan.",
+    "I search the room for anything unusual.",
+]
+
+SEED_LORE = [
+    ("hard_canon", "The Rusty Flagon is the oldest tavern in the valley."),
+    ("hard_canon", "The north road runs through the pine forest to the mountain pass."),
+    ("soft_lore", "Travellers say wolves hunt along the north road at night."),
+    ("soft_lore", "The innkeeper keeps a ledger of every caravan that passes through."),
+]
+
+
+@dataclass
+class LoadTestConfig:
+    """Shape of a load-test run."""
+
+    campaigns: int = 10
+    turns_per_campaign: int = 5
+    # Campaigns played at once; defaults to all of them
+    concurrency: int | None = None
+    engine: str = "sync"
+    # Drain process_turn_stream instead of process_turn (sync engine only)
+    stream: bool = False
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}")
+        if self.stream and self.engine != "sync":
+            raise ValueError("Streaming is only supported by the sync engine")
+
+    @property
+    def workers(self) -> int:
+        return max(1, min(self.concurrency or self.campaigns, self.campaigns))
+
+
+@dataclass
+class TurnSample:
+    """Outcome of one submitted turn."""
+
+    campaign_id: str
+    turn: int
+    latency: float
+    success: bool
+    error: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class LoadTestReport:
+    """Latency and throughput of a load-test run."""
+
+    config: LoadTestConfig
+    samples: list[TurnSample] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for sample in self.samples if sample.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.samples) - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        """Successful turns per second."""
+        return self.succeeded / self.wall_time if self.wall_time else 0.0
+
+    def latency(self, pct: float) -> float:
+        return percentile([sample.latency for sample in self.samples], pct)
+
+    def to_dict(self) -> dict:
+        return {
+            "engine": self.config.engine,
+            "stream": self.config.stream,
+            "campaigns": self.config.campaigns,
+            "concurrency": self.config.workers,
+            "turns": len(self.samples),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "wall_time_s": round(self.wall_time, 3),
+            "throughput_turns_per_s": round(self.throughput, 3),
+            "latency_ms": {f"p{pct}": round(self.latency(pct) * 1000, 1) for pct in (50, 95, 99)},
+            "input_tokens": sum(sample.input_tokens for sample in self.samples),
+            "output_tokens": sum(sample.output_tokens for sample in self.samples),
+            "errors": sorted({sample.error for sample in self.samples if sample.error}),
+        }
+
+
+def create_campaigns(count: int, chroma_service: ChromaClientService | None = None):
+    """
+    Create a throwaway user with one universe and ``count`` campaigns.
+
+    Remove everything created here with :func:`delete_campaigns`.
+
+    Returns:
+        Tuple of (user, campaigns)
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = get_user_model().objects.create_user(
+        email=f"loadtest-{suffix}@example.com",
+        username=f"loadtest_{suffix}",
+        password=uuid.uuid4().hex,
+    )
+    universe = Universe.objects.create(user=user, name=f"Load Test {suffix}")
+    if chroma_service is not None:
+        chroma_service.add_documents_batch(
+            str(universe.id),
+            [
+                {"id": f"seed-{index}", "text": text, "chunk_type": chunk_type}
+                for index, (chunk_type, text) in enumerate(SEED_LORE)
+            ],
+        )
+
+    campaigns = []
+    for index in range(count):
+        character = CharacterSheet.objects.create(
+            user=user,
+            universe=universe,
+            name=f"Hero {index + 1}",
+            species="Human",
+            character_class="Rogue",
+            background="Criminal",
+            level=1,
+            ability_scores_json={"str": 10, "dex": 16, "con": 12, "int": 12, "wis": 10, "cha": 14},
+        )
+        campaigns.append(
+            Campaign.objects.create(
+                user=user,
+                universe=universe,
+                character_sheet=character,
+                title=f"Load Test Campaign {index + 1}",
+            )
+        )
+    return user, campaigns
+
+
+def delete_campaigns(user) -> None:
+    """Delete a load-test user and everything :func:`create_campaigns` made for it."""
+    # Campaigns protect their character sheets, so they go first
+    Campaign.objects.filter(user=user).delete()
+    user.delete()
+
+
+class LoadTestHarness:
+    """
+    Plays campaigns concurrently and collects per-turn samples.
+
+    Usage:
+        harness = LoadTestHarness(LoadTestConfig(campaigns=20), llm_config, chroma_service)
+        user, campaigns = create_campaigns(20, chroma_service)
+        report = harness.run(campaigns)
+    """
+
+    def __init__(
+        self,
+        config: LoadTestConfig,
+        llm_config: LLMClientConfig,
+        chroma_service: ChromaClientService | None = None,
+    ):
+        self.config = config
+        self.llm_config = llm_config
+        self.chroma_service = chroma_service
+
+    def run(self, campaigns: list[Campaign]) -> LoadTestReport:
+        """Play every campaign's turns and report on them."""
+        report = LoadTestReport(config=self.config)
+        start = time.perf_counter()
+        if self.config.engine == "async":
+            batches = asyncio.run(self._arun(campaigns))
+        else:
+            with ThreadPoolExecutor(max_workers=self.config.workers) as pool:
+                batches = list(pool.map(self._play_campaign, range(len(campaigns)), campaigns))
+        report.wall_time = time.perf_counter() - start
+        report.samples = [sample for batch in batches for sample in batch]
+        return report
+
+    def _request(self, campaign: Campaign, turn: int) -> TurnRequest:
+        action = PLAYER_ACTIONS[(turn + self.config.seed) % len(PLAYER_ACTIONS)]
+        return TurnRequest(campaign=campaign, user_input=action, llm_config=self.llm_config)
+
+    def _sample(self, campaign: Campaign, turn: int, latency: float, result: TurnResult):
+        return TurnSample(
+            campaign_id=str(campaign.id),
+            turn=turn,
+            latency=latency,
+            success=result.success,
+            error="; ".join(result.errors),
+            input_tokens=result.metrics.input_tokens,
+            output_tokens=result.metrics.output_tokens,
+        )
+
+    def _play_campaign(self, index: int, campaign: Campaign) -> list[TurnSample]:
+        """Play one campaign's turns in order on a pool thread."""
+        engine = TurnEngine(
+            chroma_service=self.chroma_service, mechanics_seed=self.config.seed + index
+        )
+        samples = []
+        try:
+            for turn in range(self.config.turns_per_campaign):
+                request = self._request(campaign, turn)
+                start = time.perf_counter()
+                if self.config.stream:
+                    events = list(engine.process_turn_stream(request))
+                    result = _result_from_stream(events[-1].data)
+                else:
+                    result = engine.process_turn(request)
+                samples.append(self._sample(campaign, turn, time.perf_counter() - start, result))
+        finally:
+            # Pool threads hold their own DB connections
+            close_old_connections()
+        return samples
+
+    async def _arun(self, campaigns: list[Campaign]) -> list[list[TurnSample]]:
+        semaphore = asyncio.Semaphore(self.config.workers)
+
+        async def play(index: int, campaign: Campaign) -> list[TurnSample]:
+            async with semaphore:
+                return await self._aplay_campaign(index, campaign)
+
+        return await asyncio.gather(
+            *(play(index, campaign) for index, campaign in enumerate(campaigns))
+        )
+
+    async def _aplay_campaign(self, index: int, campaign: Campaign) -> list[TurnSample]:
+        """Play one campaign's turns in order on the event loop."""
+        engine = AsyncTurnEngine(
+            chroma_service=self.chroma_service, mechanics_seed=self.config.seed + index
+        )
+        samples = []
+        for turn in range(self.config.turns_per_campaign):
+            start = time.perf_counter()
+            result = await engine.process_turn(self._request(campaign, turn))
+            samples.append(self._sample(campaign, turn, time.perf_counter() - start, result))
+        return samples
+
+
+def _result_from_stream(data: dict) -> TurnResult:
+    """Rebuild the parts of a TurnResult a sample needs from a stream ``result`` event."""
+    result = TurnResult(
+        success=data["success"], phase=TurnPhase(data["phase"]), errors=data["errors"]
+    )
+    for call in data["metrics"]["llm_calls"]:
+        result.metrics.record_llm_call(
+            call["stage"],
+            call["model"],
+            call["duration_ms"] / 1000,
+            {"input_tokens": call["input_tokens"], "output_tokens": call["output_tokens"]},
+        )
+    return result
@@ -0,0 +1,106 @@
+"""
+Benchmark patch path validation.
+
+Times matching patch paths against VALID_PATCH_PATHS one regex at a time
+(the previous approach) and with the single combined regex, then times
+full PatchValidator.validate_patches over the same patches.
+
+Usage:
+    python manage.py benchmark_patch_validation
+    python manage.py benchmark_patch_validation --patches 20000
+"""
+
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.campaigns.services.validation import (
+    VALID_PATCH_PATHS,
+    PatchValidator,
+    match_patch_path,
+)
+
+SAMPLE_PATCHES = [
+    ("/party/player/hp/current", 12),
+    ("/party/player/conditions", ["prone"]),
+    ("/party/player/inventory/3", {"name": "rope"}),
+    ("/party/player/money/gp", 40),
+    ("/world/location_id", "tavern"),
+    ("/world/quests/2/stage", 3),
+    ("/world/npcs/{id}/attitude", "friendly"),
+    ("/world/npcs/{id}/knowledge_flags/1", "saw_murder"),
+    ("/world/factions/{id}/standing", 5),
+    ("/world/global_flags/{id}", True),
+    ("/world/secret_lair/{id}", "disallowed"),
+]
+
+
+def build_patches(count: int, seed: int) -> list[dict]:
+    """Synthetic patches spread over allowed and disallowed paths."""
+    rng = random.Random(seed)
+    patches = []
+    for _ in range(count):
+        path, value = rng.choice(SAMPLE_PATCHES)
+        patches.append(
+            {
+                "op": "replace",
+                "path": path.replace("{id}", f"id_{rng.randrange(500)}"),
+                "value": value,
+            }
+        )
+    return patches
+
+
+def match_loop(path: str) -> str | None:
+    """The previous matcher: try each pattern in turn."""
+    for pattern in VALID_PATCH_PATHS:
+        if re.match(pattern, path):
+            return pattern
+    return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark single-pass patch path validation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patches", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--repeat", type=int, default=5, help="Report the best of N runs")
+
+    def handle(self, *args, **options):
+        patches = build_patches(options["patches"], options["seed"])
+        paths = [patch["path"] for patch in patches]
+        validator = PatchValidator()
+
+        def timed(fn):
+            best = None
+            for _ in range(max(options["repeat"], 1)):
+                start = time.perf_counter()
+                value = fn()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best, value
+
+        loop_time, loop_matches = timed(lambda: [match_loop(path) for path in paths])
+        single_time, single_matches = timed(lambda: [match_patch_path(path) for path in paths])
+        if loop_matches != single_matches:
+            raise CommandError("Combined regex matched different templates than the loop")
+
+        validate_time, result = timed(lambda: validator.validate_patches(patches))
+
+        self.stdout.write(f"{len(patches)} patches, {len(VALID_PATCH_PATHS)} path patterns")
+        for name, elapsed in (
+            ("match: regex loop", loop_time),
+            ("match: combined regex", single_time),
+            ("validate_patches", validate_time),
+        ):
+            per_patch_us = elapsed / max(len(patches), 1) * 1_000_000
+            self.stdout.write(
+                f"  {name:<24} {elapsed * 1000:8.2f} ms  {per_patch_us:6.2f} us/patch"
+            )
+        self.stdout.write(f"  speedup (match): x{loop_time / single_time:.1f}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Templates match ({len(result.errors)} disallowed patches)")
+        )
@@ -0,0 +1,176 @@
+"""
+Benchmark PatchEngine against the copy-on-every-level deep merge.
+
+Builds a synthetic campaign in memory (no database access) and times
+replaying and advancing through it with both approaches.
+
+Usage:
+    python manage.py benchmark_patches
+    python manage.py benchmark_patches --turns 1000 --npcs 500 --patches-per-turn 6
+"""
+
+import copy
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.campaigns.models import TurnEvent
+from apps.campaigns.services.patch_engine import PatchEngine, compile_path
+
+
+def deep_merge(base: dict, update: dict) -> dict:
+    """The merge StateService used before PatchEngine: copies every merged level."""
+    result = base.copy()
+    for key, value in update.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = deep_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def patches_to_merge(patches: list[dict]) -> dict:
+    """Express replace patches as the equivalent per-section merge dicts."""
+    merged: dict = {}
+    for patch in patches:
+        compiled = compile_path(patch["path"])
+        node = merged.setdefault(compiled.section, {})
+        for token in compiled.tokens[:-1]:
+            node = node.setdefault(token, {})
+        node[compiled.tokens[-1]] = patch["value"]
+    return merged
+
+
+def build_campaign(turns: int, npcs: int, patches_per_turn: int, seed: int):
+    """Synthetic initial state and turn events."""
+    rng = random.Random(seed)
+    npc_ids = [f"npc_{i}" for i in range(npcs)]
+    state = {
+        "campaign_id": "benchmark",
+        "turn_index": 0,
+        "character_state": {"hp": {"current": 30, "max": 30, "temp": 0}, "conditions": []},
+        "world_state": {
+            "npcs": {
+                npc_id: {"status": "alive", "attitude": "neutral", "location_id": "town"}
+                for npc_id in npc_ids
+            },
+            "factions": {},
+            "locations": {},
+        },
+        "universe_time": {},
+        "rules_context": {},
+        "global_flags": {},
+    }
+
+    events = []
+    for turn_index in range(1, turns + 1):
+        patches = []
+        for _ in range(patches_per_turn):
+            kind = rng.randrange(3)
+            if kind == 0:
+                patches.append(
+                    {
+                        "op": "replace",
+                        "path": "/party/player/hp/current",
+                        "value": rng.randint(1, 30),
+                    }
+                )
+            elif kind == 1:
+                npc_id = rng.choice(npc_ids)
+                patches.append(
+                    {
+                        "op": "replace",
+                        "path": f"/world/npcs/{npc_id}/attitude",
+                        "value": rng.choice(["friendly", "neutral", "hostile"]),
+                    }
+                )
+            else:
+                patches.append(
+                    {
+                        "op": "replace",
+                        "path": f"/world/global_flags/flag_{rng.randrange(50)}",
+                        "value": rng.random() < 0.5,
+                    }
+                )
+        events.append(TurnEvent(turn_index=turn_index, state_patch_json={"patches": patches}))
+    return state, events
+
+
+class Command(BaseCommand):
+    help = "Benchmark PatchEngine against deep-merge patch application."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--turns", type=int, default=1000)
+        parser.add_argument("--npcs", type=int, default=200)
+        parser.add_argument("--patches-per-turn", type=int, default=4)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--repeat", type=int, default=3, help="Report the best of N runs")
+
+    def handle(self, *args, **options):
+        initial, turns = build_campaign(
+            options["turns"], options["npcs"], options["patches_per_turn"], options["seed"]
+        )
+        merges = [patches_to_merge(turn.state_patch_json["patches"]) for turn in turns]
+        engine = PatchEngine()
+        results = {}
+
+        def timed(name, fn):
+            best = None
+            for _ in range(max(options["repeat"], 1)):
+                start = time.perf_counter()
+                final = fn()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (best, final)
+
+        def replay_deep_merge():
+            state = copy.deepcopy(initial)
+            for turn, merge in zip(turns, merges, strict=True):
+                for section, update in merge.items():
+                    state[section] = deep_merge(state[section], update)
+                state["turn_index"] = turn.turn_index
+            return state
+
+        def replay_engine():
+            return engine.replay(initial, turns).state
+
+        def advance_deepcopy_merge():
+            # Non-mutating per-turn advance: deep copy, then merge
+            state = initial
+            for turn, merge in zip(turns, merges, strict=True):
+                state = copy.deepcopy(state)
+                for section, update in merge.items():
+                    state[section] = deep_merge(state[section], update)
+                state["turn_index"] = turn.turn_index
+            return state
+
+        def advance_engine():
+            state = initial
+            for turn in turns:
+                state = engine.apply_turn(state, turn)
+            return state
+
+        timed("replay: deep merge", replay_deep_merge)
+        timed("replay: patch engine", replay_engine)
+        timed("advance: deepcopy + deep merge", advance_deepcopy_merge)
+        timed("advance: patch engine (copy-on-write)", advance_engine)
+
+        finals = [final for _, final in results.values()]
+        if any(final != finals[0] for final in finals[1:]):
+            raise CommandError("Strategies produced different final states")
+
+        self.stdout.write(
+            f"{len(turns)} turns, {options['npcs']} npcs, "
+            f"{options['patches_per_turn']} patches/turn"
+        )
+        baselines = {"replay": None, "advance": None}
+        for name, (elapsed, _) in results.items():
+            group = name.split(":")[0]
+            baseline = baselines[group] = baselines[group] or elapsed
+            per_turn_us = elapsed / max(len(turns), 1) * 1_000_000
+            self.stdout.write(
+                f"  {name:<40} {elapsed * 1000:9.1f} ms  {per_turn_us:8.1f} us/turn  "
+                f"x{baseline / elapsed:.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS("Final states match"))
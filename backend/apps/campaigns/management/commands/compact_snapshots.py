@@ -0,0 +1,60 @@
+"""
+Convert campaign state snapshots to compressed keyframes and deltas.
+
+Usage:
+    python manage.py compact_snapshots
+    python manage.py compact_snapshots --campaign <uuid> --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.campaigns.models import Campaign, CanonicalCampaignState
+from apps.campaigns.services.state_service import StateService
+
+
+class Command(BaseCommand):
+    help = "Re-encode CanonicalCampaignState rows as compressed keyframes plus diffs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", help="Only convert this campaign (UUID)")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-chain every campaign, not just those with uncompressed snapshots",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be converted without writing",
+        )
+
+    def handle(self, *args, **options):
+        campaigns = Campaign.objects.all()
+        if options["campaign"]:
+            campaigns = campaigns.filter(id=options["campaign"])
+        if not options["all"]:
+            # Uncompressed full-state rows written before keyframes existed
+            legacy = CanonicalCampaignState.objects.filter(is_keyframe=True, encoding="json")
+            campaigns = campaigns.filter(id__in=legacy.values("campaign_id"))
+
+        state_service = StateService()
+        converted_campaigns = 0
+        converted_snapshots = 0
+
+        for campaign in campaigns.order_by("created_at").iterator():
+            if options["dry_run"]:
+                count = campaign.state_snapshots.count()
+            else:
+                with transaction.atomic():
+                    count = state_service.compact_snapshots(campaign)
+            converted_campaigns += 1
+            converted_snapshots += count
+            self.stdout.write(f"{campaign.id}: {count} snapshots")
+
+        verb = "Would convert" if options["dry_run"] else "Converted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {converted_snapshots} snapshots across {converted_campaigns} campaigns"
+            )
+        )
@@ -0,0 +1,137 @@
+"""
+Load test the turn pipeline.
+
+Starts the fake OpenAI-compatible LLM server and the in-memory Chroma
+stand-in, creates throwaway campaigns, plays them concurrently and reports
+p50/p95/p99 turn latency and throughput. The campaigns (and their user) are
+deleted afterwards unless --keep is given.
+
+Run concurrent sync-engine tests against PostgreSQL: SQLite allows one
+writer at a time, so concurrent turns fail with "database is locked".
+
+Usage:
+    python manage.py loadtest_turns
+    python manage.py loadtest_turns --campaigns 50 --turns 10 --latency-ms 300 \\
+        --tokens-per-second 60 --error-rate 0.02
+    python manage.py loadtest_turns --engine async --json
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.campaigns.loadtest import (
+    FakeLLMConfig,
+    FakeLLMServer,
+    InMemoryChromaClient,
+    LoadTestConfig,
+    LoadTestHarness,
+    create_campaigns,
+    delete_campaigns,
+)
+from apps.campaigns.loadtest.harness import ENGINES
+from apps.campaigns.services.llm_client import LLMClientConfig, LLMProvider
+from apps.lore.services.chroma_client import ChromaClientService
+
+
+class Command(BaseCommand):
+    help = "Drive concurrent campaigns through the turn pipeline against fake LLM/Chroma."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaigns", type=int, default=10)
+        parser.add_argument("--turns", type=int, default=5, help="Turns per campaign")
+        parser.add_argument(
+            "--concurrency", type=int, help="Campaigns played at once (default: all)"
+        )
+        parser.add_argument("--engine", choices=ENGINES, default="sync")
+        parser.add_argument("--stream", action="store_true", help="Stream turns (sync only)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--latency-ms", type=float, default=200, help="LLM time to first token")
+        parser.add_argument(
+            "--tokens-per-second", type=float, default=80, help="LLM output rate (0 = instant)"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share of LLM calls that fail"
+        )
+        parser.add_argument("--error-status", type=int, default=503)
+        parser.add_argument(
+            "--max-retries", type=int, default=0, help="LLM client retries per call"
+        )
+        parser.add_argument(
+            "--chroma-latency-ms", type=float, default=0, help="Added latency per lore query"
+        )
+        parser.add_argument("--keep", action="store_true", help="Keep the created campaigns")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            config = LoadTestConfig(
+                campaigns=options["campaigns"],
+                turns_per_campaign=options["turns"],
+                concurrency=options["concurrency"],
+                engine=options["engine"],
+                stream=options["stream"],
+                seed=options["seed"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        fake_config = FakeLLMConfig(
+            seed=options["seed"],
+            latency=options["latency_ms"] / 1000,
+            tokens_per_second=options["tokens_per_second"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+        )
+        chroma_client = InMemoryChromaClient(query_latency=options["chroma_latency_ms"] / 1000)
+        chroma_service = ChromaClientService(
+            client=chroma_client, embedding_function=chroma_client.embedding_function
+        )
+
+        with FakeLLMServer(fake_config) as server:
+            llm_config = LLMClientConfig(
+                provider=LLMProvider.OPENAI,
+                api_key="loadtest",
+                model="fake-dm",
+                base_url=server.base_url,
+                max_retries=options["max_retries"],
+                initial_retry_delay=0.05,
+            )
+            user, campaigns = create_campaigns(config.campaigns, chroma_service)
+            try:
+                report = LoadTestHarness(config, llm_config, chroma_service).run(campaigns)
+            finally:
+                if not options["keep"]:
+                    delete_campaigns(user)
+            llm_requests, llm_errors = server.requests, server.errors
+
+        summary = report.to_dict()
+        summary["llm_requests"] = llm_requests
+        summary["llm_errors_injected"] = llm_errors
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        self.stdout.write(
+            f"{summary['turns']} turns across {config.campaigns} campaigns "
+            f"({config.engine}{', streamed' if config.stream else ''}, "
+            f"concurrency {config.workers})"
+        )
+        latency = summary["latency_ms"]
+        self.stdout.write(
+            f"  latency   p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  "
+            f"p99 {latency['p99']:8.1f} ms"
+        )
+        self.stdout.write(
+            f"  throughput {summary['throughput_turns_per_s']:.2f} turns/s "
+            f"over {summary['wall_time_s']:.2f} s"
+        )
+        self.stdout.write(
+            f"  llm calls {llm_requests} ({llm_errors} injected errors), tokens "
+            f"{summary['input_tokens']} in / {summary['output_tokens']} out"
+        )
+        for error in summary["errors"]:
+            self.stdout.write(self.style.WARNING(f"  error: {error}"))
+        style = self.style.SUCCESS if not report.failed else self.style.WARNING
+        self.stdout.write(style(f"{report.succeeded} succeeded, {report.failed} failed"))
@@ -0,0 +1,43 @@
+"""
+Rebuild the dice log (RollRecord and RollStats) from stored turn results.
+
+Backfills campaigns played before the dice log existed, and repairs the
+running statistics if they ever drift from the turns.
+
+Usage:
+    python manage.py rebuild_dice_log
+    python manage.py rebuild_dice_log --campaign <uuid>
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.dice_log import DiceLogService
+
+
+class Command(BaseCommand):
+    help = "Regenerate RollRecord rows and RollStats aggregates from TurnEvent roll results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", help="Only rebuild this campaign (UUID)")
+
+    def handle(self, *args, **options):
+        campaigns = Campaign.objects.all()
+        if options["campaign"]:
+            campaigns = campaigns.filter(id=options["campaign"])
+
+        dice_log = DiceLogService()
+        rebuilt_campaigns = 0
+        recorded_rolls = 0
+
+        for campaign in campaigns.order_by("created_at").iterator():
+            count = dice_log.rebuild(campaign)
+            rebuilt_campaigns += 1
+            recorded_rolls += count
+            self.stdout.write(f"{campaign.id}: {count} rolls")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recorded {recorded_rolls} rolls across {rebuilt_campaigns} campaigns"
+            )
+        )
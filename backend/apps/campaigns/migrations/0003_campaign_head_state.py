@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignHeadState",
+            fields=[
+                (
+                    "campaign",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="head_state",
+                        serialize=False,
+                        to="campaigns.campaign",
+                    ),
+                ),
+                ("turn_index", models.PositiveIntegerField()),
+                ("state_json", models.JSONField()),
+                ("state_hash", models.CharField(max_length=64)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Campaign Head State",
+                "verbose_name_plural": "Campaign Head States",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0003_campaign_head_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaignheadstate",
+            name="last_snapshot_turn",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="campaignheadstate",
+            name="merge_ops_since_snapshot",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="campaignheadstate",
+            name="patch_bytes_since_snapshot",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="campaignheadstate",
+            name="turns_since_snapshot",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0004_head_state_replay_cost"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="canonicalcampaignstate",
+            name="delta_json",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="canonicalcampaignstate",
+            name="encoding",
+            field=models.CharField(
+                choices=[("json", "Uncompressed JSON"), ("zlib", "zlib-compressed JSON")],
+                default="json",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="canonicalcampaignstate",
+            name="is_keyframe",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="canonicalcampaignstate",
+            name="keyframe",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="deltas",
+                to="campaigns.canonicalcampaignstate",
+            ),
+        ),
+        migrations.AddField(
+            model_name="canonicalcampaignstate",
+            name="state_blob",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="canonicalcampaignstate",
+            name="state_json",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
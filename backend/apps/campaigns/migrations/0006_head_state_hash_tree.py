@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0005_snapshot_keyframes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaignheadstate",
+            name="hash_tree",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0006_head_state_hash_tree"),
+        ("llm_config", "0003_alter_llmendpointconfig_provider_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TurnJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "sequence",
+                    models.PositiveIntegerField(help_text="Submission order within the campaign"),
+                ),
+                ("user_input", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("result_json", models.JSONField(blank=True, default=dict)),
+                ("error_message", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="turn_jobs",
+                        to="campaigns.campaign",
+                    ),
+                ),
+                (
+                    "llm_config",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="turn_jobs",
+                        to="llm_config.llmendpointconfig",
+                    ),
+                ),
+                (
+                    "turn_event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="jobs",
+                        to="campaigns.turnevent",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Turn Job",
+                "verbose_name_plural": "Turn Jobs",
+                "ordering": ["campaign", "sequence"],
+                "unique_together": {("campaign", "sequence")},
+            },
+        ),
+    ]
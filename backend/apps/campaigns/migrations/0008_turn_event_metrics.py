@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0007_turn_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnevent",
+            name="metrics_json",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Per-phase timings and LLM token usage for the turn",
+            ),
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:53
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0008_turn_event_metrics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollRecord",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("turn_index", models.PositiveIntegerField()),
+                (
+                    "roll_number",
+                    models.PositiveIntegerField(help_text="Order of the roll within the campaign"),
+                ),
+                ("roll_id", models.CharField(max_length=100)),
+                ("roll_type", models.CharField(max_length=30)),
+                ("ability", models.CharField(blank=True, max_length=10)),
+                ("skill", models.CharField(blank=True, max_length=50)),
+                ("roll_value", models.IntegerField()),
+                ("modifier", models.IntegerField()),
+                ("total", models.IntegerField()),
+                ("dc", models.IntegerField(blank=True, null=True)),
+                ("success", models.BooleanField(blank=True, null=True)),
+                ("advantage_state", models.CharField(default="none", max_length=20)),
+                ("is_critical", models.BooleanField(default=False)),
+                ("is_fumble", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="roll_records",
+                        to="campaigns.campaign",
+                    ),
+                ),
+                (
+                    "turn",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="roll_records",
+                        to="campaigns.turnevent",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Roll Record",
+                "verbose_name_plural": "Roll Records",
+                "ordering": ["campaign", "roll_number"],
+                "indexes": [
+                    models.Index(
+                        fields=["campaign", "turn_index"], name="campaigns_r_campaig_259b59_idx"
+                    ),
+                    models.Index(
+                        fields=["campaign", "roll_type", "roll_number"],
+                        name="campaigns_r_campaig_52f60f_idx",
+                    ),
+                    models.Index(
+                        fields=["campaign", "success", "roll_number"],
+                        name="campaigns_r_campaig_891fc3_idx",
+                    ),
+                ],
+                "unique_together": {("campaign", "roll_number")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RollStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("roll_type", models.CharField(max_length=30)),
+                ("ability", models.CharField(blank=True, max_length=10)),
+                ("rolls", models.PositiveIntegerField(default=0)),
+                (
+                    "checks",
+                    models.PositiveIntegerField(default=0, help_text="Rolls made against a DC"),
+                ),
+                ("successes", models.PositiveIntegerField(default=0)),
+                ("criticals", models.PositiveIntegerField(default=0)),
+                ("fumbles", models.PositiveIntegerField(default=0)),
+                ("total_sum", models.BigIntegerField(default=0)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="roll_stats",
+                        to="campaigns.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Roll Stats",
+                "verbose_name_plural": "Roll Stats",
+                "unique_together": {("campaign", "roll_type", "ability")},
+            },
+        ),
+    ]
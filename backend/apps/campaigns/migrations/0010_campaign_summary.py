@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:58
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0009_roll_records"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "level",
+                    models.CharField(
+                        choices=[("chapter", "Chapter"), ("arc", "Arc"), ("saga", "Saga")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "index",
+                    models.PositiveIntegerField(help_text="Chapter or arc number (0 for the saga)"),
+                ),
+                ("start_turn", models.PositiveIntegerField()),
+                ("end_turn", models.PositiveIntegerField()),
+                ("summary_text", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="summaries",
+                        to="campaigns.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Campaign Summary",
+                "verbose_name_plural": "Campaign Summaries",
+                "ordering": ["campaign", "start_turn", "level"],
+                "indexes": [
+                    models.Index(
+                        fields=["campaign", "level", "end_turn"],
+                        name="campaigns_c_campaig_e5e3cc_idx",
+                    )
+                ],
+                "unique_together": {("campaign", "level", "index")},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0010_campaign_summary"),
+    ]
+
+    operations = [
+        # Existing turns were hashed before Merkle hashing
+        migrations.AddField(
+            model_name="turnevent",
+            name="merkle_hash",
+            field=models.BooleanField(
+                default=False,
+                help_text="canonical_state_hash is the Merkle root of the state after the turn (False for turns persisted before Merkle hashing)",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="turnevent",
+            name="merkle_hash",
+            field=models.BooleanField(
+                default=True,
+                help_text="canonical_state_hash is the Merkle root of the state after the turn (False for turns persisted before Merkle hashing)",
+            ),
+        ),
+    ]
@@ -104,8 +104,18 @@ class TurnEvent(models.Model):
     roll_results_json = models.JSONField(default=dict)
     state_patch_json = models.JSONField(default=dict)
     canonical_state_hash = models.CharField(max_length=64)
+    merkle_hash = models.BooleanField(
+        default=True,
+        help_text="canonical_state_hash is the Merkle root of the state after the turn "
+        "(False for turns persisted before Merkle hashing)",
+    )
     lore_deltas_json = models.JSONField(default=list)
     universe_time_after_turn = models.JSONField(default=dict)
+    metrics_json = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per-phase timings and LLM token usage for the turn",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -122,9 +132,18 @@ class CanonicalCampaignState(models.Model):
     """
     Snapshot of campaign state for fast loads.
 
-    To be fully implemented in Epic 7.
+    Keyframes store the full state zlib-compressed in ``state_blob``; the
+    snapshots between keyframes store a structural diff against their
+    keyframe in ``delta_json``. Rows written before compression keep the
+    full state in ``state_json`` (``encoding="json"``). Decode with
+    services.snapshot_codec.decode_snapshot.
     """
 
+    ENCODING_CHOICES = [
+        ("json", "Uncompressed JSON"),
+        ("zlib", "zlib-compressed JSON"),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     campaign = models.ForeignKey(
         Campaign,
@@ -132,7 +151,18 @@ class CanonicalCampaignState(models.Model):
         related_name="state_snapshots",
     )
     turn_index = models.PositiveIntegerField()
-    state_json = models.JSONField()
+    is_keyframe = models.BooleanField(default=True)
+    keyframe = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="deltas",
+    )
+    encoding = models.CharField(max_length=10, choices=ENCODING_CHOICES, default="json")
+    state_json = models.JSONField(null=True, blank=True)
+    state_blob = models.BinaryField(null=True, blank=True)
+    delta_json = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -142,3 +172,232 @@ class CanonicalCampaignState(models.Model):
 
     def __str__(self):
         return f"State at turn {self.turn_index} - {self.campaign.title}"
+
+
+class CampaignHeadState(models.Model):
+    """
+    Materialized current state of a campaign.
+
+    Written through inside the same transaction that persists each turn and
+    reset by rewind, so reading the current state is a single row fetch.
+    Snapshots plus TurnEvent replay remain the source of truth and are used
+    for verification and rewind.
+
+    Also tracks the replay cost accumulated since the last snapshot, which
+    drives the cost-based snapshot policy, and the root and section hashes
+    of the state's Merkle tree so the next turn only rehashes the sections
+    it touched.
+    """
+
+    campaign = models.OneToOneField(
+        Campaign,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="head_state",
+    )
+    turn_index = models.PositiveIntegerField()
+    state_json = models.JSONField()
+    state_hash = models.CharField(max_length=64)
+    hash_tree = models.JSONField(default=dict, blank=True)
+    last_snapshot_turn = models.PositiveIntegerField(default=0)
+    turns_since_snapshot = models.PositiveIntegerField(default=0)
+    patch_bytes_since_snapshot = models.PositiveBigIntegerField(default=0)
+    merge_ops_since_snapshot = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Campaign Head State"
+        verbose_name_plural = "Campaign Head States"
+
+    def __str__(self):
+        return f"Head state at turn {self.turn_index} - {self.campaign.title}"
+
+
+class TurnJob(models.Model):
+    """
+    A queued player turn, processed by the turn_queue Celery worker.
+
+    Jobs are numbered per campaign at submission; a job is only processed
+    once every earlier job for its campaign has finished, so turns apply
+    in submission order. Clients poll the job for its TurnResult.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    campaign = models.ForeignKey(
+        Campaign,
+        on_delete=models.CASCADE,
+        related_name="turn_jobs",
+    )
+    sequence = models.PositiveIntegerField(help_text="Submission order within the campaign")
+    user_input = models.TextField()
+    llm_config = models.ForeignKey(
+        "llm_config.LlmEndpointConfig",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="turn_jobs",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result_json = models.JSONField(default=dict, blank=True)
+    turn_event = models.ForeignKey(
+        TurnEvent,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Turn Job"
+        verbose_name_plural = "Turn Jobs"
+        ordering = ["campaign", "sequence"]
+        unique_together = ["campaign", "sequence"]
+
+    def __str__(self):
+        return f"Turn job {self.sequence} ({self.status}) - {self.campaign.title}"
+
+
+class RollRecord(models.Model):
+    """
+    A single dice roll, denormalized from TurnEvent.roll_results_json.
+
+    Written in the same transaction as its turn and deleted with it on
+    rewind, so the dice log is an indexed query rather than an unpacking of
+    every turn's JSON. Rolls are numbered per campaign, which gives the
+    dice log a unique key to paginate on.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    campaign = models.ForeignKey(
+        Campaign,
+        on_delete=models.CASCADE,
+        related_name="roll_records",
+    )
+    turn = models.ForeignKey(
+        TurnEvent,
+        on_delete=models.CASCADE,
+        related_name="roll_records",
+    )
+    turn_index = models.PositiveIntegerField()
+    roll_number = models.PositiveIntegerField(help_text="Order of the roll within the campaign")
+    roll_id = models.CharField(max_length=100)
+    roll_type = models.CharField(max_length=30)
+    ability = models.CharField(max_length=10, blank=True)
+    skill = models.CharField(max_length=50, blank=True)
+    roll_value = models.IntegerField()
+    modifier = models.IntegerField()
+    total = models.IntegerField()
+    dc = models.IntegerField(null=True, blank=True)
+    success = models.BooleanField(null=True, blank=True)
+    advantage_state = models.CharField(max_length=20, default="none")
+    is_critical = models.BooleanField(default=False)
+    is_fumble = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Roll Record"
+        verbose_name_plural = "Roll Records"
+        ordering = ["campaign", "roll_number"]
+        unique_together = ["campaign", "roll_number"]
+        indexes = [
+            models.Index(fields=["campaign", "turn_index"]),
+            models.Index(fields=["campaign", "roll_type", "roll_number"]),
+            models.Index(fields=["campaign", "success", "roll_number"]),
+        ]
+
+    def __str__(self):
+        return f"Roll {self.roll_number} ({self.roll_type}) - turn {self.turn_index}"
+
+
+class RollStats(models.Model):
+    """
+    Running dice statistics for a campaign, per roll type and ability.
+
+    Adjusted incrementally as turns are persisted and rewound, so serving
+    the aggregates never scans RollRecord.
+    """
+
+    campaign = models.ForeignKey(
+        Campaign,
+        on_delete=models.CASCADE,
+        related_name="roll_stats",
+    )
+    roll_type = models.CharField(max_length=30)
+    ability = models.CharField(max_length=10, blank=True)
+    rolls = models.PositiveIntegerField(default=0)
+    checks = models.PositiveIntegerField(default=0, help_text="Rolls made against a DC")
+    successes = models.PositiveIntegerField(default=0)
+    criticals = models.PositiveIntegerField(default=0)
+    fumbles = models.PositiveIntegerField(default=0)
+    total_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Roll Stats"
+        verbose_name_plural = "Roll Stats"
+        unique_together = ["campaign", "roll_type", "ability"]
+
+    def __str__(self):
+        return f"{self.roll_type} {self.ability or '-'}: {self.rolls} rolls"
+
+
+class CampaignSummary(models.Model):
+    """
+    A narrative summary of part of a campaign, for the DM's long-term memory.
+
+    Summaries are hierarchical: a chapter summarizes a fixed run of turns, an
+    arc summarizes a fixed run of chapters, and the single saga row folds in
+    the arcs too old to be recapped individually. Written in the background
+    as chapters complete and deleted by rewinds past their end turn.
+    """
+
+    LEVEL_CHAPTER = "chapter"
+    LEVEL_ARC = "arc"
+    LEVEL_SAGA = "saga"
+
+    LEVEL_CHOICES = [
+        (LEVEL_CHAPTER, "Chapter"),
+        (LEVEL_ARC, "Arc"),
+        (LEVEL_SAGA, "Saga"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    campaign = models.ForeignKey(
+        Campaign,
+        on_delete=models.CASCADE,
+        related_name="summaries",
+    )
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    index = models.PositiveIntegerField(help_text="Chapter or arc number (0 for the saga)")
+    start_turn = models.PositiveIntegerField()
+    end_turn = models.PositiveIntegerField()
+    summary_text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Campaign Summary"
+        verbose_name_plural = "Campaign Summaries"
+        ordering = ["campaign", "start_turn", "level"]
+        unique_together = ["campaign", "level", "index"]
+        indexes = [
+            models.Index(fields=["campaign", "level", "end_turn"]),
+        ]
+
+    def __str__(self):
+        return f"{self.level.title()} {self.index} (turns {self.start_turn}-{self.end_turn})"
@@ -0,0 +1,69 @@
+"""
+Turn history and dice log pagination.
+
+Keyset (cursor) pagination over a campaign's turns on (campaign_id,
+turn_index) and its rolls on (campaign_id, roll_number), each served by
+the unique index on those columns, so deep pages cost the same as the
+first. The total count is optional and cached per
+latest turn index: turns are append-only apart from rewinds, which only
+truncate, so the count of turns up to a given latest index never changes.
+"""
+
+import logging
+
+from django.core.cache import cache
+from rest_framework.pagination import CursorPagination
+
+logger = logging.getLogger(__name__)
+
+TURN_COUNT_CACHE_TTL = 3600
+
+
+class TurnCursorPagination(CursorPagination):
+    """
+    Cursor pagination ordered by turn_index.
+
+    ?order=desc pages newest first; the cursor links keep the order.
+    """
+
+    page_size = 50
+    page_size_query_param = "limit"
+    max_page_size = 200
+    ordering = "turn_index"
+
+    def get_ordering(self, request, queryset, view):
+        if request.query_params.get("order") == "desc":
+            return (f"-{self.ordering}",)
+        return (self.ordering,)
+
+
+class RollCursorPagination(TurnCursorPagination):
+    """Cursor pagination over the dice log, ordered by roll_number."""
+
+    ordering = "roll_number"
+
+
+def cached_turn_count(campaign) -> int:
+    """
+    Count a campaign's turns, caching the result per latest turn index.
+
+    Falls back to counting directly when the cache is unavailable.
+    """
+    latest = campaign.turns.order_by("-turn_index").values_list("turn_index", flat=True).first()
+    if latest is None:
+        return 0
+
+    key = f"campaign:{campaign.id}:turn_count:{latest}"
+    try:
+        count = cache.get(key)
+    except Exception as e:
+        logger.debug(f"Turn count cache unavailable: {e}")
+        return campaign.turns.count()
+
+    if count is None:
+        count = campaign.turns.count()
+        try:
+            cache.set(key, count, TURN_COUNT_CACHE_TTL)
+        except Exception as e:
+            logger.debug(f"Turn count cache unavailable: {e}")
+    return count
@@ -6,7 +6,14 @@ Handles serialization for campaigns, turns, and state snapshots.
 
 from rest_framework import serializers
 
-from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.models import (
+    Campaign,
+    CanonicalCampaignState,
+    RollRecord,
+    TurnEvent,
+    TurnJob,
+)
+from apps.campaigns.services.snapshot_codec import decode_snapshot
 from apps.characters.models import CharacterSheet
 from apps.universes.models import Universe
 
@@ -168,6 +175,20 @@ class TurnEventSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class TurnEventCompactSerializer(serializers.ModelSerializer):
+    """Serializer for turn event index entries (list view without narration)."""
+
+    class Meta:
+        model = TurnEvent
+        fields = [
+            "id",
+            "turn_index",
+            "user_input_text",
+            "universe_time_after_turn",
+            "created_at",
+        ]
+
+
 class TurnEventSummarySerializer(serializers.ModelSerializer):
     """Serializer for turn event summaries (list view)."""
 
@@ -183,8 +204,35 @@ class TurnEventSummarySerializer(serializers.ModelSerializer):
         ]
 
 
+class RollRecordSerializer(serializers.ModelSerializer):
+    """Serializer for dice log entries."""
+
+    class Meta:
+        model = RollRecord
+        fields = [
+            "roll_number",
+            "turn_index",
+            "roll_id",
+            "roll_type",
+            "ability",
+            "skill",
+            "roll_value",
+            "modifier",
+            "total",
+            "dc",
+            "success",
+            "advantage_state",
+            "is_critical",
+            "is_fumble",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
 class CanonicalStateSerializer(serializers.ModelSerializer):
-    """Serializer for canonical campaign state."""
+    """Serializer for canonical campaign state (decodes keyframes and deltas)."""
+
+    state_json = serializers.SerializerMethodField()
 
     class Meta:
         model = CanonicalCampaignState
@@ -192,11 +240,16 @@ class CanonicalStateSerializer(serializers.ModelSerializer):
             "id",
             "campaign",
             "turn_index",
+            "is_keyframe",
             "state_json",
             "created_at",
         ]
         read_only_fields = fields
 
+    def get_state_json(self, obj):
+        """Get the full state stored in this snapshot."""
+        return decode_snapshot(obj)
+
 
 class CampaignStateResponseSerializer(serializers.Serializer):
     """Serializer for campaign state API response."""
@@ -207,6 +260,55 @@ class CampaignStateResponseSerializer(serializers.Serializer):
     character_state = serializers.DictField()
     universe_time = serializers.DictField()
     is_snapshot = serializers.BooleanField()
+    replay_stats = serializers.DictField(required=False)
+
+
+class TurnSubmitSerializer(serializers.Serializer):
+    """Serializer for player turn submission."""
+
+    user_input = serializers.CharField(
+        max_length=4000,
+        help_text="The player's action or dialogue for this turn.",
+    )
+    stream = serializers.BooleanField(
+        default=False,
+        help_text="Stream DM narration as server-sent events instead of waiting for the turn.",
+    )
+    queue = serializers.BooleanField(
+        default=False,
+        help_text="Queue the turn and return 202 with a job to poll instead of waiting for it.",
+    )
+
+    def validate(self, attrs):
+        if attrs["stream"] and attrs["queue"]:
+            raise serializers.ValidationError("stream and queue cannot both be set.")
+        return attrs
+
+
+class TurnJobSerializer(serializers.ModelSerializer):
+    """Serializer for queued turn jobs (poll view)."""
+
+    turn_index = serializers.SerializerMethodField()
+    result = serializers.JSONField(source="result_json", read_only=True)
+
+    class Meta:
+        model = TurnJob
+        fields = [
+            "id",
+            "sequence",
+            "status",
+            "user_input",
+            "turn_index",
+            "result",
+            "error_message",
+            "created_at",
+            "started_at",
+            "completed_at",
+        ]
+
+    def get_turn_index(self, obj):
+        """Get the index of the turn the job produced, if any."""
+        return obj.turn_event.turn_index if obj.turn_event else None
 
 
 class RewindRequestSerializer(serializers.Serializer):
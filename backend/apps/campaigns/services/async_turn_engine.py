@@ -0,0 +1,280 @@
+"""
+Async Turn Engine Service.
+
+asyncio implementation of the two-stage turn flow in turn_engine.py. The
+independent context dependencies - state replay, recent turns, universe prompt
+and lore retrieval - are gathered concurrently, and LLM calls go through
+``httpx.AsyncClient`` so a turn never blocks the event loop on network I/O.
+
+ORM work runs in Django's thread-sensitive executor (one connection, shared
+transaction) while the blocking ChromaDB queries run in worker threads, so
+context-build latency tracks the slowest of the two rather than their sum.
+Concurrently gathered phases are each timed on their own, so their recorded
+times can add up to more than the turn's wall time.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+
+from asgiref.sync import sync_to_async
+
+from apps.campaigns.models import Campaign, TurnEvent
+
+from .llm_client import AsyncLLMClient, LLMError, LLMResponse, Message
+from .prompt_builder import RECENT_TURN_FIELDS, LoreInjection, TurnContext
+from .state_service import CampaignState
+from .turn_engine import (
+    RollResult,
+    TurnConflictError,
+    TurnEngine,
+    TurnPhase,
+    TurnRequest,
+    TurnResult,
+)
+from .turn_metrics import TurnMetrics
+from .validation import LLMOutputValidator, ValidationResult
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTurnEngine(TurnEngine):
+    """
+    Orchestrates the complete turn flow on an event loop.
+
+    Same phases, prompts, validation and persistence as :class:`TurnEngine`;
+    only ``process_turn`` is a coroutine.
+    """
+
+    async def process_turn(self, request: TurnRequest) -> TurnResult:
+        """
+        Process a complete turn.
+
+        Args:
+            request: TurnRequest with campaign, user input, and LLM config
+
+        Returns:
+            TurnResult with outcome
+        """
+        result = TurnResult(success=False, phase=TurnPhase.INITIALIZED)
+        metrics = result.metrics
+
+        try:
+            current_state, context = await self._abuild_context(request, metrics)
+            character_state = current_state.character_state
+            result.phase = TurnPhase.CONTEXT_BUILT
+
+            # One client (and connection pool) for every call in this turn
+            async with AsyncLLMClient(request.llm_config) as client:
+                # Phase 1: Get turn proposal from LLM
+                messages = self.prompt_builder.build_proposal_messages(context, request.user_input)
+                response = await self._achat(client, messages, 0.7, "proposal", metrics)
+                proposal_result = self._parse_proposal(response.content)
+                if not self._accept_proposal(result, proposal_result):
+                    return result
+                dm_text = proposal_result["dm_text"]
+                dm_json = proposal_result["dm_json"]
+
+                # Phase 2: Execute mechanics
+                roll_results = self._execute_mechanics(result, dm_json, character_state)
+
+                # Phase 3: Get final narration if there were rolls
+                if roll_results:
+                    messages = self._build_final_narration_messages(dm_text, roll_results)
+                    response = await self._achat(client, messages, 0.7, "final_narration", metrics)
+                    final_result = self._parse_final_narration(response.content, dm_text)
+                    dm_text = self._merge_final_narration(dm_json, final_result)
+
+                # Phases 4-5: Validate and persist
+                await self._afinalize_turn(
+                    client, request, result, current_state, dm_text, dm_json, roll_results
+                )
+
+        except LLMError as e:
+            logger.error(f"LLM error during turn: {e}")
+            result.errors.append(f"LLM error: {e.message}")
+            result.phase = TurnPhase.FAILED
+
+        except TurnConflictError as e:
+            logger.warning(f"Turn conflict: {e}")
+            result.errors.append(str(e))
+            result.phase = TurnPhase.FAILED
+
+        except Exception as e:
+            logger.exception(f"Unexpected error during turn: {e}")
+            result.errors.append(f"Unexpected error: {str(e)}")
+            result.phase = TurnPhase.FAILED
+
+        finally:
+            metrics.observe(result.success)
+
+        return result
+
+    async def _achat(
+        self,
+        client: AsyncLLMClient,
+        messages: list[Message],
+        temperature: float,
+        stage: str,
+        metrics: TurnMetrics,
+    ) -> LLMResponse:
+        """Make one LLM call, timed and token-counted under ``stage``."""
+        with metrics.phase(stage):
+            start = time.perf_counter()
+            response = await client.chat(messages, temperature=temperature)
+            metrics.record_llm_call(
+                stage, response.model, time.perf_counter() - start, response.usage
+            )
+        return response
+
+    @staticmethod
+    async def _atimed(metrics: TurnMetrics, phase: str, awaitable: Awaitable):
+        """Await ``awaitable``, adding its duration to ``phase``."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            metrics.add_phase(phase, time.perf_counter() - start)
+
+    async def _abuild_context(
+        self, request: TurnRequest, metrics: TurnMetrics
+    ) -> tuple[CampaignState, TurnContext]:
+        """
+        Load state and build the LLM context, gathering independent I/O concurrently.
+
+        Lore retrieval is keyed on the player's input alone so it can start
+        before state replay finishes.
+
+        Returns:
+            Tuple of (current_state, TurnContext)
+        """
+        campaign = request.campaign
+
+        current_state, recent_turns, universe_prompt, lore = await asyncio.gather(
+            self._atimed(
+                metrics,
+                "load_state",
+                sync_to_async(self.state_service.get_current_state)(campaign),
+            ),
+            self._atimed(metrics, "load_state", self._aload_recent_turns(request)),
+            self._atimed(
+                metrics,
+                "build_context",
+                sync_to_async(self._build_universe_prompt_for)(campaign),
+            ),
+            self._atimed(metrics, "lore_retrieval", self._aretrieve_lore(request)),
+        )
+
+        with metrics.phase("build_context"):
+            campaign_setup, campaign_progress, story_recap = await sync_to_async(
+                self._build_campaign_sections
+            )(campaign, current_state.to_dict(), recent_turns)
+            context = self.prompt_builder.assemble_context(
+                universe_prompt,
+                campaign_setup,
+                campaign_progress,
+                lore,
+                story_recap=story_recap,
+                model=request.llm_config.model,
+                user_input=request.user_input,
+                metrics=metrics,
+            )
+        return current_state, context
+
+    async def _aretrieve_lore(self, request: TurnRequest) -> LoreInjection:
+        """
+        Retrieve lore for the player's input.
+
+        Goes through the retrieval cache when the campaign was loaded with its
+        universe (and so its lore version) - this runs alongside the universe
+        load, so it does not wait for one.
+        """
+        campaign = request.campaign
+        lore_version = None
+        if Campaign.universe.is_cached(campaign):
+            lore_version = campaign.universe.canonical_lore_version
+        return await self.prompt_builder.abuild_lore_injection(
+            universe_id=str(campaign.universe_id),
+            user_input=request.user_input,
+            lore_version=lore_version,
+        )
+
+    async def _aload_recent_turns(self, request: TurnRequest) -> list[TurnEvent]:
+        """Load the recent turn history with the async ORM."""
+        turns = request.campaign.turns.only(*RECENT_TURN_FIELDS).order_by("-turn_index")[:10]
+        recent_turns = [turn async for turn in turns]
+        recent_turns.reverse()
+        return recent_turns
+
+    def _build_universe_prompt_for(self, campaign) -> str:
+        """Build the universe prompt (may load the universe row)."""
+        return self.prompt_builder.build_universe_prompt(campaign.universe)
+
+    def _build_campaign_sections(
+        self, campaign, current_state: dict, recent_turns: list[TurnEvent]
+    ) -> tuple[str, str, str]:
+        """Build the campaign setup, progress and story recap (all query the database)."""
+        return (
+            self.prompt_builder.build_campaign_setup(campaign),
+            self.prompt_builder.build_campaign_progress(campaign, current_state, recent_turns),
+            self.prompt_builder.build_story_recap(campaign),
+        )
+
+    async def _afinalize_turn(
+        self,
+        client: AsyncLLMClient,
+        request: TurnRequest,
+        result: TurnResult,
+        current_state: CampaignState,
+        dm_text: str,
+        dm_json: dict,
+        roll_results: list[RollResult],
+    ) -> TurnResult:
+        """Validate the final output (repairing if needed) and persist the turn."""
+        metrics = result.metrics
+
+        # Phase 4: Validate output
+        validator, validation = self._validate_output(result, current_state, dm_text, dm_json)
+
+        if not validation.valid:
+            with metrics.phase("repair"):
+                repaired = await self._aattempt_repair(
+                    client, dm_text, dm_json, validation, validator, metrics
+                )
+            if not self._accept_repair(result, validation, repaired):
+                return result
+            dm_text, dm_json = repaired["dm_text"], repaired["dm_json"]
+
+        self._mark_validated(result, validation)
+
+        # Phase 5: Persist the turn
+        with metrics.phase("persist"):
+            turn_event = await sync_to_async(self._persist_turn)(
+                request, current_state, dm_text, dm_json, roll_results, metrics
+            )
+        self._mark_persisted(result, turn_event)
+        return result
+
+    async def _aattempt_repair(
+        self,
+        client: AsyncLLMClient,
+        dm_text: str,
+        dm_json: dict,
+        validation: ValidationResult,
+        validator: LLMOutputValidator,
+        metrics: TurnMetrics,
+    ) -> dict | None:
+        """Async variant of :meth:`TurnEngine._attempt_repair`."""
+        for messages in self._repair_requests(dm_text, dm_json, validation):
+            try:
+                response = await self._achat(client, messages, 0.5, "repair", metrics)
+            except LLMError as e:
+                logger.warning(f"Repair attempt failed: {e}")
+                continue
+
+            repaired = self._check_repaired_output(response.content, validator)
+            if repaired:
+                return repaired
+
+        return None
@@ -0,0 +1,323 @@
+"""
+Campaign Summary Service.
+
+Keeps a bounded "story so far" for the DM prompt however long a campaign
+runs. Summaries are hierarchical (see CampaignSummary):
+- Every CHAPTER_TURNS turns, the finished chapter's turns are summarized
+- Every ARC_CHAPTERS chapters, the finished arc's chapter summaries are
+  summarized
+- Arcs older than the latest RECAP_ARCS are folded into the saga summary
+
+The recap injected into the prompt is the saga, the latest RECAP_ARCS arcs
+and the chapters since the last arc, each capped at a fixed length, so its
+size stays flat as the campaign grows. Turns since the last chapter are
+covered by the prompt's recent turns.
+
+Updates run in update_campaign_summary_task, dispatched when a turn
+completes a chapter. Summaries are written by the campaign owner's active
+LLM endpoint when there is one, and extractively otherwise.
+"""
+
+import logging
+
+from django.db import transaction
+
+from apps.campaigns.models import Campaign, CampaignSummary, TurnEvent
+
+from .llm_client import LLMClient, LLMClientConfig, LLMError, Message
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = """You keep the campaign journal for a tabletop RPG Dungeon Master.
+Summarize the passages you are given into one past-tense recap of at most {max_chars} characters.
+Keep what the DM needs to stay consistent: key events and decisions, characters met, places
+visited, items gained or lost, and unresolved threads. Plain prose, no headings or lists."""
+
+
+def clip_text(text: str, limit: int) -> str:
+    """Collapse whitespace and cut text to limit characters, at a sentence end if one is near."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence_end = cut.rfind(". ")
+    if sentence_end > limit // 2:
+        return cut[: sentence_end + 1]
+    return cut[: limit - 3].rstrip() + "..."
+
+
+class NarrativeSummarizer:
+    """
+    Condenses passages of campaign narrative to a length budget.
+
+    Uses the LLM when configured; otherwise, or if the call fails, keeps the
+    opening of each passage within an equal share of the budget.
+    """
+
+    def __init__(self, llm_config: LLMClientConfig | None = None):
+        """Initialize the summarizer."""
+        self.llm_config = llm_config
+
+    def summarize(self, passages: list[str], max_chars: int) -> str:
+        """
+        Summarize passages (oldest first) in at most max_chars characters.
+        """
+        if not passages:
+            return ""
+        if self.llm_config is not None:
+            try:
+                return self._summarize_with_llm(passages, max_chars)
+            except LLMError as e:
+                logger.warning(f"LLM summary failed, using extractive summary: {e}")
+        return self._extract(passages, max_chars)
+
+    def _summarize_with_llm(self, passages: list[str], max_chars: int) -> str:
+        messages = [
+            Message(role="system", content=SUMMARY_SYSTEM_PROMPT.format(max_chars=max_chars)),
+            Message(role="user", content="\n\n".join(passages)),
+        ]
+        with LLMClient(self.llm_config) as client:
+            # Roughly 4 characters per token, with headroom for the model
+            response = client.chat(messages, temperature=0.3, max_tokens=max_chars // 3)
+        return clip_text(response.content, max_chars)
+
+    def _extract(self, passages: list[str], max_chars: int) -> str:
+        share = max(max_chars // len(passages), 40)
+        return clip_text(" ".join(clip_text(p, share) for p in passages), max_chars)
+
+
+class CampaignSummaryService:
+    """
+    Maintains hierarchical campaign summaries and builds the prompt recap.
+
+    Usage:
+        service = CampaignSummaryService()
+        recap = service.build_recap(campaign)  # for the prompt
+        # in the background, after a chapter completes:
+        CampaignSummaryService(NarrativeSummarizer(llm_config)).update(campaign)
+    """
+
+    CHAPTER_TURNS = 10
+    ARC_CHAPTERS = 5
+    RECAP_ARCS = 2
+    CHAPTER_CHARS = 500
+    ARC_CHARS = 800
+    SAGA_CHARS = 1200
+
+    def __init__(self, summarizer: NarrativeSummarizer | None = None):
+        """Initialize the service."""
+        self.summarizer = summarizer or NarrativeSummarizer()
+
+    # Scheduling (turn persistence and rewind)
+
+    def schedule_update(self, campaign_id, turn_index: int | None = None) -> None:
+        """
+        Dispatch a background update once the transaction commits.
+
+        Args:
+            campaign_id: The campaign's UUID
+            turn_index: A newly persisted turn; the update is only dispatched
+                when it completes a chapter
+        """
+        if turn_index is not None and (turn_index == 0 or turn_index % self.CHAPTER_TURNS):
+            return
+
+        def dispatch():
+            from apps.campaigns.tasks import update_campaign_summary_task
+
+            update_campaign_summary_task.delay(str(campaign_id))
+
+        # A summary is never worth failing a committed turn over
+        transaction.on_commit(dispatch, robust=True)
+
+    def discard_after(self, campaign: Campaign, turn_index: int) -> int:
+        """
+        Delete summaries that cover turns after turn_index (for rewind).
+
+        The saga is rebuilt from the remaining arcs by the next update.
+
+        Returns:
+            Number of summaries deleted
+        """
+        deleted, _ = CampaignSummary.objects.filter(
+            campaign=campaign, end_turn__gt=turn_index
+        ).delete()
+        return deleted
+
+    # Writing (background)
+
+    def update(self, campaign: Campaign) -> int:
+        """
+        Write any missing chapter, arc and saga summaries.
+
+        Returns:
+            Number of summaries written
+        """
+        return (
+            self._update_chapters(campaign)
+            + self._update_arcs(campaign)
+            + self._update_saga(campaign)
+        )
+
+    def _update_chapters(self, campaign: Campaign) -> int:
+        latest = (
+            TurnEvent.objects.filter(campaign=campaign)
+            .order_by("-turn_index")
+            .values_list("turn_index", flat=True)
+            .first()
+        ) or 0
+        done = set(
+            self._summaries(campaign, CampaignSummary.LEVEL_CHAPTER).values_list("index", flat=True)
+        )
+
+        written = 0
+        for chapter in range(1, latest // self.CHAPTER_TURNS + 1):
+            if chapter in done:
+                continue
+            start = (chapter - 1) * self.CHAPTER_TURNS + 1
+            end = chapter * self.CHAPTER_TURNS
+            turns = list(
+                TurnEvent.objects.filter(campaign=campaign, turn_index__range=(start, end))
+                .only("id", "turn_index", "user_input_text", "llm_response_text")
+                .order_by("turn_index")
+            )
+            if len(turns) != self.CHAPTER_TURNS:
+                continue
+
+            text = self.summarizer.summarize(
+                [
+                    f"Turn {t.turn_index}. Player: {t.user_input_text} DM: {t.llm_response_text}"
+                    for t in turns
+                ],
+                self.CHAPTER_CHARS,
+            )
+            written += self._save(
+                campaign,
+                CampaignSummary.LEVEL_CHAPTER,
+                chapter,
+                start,
+                end,
+                text,
+                TurnEvent.objects.filter(id__in=[t.id for t in turns]),
+                len(turns),
+            )
+        return written
+
+    def _update_arcs(self, campaign: Campaign) -> int:
+        chapters = {
+            summary.index: summary
+            for summary in self._summaries(campaign, CampaignSummary.LEVEL_CHAPTER)
+        }
+        done = set(
+            self._summaries(campaign, CampaignSummary.LEVEL_ARC).values_list("index", flat=True)
+        )
+
+        written = 0
+        for arc in range(1, max(chapters, default=0) // self.ARC_CHAPTERS + 1):
+            first = (arc - 1) * self.ARC_CHAPTERS + 1
+            members = [chapters.get(i) for i in range(first, first + self.ARC_CHAPTERS)]
+            if arc in done or None in members:
+                continue
+
+            text = self.summarizer.summarize(
+                [f"Chapter {c.index}: {c.summary_text}" for c in members], self.ARC_CHARS
+            )
+            written += self._save(
+                campaign,
+                CampaignSummary.LEVEL_ARC,
+                arc,
+                members[0].start_turn,
+                members[-1].end_turn,
+                text,
+                CampaignSummary.objects.filter(id__in=[c.id for c in members]),
+                len(members),
+            )
+        return written
+
+    def _update_saga(self, campaign: Campaign) -> int:
+        arcs = list(self._summaries(campaign, CampaignSummary.LEVEL_ARC))
+        foldable = arcs[: -self.RECAP_ARCS] if self.RECAP_ARCS else arcs
+        saga = self._summaries(campaign, CampaignSummary.LEVEL_SAGA).first()
+        new_arcs = [a for a in foldable if saga is None or a.end_turn > saga.end_turn]
+        if not new_arcs:
+            return 0
+
+        passages = [f"Earlier: {saga.summary_text}"] if saga else []
+        passages += [f"Arc {a.index}: {a.summary_text}" for a in new_arcs]
+        sources = [a.id for a in new_arcs] + ([saga.id] if saga else [])
+        return self._save(
+            campaign,
+            CampaignSummary.LEVEL_SAGA,
+            0,
+            foldable[0].start_turn,
+            new_arcs[-1].end_turn,
+            self.summarizer.summarize(passages, self.SAGA_CHARS),
+            CampaignSummary.objects.filter(id__in=sources),
+            len(sources),
+        )
+
+    def _summaries(self, campaign: Campaign, level: str):
+        return CampaignSummary.objects.filter(campaign=campaign, level=level).order_by("end_turn")
+
+    def _save(
+        self,
+        campaign: Campaign,
+        level: str,
+        index: int,
+        start_turn: int,
+        end_turn: int,
+        text: str,
+        sources,
+        source_count: int,
+    ) -> int:
+        """
+        Store a summary unless a rewind removed any of its sources meanwhile.
+
+        Returns:
+            1 if written, else 0
+        """
+        with transaction.atomic():
+            # Serializes with turn persistence and rewinds, which take the same lock
+            Campaign.objects.select_for_update().only("id").get(pk=campaign.pk)
+            if sources.count() != source_count:
+                logger.info(f"Dropping stale {level} {index} summary for campaign {campaign.pk}")
+                return 0
+            CampaignSummary.objects.update_or_create(
+                campaign=campaign,
+                level=level,
+                index=index,
+                defaults={"start_turn": start_turn, "end_turn": end_turn, "summary_text": text},
+            )
+        return 1
+
+    # Reading (prompt building)
+
+    def build_recap(self, campaign: Campaign) -> str:
+        """
+        Build the fixed-size "story so far" recap for a campaign's prompt.
+
+        Returns:
+            Recap text, or "" before the first chapter completes
+        """
+        fields = ("level", "index", "start_turn", "end_turn", "summary_text")
+        saga = self._summaries(campaign, CampaignSummary.LEVEL_SAGA).only(*fields).first()
+        arcs = list(
+            self._summaries(campaign, CampaignSummary.LEVEL_ARC)
+            .only(*fields)
+            .reverse()[: self.RECAP_ARCS]
+        )[::-1]
+        covered = arcs[-1].end_turn if arcs else (saga.end_turn if saga else 0)
+        chapters = list(
+            self._summaries(campaign, CampaignSummary.LEVEL_CHAPTER)
+            .filter(start_turn__gt=covered)
+            .only(*fields)
+            .reverse()[: self.ARC_CHAPTERS]
+        )[::-1]
+
+        lines = [f"Earlier: {saga.summary_text}"] if saga else []
+        for summary in arcs + chapters:
+            lines.append(
+                f"{summary.level.title()} {summary.index} "
+                f"(turns {summary.start_turn}-{summary.end_turn}): {summary.summary_text}"
+            )
+        return "\n".join(lines)
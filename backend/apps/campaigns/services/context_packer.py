@@ -0,0 +1,140 @@
+"""
+Context Packer - fits the DM context into a token budget.
+
+Sections are filled in priority order (hard canon, then campaign state,
+then the story recap, then soft lore) and laid out in the order given, so
+whatever has to be cut is the least important context rather than
+whatever happened to come last. Tokens are counted with the model
+family's tokenizer (see whispyrkeep.tokenizer), and the packed context
+reports the tokens it actually used.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from whispyrkeep.tokenizer import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+# Fill order, lowest first
+PRIORITY_HARD_CANON = 0
+PRIORITY_STATE = 1
+PRIORITY_RECAP = 2
+PRIORITY_SOFT_LORE = 3
+
+# Don't bother truncating an item into less room than this
+MIN_TRUNCATED_TOKENS = 32
+
+SECTION_SEPARATOR = "\n\n"
+
+
+@dataclass
+class ContextSection:
+    """
+    A section of context made of items that are kept or dropped whole.
+
+    A truncatable section cuts the first item that does not fit down to the
+    remaining room instead of dropping it (for single-item sections like the
+    campaign state). Items beyond max_item_tokens are always cut to it.
+    """
+
+    name: str
+    priority: int
+    items: list[str]
+    header: str = ""
+    truncatable: bool = False
+    max_item_tokens: int | None = None
+
+    def render(self, items: list[str]) -> str:
+        """Render the section with the given items."""
+        return "\n".join([self.header, *items] if self.header else items)
+
+
+@dataclass
+class PackedContext:
+    """A context packed into a token budget."""
+
+    text: str
+    tokens_used: int
+    budget_tokens: int
+    # Section name -> (items kept, items offered)
+    sections: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def dropped_items(self) -> int:
+        return sum(offered - kept for kept, offered in self.sections.values())
+
+
+class ContextPacker:
+    """
+    Packs context sections into a token budget.
+
+    Usage:
+        packer = ContextPacker(get_token_counter(model), budget_tokens=6000)
+        packed = packer.pack([universe, hard_canon, state, recap, soft_lore])
+        packed.text, packed.tokens_used
+    """
+
+    def __init__(self, counter: TokenCounter, budget_tokens: int):
+        """Initialize the packer."""
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+
+    def pack(self, sections: list[ContextSection]) -> PackedContext:
+        """Fill sections by priority within the budget, laid out in list order."""
+        separator_tokens = self.counter.count(SECTION_SEPARATOR)
+        remaining = self.budget_tokens
+        kept: dict[str, list[str]] = {}
+
+        for section in sorted(sections, key=lambda s: s.priority):
+            items = []
+            # The header and separator are paid for with the first kept item
+            overhead = self.counter.count(section.header) + separator_tokens
+            for item in section.items:
+                if section.max_item_tokens:
+                    item = self.counter.truncate(item, section.max_item_tokens)
+                cost = self.counter.count(item) + 1 + (0 if items else overhead)
+                if cost <= remaining:
+                    items.append(item)
+                    remaining -= cost
+                    continue
+                if section.truncatable:
+                    room = remaining - 1 - (0 if items else overhead)
+                    if room >= MIN_TRUNCATED_TOKENS:
+                        items.append(self.counter.truncate(item, room))
+                        remaining = 0
+                    break
+                # Smaller items further down may still fit
+            kept[section.name] = items
+
+        text, tokens_used = self._render(sections, kept)
+        # Merges across item boundaries can shift the count; trim if over
+        while tokens_used > self.budget_tokens and self._drop_last(sections, kept):
+            text, tokens_used = self._render(sections, kept)
+
+        packed = PackedContext(
+            text=text,
+            tokens_used=tokens_used,
+            budget_tokens=self.budget_tokens,
+            sections={s.name: (len(kept[s.name]), len(s.items)) for s in sections},
+        )
+        if packed.dropped_items:
+            logger.info(
+                f"Context packed to {tokens_used}/{self.budget_tokens} tokens, "
+                f"dropping {packed.dropped_items} items"
+            )
+        return packed
+
+    def _render(
+        self, sections: list[ContextSection], kept: dict[str, list[str]]
+    ) -> tuple[str, int]:
+        text = SECTION_SEPARATOR.join(s.render(kept[s.name]) for s in sections if kept[s.name])
+        return text, self.counter.count(text)
+
+    def _drop_last(self, sections: list[ContextSection], kept: dict[str, list[str]]) -> bool:
+        """Drop the last kept item of the lowest-priority section that has one."""
+        for section in sorted(sections, key=lambda s: s.priority, reverse=True):
+            if kept[section.name]:
+                kept[section.name].pop()
+                return True
+        return False
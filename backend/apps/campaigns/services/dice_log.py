@@ -0,0 +1,218 @@
+"""
+Dice Log Service.
+
+Maintains the campaign dice log:
+- RollRecord rows, one per roll, written in the transaction that persists
+  the turn and removed with the turn on rewind
+- RollStats aggregates per roll type and ability, adjusted by the same
+  deltas as the records are written or rewound, so statistics are read
+  from a handful of rows instead of computed by scanning the log
+
+TurnEvent.roll_results_json remains the source of truth; rebuild()
+regenerates both tables from it for campaigns played before the log
+existed.
+"""
+
+import logging
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+
+from apps.campaigns.models import Campaign, RollRecord, RollStats, TurnEvent
+
+logger = logging.getLogger(__name__)
+
+# Roll types resolved with a d20, where a natural 20/1 is a critical/fumble
+D20_ROLL_TYPES = ("ability_check", "saving_throw", "attack_roll")
+
+STAT_FIELDS = ("rolls", "checks", "successes", "criticals", "fumbles", "total_sum")
+
+
+def build_roll_records(turn: TurnEvent, first_roll_number: int) -> list[RollRecord]:
+    """
+    Build (unsaved) RollRecords from a turn's stored roll results.
+
+    The roll requests in roll_spec_json are matched to the results by
+    position, which is how the mechanics executor produced them.
+
+    Args:
+        turn: The turn event
+        first_roll_number: Campaign roll number of the turn's first roll
+    """
+    results = (turn.roll_results_json or {}).get("results", [])
+    specs = (turn.roll_spec_json or {}).get("roll_requests", [])
+
+    records = []
+    for position, result in enumerate(results):
+        spec = specs[position] if position < len(specs) else {}
+        roll_type = result.get("roll_type", "")
+        is_d20 = roll_type in D20_ROLL_TYPES
+        roll_value = result.get("roll_value", 0)
+        records.append(
+            RollRecord(
+                campaign_id=turn.campaign_id,
+                turn=turn,
+                turn_index=turn.turn_index,
+                roll_number=first_roll_number + position,
+                roll_id=str(result.get("roll_id", ""))[:100],
+                roll_type=roll_type[:30],
+                # The executor rolls d20s against strength when no ability is given
+                ability=(spec.get("ability") or ("str" if is_d20 else ""))[:10],
+                skill=(spec.get("skill") or "")[:50],
+                roll_value=roll_value,
+                modifier=result.get("modifier", 0),
+                total=result.get("total", 0),
+                dc=result.get("dc"),
+                success=result.get("success"),
+                advantage_state=result.get("advantage_state") or "none",
+                is_critical=is_d20 and roll_value == 20,
+                is_fumble=is_d20 and roll_value == 1,
+            )
+        )
+    return records
+
+
+class DiceLogService:
+    """
+    Writes the dice log and serves its statistics.
+
+    Usage:
+        service = DiceLogService()
+        service.record_turn(turn_event)  # inside the persisting transaction
+        service.remove_turns_after(campaign, 5)  # before a rewind deletes turns
+        stats = service.get_stats(campaign)
+    """
+
+    def record_turn(self, turn: TurnEvent) -> list[RollRecord]:
+        """
+        Record a newly persisted turn's rolls and fold them into the stats.
+
+        Call inside the transaction that saved the turn, with the campaign
+        locked, so roll numbers are allocated without races.
+        """
+        if not (turn.roll_results_json or {}).get("results"):
+            return []
+
+        last_number = RollRecord.objects.filter(campaign_id=turn.campaign_id).aggregate(
+            last=Max("roll_number")
+        )["last"]
+        records = build_roll_records(turn, (last_number or 0) + 1)
+        RollRecord.objects.bulk_create(records)
+
+        deltas = defaultdict(Counter)
+        for record in records:
+            delta = deltas[(record.roll_type, record.ability)]
+            delta["rolls"] += 1
+            delta["checks"] += record.success is not None
+            delta["successes"] += record.success is True
+            delta["criticals"] += record.is_critical
+            delta["fumbles"] += record.is_fumble
+            delta["total_sum"] += record.total
+        self._apply_deltas(turn.campaign_id, deltas, sign=1)
+        return records
+
+    def remove_turns_after(self, campaign: Campaign, turn_index: int) -> int:
+        """
+        Take the rolls of turns after turn_index out of the stats.
+
+        The records themselves are deleted with their turns; call this in the
+        rewind transaction before the turns are deleted.
+
+        Returns:
+            Number of rolls removed
+        """
+        grouped = (
+            RollRecord.objects.filter(campaign=campaign, turn_index__gt=turn_index)
+            .values("roll_type", "ability")
+            .annotate(
+                rolls=Count("id"),
+                checks=Count("id", filter=Q(success__isnull=False)),
+                successes=Count("id", filter=Q(success=True)),
+                criticals=Count("id", filter=Q(is_critical=True)),
+                fumbles=Count("id", filter=Q(is_fumble=True)),
+                total_sum=Sum("total"),
+            )
+        )
+        deltas = {
+            (row["roll_type"], row["ability"]): {name: row[name] or 0 for name in STAT_FIELDS}
+            for row in grouped
+        }
+        self._apply_deltas(campaign.id, deltas, sign=-1)
+        return sum(delta["rolls"] for delta in deltas.values())
+
+    def _apply_deltas(self, campaign_id, deltas: dict, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) per-bucket deltas from RollStats."""
+        for (roll_type, ability), delta in deltas.items():
+            stats, _ = RollStats.objects.get_or_create(
+                campaign_id=campaign_id, roll_type=roll_type, ability=ability
+            )
+            changes = {name: F(name) + sign * delta[name] for name in STAT_FIELDS if delta[name]}
+            if changes:
+                RollStats.objects.filter(pk=stats.pk).update(**changes)
+
+    def get_stats(self, campaign: Campaign) -> dict:
+        """
+        Dice statistics for a campaign, from the precomputed aggregates.
+
+        Returns:
+            Dict with overall figures plus the same figures by roll type and
+            by ability (for d20 rolls)
+        """
+        overall = Counter()
+        by_roll_type = defaultdict(Counter)
+        by_ability = defaultdict(Counter)
+        for row in RollStats.objects.filter(campaign=campaign).values(
+            "roll_type", "ability", *STAT_FIELDS
+        ):
+            figures = {name: row[name] for name in STAT_FIELDS}
+            overall.update(figures)
+            by_roll_type[row["roll_type"]].update(figures)
+            if row["roll_type"] in D20_ROLL_TYPES and row["ability"]:
+                by_ability[row["ability"]].update(figures)
+
+        return {
+            **self._summarize(overall),
+            "by_roll_type": {
+                key: self._summarize(value) for key, value in sorted(by_roll_type.items())
+            },
+            "by_ability": {
+                key: self._summarize(value) for key, value in sorted(by_ability.items())
+            },
+        }
+
+    @staticmethod
+    def _summarize(figures: Counter) -> dict:
+        rolls = figures["rolls"]
+        checks = figures["checks"]
+        return {
+            "rolls": rolls,
+            "checks": checks,
+            "successes": figures["successes"],
+            "success_rate": round(figures["successes"] / checks, 4) if checks else None,
+            "criticals": figures["criticals"],
+            "fumbles": figures["fumbles"],
+            "average_total": round(figures["total_sum"] / rolls, 2) if rolls else None,
+        }
+
+    def rebuild(self, campaign: Campaign) -> int:
+        """
+        Regenerate a campaign's roll records and stats from its turns.
+
+        Returns:
+            Number of rolls recorded
+        """
+        with transaction.atomic():
+            Campaign.objects.select_for_update().only("id").get(pk=campaign.pk)
+            RollRecord.objects.filter(campaign=campaign).delete()
+            RollStats.objects.filter(campaign=campaign).delete()
+
+            recorded = 0
+            turns = (
+                TurnEvent.objects.filter(campaign=campaign)
+                .only("id", "campaign_id", "turn_index", "roll_spec_json", "roll_results_json")
+                .order_by("turn_index")
+            )
+            for turn in turns.iterator():
+                recorded += len(self.record_turn(turn))
+        return recorded
@@ -0,0 +1,273 @@
+"""
+Process-wide HTTP connection pools for LLM endpoints.
+
+LLMClient instances are short-lived (one per call site), but the TCP/TLS
+connections behind them should not be. This registry keeps one ``httpx``
+client per (base_url, API key fingerprint) for the lifetime of the worker
+process, so consecutive calls to the same provider reuse keep-alive (and,
+when ``h2`` is installed, HTTP/2) connections.
+
+- Limits and idle eviction come from the LLM_HTTP_* settings
+- Pools idle for longer than LLM_HTTP_POOL_IDLE_TIMEOUT are closed; a
+  pool is idle only while no LLMClient has it checked out (see release),
+  so a long streamed response is never cut off
+- Async clients are additionally keyed by event loop, since an
+  ``httpx.AsyncClient`` cannot be shared across loops
+- The registry resets itself after a fork (gunicorn/celery prefork workers)
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """Short, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+@dataclass
+class PooledClient:
+    """A shared HTTP client and its usage counters."""
+
+    base_url: str
+    key_fingerprint: str
+    client: httpx.Client | httpx.AsyncClient
+    http2: bool
+    loop: asyncio.AbstractEventLoop | None = None
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    checkouts: int = 0
+    in_use: int = 0
+
+    @property
+    def is_async(self) -> bool:
+        return isinstance(self.client, httpx.AsyncClient)
+
+    def touch(self) -> None:
+        self.last_used = time.monotonic()
+        self.checkouts += 1
+        self.in_use += 1
+
+    def release(self) -> None:
+        self.last_used = time.monotonic()
+        self.in_use = max(self.in_use - 1, 0)
+
+    def connection_stats(self) -> dict:
+        """Open/idle connection counts, read from the underlying httpcore pool."""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {}
+        try:
+            idle = sum(1 for conn in connections if conn.is_idle())
+        except Exception:
+            return {"open": len(connections)}
+        return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+    def to_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            "base_url": self.base_url,
+            "async": self.is_async,
+            "http2": self.http2,
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "age_seconds": round(now - self.created_at, 1),
+            "idle_seconds": round(now - self.last_used, 1),
+            "connections": self.connection_stats(),
+        }
+
+
+class HTTPClientPool:
+    """
+    Registry of shared ``httpx`` clients keyed by endpoint and credentials.
+
+    Usage:
+        client = get_http_pool().get_client(base_url, api_key)
+        client.post(url, json=body, timeout=30.0)
+
+    Callers must not close the returned clients; the pool owns them. Hand
+    them back with release() once done, so their pools can be evicted.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        idle_timeout: float | None = None,
+        http2: bool | None = None,
+    ):
+        """Initialize the pool; unset limits fall back to Django settings."""
+        self.max_connections = max_connections or getattr(settings, "LLM_HTTP_MAX_CONNECTIONS", 20)
+        self.max_keepalive_connections = max_keepalive_connections or getattr(
+            settings, "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10
+        )
+        self.keepalive_expiry = keepalive_expiry or getattr(
+            settings, "LLM_HTTP_KEEPALIVE_EXPIRY", 30.0
+        )
+        self.idle_timeout = idle_timeout or getattr(settings, "LLM_HTTP_POOL_IDLE_TIMEOUT", 300.0)
+        requested_http2 = http2 if http2 is not None else getattr(settings, "LLM_HTTP2", True)
+        self.http2 = requested_http2 and HTTP2_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._clients: dict[tuple, PooledClient] = {}
+        self._pid = os.getpid()
+        self.evictions = 0
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _check_fork(self) -> None:
+        """Drop clients inherited from a parent process; their sockets are shared."""
+        if os.getpid() != self._pid:
+            self._clients = {}
+            self._pid = os.getpid()
+
+    def get_client(self, base_url: str, api_key: str) -> httpx.Client:
+        """Get the shared blocking client for an endpoint, creating it if needed."""
+        key = ("sync", base_url, api_key_fingerprint(api_key))
+
+        with self._lock:
+            self._check_fork()
+            self._evict_idle_locked()
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = PooledClient(
+                    base_url=base_url,
+                    key_fingerprint=key[2],
+                    client=httpx.Client(
+                        limits=self._limits(),
+                        http2=self.http2,
+                        follow_redirects=True,
+                    ),
+                    http2=self.http2,
+                )
+                self._clients[key] = entry
+                logger.debug(f"Opened LLM HTTP pool for {base_url}")
+            entry.touch()
+            return entry.client
+
+    def get_async_client(self, base_url: str, api_key: str) -> httpx.AsyncClient:
+        """Get the shared async client for an endpoint on the running event loop."""
+        loop = asyncio.get_running_loop()
+        key = ("async", base_url, api_key_fingerprint(api_key), id(loop))
+
+        with self._lock:
+            self._check_fork()
+            self._evict_idle_locked()
+            entry = self._clients.get(key)
+            if entry is not None and entry.loop is not loop:
+                # id() reuse after the original loop was garbage collected
+                entry = None
+            if entry is None:
+                entry = PooledClient(
+                    base_url=base_url,
+                    key_fingerprint=key[2],
+                    client=httpx.AsyncClient(
+                        limits=self._limits(),
+                        http2=self.http2,
+                        follow_redirects=True,
+                    ),
+                    http2=self.http2,
+                    loop=loop,
+                )
+                self._clients[key] = entry
+                logger.debug(f"Opened async LLM HTTP pool for {base_url}")
+            entry.touch()
+            return entry.client
+
+    def release(self, client: httpx.Client | httpx.AsyncClient) -> None:
+        """Hand back a client from get_client or get_async_client."""
+        with self._lock:
+            for entry in self._clients.values():
+                if entry.client is client:
+                    entry.release()
+                    return
+
+    def evict_idle(self) -> int:
+        """Close pools unused for longer than the idle timeout; returns how many."""
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def _evict_idle_locked(self) -> int:
+        now = time.monotonic()
+        stale = [
+            key
+            for key, entry in self._clients.items()
+            if (not entry.in_use and now - entry.last_used > self.idle_timeout)
+            or (entry.loop is not None and entry.loop.is_closed())
+        ]
+        for key in stale:
+            self._close_entry(self._clients.pop(key))
+        self.evictions += len(stale)
+        return len(stale)
+
+    def _close_entry(self, entry: PooledClient) -> None:
+        if entry.is_async:
+            loop = entry.loop
+            # A closed loop has already torn down its transports
+            if loop is not None and not loop.is_closed() and loop.is_running():
+                loop.call_soon_threadsafe(lambda: loop.create_task(entry.client.aclose()))
+            return
+        try:
+            entry.client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM HTTP pool for {entry.base_url}: {e}")
+
+    def close_all(self) -> None:
+        """Close every pooled client."""
+        with self._lock:
+            for entry in self._clients.values():
+                self._close_entry(entry)
+            self._clients = {}
+
+    def stats(self) -> dict:
+        """Pool-level statistics for monitoring."""
+        with self._lock:
+            self._check_fork()
+            pools = [entry.to_dict() for entry in self._clients.values()]
+        return {
+            "pid": self._pid,
+            "http2": self.http2,
+            "limits": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry,
+                "idle_timeout": self.idle_timeout,
+            },
+            "pool_count": len(pools),
+            "evictions": self.evictions,
+            "pools": pools,
+        }
+
+
+_pool: HTTPClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get the process-wide HTTP client pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HTTPClientPool()
+    return _pool
@@ -4,6 +4,10 @@ OpenAI-Compatible LLM Client.
 Provides a unified interface for calling LLM endpoints with:
 - Support for OpenAI, Anthropic, Azure OpenAI, and custom endpoints
 - Retry with exponential backoff
+- Server-sent event (SSE) streaming of completion deltas
+- Blocking (LLMClient) and asyncio (AsyncLLMClient) variants
+- Process-wide pooled keep-alive connections per endpoint (see http_pool)
+- Prompt-cache markers on stable prefix messages (Anthropic)
 - Encrypted API key decryption
 
 Tickets: 8.0.1, 8.0.2
@@ -11,8 +15,11 @@ Tickets: 8.0.1, 8.0.2
 Based on SYSTEM_DESIGN.md section 8 LLM Orchestration.
 """
 
+import asyncio
+import json
 import logging
 import time
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -22,6 +29,8 @@ import httpx
 from apps.llm_config.encryption import decrypt_api_key
 from apps.llm_config.models import LlmEndpointConfig
 
+from .http_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -121,9 +130,27 @@ class Message:
 
     role: str  # "system", "user", "assistant"
     content: str
+    # Ends a stable prompt prefix the provider may cache
+    cache: bool = False
+
+    def to_dict(self, cache_control: bool = False) -> dict:
+        """
+        Convert to API format.
 
-    def to_dict(self) -> dict:
-        """Convert to API format."""
+        With cache_control, a cacheable message is sent as a text block with
+        an ephemeral cache breakpoint (Anthropic prompt caching).
+        """
+        if cache_control and self.cache:
+            return {
+                "role": self.role,
+                "content": [
+                    {
+                        "type": "text",
+                        "text": self.content,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            }
         return {"role": self.role, "content": self.content}
 
 
@@ -140,66 +167,90 @@ class LLMResponse:
     @property
     def input_tokens(self) -> int:
         """Get input token count."""
-        return self.usage.get("prompt_tokens", 0)
+        return self.usage.get("prompt_tokens", self.usage.get("input_tokens", 0))
 
     @property
     def output_tokens(self) -> int:
         """Get output token count."""
-        return self.usage.get("completion_tokens", 0)
+        return self.usage.get("completion_tokens", self.usage.get("output_tokens", 0))
 
     @property
     def total_tokens(self) -> int:
         """Get total token count."""
-        return self.usage.get("total_tokens", 0)
+        return self.usage.get("total_tokens", self.input_tokens + self.output_tokens)
+
+    @property
+    def cached_tokens(self) -> int:
+        """Get input tokens served from the provider's prompt cache."""
+        details = self.usage.get("prompt_tokens_details") or {}
+        return self.usage.get("cache_read_input_tokens", details.get("cached_tokens", 0)) or 0
 
 
-class LLMClient:
+@dataclass
+class LLMStreamChunk:
+    """A single delta from a streaming chat completion."""
+
+    content: str = ""
+    finish_reason: str | None = None
+    usage: dict = field(default_factory=dict)
+
+
+class SSEDecoder:
     """
-    OpenAI-compatible LLM client with retry support.
+    Incremental decoder for server-sent event streams.
 
-    Supports:
-    - OpenAI Chat Completions API
-    - Anthropic Messages API (via compatibility layer)
-    - Azure OpenAI
-    - Local/custom OpenAI-compatible endpoints
+    Fed one line at a time; multi-line ``data:`` fields are joined per the SSE
+    spec and the OpenAI ``[DONE]`` sentinel marks the end of the stream.
+    """
 
-    Usage:
-        config = LLMClientConfig.from_endpoint_config(db_config)
-        client = LLMClient(config)
+    def __init__(self):
+        self._data_lines: list[str] = []
+        self.done = False
+
+    def feed(self, line: str) -> dict | None:
+        """Consume a line; return a JSON payload once an event is complete."""
+        if line.startswith("data:"):
+            self._data_lines.append(line[5:].lstrip())
+            return None
+        if line or not self._data_lines:
+            # event:/id:/comment lines, or a blank line with no pending data
+            return None
+        return self._dispatch()
+
+    def finish(self) -> dict | None:
+        """Flush a trailing event from a stream closed without a blank line."""
+        if self._data_lines and not self.done:
+            return self._dispatch()
+        return None
+
+    def _dispatch(self) -> dict | None:
+        data = "\n".join(self._data_lines)
+        self._data_lines = []
+        if data == "[DONE]":
+            self.done = True
+            return None
+        try:
+            return json.loads(data)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed stream event: {data[:200]}")
+            return None
 
-        messages = [
-            Message(role="system", content="You are a DM..."),
-            Message(role="user", content="I attack the goblin"),
-        ]
-        response = client.chat(messages)
+
+class BaseLLMClient:
+    """
+    Provider-agnostic request building and response parsing.
+
+    Shared by the blocking :class:`LLMClient` and :class:`AsyncLLMClient`, which
+    differ only in how they perform HTTP I/O.
     """
 
     def __init__(self, config: LLMClientConfig):
         """Initialize the client."""
         self.config = config
-        self._http_client: httpx.Client | None = None
 
-    @property
-    def http_client(self) -> httpx.Client:
-        """Get or create HTTP client (lazy initialization)."""
-        if self._http_client is None:
-            self._http_client = httpx.Client(
-                timeout=self.config.timeout,
-                follow_redirects=True,
-            )
-        return self._http_client
-
-    def close(self) -> None:
-        """Close the HTTP client."""
-        if self._http_client is not None:
-            self._http_client.close()
-            self._http_client = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *args):
-        self.close()
+    def _chat_url(self) -> str:
+        """Get the chat completions endpoint URL."""
+        return f"{self.config.get_base_url()}/chat/completions"
 
     def _get_headers(self) -> dict[str, str]:
         """Get headers for API requests."""
@@ -226,7 +277,9 @@ class LLMClient:
         """Build the request body for the API call."""
         body: dict[str, Any] = {
             "model": self.config.model,
-            "messages": [m.to_dict() for m in messages],
+            "messages": [
+                m.to_dict(cache_control=self._supports_cache_control()) for m in messages
+            ],
         }
 
         # Only add temperature if supported by the model
@@ -262,6 +315,15 @@ class LLMClient:
                 return "max_completion_tokens"
         return "max_tokens"
 
+    def _supports_cache_control(self) -> bool:
+        """
+        Check if the endpoint takes explicit prompt-cache markers.
+
+        Anthropic caches only up to marked breakpoints; OpenAI-style endpoints
+        cache matching prefixes automatically and get plain messages.
+        """
+        return self.config.provider == LLMProvider.ANTHROPIC
+
     def _supports_temperature(self) -> bool:
         """
         Check if the model supports custom temperature values.
@@ -334,6 +396,111 @@ class LLMClient:
         delay = self.config.initial_retry_delay * (self.config.retry_multiplier ** attempt)
         return min(delay, self.config.max_retry_delay)
 
+    def _build_stream_request(
+        self,
+        messages: list[Message],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, dict[str, str], dict]:
+        """Build the URL, headers and body for a streaming request."""
+        headers = self._get_headers()
+        headers["Accept"] = "text/event-stream"
+        body = self._build_request_body(messages, temperature, max_tokens, **kwargs)
+        body["stream"] = True
+        if self.config.provider in (LLMProvider.OPENAI, LLMProvider.AZURE_OPENAI):
+            # Ask for a final usage chunk so token accounting survives streaming
+            body.setdefault("stream_options", {"include_usage": True})
+        return self._chat_url(), headers, body
+
+    def _parse_stream_event(self, data: dict) -> LLMStreamChunk | None:
+        """Parse a single streamed event into a chunk (None if it carries nothing)."""
+        # OpenAI-style chunk
+        if "choices" in data:
+            usage = data.get("usage") or {}
+            choices = data.get("choices") or []
+            if not choices:
+                return LLMStreamChunk(usage=usage) if usage else None
+            choice = choices[0]
+            content = (choice.get("delta") or {}).get("content") or ""
+            finish_reason = choice.get("finish_reason")
+            if not content and not finish_reason and not usage:
+                return None
+            return LLMStreamChunk(content=content, finish_reason=finish_reason, usage=usage)
+
+        # Anthropic-style events
+        event_type = data.get("type")
+        if event_type == "content_block_delta":
+            delta = data.get("delta", {})
+            if delta.get("type") == "text_delta" and delta.get("text"):
+                return LLMStreamChunk(content=delta["text"])
+            return None
+        if event_type == "message_start":
+            usage = data.get("message", {}).get("usage") or {}
+            return LLMStreamChunk(usage=usage) if usage else None
+        if event_type == "message_delta":
+            return LLMStreamChunk(
+                finish_reason=data.get("delta", {}).get("stop_reason"),
+                usage=data.get("usage") or {},
+            )
+        if event_type == "error":
+            error = data.get("error", {})
+            raise LLMError(f"Stream error: {error.get('message', 'unknown error')}")
+
+        return None
+
+
+class LLMClient(BaseLLMClient):
+    """
+    OpenAI-compatible LLM client with retry support.
+
+    Supports:
+    - OpenAI Chat Completions API
+    - Anthropic Messages API (via compatibility layer)
+    - Azure OpenAI
+    - Local/custom OpenAI-compatible endpoints
+
+    Usage:
+        config = LLMClientConfig.from_endpoint_config(db_config)
+        client = LLMClient(config)
+
+        messages = [
+            Message(role="system", content="You are a DM..."),
+            Message(role="user", content="I attack the goblin"),
+        ]
+        response = client.chat(messages)
+
+        # Or stream the response as it is generated
+        for chunk in client.chat_stream(messages):
+            print(chunk.content, end="")
+    """
+
+    def __init__(self, config: LLMClientConfig):
+        """Initialize the client."""
+        super().__init__(config)
+        self._http_client: httpx.Client | None = None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Get the shared pooled HTTP client for this endpoint (lazy)."""
+        if self._http_client is None:
+            self._http_client = get_http_pool().get_client(
+                self.config.get_base_url(), self.config.api_key
+            )
+        return self._http_client
+
+    def close(self) -> None:
+        """Release the HTTP client; pooled connections stay open for reuse."""
+        if self._http_client is not None:
+            get_http_pool().release(self._http_client)
+        self._http_client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def chat(
         self,
         messages: list[Message],
@@ -356,7 +523,7 @@ class LLMClient:
         Raises:
             LLMError: If the request fails after all retries
         """
-        url = f"{self.config.get_base_url()}/chat/completions"
+        url = self._chat_url()
         headers = self._get_headers()
         body = self._build_request_body(messages, temperature, max_tokens, **kwargs)
 
@@ -366,7 +533,9 @@ class LLMClient:
             try:
                 logger.debug(f"LLM request attempt {attempt + 1}/{self.config.max_retries + 1}")
 
-                response = self.http_client.post(url, json=body, headers=headers)
+                response = self.http_client.post(
+                    url, json=body, headers=headers, timeout=self.config.timeout
+                )
 
                 if response.status_code == 200:
                     response_data = response.json()
@@ -414,3 +583,267 @@ class LLMClient:
         if last_error:
             raise last_error
         raise LLMError("Unknown error occurred")
+
+    def chat_stream(
+        self,
+        messages: list[Message],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> Iterator[LLMStreamChunk]:
+        """
+        Send a streaming chat completion request.
+
+        Reads the provider's server-sent events and yields content deltas as
+        they arrive. Both OpenAI-style (``choices[].delta``) and Anthropic-style
+        (``content_block_delta``) events are understood.
+
+        Retries follow the same policy as :meth:`chat`, but only until the
+        first delta has been yielded - a stream that fails part-way through
+        raises instead of replaying output the caller has already consumed.
+
+        Args:
+            messages: List of messages in the conversation
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional API parameters
+
+        Yields:
+            LLMStreamChunk for each content delta, finish reason or usage report
+
+        Raises:
+            LLMError: If the request fails after all retries or mid-stream
+        """
+        url, headers, body = self._build_stream_request(
+            messages, temperature, max_tokens, **kwargs
+        )
+
+        started = False
+
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                logger.debug(
+                    f"LLM stream attempt {attempt + 1}/{self.config.max_retries + 1}"
+                )
+
+                with self.http_client.stream(
+                    "POST", url, json=body, headers=headers, timeout=self.config.timeout
+                ) as response:
+                    if response.status_code != 200:
+                        response.read()
+                        self._handle_error_response(response)
+
+                    for data in self._iter_sse_data(response):
+                        chunk = self._parse_stream_event(data)
+                        if chunk is None:
+                            continue
+                        started = True
+                        yield chunk
+                return
+
+            except (RateLimitError, ServerError) as e:
+                if started or attempt >= self.config.max_retries:
+                    raise
+                retry_after = e.retry_after if isinstance(e, RateLimitError) else None
+                delay = self._calculate_retry_delay(attempt, retry_after)
+                logger.warning(f"Stream request failed, retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+            except httpx.TimeoutException:
+                if started:
+                    raise LLMError("Stream timed out mid-response") from None
+                if attempt >= self.config.max_retries:
+                    raise LLMError("Request timeout after all retries") from None
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Stream timeout, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+            except httpx.RequestError as e:
+                if started:
+                    raise LLMError(f"Stream interrupted: {e}") from e
+                if attempt >= self.config.max_retries:
+                    raise LLMError(f"Request failed after all retries: {e}") from e
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Stream request error, retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+    def _iter_sse_data(self, response: httpx.Response) -> Iterator[dict]:
+        """Iterate the JSON payloads of a server-sent event stream."""
+        decoder = SSEDecoder()
+        for line in response.iter_lines():
+            data = decoder.feed(line)
+            if decoder.done:
+                return
+            if data is not None:
+                yield data
+
+        data = decoder.finish()
+        if data is not None:
+            yield data
+
+
+class AsyncLLMClient(BaseLLMClient):
+    """
+    asyncio counterpart of :class:`LLMClient` built on ``httpx.AsyncClient``.
+
+    Same request format, retry policy and error types; use it from async views
+    and the AsyncTurnEngine so LLM calls do not tie up a worker thread.
+
+    Usage:
+        async with AsyncLLMClient(config) as client:
+            response = await client.chat(messages)
+
+            async for chunk in client.chat_stream(messages):
+                print(chunk.content, end="")
+    """
+
+    def __init__(self, config: LLMClientConfig):
+        """Initialize the client."""
+        super().__init__(config)
+        self._http_client: httpx.AsyncClient | None = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Get the shared pooled async HTTP client for this endpoint and loop (lazy)."""
+        if self._http_client is None:
+            self._http_client = get_http_pool().get_async_client(
+                self.config.get_base_url(), self.config.api_key
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Release the HTTP client; pooled connections stay open for reuse."""
+        if self._http_client is not None:
+            get_http_pool().release(self._http_client)
+        self._http_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def chat(
+        self,
+        messages: list[Message],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request.
+
+        See :meth:`LLMClient.chat`.
+        """
+        url = self._chat_url()
+        headers = self._get_headers()
+        body = self._build_request_body(messages, temperature, max_tokens, **kwargs)
+
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                logger.debug(f"LLM request attempt {attempt + 1}/{self.config.max_retries + 1}")
+
+                response = await self.http_client.post(
+                    url, json=body, headers=headers, timeout=self.config.timeout
+                )
+
+                if response.status_code == 200:
+                    return self._parse_response(response.json())
+                self._handle_error_response(response)
+
+            except (RateLimitError, ServerError) as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                retry_after = e.retry_after if isinstance(e, RateLimitError) else None
+                delay = self._calculate_retry_delay(attempt, retry_after)
+                logger.warning(f"Request failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+            except httpx.TimeoutException:
+                if attempt >= self.config.max_retries:
+                    raise LLMError("Request timeout after all retries") from None
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Timeout, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            except httpx.RequestError as e:
+                if attempt >= self.config.max_retries:
+                    raise LLMError(f"Request failed after all retries: {e}") from e
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Request error, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+        raise LLMError("Unknown error occurred")
+
+    async def chat_stream(
+        self,
+        messages: list[Message],
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Send a streaming chat completion request.
+
+        See :meth:`LLMClient.chat_stream`.
+        """
+        url, headers, body = self._build_stream_request(
+            messages, temperature, max_tokens, **kwargs
+        )
+
+        started = False
+
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                logger.debug(
+                    f"LLM stream attempt {attempt + 1}/{self.config.max_retries + 1}"
+                )
+
+                async with self.http_client.stream(
+                    "POST", url, json=body, headers=headers, timeout=self.config.timeout
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        self._handle_error_response(response)
+
+                    decoder = SSEDecoder()
+                    async for line in response.aiter_lines():
+                        data = decoder.feed(line)
+                        if decoder.done:
+                            break
+                        chunk = self._parse_stream_event(data) if data is not None else None
+                        if chunk is not None:
+                            started = True
+                            yield chunk
+                    else:
+                        data = decoder.finish()
+                        chunk = self._parse_stream_event(data) if data is not None else None
+                        if chunk is not None:
+                            yield chunk
+                return
+
+            except (RateLimitError, ServerError) as e:
+                if started or attempt >= self.config.max_retries:
+                    raise
+                retry_after = e.retry_after if isinstance(e, RateLimitError) else None
+                delay = self._calculate_retry_delay(attempt, retry_after)
+                logger.warning(f"Stream request failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+            except httpx.TimeoutException:
+                if started:
+                    raise LLMError("Stream timed out mid-response") from None
+                if attempt >= self.config.max_retries:
+                    raise LLMError("Request timeout after all retries") from None
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Stream timeout, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            except httpx.RequestError as e:
+                if started:
+                    raise LLMError(f"Stream interrupted: {e}") from e
+                if attempt >= self.config.max_retries:
+                    raise LLMError(f"Request failed after all retries: {e}") from e
+                delay = self._calculate_retry_delay(attempt)
+                logger.warning(f"Stream request error, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
@@ -0,0 +1,310 @@
+"""
+Patch Engine.
+
+Applies the RFC 6902-style patches the DM emits
+(``{"op": "replace", "path": "/party/player/hp/current", "value": 7}``)
+to campaign state.
+
+- Paths are JSON pointers in the prompt's vocabulary and are mapped onto
+  state sections: /party/player -> character_state, /world/global_flags ->
+  global_flags, /world -> world_state
+- Each path string is compiled once (LRU-cached) into its section and
+  tokens
+- In-place mode mutates the state; copy-on-write mode copies only the
+  containers along each patched path, sharing everything else with the
+  input state. Batched replay applies each turn copy-on-write, so a turn
+  that fails partway leaves no trace
+- Legacy turn patches ({"character": ..., "world": ..., "global_flags": ...})
+  are deep-merged the same way
+
+Ops follow RFC 6902 with one leniency: missing intermediate objects are
+created, since LLM-authored worlds are sparse.
+"""
+
+import copy
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from apps.campaigns.models import TurnEvent
+
+# JSON pointer prefixes -> state sections, most specific first
+PATH_ROOTS: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("party", "player"), "character_state"),
+    (("world", "global_flags"), "global_flags"),
+    (("world",), "world_state"),
+)
+
+# Legacy merge-patch keys -> state sections
+LEGACY_SECTIONS = {
+    "character": "character_state",
+    "world": "world_state",
+    "global_flags": "global_flags",
+}
+
+# Ops that do not address state by path
+PATHLESS_OPS = {"advance_time"}
+
+
+class PatchError(ValueError):
+    """A patch could not be applied."""
+
+
+@dataclass(frozen=True)
+class CompiledPath:
+    """A JSON pointer resolved to a state section and the tokens below it."""
+
+    raw: str
+    section: str
+    tokens: tuple[str, ...]
+    # Path from the state root, e.g. ("world_state", "npcs", "bob")
+    state_path: tuple[str, ...]
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> CompiledPath:
+    """
+    Parse and map a JSON pointer (cached per path string).
+
+    Args:
+        path: JSON pointer, e.g. "/world/npcs/bob/attitude"
+
+    Returns:
+        CompiledPath
+
+    Raises:
+        PatchError: If the pointer is malformed or outside the state
+    """
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise PatchError(f"Patch path must start with '/': {path}")
+
+    tokens = tuple(token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/"))
+    for prefix, section in PATH_ROOTS:
+        if tokens[: len(prefix)] == prefix:
+            tokens = tokens[len(prefix) :]
+            return CompiledPath(
+                raw=path, section=section, tokens=tokens, state_path=(section,) + tokens
+            )
+
+    raise PatchError(f"Patch path is outside the campaign state: {path}")
+
+
+def _list_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"Invalid list index: {token}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"List index out of range: {token}")
+    return index
+
+
+@dataclass
+class PatchReplayResult:
+    """Outcome of replaying many turns with PatchEngine.replay."""
+
+    state: dict
+    turns_applied: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class PatchEngine:
+    """
+    Applies patch lists to state dicts.
+
+    Usage:
+        engine = PatchEngine()
+        new_state = engine.apply_turn(state.to_dict(), turn)            # copy-on-write
+        engine.apply_turn(owned_state, turn, in_place=True)             # mutate
+        result = engine.replay(state_dict, turns)                       # batched
+    """
+
+    def apply(self, state: dict, patches: list[dict], in_place: bool = False) -> dict:
+        """
+        Apply a list of patches.
+
+        Args:
+            state: State dict keyed by section (CampaignState.to_dict())
+            patches: Patch dicts
+            in_place: Mutate ``state`` instead of copying along patched paths
+
+        Returns:
+            The patched state (``state`` itself when in_place)
+
+        Raises:
+            PatchError: If a patch is malformed or its target is invalid
+        """
+        if not in_place:
+            state = dict(state)
+        return self._apply(state, patches, None if in_place else {id(state)})
+
+    def _apply(self, state: dict, patches: list[dict], owned: set[int] | None) -> dict:
+        """Apply patches; ``owned`` holds ids of containers already copied (None = in place)."""
+        for patch in patches:
+            op = patch.get("op")
+            if op in PATHLESS_OPS:
+                continue
+            if op not in ("replace", "add", "remove"):
+                raise PatchError(f"Invalid operation: {op}")
+            if op != "remove" and "value" not in patch:
+                raise PatchError(f"Patch operation '{op}' requires 'value' field")
+
+            compiled = compile_path(patch.get("path"))
+            parent, key = self._resolve_parent(state, compiled, owned)
+
+            if op == "remove":
+                self._remove(parent, key)
+            else:
+                self._set(parent, key, patch["value"], insert=op == "add")
+
+        return state
+
+    def apply_turn(self, state: dict, turn: TurnEvent, in_place: bool = False) -> dict:
+        """
+        Apply one turn's state patch (patch list and/or legacy merge keys).
+
+        Args:
+            state: State dict keyed by section
+            turn: Turn event with state_patch_json
+            in_place: Mutate ``state`` instead of copying along patched paths
+
+        Returns:
+            The patched state
+        """
+        patch = turn.state_patch_json or {}
+        if not in_place:
+            state = dict(state)
+
+        if patch.get("patches"):
+            self._apply(state, patch["patches"], None if in_place else {id(state)})
+
+        for key, section in LEGACY_SECTIONS.items():
+            if key in patch:
+                state[section] = self.merge(state.get(section) or {}, patch[key], in_place)
+
+        if turn.universe_time_after_turn:
+            state["universe_time"] = turn.universe_time_after_turn
+
+        state["turn_index"] = turn.turn_index
+        return state
+
+    def replay(self, state: dict, turns: Iterable[TurnEvent]) -> PatchReplayResult:
+        """
+        Apply many turns in order.
+
+        Each turn is applied copy-on-write and its result kept only if the
+        whole turn applies, so a turn that fails partway is recorded and
+        skipped without leaving its earlier operations behind. ``state``
+        itself is not modified.
+
+        Args:
+            state: State dict keyed by section
+            turns: Turn events in turn order
+
+        Returns:
+            PatchReplayResult with the final state
+        """
+        result = PatchReplayResult(state=state)
+
+        for turn in turns:
+            try:
+                result.state = self.apply_turn(result.state, turn)
+                result.turns_applied += 1
+            except Exception as e:
+                result.errors.append(f"Turn {turn.turn_index}: {str(e)}")
+
+        return result
+
+    def merge(self, base: dict, update: dict, in_place: bool = False) -> dict:
+        """Deep merge ``update`` into ``base``, copying only merged dicts unless in place."""
+        result = base if in_place else dict(base)
+
+        for key, value in update.items():
+            current = result.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                result[key] = self.merge(current, value, in_place)
+            else:
+                # The value belongs to the turn's patch JSON; never alias it into state
+                result[key] = copy.deepcopy(value) if isinstance(value, dict | list) else value
+
+        return result
+
+    def _resolve_parent(
+        self, state: dict, compiled: CompiledPath, owned: set[int] | None
+    ) -> tuple[dict | list, str]:
+        """Walk to the container holding the target, copying it on the way if needed."""
+        path = compiled.state_path
+        container = state
+
+        if owned is None:
+            for token in path[:-1]:
+                if isinstance(container, dict):
+                    child = container.get(token)
+                    if child is None:
+                        child = container[token] = {}
+                elif isinstance(container, list):
+                    child = container[_list_index(container, token, allow_end=False)]
+                else:
+                    raise PatchError(f"Cannot traverse into a scalar at {compiled.raw}")
+                container = child
+            if not isinstance(container, dict | list):
+                raise PatchError(f"Cannot patch inside a scalar at {compiled.raw}")
+            return container, path[-1]
+
+        for token in path[:-1]:
+            if isinstance(container, list):
+                index = _list_index(container, token, allow_end=False)
+                child = container[index]
+            elif isinstance(container, dict):
+                child = container.get(token)
+                if child is None:
+                    child = {}
+                    container[token] = child
+                    owned.add(id(child))
+            else:
+                raise PatchError(f"Cannot traverse into a scalar at {compiled.raw}")
+
+            if id(child) not in owned and isinstance(child, dict | list):
+                child = child.copy()
+                owned.add(id(child))
+                if isinstance(container, list):
+                    container[index] = child
+                else:
+                    container[token] = child
+            container = child
+
+        if not isinstance(container, dict | list):
+            raise PatchError(f"Cannot patch inside a scalar at {compiled.raw}")
+        return container, path[-1]
+
+    def _set(self, parent: dict | list, key: str, value, insert: bool) -> None:
+        # The value belongs to the turn's patch JSON; never alias it into state
+        if isinstance(value, dict | list):
+            value = copy.deepcopy(value)
+        if isinstance(parent, dict):
+            parent[key] = value
+        elif insert:
+            parent.insert(_list_index(parent, key, allow_end=True), value)
+        else:
+            parent[_list_index(parent, key, allow_end=False)] = value
+
+    def _remove(self, parent: dict | list, key: str) -> None:
+        if isinstance(parent, dict):
+            parent.pop(key, None)
+        else:
+            index = _list_index(parent, key, allow_end=False)
+            del parent[index]
+
+
+def patch_paths(patches: list[dict]) -> list[tuple[str, ...]]:
+    """State paths a patch list touches (unmappable patches are skipped)."""
+    paths = []
+    for patch in patches:
+        if patch.get("op") in PATHLESS_OPS:
+            continue
+        try:
+            paths.append(compile_path(patch.get("path")).state_path)
+        except PatchError:
+            continue
+    return paths
@@ -5,19 +5,56 @@ Constructs prompts for the LLM DM including:
 - System prompt (static)
 - Universe prompt (dynamic)
 - Campaign prompt (dynamic)
+- Story recap (summaries of earlier play)
 - Lore injection
 
+The context sections are packed into the model's token budget by
+priority (see ContextPacker). Proposal messages put the stable layers
+first - system prompt, then the universe and campaign setup - and the
+per-turn state, recap and lore last, so providers can cache the prefix.
+The stable layers are rendered once and shared through the Django cache
+(see prompt_cache).
+
 Tickets: 8.1.1, 8.1.2, 8.1.3, 8.1.4
 
 Based on SYSTEM_DESIGN.md section 8.1 Prompt Layers.
 """
 
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
 from apps.campaigns.models import Campaign, TurnEvent
 from apps.lore.services.chroma_client import ChromaClientService, LoreQueryResult
 from apps.timeline.services import CalendarService, UniverseTime
 from apps.universes.models import Universe
+from whispyrkeep.tokenizer import get_token_counter
+
+from .campaign_summary import CampaignSummaryService
+from .context_packer import (
+    PRIORITY_HARD_CANON,
+    PRIORITY_RECAP,
+    PRIORITY_SOFT_LORE,
+    PRIORITY_STATE,
+    ContextPacker,
+    ContextSection,
+    PackedContext,
+)
+from .llm_client import Message
+from .prompt_cache import cached_prompt, campaign_setup_key, universe_prompt_key
+from .turn_metrics import TurnMetrics
+
+# Tokens kept free for the model's reply when budgeting the context
+RESPONSE_TOKEN_RESERVE = 2048
+
+# Longest a single lore chunk may run in the context
+LORE_CHUNK_TOKENS = 200
+
+# Calendar formatting is stateless, so one service serves every prompt
+_calendar_service = CalendarService()
 
 # System prompt template - static core instructions
 SYSTEM_PROMPT_TEMPLATE = """You are a skilled and creative Dungeon Master for a single-player tabletop RPG using SRD 5.2 rules.
@@ -200,10 +237,8 @@ class UniversePrompt:
 
         # Current time
         if self.current_time:
-            calendar_service = CalendarService()
-            formatted = calendar_service.format_time(self.current_time)
             parts.append("### Current Universe Time")
-            parts.append(formatted)
+            parts.append(_calendar_service.format_time(self.current_time))
             parts.append("")
 
         # Key events
@@ -227,10 +262,15 @@ class UniversePrompt:
         return "\n".join(parts)
 
     @classmethod
-    def from_universe(cls, universe: Universe) -> "UniversePrompt":
-        """Create from a Universe model instance."""
+    def from_universe(cls, universe: Universe, include_time: bool = True) -> "UniversePrompt":
+        """
+        Create from a Universe model instance.
+
+        Without include_time the current universe time, which advances every
+        turn, is left out (it goes in the campaign progress instead).
+        """
         current_time = None
-        if universe.current_universe_time:
+        if include_time and universe.current_universe_time:
             current_time = UniverseTime.from_dict(universe.current_universe_time)
 
         # Extract key events from calendar profile
@@ -251,6 +291,10 @@ class UniversePrompt:
         )
 
 
+# TurnEvent fields CampaignPrompt renders for the recent turns
+RECENT_TURN_FIELDS = ("id", "campaign_id", "turn_index", "user_input_text")
+
+
 @dataclass
 class CampaignPrompt:
     """Dynamic campaign context prompt."""
@@ -264,9 +308,14 @@ class CampaignPrompt:
     current_state: dict = field(default_factory=dict)
     recent_turns: list[dict] = field(default_factory=list)
     active_quests: list[dict] = field(default_factory=list)
+    current_time: UniverseTime | None = None
 
     def build(self) -> str:
         """Build the campaign prompt string."""
+        return "\n".join([self.build_setup(), "", self.build_progress()])
+
+    def build_setup(self) -> str:
+        """Build the parts that only change with the campaign's settings."""
         parts = [
             f"## Campaign: {self.campaign_title}",
             f"Mode: {self.mode.title()} | Target Length: {self.target_length}",
@@ -288,7 +337,18 @@ class CampaignPrompt:
         # Character
         parts.append("### Player Character")
         parts.append(self.character_summary)
-        parts.append("")
+
+        return "\n".join(parts)
+
+    def build_progress(self) -> str:
+        """Build the parts that change from turn to turn."""
+        parts = []
+
+        # Current time
+        if self.current_time:
+            parts.append("### Current Universe Time")
+            parts.append(_calendar_service.format_time(self.current_time))
+            parts.append("")
 
         # Current state summary
         if self.current_state:
@@ -347,6 +407,9 @@ class CampaignPrompt:
         # Extract active quests from state
         active_quests = current_state.get("world", {}).get("quests", [])
 
+        universe_time = campaign.universe.current_universe_time
+        current_time = UniverseTime.from_dict(universe_time) if universe_time else None
+
         # Convert turns to dicts
         turn_dicts = []
         if recent_turns:
@@ -366,6 +429,7 @@ class CampaignPrompt:
             current_state=current_state,
             recent_turns=turn_dicts,
             active_quests=active_quests,
+            current_time=current_time,
         )
 
 
@@ -399,6 +463,31 @@ class LoreInjection:
 
         return "\n".join(parts)
 
+    def sections(self) -> list[ContextSection]:
+        """Context sections for the packer, chunks in retrieval rank order."""
+        return [
+            ContextSection(
+                name="hard_canon",
+                priority=PRIORITY_HARD_CANON,
+                header=(
+                    "## Established Facts (Hard Canon)\n"
+                    "These facts are TRUE and must not be contradicted:"
+                ),
+                items=[f"- {chunk}" for chunk in self.hard_canon_chunks],
+                max_item_tokens=LORE_CHUNK_TOKENS,
+            ),
+            ContextSection(
+                name="soft_lore",
+                priority=PRIORITY_SOFT_LORE,
+                header=(
+                    "## Rumors & Legends (Soft Lore)\n"
+                    "These may be true, partially true, or false rumors:"
+                ),
+                items=[f"- {chunk}" for chunk in self.soft_lore_chunks],
+                max_item_tokens=LORE_CHUNK_TOKENS,
+            ),
+        ]
+
     @classmethod
     def from_query_result(
         cls,
@@ -409,13 +498,14 @@ class LoreInjection:
         hard_canon = []
         soft_lore = []
 
+        # Chunks are capped in tokens when packed (LORE_CHUNK_TOKENS)
         if hard_canon_result:
             for result in hard_canon_result.results:
-                hard_canon.append(result.text[:500])  # Truncate long chunks
+                hard_canon.append(result.text)
 
         if soft_lore_result:
             for result in soft_lore_result.results:
-                soft_lore.append(result.text[:500])
+                soft_lore.append(result.text)
 
         return cls(
             hard_canon_chunks=hard_canon,
@@ -423,6 +513,20 @@ class LoreInjection:
         )
 
 
+@dataclass
+class TurnContext:
+    """
+    Assistant context for a turn proposal, split for prompt caching.
+
+    stable only changes when the universe or campaign settings do; volatile
+    changes every turn.
+    """
+
+    stable: str
+    volatile: str
+    tokens_used: int = 0
+
+
 class PromptBuilder:
     """
     Builds complete prompts for the LLM DM.
@@ -431,17 +535,31 @@ class PromptBuilder:
     and relevant lore into a coherent prompt.
     """
 
-    def __init__(self, chroma_service: ChromaClientService | None = None):
+    def __init__(
+        self,
+        chroma_service: ChromaClientService | None = None,
+        summary_service: CampaignSummaryService | None = None,
+    ):
         """Initialize the prompt builder."""
         self.chroma_service = chroma_service or ChromaClientService()
+        self.summary_service = summary_service or CampaignSummaryService()
 
     def build_system_prompt(self) -> str:
         """Get the system prompt."""
         return SYSTEM_PROMPT_TEMPLATE
 
     def build_universe_prompt(self, universe: Universe) -> str:
-        """Build universe context prompt."""
-        return UniversePrompt.from_universe(universe).build()
+        """
+        Build universe context prompt, less the current time.
+
+        Cached until the universe or its lore changes; the time advances every
+        turn, so it goes in the campaign progress instead.
+        """
+        return cached_prompt(
+            universe_prompt_key(universe.id),
+            f"{universe.updated_at.isoformat()}:{universe.canonical_lore_version}",
+            lambda: UniversePrompt.from_universe(universe, include_time=False).build(),
+        )
 
     def build_campaign_prompt(
         self,
@@ -454,46 +572,108 @@ class PromptBuilder:
             campaign, current_state, recent_turns
         ).build()
 
+    def build_campaign_setup(self, campaign: Campaign) -> str:
+        """
+        Build the campaign's settings and character (stable across turns).
+
+        Cached until the campaign or its character sheet is saved.
+        """
+        return cached_prompt(
+            campaign_setup_key(campaign.id),
+            f"{campaign.updated_at.isoformat()}:{campaign.character_sheet_id}",
+            lambda: CampaignPrompt.from_campaign(campaign, {}).build_setup(),
+        )
+
+    def build_campaign_progress(
+        self,
+        campaign: Campaign,
+        current_state: dict,
+        recent_turns: list[TurnEvent] | None = None,
+    ) -> str:
+        """Build the campaign's current time, state, quests and recent turns."""
+        return CampaignPrompt.from_campaign(
+            campaign, current_state, recent_turns
+        ).build_progress()
+
+    def build_story_recap(self, campaign: Campaign) -> str:
+        """Get the campaign's summarized story so far (see CampaignSummaryService)."""
+        return self.summary_service.build_recap(campaign)
+
     def build_lore_injection(
         self,
         universe_id: str,
         user_input: str,
         current_context: str = "",
-        top_k: int = 5,
-    ) -> str:
+        top_k: int | None = None,
+        lore_version: int | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> LoreInjection:
         """
         Build lore injection based on user input and context.
 
+        Hard canon and soft lore are retrieved together in one query.
+
         Args:
             universe_id: UUID of the universe
             user_input: The user's current input
             current_context: Additional context for the query
-            top_k: Number of lore chunks to retrieve
+            top_k: Number of lore chunks to retrieve of each type
+                (default LORE_INJECTION_TOP_K)
+            lore_version: The universe's canonical_lore_version, to serve
+                repeated queries from the retrieval cache
+            query_embedding: Optional precomputed embedding of the query
 
         Returns:
-            Lore injection string
+            LoreInjection with the retrieved chunks
         """
         # Combine user input and context for semantic search
         query = f"{user_input} {current_context}".strip()
+        if top_k is None:
+            top_k = settings.LORE_INJECTION_TOP_K
 
-        # Query hard canon
-        hard_canon_result = self.chroma_service.query(
+        retrieval = self.chroma_service.query_lore(
             universe_id=universe_id,
             query_text=query,
-            top_k=top_k,
-            chunk_type="hard_canon",
+            hard_canon_k=top_k,
+            soft_lore_k=top_k,
+            query_embedding=query_embedding,
+            lore_version=lore_version,
         )
 
-        # Query soft lore
-        soft_lore_result = self.chroma_service.query(
-            universe_id=universe_id,
-            query_text=query,
+        return LoreInjection.from_query_result(retrieval.hard_canon, retrieval.soft_lore)
+
+    async def abuild_lore_injection(
+        self,
+        universe_id: str,
+        user_input: str,
+        current_context: str = "",
+        top_k: int | None = None,
+        lore_version: int | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> LoreInjection:
+        """
+        Async variant of :meth:`build_lore_injection`.
+
+        The query runs in a worker thread since the ChromaDB client is blocking.
+        """
+        return await sync_to_async(self._build_lore_injection_in_worker, thread_sensitive=False)(
+            universe_id,
+            user_input,
+            current_context,
             top_k=top_k,
-            chunk_type="soft_lore",
+            lore_version=lore_version,
+            query_embedding=query_embedding,
         )
 
-        injection = LoreInjection.from_query_result(hard_canon_result, soft_lore_result)
-        return injection.build()
+    def _build_lore_injection_in_worker(self, *args, **kwargs) -> LoreInjection:
+        """Run build_lore_injection on an executor thread, closing its database connection."""
+        try:
+            return self.build_lore_injection(*args, **kwargs)
+        finally:
+            # Hybrid retrieval queries Postgres from this thread; request
+            # signals never close connections opened outside the request thread
+            if self.chroma_service.lexical_index is not None:
+                connections.close_all()
 
     def build_full_context(
         self,
@@ -501,7 +681,9 @@ class PromptBuilder:
         current_state: dict,
         user_input: str,
         recent_turns: list[TurnEvent] | None = None,
-    ) -> str:
+        metrics: TurnMetrics | None = None,
+        model: str | None = None,
+    ) -> TurnContext:
         """
         Build the complete context for an LLM call.
 
@@ -510,31 +692,135 @@ class PromptBuilder:
             current_state: Current canonical state
             user_input: User's input for this turn
             recent_turns: Recent turn history
+            metrics: Turn metrics to time lore retrieval under
+            model: Model the context is for, which sets the token budget
 
         Returns:
-            Complete context string (for assistant message)
+            TurnContext with the stable and volatile context
         """
-        parts = []
-
-        # Universe context
         universe = campaign.universe
-        parts.append(self.build_universe_prompt(universe))
-        parts.append("")
 
-        # Campaign context
-        parts.append(self.build_campaign_prompt(campaign, current_state, recent_turns))
-        parts.append("")
+        with metrics.phase("lore_retrieval") if metrics else nullcontext():
+            lore = self.build_lore_injection(
+                universe_id=str(universe.id),
+                user_input=user_input,
+                current_context=current_state.get("world", {}).get("location_id", ""),
+                lore_version=universe.canonical_lore_version,
+            )
 
-        # Lore injection
-        lore = self.build_lore_injection(
-            universe_id=str(universe.id),
+        return self.assemble_context(
+            self.build_universe_prompt(universe),
+            self.build_campaign_setup(campaign),
+            self.build_campaign_progress(campaign, current_state, recent_turns),
+            lore,
+            story_recap=self.build_story_recap(campaign),
+            model=model,
             user_input=user_input,
-            current_context=current_state.get("world", {}).get("location_id", ""),
+            metrics=metrics,
         )
-        if lore:
-            parts.append(lore)
 
-        return "\n".join(parts)
+    def assemble_context(
+        self,
+        universe_prompt: str,
+        campaign_setup: str,
+        campaign_progress: str,
+        lore: LoreInjection,
+        story_recap: str = "",
+        model: str | None = None,
+        user_input: str = "",
+        metrics: TurnMetrics | None = None,
+    ) -> TurnContext:
+        """
+        Pack independently built context sections into the assistant context.
+
+        Lets callers build the sections concurrently (see AsyncTurnEngine).
+        The stable universe and campaign setup are packed first, then the
+        volatile sections by priority in the remaining token budget; the
+        tokens used are recorded on metrics.
+        """
+        model = model or settings.LLM_DEFAULT_MODEL
+        budget = self.context_budget(model, user_input)
+        stable = self.pack_context(
+            [
+                ContextSection(
+                    "universe", PRIORITY_HARD_CANON, [universe_prompt], truncatable=True
+                ),
+                ContextSection(
+                    "campaign_setup", PRIORITY_HARD_CANON, [campaign_setup], truncatable=True
+                ),
+            ],
+            model,
+            budget,
+        )
+        volatile = self.pack_context(
+            [
+                # Laid out as a story: the recap leads into the current state
+                # and recent events, though the state is filled first
+                ContextSection(
+                    "story_recap",
+                    PRIORITY_RECAP,
+                    [story_recap] if story_recap else [],
+                    header="## Story So Far",
+                    truncatable=True,
+                ),
+                ContextSection(
+                    "campaign_progress",
+                    PRIORITY_STATE,
+                    [campaign_progress] if campaign_progress else [],
+                    truncatable=True,
+                ),
+                *lore.sections(),
+            ],
+            model,
+            budget - stable.tokens_used,
+        )
+        context = TurnContext(
+            stable=stable.text,
+            volatile=volatile.text,
+            tokens_used=stable.tokens_used + volatile.tokens_used,
+        )
+        if metrics:
+            metrics.context_tokens = context.tokens_used
+        return context
+
+    def pack_context(
+        self, sections: list[ContextSection], model: str, budget_tokens: int
+    ) -> PackedContext:
+        """Pack sections into a token budget, counted with the model's tokenizer."""
+        return ContextPacker(get_token_counter(model), budget_tokens).pack(sections)
+
+    def context_budget(self, model: str, user_input: str = "") -> int:
+        """
+        Tokens available to the assistant context for a model.
+
+        The model's context window less the system prompt, the player's
+        input and room for the reply, capped at LLM_CONTEXT_TOKEN_BUDGET.
+        """
+        counter = get_token_counter(model)
+        available = (
+            counter.family.context_window
+            - counter.count(self.build_system_prompt())
+            - counter.count(user_input)
+            - RESPONSE_TOKEN_RESERVE
+        )
+        return max(0, min(settings.LLM_CONTEXT_TOKEN_BUDGET, available))
+
+    def build_proposal_messages(self, context: TurnContext, user_input: str) -> list[Message]:
+        """
+        Lay out the turn proposal messages, most stable first.
+
+        The system prompt and the universe/campaign setup form a prefix that
+        repeats across a campaign's turns, and each ends a cache breakpoint;
+        state, recap and lore follow, then the player's input.
+        """
+        messages = [Message(role="system", content=self.build_system_prompt(), cache=True)]
+        if context.stable:
+            messages.append(
+                Message(role="system", content=f"[Setting]\n{context.stable}", cache=True)
+            )
+        messages.append(Message(role="assistant", content=f"[Context]\n{context.volatile}"))
+        messages.append(Message(role="user", content=user_input))
+        return messages
 
     def build_repair_prompt(self, error_message: str, original_response: str) -> str:
         """
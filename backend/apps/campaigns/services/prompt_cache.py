@@ -0,0 +1,64 @@
+"""
+Rendered prompt cache.
+
+The universe prompt and a campaign's setup (settings, rating and
+failure-style text, player character) change far less often than turns
+are played, so their rendered text is kept in the shared Django cache
+(Redis) instead of being rebuilt on every turn.
+
+Each entry is stored under a per-object key together with a fingerprint
+of what it was rendered from (e.g. the universe's updated_at and
+canonical_lore_version); a stale fingerprint is a miss. Saves that can
+change the text without touching the fingerprint are covered by
+invalidate_prompts, called from the save signals in apps.campaigns.signals.
+"""
+
+import logging
+from collections.abc import Callable
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE_TTL = 24 * 3600
+
+
+def universe_prompt_key(universe_id) -> str:
+    return f"prompt:universe:{universe_id}"
+
+
+def campaign_setup_key(campaign_id) -> str:
+    return f"prompt:campaign_setup:{campaign_id}"
+
+
+def cached_prompt(key: str, fingerprint: str, render: Callable[[], str]) -> str:
+    """
+    Get rendered prompt text from the cache, rendering it on a miss.
+
+    Falls back to rendering directly when the cache is unavailable.
+    """
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        logger.debug(f"Prompt cache unavailable: {e}")
+        return render()
+
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+
+    text = render()
+    try:
+        cache.set(key, (fingerprint, text), PROMPT_CACHE_TTL)
+    except Exception as e:
+        logger.debug(f"Prompt cache unavailable: {e}")
+    return text
+
+
+def invalidate_prompts(keys: list[str]) -> None:
+    """Drop rendered prompts, e.g. after the objects they render are saved."""
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except Exception as e:
+        logger.debug(f"Prompt cache unavailable: {e}")
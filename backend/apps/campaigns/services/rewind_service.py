@@ -4,7 +4,10 @@ Rewind Service - Handles campaign rewind operations.
 Based on SYSTEM_DESIGN.md section 11.2:
 - Rewind rewrites history
 - All later TurnEvents are deleted (soft-deleted)
-- Soft lore from those turns is invalidated
+- Soft lore from those turns is invalidated in one batch; its vector
+  deletes go through the vector outbox and reach ChromaDB after commit
+- Their rolls are taken out of the dice log statistics
+- Story summaries covering them are discarded and rebuilt in the background
 - Universe time resets to snapshot time
 
 Epic 10.0.1 implementation.
@@ -16,6 +19,8 @@ from dataclasses import dataclass, field
 from django.db import transaction
 
 from apps.campaigns.models import Campaign, TurnEvent
+from apps.campaigns.services.campaign_summary import CampaignSummaryService
+from apps.campaigns.services.dice_log import DiceLogService
 from apps.campaigns.services.state_service import CampaignState, StateService
 from apps.lore.services.lore_service import LoreService
 
@@ -44,7 +49,7 @@ class RewindService:
     2. Delete all turns after target
     3. Delete state snapshots after target
     4. Invalidate soft lore from deleted turns
-    5. Update campaign state
+    5. Reset the materialized head state to the target turn
 
     Usage:
         service = RewindService()
@@ -55,6 +60,8 @@ class RewindService:
         """Initialize rewind service."""
         self.state_service = StateService()
         self.lore_service = LoreService()
+        self.dice_log = DiceLogService()
+        self.summary_service = CampaignSummaryService()
 
     def rewind_to_turn(
         self,
@@ -88,6 +95,9 @@ class RewindService:
 
         try:
             with transaction.atomic():
+                # Lock the campaign like turn persistence and summary updates do
+                Campaign.objects.select_for_update().only("id").get(pk=campaign.pk)
+
                 # Get turns to delete (after target)
                 turns_to_delete = TurnEvent.objects.filter(
                     campaign=campaign,
@@ -100,24 +110,29 @@ class RewindService:
                 )
                 turns_deleted = turns_to_delete.count()
 
+                # Subtract their rolls from the dice stats (records cascade)
+                self.dice_log.remove_turns_after(campaign, target_turn_index)
+
                 # Delete turns
                 turns_to_delete.delete()
 
+                # Drop story summaries covering them; the next update rebuilds
+                self.summary_service.discard_after(campaign, target_turn_index)
+                self.summary_service.schedule_update(campaign.id)
+
                 # Delete state snapshots after target turn
                 snapshots_deleted = self.state_service.delete_snapshots_after_turn(
                     campaign, target_turn_index
                 )
 
                 # Invalidate lore from deleted turns
-                lore_chunks_invalidated = 0
-                for turn_id in turn_ids_to_invalidate:
-                    chunks = self.lore_service.invalidate_turn_lore(
-                        campaign.universe,
-                        str(turn_id),
-                    )
-                    lore_chunks_invalidated += chunks
+                lore_chunks_invalidated = self.lore_service.invalidate_turns_lore(
+                    campaign.universe,
+                    [str(turn_id) for turn_id in turn_ids_to_invalidate],
+                )
 
                 # Rebuild state at target turn
+                replay_result = None
                 if target_turn_index == 0:
                     new_state = self.state_service.get_initial_state(campaign)
                 else:
@@ -130,6 +145,19 @@ class RewindService:
                         new_state = self.state_service.get_initial_state(campaign)
                         errors.extend(replay_result.errors)
 
+                if errors:
+                    # Let the next read rebuild it rather than pin a fallback state
+                    self.state_service.invalidate_head_state(campaign)
+                elif replay_result is not None:
+                    self.state_service.update_head_state(
+                        campaign,
+                        new_state,
+                        cost=replay_result.cost,
+                        last_snapshot_turn=replay_result.snapshot_turn_index,
+                    )
+                else:
+                    self.state_service.update_head_state(campaign, new_state)
+
                 logger.info(
                     f"Rewound campaign {campaign.id} to turn {target_turn_index}. "
                     f"Deleted {turns_deleted} turns, {snapshots_deleted} snapshots, "
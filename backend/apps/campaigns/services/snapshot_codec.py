@@ -0,0 +1,145 @@
+"""
+Snapshot Codec.
+
+Storage format for CanonicalCampaignState rows.
+
+- Keyframes hold the full state, zlib-compressed into ``state_blob``
+- Deltas hold a structural diff against their keyframe in ``delta_json``
+- Legacy rows (``encoding="json"``) hold the full state in ``state_json``
+
+A structural diff is a list of operations applied in order:
+
+    ["set", ["world_state", "npcs", "bob"], {...}]
+    ["del", ["global_flags", "door_open"]]
+
+Dicts present on both sides are diffed key by key; any other changed value
+(including lists) is replaced whole.
+"""
+
+import copy
+import json
+import zlib
+
+from apps.campaigns.models import CanonicalCampaignState
+
+ENCODING_JSON = "json"
+ENCODING_ZLIB = "zlib"
+
+COMPRESSION_LEVEL = 6
+
+
+def compress_state(state: dict) -> bytes:
+    """Canonical-JSON encode and zlib-compress a state dict."""
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":"))
+    return zlib.compress(payload.encode(), COMPRESSION_LEVEL)
+
+
+def decompress_state(blob: bytes) -> dict:
+    """Inverse of compress_state."""
+    return json.loads(zlib.decompress(bytes(blob)))
+
+
+def diff_states(base: dict, target: dict, path: list | None = None) -> list[list]:
+    """
+    Compute the structural diff that turns ``base`` into ``target``.
+
+    Args:
+        base: State to diff against (the keyframe)
+        target: State to reach
+
+    Returns:
+        List of set/del operations
+    """
+    path = path or []
+    ops = []
+
+    for key, value in target.items():
+        if key not in base:
+            ops.append(["set", path + [key], value])
+        elif isinstance(value, dict) and isinstance(base[key], dict):
+            ops.extend(diff_states(base[key], value, path + [key]))
+        elif base[key] != value:
+            ops.append(["set", path + [key], value])
+
+    for key in base:
+        if key not in target:
+            ops.append(["del", path + [key]])
+
+    return ops
+
+
+def apply_diff(base: dict, ops: list[list]) -> dict:
+    """
+    Apply a structural diff to a copy of ``base``.
+
+    Args:
+        base: State the diff was computed against
+        ops: Operations from diff_states
+
+    Returns:
+        The reconstructed state
+    """
+    state = copy.deepcopy(base)
+
+    for op in ops:
+        action, path = op[0], op[1]
+        parent = state
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        if action == "set":
+            parent[path[-1]] = copy.deepcopy(op[2])
+        elif action == "del":
+            parent.pop(path[-1], None)
+        else:
+            raise ValueError(f"Unknown snapshot diff operation: {action}")
+
+    return state
+
+
+def encode_keyframe(state: dict) -> dict:
+    """Model field values for a compressed keyframe."""
+    return {
+        "is_keyframe": True,
+        "keyframe": None,
+        "encoding": ENCODING_ZLIB,
+        "state_blob": compress_state(state),
+        "state_json": None,
+        "delta_json": None,
+    }
+
+
+def encode_delta(state: dict, keyframe: CanonicalCampaignState, keyframe_state: dict) -> dict:
+    """Model field values for a delta against ``keyframe``."""
+    return {
+        "is_keyframe": False,
+        "keyframe": keyframe,
+        "encoding": ENCODING_JSON,
+        "state_blob": None,
+        "state_json": None,
+        "delta_json": diff_states(keyframe_state, state),
+    }
+
+
+def decode_keyframe(snapshot: CanonicalCampaignState) -> dict:
+    """Full state stored in a keyframe (or legacy) row."""
+    if snapshot.encoding == ENCODING_ZLIB:
+        return decompress_state(snapshot.state_blob)
+    return snapshot.state_json
+
+
+def decode_snapshot(snapshot: CanonicalCampaignState) -> dict:
+    """
+    Reconstruct the full state stored in any snapshot row.
+
+    Deltas load their keyframe (select_related("keyframe") avoids the
+    extra query).
+
+    Args:
+        snapshot: The snapshot row
+
+    Returns:
+        Full state dict
+    """
+    if snapshot.is_keyframe:
+        return decode_keyframe(snapshot)
+    return apply_diff(decode_keyframe(snapshot.keyframe), snapshot.delta_json or [])
@@ -0,0 +1,189 @@
+"""
+Snapshot Policy.
+
+Decides when a campaign's state is worth snapshotting and which old
+snapshots can be dropped.
+
+Instead of a fixed turn interval, the head state accumulates the replay
+cost of every turn since the last snapshot - turns, patch bytes and merge
+operations - and a snapshot is taken once the weighted estimate crosses a
+threshold. Campaigns with heavy world patches snapshot often; campaigns
+with tiny patches rarely.
+
+Old snapshots are thinned on a logarithmic schedule: the most recent few
+are kept, then one per power-of-two age bucket, so storage grows with
+log(turns) while rewinds to recent turns stay cheap.
+
+Snapshots are stored as compressed keyframes plus diffs against them (see
+snapshot_codec.py); the policy also decides when a new keyframe is needed.
+
+Weights and thresholds come from the CAMPAIGN_SNAPSHOT_* settings.
+"""
+
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from apps.campaigns.models import TurnEvent
+
+# Legacy merge-patch sections (see PatchEngine.merge)
+MERGE_SECTIONS = ("character", "world", "global_flags")
+
+
+@dataclass
+class ReplayCost:
+    """Accumulated replay work since the last snapshot."""
+
+    turns: int = 0
+    patch_bytes: int = 0
+    merge_ops: int = 0
+
+    def __add__(self, other: "ReplayCost") -> "ReplayCost":
+        return ReplayCost(
+            turns=self.turns + other.turns,
+            patch_bytes=self.patch_bytes + other.patch_bytes,
+            merge_ops=self.merge_ops + other.merge_ops,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "turns": self.turns,
+            "patch_bytes": self.patch_bytes,
+            "merge_ops": self.merge_ops,
+        }
+
+
+def _count_merge_ops(value) -> int:
+    """Count the keys a deep merge of ``value`` has to visit."""
+    if not isinstance(value, dict):
+        return 1
+    return sum(1 + (_count_merge_ops(v) if isinstance(v, dict) else 0) for v in value.values())
+
+
+def measure_turn(turn: TurnEvent) -> ReplayCost:
+    """
+    Estimate the work needed to replay a single turn.
+
+    Args:
+        turn: The turn event
+
+    Returns:
+        ReplayCost for that one turn
+    """
+    patch = turn.state_patch_json or {}
+    patch_bytes = len(json.dumps(patch, separators=(",", ":"))) if patch else 0
+
+    merge_ops = len(patch.get("patches", []))
+    for section in MERGE_SECTIONS:
+        if section in patch:
+            merge_ops += _count_merge_ops(patch[section])
+    if turn.universe_time_after_turn:
+        merge_ops += 1
+
+    return ReplayCost(turns=1, patch_bytes=patch_bytes, merge_ops=merge_ops)
+
+
+@dataclass
+class SnapshotPolicy:
+    """
+    Cost-based snapshot scheduling and logarithmic thinning.
+
+    Usage:
+        policy = SnapshotPolicy.from_settings()
+        if policy.should_snapshot(cost):
+            ...
+        stale = policy.snapshots_to_thin(snapshot_turns, head_turn)
+    """
+
+    cost_threshold: float = 10.0
+    turn_weight: float = 1.0
+    kb_weight: float = 1.0
+    op_weight: float = 0.1
+    max_turns: int = 100
+    keep_recent: int = 3
+    keyframe_interval: int = 8
+    max_delta_ratio: float = 0.5
+
+    @classmethod
+    def from_settings(cls) -> "SnapshotPolicy":
+        """Build the policy from the CAMPAIGN_SNAPSHOT_* settings."""
+        defaults = cls()
+        return cls(
+            cost_threshold=getattr(
+                settings, "CAMPAIGN_SNAPSHOT_COST_THRESHOLD", defaults.cost_threshold
+            ),
+            turn_weight=getattr(settings, "CAMPAIGN_SNAPSHOT_TURN_WEIGHT", defaults.turn_weight),
+            kb_weight=getattr(settings, "CAMPAIGN_SNAPSHOT_KB_WEIGHT", defaults.kb_weight),
+            op_weight=getattr(settings, "CAMPAIGN_SNAPSHOT_OP_WEIGHT", defaults.op_weight),
+            max_turns=getattr(settings, "CAMPAIGN_SNAPSHOT_MAX_TURNS", defaults.max_turns),
+            keep_recent=getattr(settings, "CAMPAIGN_SNAPSHOT_KEEP_RECENT", defaults.keep_recent),
+            keyframe_interval=getattr(
+                settings, "CAMPAIGN_SNAPSHOT_KEYFRAME_INTERVAL", defaults.keyframe_interval
+            ),
+            max_delta_ratio=getattr(
+                settings, "CAMPAIGN_SNAPSHOT_MAX_DELTA_RATIO", defaults.max_delta_ratio
+            ),
+        )
+
+    def estimate_cost(self, cost: ReplayCost) -> float:
+        """Weighted replay cost estimate."""
+        return (
+            cost.turns * self.turn_weight
+            + cost.patch_bytes / 1024 * self.kb_weight
+            + cost.merge_ops * self.op_weight
+        )
+
+    def should_snapshot(self, cost: ReplayCost) -> bool:
+        """Whether the accumulated cost warrants a new snapshot."""
+        if cost.turns == 0:
+            return False
+        return cost.turns >= self.max_turns or self.estimate_cost(cost) >= self.cost_threshold
+
+    def should_store_delta(
+        self, deltas_since_keyframe: int, delta_bytes: int, full_bytes: int
+    ) -> bool:
+        """
+        Whether a snapshot should be a diff rather than a new keyframe.
+
+        Args:
+            deltas_since_keyframe: Deltas already stored against the keyframe
+            delta_bytes: Serialized size of the diff
+            full_bytes: Serialized size of the full state
+
+        Returns:
+            False once the chain is long or the diff is no longer small
+        """
+        if deltas_since_keyframe >= self.keyframe_interval - 1:
+            return False
+        return delta_bytes <= full_bytes * self.max_delta_ratio
+
+    def snapshots_to_thin(self, snapshot_turns: list[int], head_turn: int) -> list[int]:
+        """
+        Pick the snapshots to delete.
+
+        Keeps the earliest snapshot (the replay base), the ``keep_recent``
+        newest, and the newest snapshot in each power-of-two age bucket.
+
+        Args:
+            snapshot_turns: Turn indices of the existing snapshots
+            head_turn: Current head turn index
+
+        Returns:
+            Turn indices to delete
+        """
+        turns = sorted(set(snapshot_turns), reverse=True)
+        if len(turns) <= self.keep_recent + 1:
+            return []
+
+        keep = set(turns[: self.keep_recent])
+        keep.add(turns[-1])
+
+        seen_buckets = set()
+        for turn_index in turns[self.keep_recent :]:
+            bucket = max(head_turn - turn_index, 0).bit_length()
+            if bucket not in seen_buckets:
+                seen_buckets.add(bucket)
+                keep.add(turn_index)
+
+        return sorted(t for t in turns if t not in keep)
@@ -0,0 +1,180 @@
+"""
+State Hash Tree.
+
+Merkle tree over a campaign state dict, so a turn only rehashes the parts
+of the state its patch touched.
+
+- The root covers every top-level section (character_state, world_state, ...)
+- Sections listed in HASH_TREE_SPEC are split into one node per key, and
+  keyed collections (world_state npcs, factions, locations, quests) into
+  one leaf per entity
+- Everything else is a leaf hashed from its canonical JSON
+
+Updating a path rebuilds only the nodes along it; untouched subtrees are
+shared with the previous tree. The root hash is the state hash stored on
+TurnEvent.canonical_state_hash and CampaignHeadState.state_hash. The head
+state keeps only the root and section hashes (see StateHashTree.sections),
+so the next turn rehashes the sections it touched, and nothing else.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+
+# Which parts of the state get their own nodes. A key maps to the spec for
+# its children; {} means "one leaf per key", a missing key means "leaf".
+HASH_TREE_SPEC: dict = {
+    "character_state": {},
+    "global_flags": {},
+    "world_state": {
+        "npcs": {},
+        "factions": {},
+        "locations": {},
+        "quests": {},
+    },
+}
+
+
+def _leaf_hash(value) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(b"\x00" + payload.encode()).hexdigest()
+
+
+def _internal_hash(children: dict) -> str:
+    payload = ",".join(f"{json.dumps(key)}:{children[key]['h']}" for key in sorted(children))
+    return hashlib.sha256(b"\x01" + payload.encode()).hexdigest()
+
+
+def _build_node(value, spec: dict | None) -> dict:
+    if spec is None or not isinstance(value, dict):
+        return {"h": _leaf_hash(value)}
+    children = {key: _build_node(child, spec.get(key)) for key, child in value.items()}
+    return {"h": _internal_hash(children), "c": children}
+
+
+def _update_node(node: dict | None, value, spec: dict | None, path: tuple) -> dict:
+    if node is None or "c" not in node or spec is None or not isinstance(value, dict) or not path:
+        return _build_node(value, spec)
+
+    key = path[0]
+    children = dict(node["c"])
+    if key in value:
+        children[key] = _update_node(children.get(key), value[key], spec.get(key), path[1:])
+    else:
+        children.pop(key, None)
+    return {"h": _internal_hash(children), "c": children}
+
+
+def merge_paths(prefix: tuple, update: dict, spec: dict | None = None) -> list[tuple]:
+    """
+    Paths a deep merge of ``update`` at ``prefix`` can change.
+
+    Args:
+        prefix: Path of the merged section, e.g. ("world_state",)
+        update: The dict being merged in
+        spec: Tree spec at ``prefix`` (looked up from HASH_TREE_SPEC if omitted)
+
+    Returns:
+        Paths to pass to StateHashTree.update
+    """
+    if spec is None:
+        spec = HASH_TREE_SPEC
+        for key in prefix:
+            spec = spec.get(key) if spec is not None else None
+    if spec is None or not isinstance(update, dict):
+        return [prefix]
+
+    paths = []
+    for key, value in update.items():
+        child_spec = spec.get(key)
+        if child_spec is not None and isinstance(value, dict):
+            paths.extend(merge_paths(prefix + (key,), value, child_spec))
+        else:
+            paths.append(prefix + (key,))
+    return paths
+
+
+class StateHashTree:
+    """
+    Immutable Merkle tree over a state dict.
+
+    Usage:
+        tree = StateHashTree.build(state.to_dict())
+        tree = tree.update(new_state.to_dict(), [("world_state", "npcs", "bob")])
+        tree.root_hash
+    """
+
+    def __init__(self, root: dict):
+        self._root = root
+
+    @classmethod
+    def build(cls, state: dict) -> "StateHashTree":
+        """Hash a whole state dict."""
+        return cls(_build_node(state, HASH_TREE_SPEC))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StateHashTree":
+        """Load a tree stored with to_dict."""
+        return cls(data)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form of the tree."""
+        return self._root
+
+    @property
+    def root_hash(self) -> str:
+        return self._root["h"]
+
+    def sections(self) -> "StateHashTree":
+        """
+        This tree cut down to the root and the top-level section hashes.
+
+        Small enough to store with every turn; updating it rebuilds each
+        touched section whole and reuses the hashes of the others.
+        """
+        children = {key: {"h": child["h"]} for key, child in self._root.get("c", {}).items()}
+        return StateHashTree({"h": self.root_hash, "c": children})
+
+    def update(self, state: dict, paths: Iterable[tuple]) -> "StateHashTree":
+        """
+        Rehash the nodes along ``paths`` against the new state.
+
+        Paths may point below the tree's leaves (the enclosing leaf is
+        rehashed) or at removed keys (the node is dropped). Every part of
+        the state that changed must be covered by some path.
+
+        Args:
+            state: The new state dict
+            paths: Changed paths, e.g. ("world_state", "npcs", "bob", "hp")
+
+        Returns:
+            A new tree sharing untouched subtrees with this one
+        """
+        root = self._root
+        for path in dict.fromkeys(tuple(path) for path in paths):
+            root = _update_node(root, state, HASH_TREE_SPEC, path)
+        return StateHashTree(root)
+
+    def diff(self, other: "StateHashTree") -> list[tuple]:
+        """
+        Paths of the deepest nodes whose hashes differ between two trees.
+
+        Args:
+            other: Tree to compare against
+
+        Returns:
+            List of differing paths (empty if the roots match)
+        """
+        differing = []
+
+        def walk(a: dict | None, b: dict | None, path: tuple) -> None:
+            if a is not None and b is not None and a["h"] == b["h"]:
+                return
+            if a is None or b is None or "c" not in a or "c" not in b:
+                differing.append(path)
+                return
+            for key in sorted(set(a["c"]) | set(b["c"])):
+                walk(a["c"].get(key), b["c"].get(key), path + (key,))
+
+        walk(self._root, other._root, ())
+        return differing
@@ -7,16 +7,33 @@ Based on SYSTEM_DESIGN.md:
 - Snapshot-based state storage for fast loads
 - Event-sourced replay for state reconstruction
 - Hash verification for integrity
+
+The current ("head") state of each campaign is materialized in
+CampaignHeadState and written through on every turn, so reads never replay.
+Snapshots are scheduled by replay cost rather than a fixed interval (see
+snapshot_policy.py) and stored as compressed keyframes plus structural
+diffs (see snapshot_codec.py). State hashes are Merkle roots (see
+state_hash.py), updated incrementally along the paths each turn touches.
 """
 
-import hashlib
+import copy
 import json
 import logging
 from dataclasses import dataclass, field
 
-from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.models import (
+    Campaign,
+    CampaignHeadState,
+    CanonicalCampaignState,
+    TurnEvent,
+)
 from apps.characters.models import CharacterSheet
 
+from .patch_engine import PatchEngine, patch_paths
+from .snapshot_codec import decode_keyframe, decode_snapshot, encode_delta, encode_keyframe
+from .snapshot_policy import ReplayCost, SnapshotPolicy, measure_turn
+from .state_hash import StateHashTree, merge_paths
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,9 +75,8 @@ class CampaignState:
         )
 
     def compute_hash(self) -> str:
-        """Compute deterministic hash of state."""
-        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(canonical.encode()).hexdigest()
+        """Compute deterministic hash of state (Merkle root of the full tree)."""
+        return StateHashTree.build(self.to_dict()).root_hash
 
 
 @dataclass
@@ -71,7 +87,22 @@ class StateReplayResult:
     state: CampaignState | None = None
     turn_index: int = 0
     from_snapshot: bool = False
+    snapshot_turn_index: int = 0
     turns_replayed: int = 0
+    cost: ReplayCost = field(default_factory=ReplayCost)
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class HashVerificationResult:
+    """Result of verifying stored turn hashes against replayed state."""
+
+    valid: bool
+    start_turn_index: int = 0
+    end_turn_index: int = 0
+    turns_checked: int = 0
+    turns_skipped: int = 0
+    mismatches: list[dict] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
 
 
@@ -81,18 +112,21 @@ class StateService:
 
     Provides:
     - Initial state generation
-    - State snapshot storage
+    - Materialized head state (O(1) current-state reads)
+    - Cost-based state snapshots with logarithmic thinning
     - State replay from turns
     - State hash verification
 
     Usage:
         service = StateService()
         state = service.get_current_state(campaign)
-        service.save_snapshot(campaign, state)
+        service.record_turn(campaign, new_state, turn_event)
     """
 
-    # Snapshot every N turns for fast recovery
-    SNAPSHOT_INTERVAL = 10
+    def __init__(self, snapshot_policy: SnapshotPolicy | None = None):
+        """Initialize the service; the policy defaults to the configured one."""
+        self.snapshot_policy = snapshot_policy or SnapshotPolicy.from_settings()
+        self.patch_engine = PatchEngine()
 
     def get_initial_state(self, campaign: Campaign) -> CampaignState:
         """
@@ -170,8 +204,9 @@ class StateService:
         """
         Get the current state of a campaign.
 
-        First tries to load from latest snapshot, then replays any
-        turns after the snapshot.
+        Reads the materialized head state. Campaigns without one (created
+        before head states existed, or after a failed rewind) are replayed
+        from the latest snapshot once and the head is backfilled.
 
         Args:
             campaign: The campaign
@@ -179,14 +214,232 @@ class StateService:
         Returns:
             Current CampaignState
         """
+        head = CampaignHeadState.objects.filter(campaign=campaign).first()
+        if head is not None:
+            return CampaignState.from_dict(head.state_json)
+
         result = self.replay_to_turn(campaign, turn_index=None)
 
         if result.success and result.state:
+            self.update_head_state(
+                campaign,
+                result.state,
+                cost=result.cost,
+                last_snapshot_turn=result.snapshot_turn_index,
+            )
             return result.state
 
         # If replay fails, return initial state
         return self.get_initial_state(campaign)
 
+    def advance_state(self, state: CampaignState, turn: TurnEvent) -> CampaignState:
+        """
+        Compute the state after a turn without mutating the input state.
+
+        Only the containers along patched paths are copied; the rest of the
+        new state is shared with the input.
+
+        Args:
+            state: State before the turn
+            turn: The (persisted) turn event
+
+        Returns:
+            New CampaignState at turn.turn_index
+        """
+        return CampaignState.from_dict(self.patch_engine.apply_turn(state.to_dict(), turn))
+
+    def turn_touched_paths(self, turn: TurnEvent) -> list[tuple]:
+        """
+        State paths a turn's patch can change (see PatchEngine.apply_turn).
+
+        Args:
+            turn: The turn event
+
+        Returns:
+            Paths for StateHashTree.update
+        """
+        paths = [("turn_index",)]
+        patch = turn.state_patch_json or {}
+        paths.extend(patch_paths(patch.get("patches", [])))
+
+        for patch_key, section in (
+            ("character", "character_state"),
+            ("world", "world_state"),
+            ("global_flags", "global_flags"),
+        ):
+            if patch_key in patch:
+                paths.extend(merge_paths((section,), patch[patch_key]))
+
+        if turn.universe_time_after_turn:
+            paths.append(("universe_time",))
+
+        return paths
+
+    def hash_turn(
+        self,
+        campaign: Campaign,
+        previous_state: CampaignState,
+        new_state: CampaignState,
+        turn: TurnEvent,
+    ) -> StateHashTree:
+        """
+        Hash the state after a turn, reusing the head's hashes when current.
+
+        The head stores the root and section hashes, so only the sections
+        the turn touched are rehashed. Falls back to hashing the whole state
+        if the head has no hashes or is not at ``previous_state``.
+
+        Args:
+            campaign: The campaign
+            previous_state: State before the turn
+            new_state: State after the turn (see advance_state)
+            turn: The turn event (need not be saved yet)
+
+        Returns:
+            StateHashTree for new_state
+        """
+        head = (
+            CampaignHeadState.objects.filter(campaign=campaign)
+            .only("turn_index", "hash_tree")
+            .first()
+        )
+        if head is None or not head.hash_tree or head.turn_index != previous_state.turn_index:
+            return StateHashTree.build(new_state.to_dict())
+
+        tree = StateHashTree.from_dict(head.hash_tree)
+        return tree.update(new_state.to_dict(), self.turn_touched_paths(turn))
+
+    def update_head_state(
+        self,
+        campaign: Campaign,
+        state: CampaignState,
+        cost: ReplayCost | None = None,
+        last_snapshot_turn: int | None = None,
+        hash_tree: StateHashTree | None = None,
+    ) -> CampaignHeadState:
+        """
+        Write the materialized head state for a campaign.
+
+        Call inside the transaction that persists the turn (or rewind) so the
+        head can never be ahead of or behind the TurnEvent log.
+
+        Args:
+            campaign: The campaign
+            state: The new current state
+            cost: Replay cost accumulated since the last snapshot
+                (None = nothing to replay)
+            last_snapshot_turn: Turn of the snapshot that cost is measured
+                from (None = the state's own turn)
+            hash_tree: Hash tree of ``state`` (built here if omitted)
+
+        Returns:
+            The CampaignHeadState row
+        """
+        cost = cost or ReplayCost()
+        hash_tree = hash_tree or StateHashTree.build(state.to_dict())
+        head, _ = CampaignHeadState.objects.update_or_create(
+            campaign=campaign,
+            defaults={
+                "turn_index": state.turn_index,
+                "state_json": state.to_dict(),
+                "state_hash": hash_tree.root_hash,
+                "hash_tree": hash_tree.sections().to_dict(),
+                "last_snapshot_turn": (
+                    state.turn_index if last_snapshot_turn is None else last_snapshot_turn
+                ),
+                "turns_since_snapshot": cost.turns,
+                "patch_bytes_since_snapshot": cost.patch_bytes,
+                "merge_ops_since_snapshot": cost.merge_ops,
+            },
+        )
+        return head
+
+    def record_turn(
+        self,
+        campaign: Campaign,
+        state: CampaignState,
+        turn: TurnEvent,
+        hash_tree: StateHashTree | None = None,
+    ) -> CampaignHeadState:
+        """
+        Write through the head state after a turn and snapshot if it is due.
+
+        Adds the turn's replay cost to the head's running total; once the
+        snapshot policy says replaying from the last snapshot has become too
+        expensive, the state is snapshotted and old snapshots are thinned.
+
+        Call inside the transaction that persists the turn.
+
+        Args:
+            campaign: The campaign
+            state: State after the turn (see advance_state)
+            turn: The persisted turn event
+            hash_tree: Hash tree of ``state`` (see hash_turn)
+
+        Returns:
+            The CampaignHeadState row
+        """
+        head = CampaignHeadState.objects.filter(campaign=campaign).first()
+        cost = measure_turn(turn)
+        last_snapshot_turn = 0
+        if head is not None:
+            cost = self.get_replay_cost(head) + cost
+            last_snapshot_turn = head.last_snapshot_turn
+
+        snapshot_due = self.snapshot_policy.should_snapshot(cost)
+        if snapshot_due:
+            self._create_snapshot(campaign, state)
+            cost = ReplayCost()
+            last_snapshot_turn = state.turn_index
+
+        head = self.update_head_state(
+            campaign,
+            state,
+            cost=cost,
+            last_snapshot_turn=last_snapshot_turn,
+            hash_tree=hash_tree,
+        )
+
+        if snapshot_due:
+            self.thin_snapshots(campaign, state.turn_index)
+
+        return head
+
+    def get_replay_cost(self, head: CampaignHeadState) -> ReplayCost:
+        """Replay cost accumulated on a head state since its last snapshot."""
+        return ReplayCost(
+            turns=head.turns_since_snapshot,
+            patch_bytes=head.patch_bytes_since_snapshot,
+            merge_ops=head.merge_ops_since_snapshot,
+        )
+
+    def invalidate_head_state(self, campaign: Campaign) -> None:
+        """Drop the head state; the next read rebuilds it by replay."""
+        CampaignHeadState.objects.filter(campaign=campaign).delete()
+
+    def verify_head_state(self, campaign: Campaign) -> bool:
+        """
+        Verify the head state against a full replay.
+
+        Args:
+            campaign: The campaign
+
+        Returns:
+            True if there is no head state or it matches the replayed state
+        """
+        head = CampaignHeadState.objects.filter(campaign=campaign).first()
+        if head is None:
+            return True
+
+        result = self.replay_to_turn(campaign, turn_index=None)
+        if not result.success or not result.state:
+            return False
+
+        return (
+            head.turn_index == result.turn_index
+            and head.state_hash == result.state.compute_hash()
+        )
+
     def replay_to_turn(
         self,
         campaign: Campaign,
@@ -211,36 +464,43 @@ class StateService:
         snapshot = CanonicalCampaignState.objects.filter(
             campaign=campaign,
             turn_index__lte=turn_index,
-        ).order_by("-turn_index").first()
+        ).select_related("keyframe").order_by("-turn_index").first()
 
         if snapshot:
             # Start from snapshot
-            state = CampaignState.from_dict(snapshot.state_json)
+            state = CampaignState.from_dict(decode_snapshot(snapshot))
             from_snapshot = True
+            snapshot_turn_index = snapshot.turn_index
             start_turn = snapshot.turn_index + 1
         else:
-            # Start from initial state
-            state = self.get_initial_state(campaign)
+            # Start from initial state (copied: replay patches it in place)
+            state = CampaignState.from_dict(
+                copy.deepcopy(self.get_initial_state(campaign).to_dict())
+            )
             from_snapshot = False
+            snapshot_turn_index = 0
             start_turn = 1
 
         # Replay turns from start to target
-        turns = campaign.turns.filter(
-            turn_index__gte=start_turn,
-            turn_index__lte=turn_index,
-        ).order_by("turn_index")
-
-        turns_replayed = 0
-        errors = []
+        turns = list(
+            campaign.turns.filter(
+                turn_index__gte=start_turn,
+                turn_index__lte=turn_index,
+            ).order_by("turn_index")
+        )
 
+        cost = ReplayCost()
         for turn in turns:
-            try:
-                state = self._apply_turn_patch(state, turn)
-                turns_replayed += 1
-            except Exception as e:
-                logger.error(f"Failed to apply turn {turn.turn_index}: {e}")
-                errors.append(f"Turn {turn.turn_index}: {str(e)}")
+            cost = cost + measure_turn(turn)
 
+        # Apply the turns in one batch; a turn that fails is skipped whole
+        replay = self.patch_engine.replay(state.to_dict(), turns)
+        for error in replay.errors:
+            logger.error(f"Failed to apply {error}")
+        turns_replayed = replay.turns_applied
+        errors = replay.errors
+
+        state = CampaignState.from_dict(replay.state)
         state.turn_index = turn_index
 
         return StateReplayResult(
@@ -248,7 +508,9 @@ class StateService:
             state=state,
             turn_index=turn_index,
             from_snapshot=from_snapshot,
+            snapshot_turn_index=snapshot_turn_index,
             turns_replayed=turns_replayed,
+            cost=cost,
             errors=errors,
         )
 
@@ -258,58 +520,18 @@ class StateService:
         turn: TurnEvent,
     ) -> CampaignState:
         """
-        Apply a turn's state patch to the state.
+        Apply a turn's state patch to the state, in place.
 
         Args:
-            state: Current state
+            state: Current state (owned by the caller)
             turn: Turn event with patch
 
         Returns:
             Updated state
         """
-        patch = turn.state_patch_json
-
-        if not patch:
-            return state
-
-        # Apply character state patches
-        if "character" in patch:
-            state.character_state = self._deep_merge(
-                state.character_state,
-                patch["character"],
-            )
-
-        # Apply world state patches
-        if "world" in patch:
-            state.world_state = self._deep_merge(
-                state.world_state,
-                patch["world"],
-            )
-
-        # Apply global flags
-        if "global_flags" in patch:
-            state.global_flags = self._deep_merge(
-                state.global_flags,
-                patch["global_flags"],
-            )
-
-        # Update universe time
-        if turn.universe_time_after_turn:
-            state.universe_time = turn.universe_time_after_turn
-
-        return state
-
-    def _deep_merge(self, base: dict, update: dict) -> dict:
-        """Deep merge update into base."""
-        result = base.copy()
-
-        for key, value in update.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
-
-        return result
+        return CampaignState.from_dict(
+            self.patch_engine.apply_turn(state.to_dict(), turn, in_place=True)
+        )
 
     def save_snapshot(
         self,
@@ -320,42 +542,179 @@ class StateService:
         """
         Save a state snapshot.
 
+        Turns snapshot themselves through record_turn; this is for explicit
+        snapshots (e.g. the initial state at campaign creation).
+
         Args:
             campaign: The campaign
             state: State to save
-            force: If True, save regardless of interval
+            force: If True, save regardless of the snapshot policy
 
         Returns:
             Created snapshot or None if not due for snapshot
         """
-        # Only save at intervals unless forced
-        if not force and state.turn_index % self.SNAPSHOT_INTERVAL != 0:
-            return None
+        if not force:
+            head = CampaignHeadState.objects.filter(campaign=campaign).first()
+            if (
+                head is None
+                or head.turn_index != state.turn_index
+                or not self.snapshot_policy.should_snapshot(self.get_replay_cost(head))
+            ):
+                return None
+
+        snapshot = self._create_snapshot(campaign, state)
+
+        # Replay cost now restarts from this snapshot
+        CampaignHeadState.objects.filter(campaign=campaign, turn_index=state.turn_index).update(
+            last_snapshot_turn=state.turn_index,
+            turns_since_snapshot=0,
+            patch_bytes_since_snapshot=0,
+            merge_ops_since_snapshot=0,
+        )
+        self.thin_snapshots(campaign, state.turn_index)
 
-        # Check if snapshot already exists
-        existing = CanonicalCampaignState.objects.filter(
+        return snapshot
+
+    def _create_snapshot(self, campaign: Campaign, state: CampaignState) -> CanonicalCampaignState:
+        """Write a snapshot row (no policy or duplicate checks)."""
+        keyframe = CanonicalCampaignState.objects.filter(
             campaign=campaign,
-            turn_index=state.turn_index,
-        ).exists()
+            is_keyframe=True,
+            turn_index__lte=state.turn_index,
+        ).order_by("-turn_index").first()
 
-        if existing and not force:
-            return None
+        deltas_since_keyframe = keyframe.deltas.count() if keyframe is not None else 0
+        fields = self._encode_snapshot(state.to_dict(), keyframe, deltas_since_keyframe)
 
-        # Create snapshot
         snapshot = CanonicalCampaignState.objects.create(
             campaign=campaign,
             turn_index=state.turn_index,
-            state_json=state.to_dict(),
+            **fields,
+        )
+        logger.info(
+            f"Saved state {'keyframe' if snapshot.is_keyframe else 'delta'} snapshot "
+            f"for campaign {campaign.id} at turn {state.turn_index}"
         )
-
-        logger.info(f"Saved state snapshot for campaign {campaign.id} at turn {state.turn_index}")
         return snapshot
 
+    def _encode_snapshot(
+        self,
+        state_dict: dict,
+        keyframe: CanonicalCampaignState | None,
+        deltas_since_keyframe: int,
+        keyframe_state: dict | None = None,
+    ) -> dict:
+        """
+        Choose between a keyframe and a delta and encode the snapshot.
+
+        Args:
+            state_dict: Full state to store
+            keyframe: Latest keyframe at or before this turn, if any
+            deltas_since_keyframe: Deltas already stored against it
+            keyframe_state: Decoded keyframe state (decoded here if omitted)
+
+        Returns:
+            Model field values for CanonicalCampaignState
+        """
+        if keyframe is None:
+            return encode_keyframe(state_dict)
+
+        if keyframe_state is None:
+            keyframe_state = decode_keyframe(keyframe)
+        delta = encode_delta(state_dict, keyframe, keyframe_state)
+
+        delta_bytes = len(json.dumps(delta["delta_json"], separators=(",", ":")))
+        full_bytes = len(json.dumps(state_dict, separators=(",", ":")))
+        if self.snapshot_policy.should_store_delta(deltas_since_keyframe, delta_bytes, full_bytes):
+            return delta
+        return encode_keyframe(state_dict)
+
+    def compact_snapshots(self, campaign: Campaign) -> int:
+        """
+        Re-encode a campaign's snapshots as compressed keyframes and deltas.
+
+        Converts rows written before compression (full ``state_json``) and
+        re-chains existing ones. Run inside a transaction.
+
+        Args:
+            campaign: The campaign
+
+        Returns:
+            Number of snapshots rewritten
+        """
+        snapshots = list(
+            CanonicalCampaignState.objects.filter(campaign=campaign)
+            .select_related("keyframe")
+            .order_by("turn_index", "created_at")
+        )
+        # Decode everything first; rewriting a keyframe changes what its deltas mean
+        states = [decode_snapshot(snapshot) for snapshot in snapshots]
+
+        keyframe = None
+        keyframe_state = None
+        deltas_since_keyframe = 0
+        for snapshot, state_dict in zip(snapshots, states, strict=True):
+            fields = self._encode_snapshot(
+                state_dict, keyframe, deltas_since_keyframe, keyframe_state
+            )
+            for name, value in fields.items():
+                setattr(snapshot, name, value)
+            snapshot.save(update_fields=list(fields))
+
+            if snapshot.is_keyframe:
+                keyframe = snapshot
+                keyframe_state = state_dict
+                deltas_since_keyframe = 0
+            else:
+                deltas_since_keyframe += 1
+
+        return len(snapshots)
+
+    def thin_snapshots(self, campaign: Campaign, head_turn: int) -> int:
+        """
+        Delete old snapshots on the policy's logarithmic schedule.
+
+        Args:
+            campaign: The campaign
+            head_turn: Current head turn index
+
+        Returns:
+            Number of snapshots deleted
+        """
+        rows = list(
+            CanonicalCampaignState.objects.filter(campaign=campaign).values_list(
+                "id", "turn_index", "keyframe_id"
+            )
+        )
+        stale_turns = set(
+            self.snapshot_policy.snapshots_to_thin([row[1] for row in rows], head_turn)
+        )
+        if not stale_turns:
+            return 0
+
+        # Keyframes still referenced by a retained delta must stay
+        referenced = {
+            keyframe_id
+            for _, turn_index, keyframe_id in rows
+            if keyframe_id is not None and turn_index not in stale_turns
+        }
+        stale_ids = [
+            snapshot_id
+            for snapshot_id, turn_index, _ in rows
+            if turn_index in stale_turns and snapshot_id not in referenced
+        ]
+        if not stale_ids:
+            return 0
+
+        deleted, _ = CanonicalCampaignState.objects.filter(id__in=stale_ids).delete()
+        logger.debug(f"Thinned {deleted} snapshots for campaign {campaign.id}")
+        return deleted
+
     def verify_state_hash(
         self,
         campaign: Campaign,
         turn_index: int,
-        expected_hash: str,
+        expected_hash: str | None = None,
     ) -> bool:
         """
         Verify state hash matches expected value.
@@ -363,11 +722,15 @@ class StateService:
         Args:
             campaign: The campaign
             turn_index: Turn to verify
-            expected_hash: Expected state hash
+            expected_hash: Expected state hash (None = the hash stored on
+                the turn event; see verify_turn_range)
 
         Returns:
             True if hash matches
         """
+        if expected_hash is None:
+            return self.verify_turn_range(campaign, turn_index, turn_index).valid
+
         result = self.replay_to_turn(campaign, turn_index)
 
         if not result.success or not result.state:
@@ -376,6 +739,81 @@ class StateService:
         actual_hash = result.state.compute_hash()
         return actual_hash == expected_hash
 
+    def verify_turn_range(
+        self,
+        campaign: Campaign,
+        start_turn_index: int,
+        end_turn_index: int | None = None,
+    ) -> HashVerificationResult:
+        """
+        Verify the stored hashes of a range of turns.
+
+        Replays from the nearest snapshot before the range (not from turn 0)
+        and checks each turn's canonical_state_hash, rehashing only the
+        paths each turn touches. Turns persisted before Merkle hashing carry
+        a different hash format; they are replayed but not checked, and
+        counted in turns_skipped.
+
+        Args:
+            campaign: The campaign
+            start_turn_index: First turn to verify (>= 1)
+            end_turn_index: Last turn to verify (None = latest)
+
+        Returns:
+            HashVerificationResult listing any mismatching turns
+        """
+        start_turn_index = max(start_turn_index, 1)
+        if end_turn_index is None:
+            latest_turn = campaign.turns.order_by("-turn_index").first()
+            end_turn_index = latest_turn.turn_index if latest_turn else 0
+
+        result = HashVerificationResult(
+            valid=True,
+            start_turn_index=start_turn_index,
+            end_turn_index=end_turn_index,
+        )
+        if end_turn_index < start_turn_index:
+            return result
+
+        base = self.replay_to_turn(campaign, start_turn_index - 1)
+        if not base.success or not base.state:
+            result.valid = False
+            result.errors.extend(base.errors)
+            return result
+
+        state = base.state
+        tree = StateHashTree.build(state.to_dict())
+        turns = campaign.turns.filter(
+            turn_index__gte=start_turn_index,
+            turn_index__lte=end_turn_index,
+        ).order_by("turn_index")
+
+        for turn in turns:
+            try:
+                state = self._apply_turn_patch(state, turn)
+            except Exception as e:
+                result.valid = False
+                result.errors.append(f"Turn {turn.turn_index}: {str(e)}")
+                return result
+            state.turn_index = turn.turn_index
+            tree = tree.update(state.to_dict(), self.turn_touched_paths(turn))
+            if not turn.merkle_hash:
+                result.turns_skipped += 1
+                continue
+            result.turns_checked += 1
+
+            if tree.root_hash != turn.canonical_state_hash:
+                result.valid = False
+                result.mismatches.append(
+                    {
+                        "turn_index": turn.turn_index,
+                        "expected": turn.canonical_state_hash,
+                        "actual": tree.root_hash,
+                    }
+                )
+
+        return result
+
     def delete_snapshots_after_turn(
         self,
         campaign: Campaign,
@@ -409,10 +847,7 @@ class StateService:
             Dict formatted for API response
         """
         state = self.get_current_state(campaign)
-        snapshot = CanonicalCampaignState.objects.filter(
-            campaign=campaign,
-            turn_index=state.turn_index,
-        ).exists()
+        replay_stats = self.get_replay_stats(campaign)
 
         return {
             "campaign_id": str(campaign.id),
@@ -420,5 +855,38 @@ class StateService:
             "state": state.to_dict(),
             "character_state": state.character_state,
             "universe_time": state.universe_time,
-            "is_snapshot": snapshot,
+            "is_snapshot": state.turn_index in replay_stats["snapshot_turns"],
+            "replay_stats": replay_stats,
+        }
+
+    def get_replay_stats(self, campaign: Campaign) -> dict:
+        """
+        Replay-cost statistics for tuning the snapshot policy.
+
+        Args:
+            campaign: The campaign
+
+        Returns:
+            Dict with the cost accumulated since the last snapshot, the
+            policy's estimate and threshold, and the retained snapshots
+        """
+        head = CampaignHeadState.objects.filter(campaign=campaign).first()
+        cost = self.get_replay_cost(head) if head is not None else ReplayCost()
+        snapshots = sorted(
+            CanonicalCampaignState.objects.filter(campaign=campaign).values_list(
+                "turn_index", "is_keyframe"
+            )
+        )
+        snapshot_turns = [turn_index for turn_index, _ in snapshots]
+        policy = self.snapshot_policy
+
+        return {
+            "last_snapshot_turn": head.last_snapshot_turn if head is not None else None,
+            "since_snapshot": cost.to_dict(),
+            "estimated_cost": round(policy.estimate_cost(cost), 3),
+            "cost_threshold": policy.cost_threshold,
+            "max_turns": policy.max_turns,
+            "snapshot_count": len(snapshot_turns),
+            "snapshot_turns": snapshot_turns,
+            "keyframe_turns": [turn_index for turn_index, is_keyframe in snapshots if is_keyframe],
         }
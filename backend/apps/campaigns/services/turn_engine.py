@@ -7,15 +7,22 @@ Orchestrates the two-stage turn flow:
 3. LLM generates final narration with resolved rolls
 4. Turn is persisted
 
+Turns can also be streamed: DM_TEXT narration is forwarded token by token
+while DM_JSON is buffered and validated once the response is complete.
+
+Every turn records per-phase timings and per-call token usage in
+TurnResult.metrics (see turn_metrics.py).
+
 Tickets: 8.2.1, 8.2.2, 8.2.3, 8.3.2
 
 Based on SYSTEM_DESIGN.md section 8.2 Turn Flow.
 """
 
-import hashlib
 import json
 import logging
 import re
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -23,14 +30,25 @@ from apps.campaigns.models import Campaign, TurnEvent
 from apps.lore.services.chroma_client import ChromaClientService
 from apps.timeline.services import CalendarService, TimeDelta, UniverseTime
 
-from .llm_client import LLMClient, LLMClientConfig, LLMError, Message
-from .prompt_builder import PromptBuilder
+from .campaign_summary import CampaignSummaryService
+from .dice_log import DiceLogService
+from .llm_client import LLMClient, LLMClientConfig, LLMError, LLMResponse, Message
+from .prompt_builder import RECENT_TURN_FIELDS, PromptBuilder
 from .state_service import CampaignState, StateService
+from .turn_metrics import TurnMetrics
 from .validation import LLMOutputValidator, ValidationResult
 
 logger = logging.getLogger(__name__)
 
 
+# Streamed token stages -> the metrics phase/LLM stage they are timed under
+STREAM_STAGE_PHASES = {"proposal": "proposal", "final": "final_narration"}
+
+
+class TurnConflictError(Exception):
+    """The campaign advanced while a turn was being generated against its old state."""
+
+
 class TurnPhase(str, Enum):
     """Phases of turn processing."""
 
@@ -98,6 +116,7 @@ class TurnResult:
     turn_event: TurnEvent | None = None
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    metrics: TurnMetrics = field(default_factory=TurnMetrics)
 
     def to_dict(self) -> dict:
         return {
@@ -108,9 +127,22 @@ class TurnResult:
             "turn_event_id": str(self.turn_event.id) if self.turn_event else None,
             "errors": self.errors,
             "warnings": self.warnings,
+            "metrics": self.metrics.to_dict(),
         }
 
 
+@dataclass
+class TurnStreamEvent:
+    """An event emitted while a turn is being streamed."""
+
+    event: str  # "phase", "token", "rolls" or "result"
+    data: dict = field(default_factory=dict)
+
+    def to_sse(self) -> str:
+        """Format as a server-sent event."""
+        return f"event: {self.event}\ndata: {json.dumps(self.data)}\n\n"
+
+
 class LLMResponseParser:
     """Parses LLM responses into structured data."""
 
@@ -163,6 +195,79 @@ class LLMResponseParser:
         return dm_text, dm_json, errors
 
 
+class DMTextStreamFilter:
+    """
+    Incrementally extracts DM_TEXT narration from a streamed LLM response.
+
+    Deltas are fed in as they arrive. Narration between the ``DM_TEXT:`` and
+    ``DM_JSON:`` markers is released as soon as it cannot be the start of a
+    marker split across two deltas (or whitespace preceding one); everything
+    from ``DM_JSON:`` onwards is withheld so the client never sees raw JSON.
+    """
+
+    TEXT_MARKER = "DM_TEXT:"
+    JSON_MARKER = "DM_JSON:"
+
+    def __init__(self):
+        self._buffer = ""
+        self._state = "preamble"  # preamble -> text -> json
+        self._at_start = True
+
+    def feed(self, delta: str) -> str:
+        """
+        Consume a raw delta.
+
+        Returns:
+            Narration text that is safe to forward (may be empty)
+        """
+        if self._state == "json" or not delta:
+            return ""
+
+        self._buffer += delta
+
+        if self._state == "preamble":
+            marker_pos = self._buffer.find(self.TEXT_MARKER)
+            if marker_pos == -1:
+                if self.JSON_MARKER in self._buffer:
+                    self._state = "json"
+                    self._buffer = ""
+                else:
+                    # Keep only enough to detect a marker split across deltas
+                    self._buffer = self._buffer[-(len(self.TEXT_MARKER) - 1):]
+                return ""
+            self._buffer = self._buffer[marker_pos + len(self.TEXT_MARKER):]
+            self._state = "text"
+
+        marker_pos = self._buffer.find(self.JSON_MARKER)
+        if marker_pos != -1:
+            text = self._buffer[:marker_pos].rstrip()
+            self._buffer = ""
+            self._state = "json"
+        else:
+            safe_len = max(0, len(self._buffer) - (len(self.JSON_MARKER) - 1))
+            # Trailing whitespace is held back too, in case DM_JSON follows it
+            text = self._buffer[:safe_len].rstrip()
+            self._buffer = self._buffer[len(text):]
+
+        return self._release(text)
+
+    def flush(self) -> str:
+        """Release any narration still held back once the stream has ended."""
+        if self._state != "text":
+            return ""
+        text = self._buffer.rstrip()
+        self._buffer = ""
+        return self._release(text)
+
+    def _release(self, text: str) -> str:
+        """Strip the whitespace that follows the DM_TEXT marker."""
+        if self._at_start:
+            text = text.lstrip()
+            if text:
+                self._at_start = False
+        return text
+
+
 class MechanicsExecutor:
     """Executes game mechanics (dice rolls, etc.)."""
 
@@ -361,6 +466,8 @@ class TurnEngine:
         self.parser = LLMResponseParser()
         self.mechanics = MechanicsExecutor(seed=mechanics_seed)
         self.calendar_service = CalendarService()
+        self.dice_log = DiceLogService()
+        self.summary_service = CampaignSummaryService()
 
     def process_turn(self, request: TurnRequest) -> TurnResult:
         """
@@ -373,133 +480,335 @@ class TurnEngine:
             TurnResult with outcome
         """
         result = TurnResult(success=False, phase=TurnPhase.INITIALIZED)
+        metrics = result.metrics
 
         try:
-            # Get current state
-            current_state = self.state_service.get_current_state(request.campaign)
+            with metrics.phase("load_state"):
+                current_state, recent_turns = self._load_context(request)
             character_state = current_state.character_state
 
-            # Get recent turns for context
-            recent_turns = list(
-                request.campaign.turns.order_by("-turn_index")[:10]
-            )
-            recent_turns.reverse()
-
             # Build context
             result.phase = TurnPhase.CONTEXT_BUILT
 
             # Phase 1: Get turn proposal from LLM
             proposal_result = self._get_turn_proposal(
-                request, current_state.to_dict(), recent_turns
+                request, current_state.to_dict(), recent_turns, metrics
             )
-            if not proposal_result["success"]:
-                result.errors.extend(proposal_result.get("errors", []))
-                result.phase = TurnPhase.FAILED
+            if not self._accept_proposal(result, proposal_result):
                 return result
-
-            result.phase = TurnPhase.PROPOSAL_RECEIVED
             dm_text = proposal_result["dm_text"]
             dm_json = proposal_result["dm_json"]
 
             # Phase 2: Execute mechanics
-            roll_requests = dm_json.get("roll_requests", [])
-            roll_results = self.mechanics.execute_rolls(roll_requests, character_state)
-            result.roll_results = roll_results
-            result.phase = TurnPhase.MECHANICS_EXECUTED
+            roll_results = self._execute_mechanics(result, dm_json, character_state)
 
             # Phase 3: Get final narration if there were rolls
             if roll_results:
                 final_result = self._get_final_narration(
-                    request, dm_text, roll_results, current_state.to_dict()
+                    request, dm_text, roll_results, current_state.to_dict(), metrics
                 )
-                if final_result["success"]:
-                    dm_text = final_result["dm_text"]
-                    # Merge any additional patches
-                    final_json = final_result.get("dm_json", {})
-                    dm_json["patches"] = dm_json.get("patches", []) + final_json.get(
-                        "patches", []
-                    )
-
-            result.dm_text = dm_text
-            result.state_patches = dm_json.get("patches", [])
-            result.lore_deltas = dm_json.get("lore_deltas", [])
-            result.phase = TurnPhase.FINAL_RESPONSE
-
-            # Phase 4: Validate output
-            validator = LLMOutputValidator(current_state.to_dict())
-            validation = validator.validate_json_output(dm_json)
+                dm_text = self._merge_final_narration(dm_json, final_result)
 
-            if not validation.valid:
-                # Attempt repair
-                repair_result = self._attempt_repair(
-                    request, dm_text, dm_json, validation, current_state.to_dict()
+            # Phases 4-5: Validate and persist
+            self._finalize_turn(request, result, current_state, dm_text, dm_json, roll_results)
+
+        except LLMError as e:
+            logger.error(f"LLM error during turn: {e}")
+            result.errors.append(f"LLM error: {e.message}")
+            result.phase = TurnPhase.FAILED
+
+        except TurnConflictError as e:
+            logger.warning(f"Turn conflict: {e}")
+            result.errors.append(str(e))
+            result.phase = TurnPhase.FAILED
+
+        except Exception as e:
+            logger.exception(f"Unexpected error during turn: {e}")
+            result.errors.append(f"Unexpected error: {str(e)}")
+            result.phase = TurnPhase.FAILED
+
+        finally:
+            metrics.observe(result.success)
+
+        return result
+
+    def process_turn_stream(self, request: TurnRequest) -> Iterator[TurnStreamEvent]:
+        """
+        Process a complete turn, streaming narration as it is generated.
+
+        Follows the same flow as :meth:`process_turn`, but both LLM calls are
+        streamed. DM_TEXT tokens are forwarded as ``token`` events tagged with
+        the stage that produced them ("proposal" or "final"); DM_JSON is
+        buffered, parsed and validated once each response completes. Repairs
+        are not streamed - the closing ``result`` event always carries the
+        authoritative narration.
+
+        Args:
+            request: TurnRequest with campaign, user input, and LLM config
+
+        Yields:
+            TurnStreamEvent instances, ending with a single ``result`` event
+        """
+        result = TurnResult(success=False, phase=TurnPhase.INITIALIZED)
+        metrics = result.metrics
+
+        try:
+            with metrics.phase("load_state"):
+                current_state, recent_turns = self._load_context(request)
+            character_state = current_state.character_state
+            result.phase = TurnPhase.CONTEXT_BUILT
+            yield TurnStreamEvent("phase", {"phase": result.phase.value})
+
+            # Phase 1: Stream the turn proposal
+            with metrics.phase("build_context"):
+                messages = self._build_proposal_messages(
+                    request, current_state.to_dict(), recent_turns, metrics
                 )
-                if repair_result["success"]:
-                    dm_text = repair_result["dm_text"]
-                    dm_json = repair_result["dm_json"]
-                    result.dm_text = dm_text
-                    result.state_patches = dm_json.get("patches", [])
-                    result.lore_deltas = dm_json.get("lore_deltas", [])
-                else:
-                    result.errors.extend(validation.errors)
-                    result.phase = TurnPhase.FAILED
-                    return result
+            content = yield from self._stream_narration(
+                request, messages, temperature=0.7, stage="proposal", metrics=metrics
+            )
+            proposal_result = self._parse_proposal(content)
+            if not self._accept_proposal(result, proposal_result):
+                metrics.observe(result.success)
+                yield TurnStreamEvent("result", result.to_dict())
+                return
+
+            yield TurnStreamEvent("phase", {"phase": result.phase.value})
+            dm_text = proposal_result["dm_text"]
+            dm_json = proposal_result["dm_json"]
+
+            # Phase 2: Execute mechanics
+            roll_results = self._execute_mechanics(result, dm_json, character_state)
+            if roll_results:
+                yield TurnStreamEvent(
+                    "rolls", {"roll_results": [r.to_dict() for r in roll_results]}
+                )
+
+            # Phase 3: Stream the final narration if there were rolls
+            if roll_results:
+                messages = self._build_final_narration_messages(dm_text, roll_results)
+                content = yield from self._stream_narration(
+                    request, messages, temperature=0.7, stage="final", metrics=metrics
+                )
+                final_result = self._parse_final_narration(content, dm_text)
+                dm_text = self._merge_final_narration(dm_json, final_result)
+
+            # Phases 4-5: Validate and persist
+            self._finalize_turn(request, result, current_state, dm_text, dm_json, roll_results)
+
+        except LLMError as e:
+            logger.error(f"LLM error during streamed turn: {e}")
+            result.errors.append(f"LLM error: {e.message}")
+            result.phase = TurnPhase.FAILED
+
+        except TurnConflictError as e:
+            logger.warning(f"Turn conflict: {e}")
+            result.errors.append(str(e))
+            result.phase = TurnPhase.FAILED
+
+        except Exception as e:
+            logger.exception(f"Unexpected error during streamed turn: {e}")
+            result.errors.append(f"Unexpected error: {str(e)}")
+            result.phase = TurnPhase.FAILED
+
+        metrics.observe(result.success)
+        yield TurnStreamEvent("result", result.to_dict())
+
+    def _load_context(self, request: TurnRequest) -> tuple[CampaignState, list[TurnEvent]]:
+        """Load the current state and recent turn history for a turn."""
+        current_state = self.state_service.get_current_state(request.campaign)
+
+        # Older play reaches the prompt through the story recap, so only the
+        # fields the recent-events section renders are loaded
+        recent_turns = list(
+            request.campaign.turns.only(*RECENT_TURN_FIELDS).order_by("-turn_index")[:10]
+        )
+        recent_turns.reverse()
+
+        return current_state, recent_turns
+
+    def _stream_narration(
+        self,
+        request: TurnRequest,
+        messages: list[Message],
+        temperature: float,
+        stage: str,
+        metrics: TurnMetrics,
+    ) -> Iterator[TurnStreamEvent]:
+        """
+        Stream one LLM call, forwarding DM_TEXT tokens as events.
+
+        Returns (via StopIteration) the full raw response content.
+        """
+        text_filter = DMTextStreamFilter()
+        content_parts: list[str] = []
+        usage: dict = {}
+        phase = STREAM_STAGE_PHASES.get(stage, stage)
+
+        with metrics.phase(phase):
+            start = time.perf_counter()
+            with LLMClient(request.llm_config) as client:
+                for chunk in client.chat_stream(messages, temperature=temperature):
+                    # Providers report usage across several chunks
+                    usage.update(chunk.usage)
+                    if not chunk.content:
+                        continue
+                    content_parts.append(chunk.content)
+                    text = text_filter.feed(chunk.content)
+                    if text:
+                        yield TurnStreamEvent("token", {"stage": stage, "text": text})
+            metrics.record_llm_call(
+                phase, request.llm_config.model, time.perf_counter() - start, usage
+            )
+
+        text = text_filter.flush()
+        if text:
+            yield TurnStreamEvent("token", {"stage": stage, "text": text})
+
+        return "".join(content_parts)
+
+    def _chat(
+        self,
+        request: TurnRequest,
+        messages: list[Message],
+        temperature: float,
+        stage: str,
+        metrics: TurnMetrics,
+    ) -> LLMResponse:
+        """Make one LLM call, timed and token-counted under ``stage``."""
+        with metrics.phase(stage):
+            start = time.perf_counter()
+            with LLMClient(request.llm_config) as client:
+                response = client.chat(messages, temperature=temperature)
+            metrics.record_llm_call(
+                stage, response.model, time.perf_counter() - start, response.usage
+            )
+        return response
+
+    def _finalize_turn(
+        self,
+        request: TurnRequest,
+        result: TurnResult,
+        current_state: CampaignState,
+        dm_text: str,
+        dm_json: dict,
+        roll_results: list[RollResult],
+    ) -> TurnResult:
+        """Validate the final output (repairing if needed) and persist the turn."""
+        # Phase 4: Validate output
+        validator, validation = self._validate_output(result, current_state, dm_text, dm_json)
+
+        if not validation.valid:
+            with result.metrics.phase("repair"):
+                repaired = self._attempt_repair(
+                    request, dm_text, dm_json, validation, validator, result.metrics
+                )
+            if not self._accept_repair(result, validation, repaired):
+                return result
+            dm_text, dm_json = repaired["dm_text"], repaired["dm_json"]
 
-            result.warnings.extend(validation.warnings)
-            result.phase = TurnPhase.VALIDATED
+        self._mark_validated(result, validation)
 
-            # Phase 5: Persist the turn
+        # Phase 5: Persist the turn
+        with result.metrics.phase("persist"):
             turn_event = self._persist_turn(
                 request,
                 current_state,
                 dm_text,
                 dm_json,
                 roll_results,
+                result.metrics,
             )
-            result.turn_event = turn_event
-            result.phase = TurnPhase.PERSISTED
-            result.success = True
+        self._mark_persisted(result, turn_event)
+        return result
 
-        except LLMError as e:
-            logger.error(f"LLM error during turn: {e}")
-            result.errors.append(f"LLM error: {e.message}")
-            result.phase = TurnPhase.FAILED
+    # Steps shared with AsyncTurnEngine, which only awaits the I/O between them
 
-        except Exception as e:
-            logger.exception(f"Unexpected error during turn: {e}")
-            result.errors.append(f"Unexpected error: {str(e)}")
+    def _accept_proposal(self, result: TurnResult, proposal_result: dict) -> bool:
+        """Record a parsed proposal on the result; False (turn failed) if it did not parse."""
+        if not proposal_result["success"]:
+            result.errors.extend(proposal_result.get("errors", []))
             result.phase = TurnPhase.FAILED
+            return False
+        result.phase = TurnPhase.PROPOSAL_RECEIVED
+        return True
 
-        return result
+    def _execute_mechanics(
+        self, result: TurnResult, dm_json: dict, character_state: dict
+    ) -> list[RollResult]:
+        """Execute the proposal's roll requests (phase 2)."""
+        with result.metrics.phase("mechanics"):
+            roll_requests = dm_json.get("roll_requests", [])
+            roll_results = self.mechanics.execute_rolls(roll_requests, character_state)
+        result.roll_results = roll_results
+        result.phase = TurnPhase.MECHANICS_EXECUTED
+        return roll_results
 
-    def _get_turn_proposal(
+    def _validate_output(
+        self,
+        result: TurnResult,
+        current_state: CampaignState,
+        dm_text: str,
+        dm_json: dict,
+    ) -> tuple[LLMOutputValidator, ValidationResult]:
+        """Record the final output on the result and validate it against the state."""
+        self._record_output(result, dm_text, dm_json)
+        result.phase = TurnPhase.FINAL_RESPONSE
+        with result.metrics.phase("validation"):
+            validator = LLMOutputValidator(current_state.to_dict())
+            validation = validator.validate_json_output(dm_json)
+        return validator, validation
+
+    def _accept_repair(
+        self, result: TurnResult, validation: ValidationResult, repaired: dict | None
+    ) -> bool:
+        """Record a repaired output; False (turn failed) if no repair succeeded."""
+        if not repaired:
+            result.errors.extend(validation.errors)
+            result.phase = TurnPhase.FAILED
+            return False
+        self._record_output(result, repaired["dm_text"], repaired["dm_json"])
+        return True
+
+    @staticmethod
+    def _record_output(result: TurnResult, dm_text: str, dm_json: dict) -> None:
+        result.dm_text = dm_text
+        result.state_patches = dm_json.get("patches", [])
+        result.lore_deltas = dm_json.get("lore_deltas", [])
+
+    @staticmethod
+    def _mark_validated(result: TurnResult, validation: ValidationResult) -> None:
+        result.warnings.extend(validation.warnings)
+        result.phase = TurnPhase.VALIDATED
+
+    @staticmethod
+    def _mark_persisted(result: TurnResult, turn_event: TurnEvent) -> None:
+        result.turn_event = turn_event
+        result.phase = TurnPhase.PERSISTED
+        result.success = True
+
+    def _build_proposal_messages(
         self,
         request: TurnRequest,
         current_state: dict,
         recent_turns: list[TurnEvent],
-    ) -> dict:
-        """Get the initial turn proposal from LLM."""
-        # Build messages
-        system_prompt = self.prompt_builder.build_system_prompt()
+        metrics: TurnMetrics | None = None,
+    ) -> list[Message]:
+        """Build the message list for the turn proposal call."""
         context = self.prompt_builder.build_full_context(
             campaign=request.campaign,
             current_state=current_state,
             user_input=request.user_input,
             recent_turns=recent_turns,
+            metrics=metrics,
+            model=request.llm_config.model,
         )
 
-        messages = [
-            Message(role="system", content=system_prompt),
-            Message(role="assistant", content=f"[Context]\n{context}"),
-            Message(role="user", content=request.user_input),
-        ]
+        return self.prompt_builder.build_proposal_messages(context, request.user_input)
 
-        # Call LLM
-        with LLMClient(request.llm_config) as client:
-            response = client.chat(messages, temperature=0.7)
-
-        # Parse response
-        dm_text, dm_json, errors = self.parser.parse(response.content)
+    def _parse_proposal(self, content: str) -> dict:
+        """Parse a turn proposal response."""
+        dm_text, dm_json, errors = self.parser.parse(content)
 
         if errors:
             return {"success": False, "errors": errors}
@@ -510,14 +819,30 @@ class TurnEngine:
             "dm_json": dm_json,
         }
 
-    def _get_final_narration(
+    def _get_turn_proposal(
         self,
         request: TurnRequest,
-        proposal_text: str,
-        roll_results: list[RollResult],
         current_state: dict,
+        recent_turns: list[TurnEvent],
+        metrics: TurnMetrics,
     ) -> dict:
-        """Get final narration after mechanics are resolved."""
+        """Get the initial turn proposal from LLM."""
+        with metrics.phase("build_context"):
+            messages = self._build_proposal_messages(
+                request, current_state, recent_turns, metrics
+            )
+
+        # Call LLM
+        response = self._chat(request, messages, 0.7, "proposal", metrics)
+
+        return self._parse_proposal(response.content)
+
+    def _build_final_narration_messages(
+        self,
+        proposal_text: str,
+        roll_results: list[RollResult],
+    ) -> list[Message]:
+        """Build the message list for the final narration call."""
         # Format roll results for LLM
         roll_summary = "\n".join(
             f"- {r.roll_id}: Rolled {r.roll_value} + {r.modifier} = {r.total}"
@@ -527,8 +852,8 @@ class TurnEngine:
 
         system_prompt = self.prompt_builder.build_system_prompt()
 
-        messages = [
-            Message(role="system", content=system_prompt),
+        return [
+            Message(role="system", content=system_prompt, cache=True),
             Message(
                 role="assistant",
                 content=f"[Previous proposal]\n{proposal_text}\n\n[Roll Results]\n{roll_summary}",
@@ -540,10 +865,9 @@ class TurnEngine:
             ),
         ]
 
-        with LLMClient(request.llm_config) as client:
-            response = client.chat(messages, temperature=0.7)
-
-        dm_text, dm_json, errors = self.parser.parse(response.content)
+    def _parse_final_narration(self, content: str, proposal_text: str) -> dict:
+        """Parse a final narration response, falling back to the proposal text."""
+        dm_text, dm_json, errors = self.parser.parse(content)
 
         if errors:
             # Fall back to proposal text if parsing fails
@@ -551,55 +875,101 @@ class TurnEngine:
 
         return {"success": True, "dm_text": dm_text, "dm_json": dm_json}
 
+    def _get_final_narration(
+        self,
+        request: TurnRequest,
+        proposal_text: str,
+        roll_results: list[RollResult],
+        current_state: dict,
+        metrics: TurnMetrics,
+    ) -> dict:
+        """Get final narration after mechanics are resolved."""
+        messages = self._build_final_narration_messages(proposal_text, roll_results)
+
+        response = self._chat(request, messages, 0.7, "final_narration", metrics)
+
+        return self._parse_final_narration(response.content, proposal_text)
+
+    def _merge_final_narration(self, dm_json: dict, final_result: dict) -> str:
+        """Merge final narration patches into the proposal JSON; return the narration."""
+        final_json = final_result.get("dm_json", {})
+        dm_json["patches"] = dm_json.get("patches", []) + final_json.get("patches", [])
+        return final_result["dm_text"]
+
     def _attempt_repair(
         self,
         request: TurnRequest,
         dm_text: str,
         dm_json: dict,
         validation: ValidationResult,
-        current_state: dict,
-    ) -> dict:
-        """Attempt to repair invalid LLM output."""
-        for attempt in range(self.MAX_REPAIR_ATTEMPTS):
-            logger.info(f"Repair attempt {attempt + 1}/{self.MAX_REPAIR_ATTEMPTS}")
+        validator: LLMOutputValidator,
+        metrics: TurnMetrics,
+    ) -> dict | None:
+        """
+        Attempt to repair invalid LLM output, re-checking with the turn's validator.
 
-            # Build repair prompt
-            error_summary = "\n".join(f"- {e}" for e in validation.errors)
-            original_response = f"DM_TEXT:\n{dm_text}\n\nDM_JSON:\n{json.dumps(dm_json, indent=2)}"
-            repair_prompt = self.prompt_builder.build_repair_prompt(
-                error_summary, original_response
-            )
+        Returns:
+            The repaired output (see _check_repaired_output), or None
+        """
+        for messages in self._repair_requests(dm_text, dm_json, validation):
+            try:
+                response = self._chat(request, messages, 0.5, "repair", metrics)
+            except LLMError as e:
+                logger.warning(f"Repair attempt failed: {e}")
+                continue
 
-            messages = [
-                Message(role="system", content=self.prompt_builder.build_system_prompt()),
-                Message(role="user", content=repair_prompt),
-            ]
+            repaired = self._check_repaired_output(response.content, validator)
+            if repaired:
+                return repaired
 
-            try:
-                with LLMClient(request.llm_config) as client:
-                    response = client.chat(messages, temperature=0.5)
+        return None
 
-                new_dm_text, new_dm_json, errors = self.parser.parse(response.content)
+    def _repair_requests(
+        self, dm_text: str, dm_json: dict, validation: ValidationResult
+    ) -> Iterator[list[Message]]:
+        """Messages for each repair attempt, up to MAX_REPAIR_ATTEMPTS."""
+        for attempt in range(self.MAX_REPAIR_ATTEMPTS):
+            logger.info(f"Repair attempt {attempt + 1}/{self.MAX_REPAIR_ATTEMPTS}")
+            yield self._build_repair_messages(dm_text, dm_json, validation)
 
-                if errors:
-                    continue
+    def _build_repair_messages(
+        self,
+        dm_text: str,
+        dm_json: dict,
+        validation: ValidationResult,
+    ) -> list[Message]:
+        """Build the message list for a repair call."""
+        error_summary = "\n".join(f"- {e}" for e in validation.errors)
+        original_response = f"DM_TEXT:\n{dm_text}\n\nDM_JSON:\n{json.dumps(dm_json, indent=2)}"
+        repair_prompt = self.prompt_builder.build_repair_prompt(
+            error_summary, original_response
+        )
 
-                # Validate repaired output
-                validator = LLMOutputValidator(current_state)
-                new_validation = validator.validate_json_output(new_dm_json)
+        return [
+            Message(
+                role="system", content=self.prompt_builder.build_system_prompt(), cache=True
+            ),
+            Message(role="user", content=repair_prompt),
+        ]
 
-                if new_validation.valid:
-                    return {
-                        "success": True,
-                        "dm_text": new_dm_text,
-                        "dm_json": new_dm_json,
-                    }
+    def _check_repaired_output(self, content: str, validator: LLMOutputValidator) -> dict | None:
+        """Parse and validate a repair response; None if it is still invalid."""
+        new_dm_text, new_dm_json, errors = self.parser.parse(content)
 
-            except LLMError as e:
-                logger.warning(f"Repair attempt failed: {e}")
-                continue
+        if errors:
+            return None
+
+        # Validate repaired output
+        new_validation = validator.validate_json_output(new_dm_json)
 
-        return {"success": False}
+        if not new_validation.valid:
+            return None
+
+        return {
+            "success": True,
+            "dm_text": new_dm_text,
+            "dm_json": new_dm_json,
+        }
 
     def _persist_turn(
         self,
@@ -608,13 +978,18 @@ class TurnEngine:
         dm_text: str,
         dm_json: dict,
         roll_results: list[RollResult],
+        metrics: TurnMetrics | None = None,
     ) -> TurnEvent:
-        """Persist the turn to the database."""
-        from django.db import transaction
+        """
+        Persist the turn to the database.
 
-        # Calculate new turn index
-        last_turn = request.campaign.turns.order_by("-turn_index").first()
-        turn_index = (last_turn.turn_index + 1) if last_turn else 0
+        The turn's metrics are stored as recorded so far; persistence itself
+        is only exported to Prometheus, since it is still running here.
+
+        Raises:
+            TurnConflictError: If another turn was persisted since current_state
+        """
+        from django.db import transaction
 
         # Apply time advancement if present
         new_time = current_state.to_dict().get("universe_time", {})
@@ -624,12 +999,22 @@ class TurnEngine:
                 current_time = UniverseTime.from_dict(new_time)
                 new_time = self.calendar_service.advance_time(current_time, delta).to_dict()
 
-        # Compute state hash
-        state_hash = self._compute_state_hash(current_state.to_dict(), dm_json)
-
         with transaction.atomic():
-            # Create turn event
-            turn_event = TurnEvent.objects.create(
+            # Lock the campaign so concurrent turns cannot claim the same index,
+            # and refuse a turn generated against a state that is no longer
+            # the latest (turn 0 is the initial state)
+            Campaign.objects.select_for_update().only("id").get(pk=request.campaign.pk)
+            last_turn = request.campaign.turns.order_by("-turn_index").first()
+            last_index = last_turn.turn_index if last_turn else 0
+            if last_index != current_state.turn_index:
+                raise TurnConflictError(
+                    f"Campaign advanced to turn {last_index} while this turn was "
+                    f"generated from turn {current_state.turn_index}; resubmit it"
+                )
+            turn_index = last_index + 1
+
+            # Create turn event, hashed as the state it produces
+            turn_event = TurnEvent(
                 campaign=request.campaign,
                 turn_index=turn_index,
                 user_input_text=request.user_input,
@@ -637,19 +1022,33 @@ class TurnEngine:
                 roll_spec_json={"roll_requests": dm_json.get("roll_requests", [])},
                 roll_results_json={"results": [r.to_dict() for r in roll_results]},
                 state_patch_json={"patches": dm_json.get("patches", [])},
-                canonical_state_hash=state_hash,
                 lore_deltas_json=dm_json.get("lore_deltas", []),
                 universe_time_after_turn=new_time,
+                metrics_json=metrics.to_dict() if metrics else {},
+            )
+            new_state = self.state_service.advance_state(current_state, turn_event)
+            hash_tree = self.state_service.hash_turn(
+                request.campaign, current_state, new_state, turn_event
             )
+            turn_event.canonical_state_hash = hash_tree.root_hash
+            turn_event.save()
 
-            # Update universe time
+            # Denormalize the rolls into the dice log and its running stats
+            self.dice_log.record_turn(turn_event)
+
+            # Summarize the chapter in the background if this turn completes one
+            self.summary_service.schedule_update(request.campaign.id, turn_index)
+
+            # Update universe time. Time passing in play is not an edit to the
+            # universe, so updated_at (and its cached prompt) is left alone.
             universe = request.campaign.universe
             universe.current_universe_time = new_time
-            universe.save(update_fields=["current_universe_time", "updated_at"])
+            universe.save(update_fields=["current_universe_time"])
 
-            # Maybe save state snapshot
-            new_state = self._apply_patches(current_state, dm_json.get("patches", []))
-            self.state_service.save_snapshot(request.campaign, new_state)
+            # Write through the head state; snapshots when replay cost warrants
+            self.state_service.record_turn(
+                request.campaign, new_state, turn_event, hash_tree=hash_tree
+            )
 
             # Queue lore deltas for embedding (would use Celery in production)
             self._queue_lore_deltas(
@@ -660,26 +1059,6 @@ class TurnEngine:
 
         return turn_event
 
-    def _compute_state_hash(self, state: dict, patches: dict) -> str:
-        """Compute a hash of the state for integrity verification."""
-        combined = json.dumps(
-            {"state": state, "patches": patches}, sort_keys=True
-        )
-        return hashlib.sha256(combined.encode()).hexdigest()
-
-    def _apply_patches(
-        self, state: CampaignState, patches: list[dict]
-    ) -> CampaignState:
-        """Apply patches to create new state (simplified)."""
-        # In production, this would properly apply JSON patches
-        # For now, return the state with updated turn index
-        return CampaignState(
-            campaign_id=state.campaign_id,
-            turn_index=state.turn_index + 1,
-            character_state=state.character_state,
-            world_state=state.world_state,
-        )
-
     def _queue_lore_deltas(
         self,
         universe_id: str,
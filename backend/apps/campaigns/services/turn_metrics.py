@@ -0,0 +1,212 @@
+"""
+Turn Metrics.
+
+Per-turn latency and token accounting for TurnEngine:
+- Each phase (state load, lore retrieval, LLM calls, validation, repair,
+  persistence) is timed with a monotonic clock. Phases nest exclusively:
+  time spent in an inner phase is not counted again in the outer one, so
+  the phases of a sequential turn add up to its wall time
+- Every LLM call records its stage, model, latency and token usage,
+  including input tokens served from the provider's prompt cache
+- The proposal context records the tokens it was packed into
+
+The record is stored on TurnEvent.metrics_json and exported through the
+Prometheus registry in whispyrkeep.metrics.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from whispyrkeep.metrics import registry
+
+TURNS = registry.counter("whispyrkeep_turns_total", "Turns processed, by outcome.", ("outcome",))
+TURN_DURATION = registry.histogram(
+    "whispyrkeep_turn_duration_seconds", "Wall time of a whole turn.", ("outcome",)
+)
+PHASE_DURATION = registry.histogram(
+    "whispyrkeep_turn_phase_duration_seconds", "Time spent in each turn phase.", ("phase",)
+)
+LLM_CALLS = registry.counter(
+    "whispyrkeep_llm_calls_total", "LLM calls made by turns, by stage.", ("stage",)
+)
+LLM_CALL_DURATION = registry.histogram(
+    "whispyrkeep_llm_call_duration_seconds", "Latency of LLM calls, by stage.", ("stage",)
+)
+LLM_TOKENS = registry.counter(
+    "whispyrkeep_llm_tokens_total",
+    "Tokens used by turn LLM calls, by stage and direction.",
+    ("stage", "direction"),
+)
+CONTEXT_TOKENS = registry.histogram(
+    "whispyrkeep_context_tokens",
+    "Tokens of packed context sent with a turn's proposal.",
+    buckets=(500, 1000, 2000, 4000, 6000, 8000, 12000, 16000, 32000, 64000),
+)
+
+
+def usage_tokens(usage: dict | None) -> tuple[int, int]:
+    """
+    Input and output token counts from a provider usage dict.
+
+    Handles OpenAI-style (prompt_tokens/completion_tokens) and
+    Anthropic-style (input_tokens/output_tokens) usage. Anthropic reports
+    cache reads and writes apart from input_tokens; they are added back so
+    input always covers the whole prompt.
+    """
+    if not isinstance(usage, dict):
+        return 0, 0
+    if "prompt_tokens" in usage:
+        input_tokens = usage["prompt_tokens"] or 0
+    else:
+        input_tokens = (
+            (usage.get("input_tokens") or 0)
+            + (usage.get("cache_read_input_tokens") or 0)
+            + (usage.get("cache_creation_input_tokens") or 0)
+        )
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+    return int(input_tokens), int(output_tokens)
+
+
+def cached_input_tokens(usage: dict | None) -> int:
+    """
+    Input tokens served from the provider's prompt cache.
+
+    OpenAI reports them under prompt_tokens_details.cached_tokens,
+    Anthropic as cache_read_input_tokens.
+    """
+    if not isinstance(usage, dict):
+        return 0
+    if "cache_read_input_tokens" in usage:
+        return int(usage["cache_read_input_tokens"] or 0)
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, dict):
+        return int(details.get("cached_tokens") or 0)
+    return 0
+
+
+@dataclass
+class LLMCallRecord:
+    """One LLM call made during a turn."""
+
+    stage: str
+    model: str
+    duration_ms: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "model": self.model,
+            "duration_ms": round(self.duration_ms, 3),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+        }
+
+
+@dataclass
+class TurnMetrics:
+    """
+    Timings and token counts for one turn.
+
+    Usage:
+        metrics = TurnMetrics()
+        with metrics.phase("load_state"):
+            ...
+        metrics.record_llm_call("proposal", response.model, seconds, response.usage)
+        metrics.observe(success=True)
+    """
+
+    phases_ms: dict[str, float] = field(default_factory=dict)
+    llm_calls: list[LLMCallRecord] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    total_ms: float | None = None
+    # Tokens of the packed proposal context (see PromptBuilder.assemble_context)
+    context_tokens: int = 0
+    # Inner-phase time accumulated for each open phase
+    _open: list[float] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase, excluding time spent in phases nested inside it."""
+        start = time.perf_counter()
+        self._open.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = self._open.pop()
+            self.add_phase(name, elapsed - inner)
+            if self._open:
+                self._open[-1] += elapsed
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """Add time to a phase measured elsewhere (e.g. a concurrent task)."""
+        self.phases_ms[name] = self.phases_ms.get(name, 0.0) + seconds * 1000
+
+    def record_llm_call(
+        self, stage: str, model: str, seconds: float, usage: dict | None = None
+    ) -> None:
+        """Record an LLM call's latency and token usage."""
+        input_tokens, output_tokens = usage_tokens(usage)
+        self.llm_calls.append(
+            LLMCallRecord(
+                stage=stage,
+                model=model or "",
+                duration_ms=seconds * 1000,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cached_input_tokens=cached_input_tokens(usage),
+            )
+        )
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(call.input_tokens for call in self.llm_calls)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(call.output_tokens for call in self.llm_calls)
+
+    @property
+    def cached_input_tokens(self) -> int:
+        return sum(call.cached_input_tokens for call in self.llm_calls)
+
+    def elapsed_ms(self) -> float:
+        """Wall time so far (or the final total once observed)."""
+        if self.total_ms is not None:
+            return self.total_ms
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round(self.elapsed_ms(), 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases_ms.items()},
+            "llm_calls": [call.to_dict() for call in self.llm_calls],
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "context_tokens": self.context_tokens,
+        }
+
+    def observe(self, success: bool) -> None:
+        """Finish the turn and export its metrics to the Prometheus registry."""
+        self.total_ms = self.elapsed_ms()
+        outcome = "success" if success else "failed"
+
+        TURNS.inc(outcome=outcome)
+        TURN_DURATION.observe(self.total_ms / 1000, outcome=outcome)
+        if self.context_tokens:
+            CONTEXT_TOKENS.observe(self.context_tokens)
+        for name, ms in self.phases_ms.items():
+            PHASE_DURATION.observe(ms / 1000, phase=name)
+        for call in self.llm_calls:
+            LLM_CALLS.inc(stage=call.stage)
+            LLM_CALL_DURATION.observe(call.duration_ms / 1000, stage=call.stage)
+            LLM_TOKENS.inc(call.input_tokens, stage=call.stage, direction="input")
+            LLM_TOKENS.inc(call.output_tokens, stage=call.stage, direction="output")
+            LLM_TOKENS.inc(call.cached_input_tokens, stage=call.stage, direction="cached_input")
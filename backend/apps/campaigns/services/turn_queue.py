@@ -0,0 +1,241 @@
+"""
+Turn Queue Service.
+
+Runs player turns on the turn_queue Celery worker instead of in the web
+request, so a multi-call LLM round trip never holds a web worker.
+
+Ordering per campaign:
+- Each TurnJob gets the next per-campaign sequence number at submission,
+  allocated under a row lock on the campaign
+- A job is claimed (pending -> processing) under the same lock, and only
+  when no earlier job for the campaign is still pending or processing
+- When a job finishes, the next pending job for the campaign is dispatched
+
+A job whose worker died mid-turn is failed once it has been processing for
+longer than CAMPAIGN_TURN_JOB_TIMEOUT, and the campaign's next pending job is
+dispatched, so it cannot block its campaign forever. Expiry runs when a later
+job is claimed and periodically from sweep_stale_turn_jobs_task, for
+campaigns with no new submissions.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.campaigns.models import Campaign, TurnJob
+from apps.llm_config.models import LlmEndpointConfig
+
+from .llm_client import LLMClientConfig
+from .turn_engine import TurnEngine, TurnPhase, TurnRequest, TurnResult
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (TurnJob.STATUS_PENDING, TurnJob.STATUS_PROCESSING)
+
+
+class TurnQueueService:
+    """
+    Enqueues turns and processes them in per-campaign order.
+
+    Usage:
+        service = TurnQueueService()
+        job = service.enqueue(campaign, "I open the door", llm_config)
+        # on the worker (apps.campaigns.tasks.process_turn_job):
+        job = service.claim(job_id)
+        if job:
+            service.run(job)
+    """
+
+    def __init__(self, engine: TurnEngine | None = None):
+        """Initialize the service."""
+        self.engine = engine or TurnEngine()
+
+    @staticmethod
+    def _lock_campaign(campaign_id) -> None:
+        """Take the campaign row lock that serializes its turn jobs."""
+        Campaign.objects.select_for_update().only("id").get(pk=campaign_id)
+
+    def enqueue(
+        self, campaign: Campaign, user_input: str, llm_config: LlmEndpointConfig
+    ) -> TurnJob:
+        """
+        Create a turn job and dispatch it once the transaction commits.
+
+        Args:
+            campaign: Campaign to play the turn in
+            user_input: The player's action
+            llm_config: Endpoint the worker calls
+
+        Returns:
+            The pending TurnJob
+        """
+        with transaction.atomic():
+            self._lock_campaign(campaign.id)
+            last_sequence = TurnJob.objects.filter(campaign=campaign).aggregate(
+                last=Max("sequence")
+            )["last"]
+            job = TurnJob.objects.create(
+                campaign=campaign,
+                sequence=(last_sequence or 0) + 1,
+                user_input=user_input,
+                llm_config=llm_config,
+            )
+            transaction.on_commit(lambda: self.dispatch(job))
+
+        return job
+
+    def dispatch(self, job: TurnJob) -> None:
+        """Send a job to the turn_queue worker."""
+        from apps.campaigns.tasks import process_turn_job
+
+        process_turn_job.delay(str(job.id))
+
+    def claim(self, job_id: str) -> TurnJob | None:
+        """
+        Mark a job as processing if it is next in line for its campaign.
+
+        Args:
+            job_id: UUID of the job
+
+        Returns:
+            The claimed job, or None if it is missing, already claimed, or
+            waiting on an earlier job (which dispatches it when done)
+        """
+        campaign_id = (
+            TurnJob.objects.filter(id=job_id).values_list("campaign_id", flat=True).first()
+        )
+        if campaign_id is None:
+            return None
+
+        with transaction.atomic():
+            self._lock_campaign(campaign_id)
+            self._expire_stale_jobs(campaign_id)
+
+            job = TurnJob.objects.get(id=job_id)
+            if job.status != TurnJob.STATUS_PENDING:
+                return None
+
+            blocked = TurnJob.objects.filter(
+                campaign_id=campaign_id,
+                sequence__lt=job.sequence,
+                status__in=ACTIVE_STATUSES,
+            ).exists()
+            if blocked:
+                return None
+
+            job.status = TurnJob.STATUS_PROCESSING
+            job.started_at = timezone.now()
+            job.save(update_fields=["status", "started_at"])
+
+        return job
+
+    def run(self, job: TurnJob) -> TurnResult:
+        """
+        Process a claimed job and record its result.
+
+        Args:
+            job: Job returned by claim
+
+        Returns:
+            TurnResult of the turn
+        """
+        result = TurnResult(success=False, phase=TurnPhase.FAILED)
+        try:
+            campaign = Campaign.objects.select_related("universe").get(pk=job.campaign_id)
+            if campaign.status != "active":
+                result.errors.append(f"Cannot submit turns to a {campaign.status} campaign")
+            elif job.llm_config is None or not job.llm_config.is_active:
+                result.errors.append("No LLM endpoint configured")
+            else:
+                request = TurnRequest(
+                    campaign=campaign,
+                    user_input=job.user_input,
+                    llm_config=LLMClientConfig.from_endpoint_config(job.llm_config),
+                )
+                result = self.engine.process_turn(request)
+        except Exception as e:
+            logger.exception(f"Turn job {job.id} crashed: {e}")
+            result.errors.append(f"Unexpected error: {str(e)}")
+        finally:
+            self.complete(job, result)
+
+        return result
+
+    def complete(self, job: TurnJob, result: TurnResult) -> None:
+        """Store a job's result and dispatch the campaign's next pending job."""
+        with transaction.atomic():
+            self._lock_campaign(job.campaign_id)
+
+            job.status = TurnJob.STATUS_COMPLETED if result.success else TurnJob.STATUS_FAILED
+            job.result_json = result.to_dict()
+            job.turn_event = result.turn_event
+            job.error_message = "\n".join(result.errors)
+            job.completed_at = timezone.now()
+            job.save(
+                update_fields=[
+                    "status",
+                    "result_json",
+                    "turn_event",
+                    "error_message",
+                    "completed_at",
+                ]
+            )
+
+            self._dispatch_next(job.campaign_id)
+
+    def sweep_stale_jobs(self) -> int:
+        """
+        Expire stale jobs in every campaign and dispatch what they blocked.
+
+        Returns:
+            Number of campaigns with expired jobs
+        """
+        campaign_ids = set(
+            TurnJob.objects.filter(
+                status=TurnJob.STATUS_PROCESSING, started_at__lt=self._stale_cutoff()
+            ).values_list("campaign_id", flat=True)
+        )
+        swept = 0
+        for campaign_id in campaign_ids:
+            with transaction.atomic():
+                self._lock_campaign(campaign_id)
+                if self._expire_stale_jobs(campaign_id):
+                    swept += 1
+        return swept
+
+    def _dispatch_next(self, campaign_id) -> None:
+        next_job = (
+            TurnJob.objects.filter(campaign_id=campaign_id, status=TurnJob.STATUS_PENDING)
+            .order_by("sequence")
+            .first()
+        )
+        if next_job:
+            transaction.on_commit(lambda: self.dispatch(next_job))
+
+    @staticmethod
+    def _stale_cutoff():
+        return timezone.now() - timedelta(seconds=settings.CAMPAIGN_TURN_JOB_TIMEOUT)
+
+    def _expire_stale_jobs(self, campaign_id) -> int:
+        """
+        Fail jobs whose worker stopped reporting and dispatch the next pending job.
+
+        The caller holds the campaign lock. Returns the number of jobs expired.
+        """
+        expired = TurnJob.objects.filter(
+            campaign_id=campaign_id,
+            status=TurnJob.STATUS_PROCESSING,
+            started_at__lt=self._stale_cutoff(),
+        ).update(
+            status=TurnJob.STATUS_FAILED,
+            error_message="Turn job timed out",
+            completed_at=timezone.now(),
+        )
+        if expired:
+            logger.warning(f"Expired {expired} stale turn job(s) for campaign {campaign_id}")
+            self._dispatch_next(campaign_id)
+        return expired
@@ -12,6 +12,7 @@ Based on SYSTEM_DESIGN.md sections 6.2, 7.2, 7.4.
 """
 
 import re
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -95,6 +96,31 @@ VALID_PATCH_PATHS = [
     r"^/world/global_flags/[^/]+$",
 ]
 
+# All of VALID_PATCH_PATHS as one regex; the named group that matched
+# (p<index>) identifies the path template
+_PATCH_PATH_REGEX = re.compile(
+    "|".join(
+        f"(?P<p{index}>{pattern.removeprefix('^').removesuffix('$')})"
+        for index, pattern in enumerate(VALID_PATCH_PATHS)
+    )
+)
+
+
+def match_patch_path(path: str) -> str | None:
+    """
+    Match a patch path against VALID_PATCH_PATHS in a single regex pass.
+
+    Args:
+        path: JSON pointer from a patch
+
+    Returns:
+        The matching pattern from VALID_PATCH_PATHS, or None if disallowed
+    """
+    match = _PATCH_PATH_REGEX.fullmatch(path)
+    if match is None:
+        return None
+    return VALID_PATCH_PATHS[int(match.lastgroup[1:])]
+
 
 @dataclass
 class ValidationResult:
@@ -295,6 +321,46 @@ class RollValidator:
         return result
 
 
+def _check_hp(value: Any, result: ValidationResult) -> None:
+    if not isinstance(value, int) or value < 0:
+        result.add_error(f"HP value must be non-negative integer: {value}")
+
+
+def _check_conditions(value: Any, result: ValidationResult) -> None:
+    if not isinstance(value, list):
+        result.add_error("Conditions must be a list")
+    elif not all(isinstance(c, str) for c in value):
+        result.add_error("Each condition must be a string")
+
+
+def _check_npc_status(value: Any, result: ValidationResult) -> None:
+    valid_statuses = {"alive", "dead", "unconscious", "missing", "unknown"}
+    if value not in valid_statuses:
+        result.add_warning(f"Unusual NPC status: {value}")
+
+
+def _check_npc_attitude(value: Any, result: ValidationResult) -> None:
+    valid_attitudes = {
+        "hostile",
+        "unfriendly",
+        "neutral",
+        "friendly",
+        "helpful",
+    }
+    if value not in valid_attitudes:
+        result.add_warning(f"Unusual NPC attitude: {value}")
+
+
+# Value checks keyed by the VALID_PATCH_PATHS pattern a patch path matched
+VALUE_CHECKS: dict[str, Callable[[Any, ValidationResult], None]] = {
+    r"^/party/player/hp/current$": _check_hp,
+    r"^/party/player/hp/temp$": _check_hp,
+    r"^/party/player/conditions$": _check_conditions,
+    r"^/world/npcs/[^/]+/status$": _check_npc_status,
+    r"^/world/npcs/[^/]+/attitude$": _check_npc_attitude,
+}
+
+
 class PatchValidator:
     """Validates state patch operations."""
 
@@ -397,58 +463,26 @@ class PatchValidator:
             result.add_error(f"Patch path must start with '/': {path}")
 
         # Validate path against allowed patterns
-        path_valid = False
-        for pattern in VALID_PATCH_PATHS:
-            if re.match(pattern, path):
-                path_valid = True
-                break
-
-        if not path_valid:
+        template = match_patch_path(path)
+        if template is None:
             result.add_error(f"Invalid or disallowed patch path: {path}")
 
         # Validate value for non-remove operations
         if op != PatchOperation.REMOVE:
             if "value" not in patch:
                 result.add_error(f"Patch operation '{op.value}' requires 'value' field")
-            else:
-                result.merge(self._validate_value(path, patch["value"]))
+            elif template is not None:
+                result.merge(self._validate_value(template, patch["value"]))
 
         return result
 
-    def _validate_value(self, path: str, value: Any) -> ValidationResult:
-        """Validate a patch value based on the path."""
+    def _validate_value(self, template: str, value: Any) -> ValidationResult:
+        """Validate a patch value based on the matched path template."""
         result = ValidationResult(valid=True)
 
-        # HP validation
-        if ("/hp/current" in path or "/hp/temp" in path) and (
-            not isinstance(value, int) or value < 0
-        ):
-            result.add_error(f"HP value must be non-negative integer: {value}")
-
-        # Conditions validation
-        if path.endswith("/conditions"):
-            if not isinstance(value, list):
-                result.add_error("Conditions must be a list")
-            elif not all(isinstance(c, str) for c in value):
-                result.add_error("Each condition must be a string")
-
-        # Status validation
-        if path.endswith("/status"):
-            valid_statuses = {"alive", "dead", "unconscious", "missing", "unknown"}
-            if value not in valid_statuses:
-                result.add_warning(f"Unusual NPC status: {value}")
-
-        # Attitude validation
-        if path.endswith("/attitude"):
-            valid_attitudes = {
-                "hostile",
-                "unfriendly",
-                "neutral",
-                "friendly",
-                "helpful",
-            }
-            if value not in valid_attitudes:
-                result.add_warning(f"Unusual NPC attitude: {value}")
+        check = VALUE_CHECKS.get(template)
+        if check:
+            check(value, result)
 
         return result
 
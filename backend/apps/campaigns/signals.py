@@ -0,0 +1,46 @@
+"""
+Campaign app signal handlers.
+
+Drop cached prompt renderings (see services.prompt_cache) when the
+universe, campaign or character sheet they were rendered from is saved
+or deleted.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.prompt_cache import (
+    campaign_setup_key,
+    invalidate_prompts,
+    universe_prompt_key,
+)
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+# Universe fields the cached universe prompt does not render
+UNRENDERED_UNIVERSE_FIELDS = frozenset({"current_universe_time", "canonical_lore_version"})
+
+
+@receiver([post_save, post_delete], sender=Universe)
+def invalidate_universe_prompt(sender, instance, update_fields=None, **kwargs):
+    """Drop the universe prompt when a rendered universe field changes."""
+    # Turns save the advancing universe time on every turn
+    if update_fields and update_fields <= UNRENDERED_UNIVERSE_FIELDS:
+        return
+    invalidate_prompts([universe_prompt_key(instance.pk)])
+
+
+@receiver([post_save, post_delete], sender=Campaign)
+def invalidate_campaign_setup(sender, instance, **kwargs):
+    """Drop the campaign setup prompt when the campaign changes."""
+    invalidate_prompts([campaign_setup_key(instance.pk)])
+
+
+@receiver(post_save, sender=CharacterSheet)
+def invalidate_character_campaign_setups(sender, instance, created, **kwargs):
+    """Drop the setup prompts of the campaigns an edited character plays in."""
+    if created:
+        return
+    campaign_ids = instance.campaigns.values_list("id", flat=True)
+    invalidate_prompts([campaign_setup_key(campaign_id) for campaign_id in campaign_ids])
@@ -0,0 +1,107 @@
+"""
+Celery tasks for campaign turns.
+
+- process_turn_job(job_id)
+- sweep_stale_turn_jobs_task(), run periodically by celery beat
+- Use turn_queue
+"""
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from apps.campaigns.services.turn_queue import TurnQueueService
+
+logger = logging.getLogger(__name__)
+
+# A turn's soft time limit raises inside TurnQueueService.run, which then
+# records the failure and dispatches the next job; the hard limit kills the
+# worker process. Both stay below CAMPAIGN_TURN_JOB_TIMEOUT so a job is
+# finished by its own worker before it can be expired as stale.
+TURN_JOB_SOFT_TIME_LIMIT = int(settings.CAMPAIGN_TURN_JOB_TIMEOUT * 0.8)
+TURN_JOB_TIME_LIMIT = int(settings.CAMPAIGN_TURN_JOB_TIMEOUT * 0.9)
+
+
+@shared_task(
+    bind=True,
+    queue="turn_queue",
+    acks_late=True,
+    soft_time_limit=TURN_JOB_SOFT_TIME_LIMIT,
+    time_limit=TURN_JOB_TIME_LIMIT,
+)
+def process_turn_job(self, job_id: str) -> dict:
+    """
+    Process a queued turn if it is next in line for its campaign.
+
+    A job that is waiting on an earlier turn is left pending; the earlier
+    job dispatches it again when it finishes.
+
+    Args:
+        job_id: UUID of the TurnJob
+
+    Returns:
+        Dict with status and result info
+    """
+    service = TurnQueueService()
+    job = service.claim(job_id)
+    if job is None:
+        logger.info(f"Turn job {job_id} not claimed (waiting, done, or missing)")
+        return {"success": False, "job_id": str(job_id), "status": "not_claimed"}
+
+    result = service.run(job)
+    return {
+        "success": result.success,
+        "job_id": str(job_id),
+        "status": job.status,
+        "turn_event_id": str(result.turn_event.id) if result.turn_event else None,
+    }
+
+
+@shared_task(queue="turn_queue")
+def sweep_stale_turn_jobs_task() -> dict:
+    """
+    Expire turn jobs whose worker died and dispatch the jobs they blocked.
+
+    Stale jobs are otherwise only expired when a later job for the same
+    campaign is claimed, which never happens if the player stops submitting.
+
+    Returns:
+        Dict with the number of campaigns swept
+    """
+    swept = TurnQueueService().sweep_stale_jobs()
+    return {"success": True, "campaigns_swept": swept}
+
+
+@shared_task(queue="summary_queue")
+def update_campaign_summary_task(campaign_id: str) -> dict:
+    """
+    Write a campaign's missing story summaries.
+
+    Dispatched when a turn completes a chapter, and after rewinds. Uses the
+    campaign owner's active LLM endpoint, or extractive summaries without one.
+
+    Args:
+        campaign_id: UUID of the Campaign
+
+    Returns:
+        Dict with the number of summaries written
+    """
+    from apps.campaigns.models import Campaign
+    from apps.campaigns.services.campaign_summary import (
+        CampaignSummaryService,
+        NarrativeSummarizer,
+    )
+    from apps.campaigns.services.llm_client import LLMClientConfig
+    from apps.llm_config.models import LlmEndpointConfig
+
+    campaign = Campaign.objects.filter(id=campaign_id).first()
+    if campaign is None:
+        logger.info(f"Campaign {campaign_id} gone before its summary update")
+        return {"success": False, "campaign_id": campaign_id, "written": 0}
+
+    endpoint = LlmEndpointConfig.objects.filter(user=campaign.user, is_active=True).first()
+    llm_config = LLMClientConfig.from_endpoint_config(endpoint) if endpoint else None
+
+    written = CampaignSummaryService(NarrativeSummarizer(llm_config)).update(campaign)
+    return {"success": True, "campaign_id": campaign_id, "written": written}
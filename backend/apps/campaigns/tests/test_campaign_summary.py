@@ -0,0 +1,300 @@
+"""
+Tests for the campaign story summaries.
+
+Tests the chapter/arc/saga hierarchy, the fixed-size recap, rewind and
+stale-write handling, the summarizer fallbacks, and the prompt wiring.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.campaigns.models import Campaign, CampaignSummary, TurnEvent
+from apps.campaigns.services.campaign_summary import (
+    CampaignSummaryService,
+    NarrativeSummarizer,
+    clip_text,
+)
+from apps.campaigns.services.llm_client import LLMClientConfig, LLMError, LLMProvider
+from apps.campaigns.services.prompt_builder import PromptBuilder
+from apps.campaigns.services.rewind_service import RewindService
+from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+from apps.campaigns.tasks import update_campaign_summary_task
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+LLM_CONFIG = LLMClientConfig(provider=LLMProvider.OPENAI, api_key="x", model="m")
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="saga@example.com",
+        password="testpass123",
+        username="saga",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Saga Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Chronicler",
+        species="Elf",
+        character_class="Bard",
+        background="Sage",
+        level=1,
+        ability_scores_json={"str": 8, "dex": 14, "con": 12, "int": 12, "wis": 10, "cha": 16},
+    )
+    return Campaign.objects.create(
+        user=user, universe=universe, character_sheet=character, title="Saga Campaign"
+    )
+
+
+def play(campaign, first, last):
+    for turn_index in range(first, last + 1):
+        TurnEvent.objects.create(
+            campaign=campaign,
+            turn_index=turn_index,
+            user_input_text=f"Action {turn_index}",
+            llm_response_text=f"Narration {turn_index}. " + "More happens. " * 20,
+            canonical_state_hash="0" * 64,
+        )
+
+
+@pytest.fixture
+def service():
+    """Summary service with a small hierarchy: 2 turns/chapter, 2 chapters/arc."""
+    service = CampaignSummaryService()
+    service.CHAPTER_TURNS = 2
+    service.ARC_CHAPTERS = 2
+    service.RECAP_ARCS = 1
+    return service
+
+
+def levels(campaign) -> list[tuple[str, int, int, int]]:
+    return list(
+        CampaignSummary.objects.filter(campaign=campaign)
+        .order_by("start_turn", "level")
+        .values_list("level", "index", "start_turn", "end_turn")
+    )
+
+
+@pytest.mark.django_db
+class TestCampaignSummaryService:
+    """Tests for CampaignSummaryService."""
+
+    def test_update_builds_hierarchy(self, campaign, service):
+        """Test chapters, arcs and the saga are written for completed spans."""
+        play(campaign, 1, 13)
+
+        written = service.update(campaign)
+
+        # 6 chapters, 3 arcs, and the saga folding all but the latest arc
+        assert written == 10
+        chapters = [row for row in levels(campaign) if row[0] == "chapter"]
+        assert chapters[0] == ("chapter", 1, 1, 2)
+        assert chapters[-1] == ("chapter", 6, 11, 12)
+        arcs = [row for row in levels(campaign) if row[0] == "arc"]
+        assert arcs == [("arc", 1, 1, 4), ("arc", 2, 5, 8), ("arc", 3, 9, 12)]
+        assert ("saga", 0, 1, 8) in levels(campaign)
+
+        # Nothing new to summarize until turn 14 completes chapter 7
+        assert service.update(campaign) == 0
+        play(campaign, 14, 14)
+        assert service.update(campaign) == 1
+
+    def test_saga_folds_in_new_arcs(self, campaign, service):
+        """Test the saga is re-summarized from its old text plus newly old arcs."""
+        play(campaign, 1, 12)
+        service.update(campaign)
+        play(campaign, 13, 16)
+
+        service.summarizer = MagicMock(wraps=service.summarizer)
+        service.update(campaign)
+
+        saga = CampaignSummary.objects.get(campaign=campaign, level="saga")
+        assert (saga.start_turn, saga.end_turn) == (1, 12)
+        saga_passages = service.summarizer.summarize.call_args_list[-1].args[0]
+        assert saga_passages[0].startswith("Earlier: ")
+        assert saga_passages[1].startswith("Arc 3: ")
+
+    def test_recap_is_bounded(self, campaign):
+        """Test the recap stops growing as the campaign does."""
+        service = CampaignSummaryService()
+        play(campaign, 1, 200)
+        service.update(campaign)
+        short = service.build_recap(campaign)
+
+        play(campaign, 201, 600)
+        service.update(campaign)
+        long = service.build_recap(campaign)
+
+        bound = (
+            service.SAGA_CHARS
+            + service.RECAP_ARCS * service.ARC_CHARS
+            + service.ARC_CHAPTERS * service.CHAPTER_CHARS
+            + 200
+        )
+        assert short.startswith("Earlier: ")
+        assert len(long) <= bound
+        assert "Arc 12 (turns 551-600)" in long
+        assert not any(line.startswith("Chapter") for line in long.splitlines())
+
+    def test_recap_sections(self, campaign, service):
+        """Test the recap lists the saga, latest arcs and later chapters in order."""
+        assert service.build_recap(campaign) == ""
+
+        play(campaign, 1, 14)
+        service.update(campaign)
+        lines = service.build_recap(campaign).splitlines()
+
+        assert lines[0].startswith("Earlier: ")
+        assert lines[1].startswith("Arc 3 (turns 9-12): ")
+        assert lines[2].startswith("Chapter 7 (turns 13-14): ")
+        assert len(lines) == 3
+
+    def test_rewind_discards_later_summaries(
+        self, campaign, service, django_capture_on_commit_callbacks
+    ):
+        """Test a rewind drops summaries past the target and schedules a rebuild."""
+        play(campaign, 1, 12)
+        service.update(campaign)
+        rewind = RewindService()
+        rewind.lore_service = MagicMock()
+        rewind.lore_service.invalidate_turns_lore.return_value = 0
+
+        with (
+            patch.object(update_campaign_summary_task, "delay") as delay,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            result = rewind.rewind_to_turn(campaign, 5)
+
+        assert result.success
+        assert all(end_turn <= 5 for *_, end_turn in levels(campaign))
+        assert ("arc", 1, 1, 4) in levels(campaign)
+        assert not CampaignSummary.objects.filter(campaign=campaign, level="saga").exists()
+        delay.assert_called_once_with(str(campaign.id))
+
+    def test_stale_summary_is_dropped(self, campaign, service):
+        """Test a summary whose turns were rewound while it was written is not stored."""
+        play(campaign, 1, 2)
+
+        def rewind_meanwhile(passages, max_chars):
+            TurnEvent.objects.filter(campaign=campaign, turn_index=2).delete()
+            return "A chapter that never was."
+
+        service.summarizer = MagicMock()
+        service.summarizer.summarize.side_effect = rewind_meanwhile
+
+        assert service.update(campaign) == 0
+        assert not CampaignSummary.objects.filter(campaign=campaign).exists()
+
+    def test_schedule_update_on_chapter_boundary(
+        self, campaign, service, django_capture_on_commit_callbacks
+    ):
+        """Test the background update is dispatched only when a chapter completes."""
+        with patch.object(update_campaign_summary_task, "delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                service.schedule_update(campaign.id, 3)
+            delay.assert_not_called()
+
+            with django_capture_on_commit_callbacks(execute=True):
+                service.schedule_update(campaign.id, 4)
+            delay.assert_called_once_with(str(campaign.id))
+
+    def test_persist_turn_schedules_update(self, campaign, django_capture_on_commit_callbacks):
+        """Test the turn engine schedules a summary when a turn completes a chapter."""
+        engine = TurnEngine()
+        engine.summary_service.CHAPTER_TURNS = 1
+        request = TurnRequest(campaign=campaign, user_input="I look around.", llm_config=LLM_CONFIG)
+        state = engine.state_service.get_initial_state(campaign)
+
+        with (
+            patch.object(update_campaign_summary_task, "delay") as delay,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            engine._persist_turn(request, state, "You see a hall.", {}, [])
+
+        delay.assert_called_once_with(str(campaign.id))
+
+    def test_task_summarizes_without_llm_endpoint(self, campaign):
+        """Test the task falls back to extractive summaries with no active endpoint."""
+        play(campaign, 1, 10)
+
+        result = update_campaign_summary_task(str(campaign.id))
+
+        assert result == {"success": True, "campaign_id": str(campaign.id), "written": 1}
+        chapter = CampaignSummary.objects.get(campaign=campaign)
+        assert chapter.summary_text.startswith("Turn 1. Player: Action 1")
+
+
+class TestNarrativeSummarizer:
+    """Tests for NarrativeSummarizer."""
+
+    def test_clip_text(self):
+        """Test clipping prefers a sentence end and collapses whitespace."""
+        assert clip_text("a  b\nc", 10) == "a b c"
+        assert clip_text("First sentence here. Second sentence.", 30) == "First sentence here."
+        assert clip_text("x" * 50, 10) == "xxxxxxx..."
+
+    def test_extractive_keeps_each_passage(self):
+        """Test the extractive summary shares the budget across passages."""
+        summary = NarrativeSummarizer().summarize(["A" * 300, "B" * 300], 200)
+
+        assert len(summary) <= 200
+        assert "A" in summary and "B" in summary
+        assert NarrativeSummarizer().summarize([], 200) == ""
+
+    def test_llm_summary(self):
+        """Test the LLM writes the summary when configured."""
+        client = MagicMock()
+        client.chat.return_value.content = "The party  found the map."
+        with patch("apps.campaigns.services.campaign_summary.LLMClient") as llm_client:
+            llm_client.return_value.__enter__.return_value = client
+            summary = NarrativeSummarizer(LLM_CONFIG).summarize(["Turn 1..."], 300)
+
+        assert summary == "The party found the map."
+        messages = client.chat.call_args.args[0]
+        assert "at most 300 characters" in messages[0].content
+
+    def test_llm_failure_falls_back(self):
+        """Test an LLM error falls back to the extractive summary."""
+        with patch("apps.campaigns.services.campaign_summary.LLMClient") as llm_client:
+            llm_client.return_value.__enter__.return_value.chat.side_effect = LLMError("down")
+            summary = NarrativeSummarizer(LLM_CONFIG).summarize(["The door opened."], 300)
+
+        assert summary == "The door opened."
+
+
+@pytest.mark.django_db
+class TestStoryRecapPrompt:
+    """Tests for the recap in the turn context."""
+
+    def test_context_includes_recap(self, campaign, service):
+        """Test the context carries the story so far before recent events."""
+        play(campaign, 1, 4)
+        service.update(campaign)
+        builder = PromptBuilder(chroma_service=MagicMock(), summary_service=service)
+
+        context = builder.build_full_context(
+            campaign, {}, "I rest.", recent_turns=list(campaign.turns.all())
+        )
+
+        assert "## Story So Far\nArc 1 (turns 1-4): " in context.volatile
+        assert context.volatile.index("Story So Far") < context.volatile.index("Recent Events")
+
+    def test_no_recap_section_for_new_campaign(self, campaign):
+        """Test a campaign without summaries gets no recap section."""
+        context = PromptBuilder(chroma_service=MagicMock()).build_full_context(
+            campaign, {}, "I rest."
+        )
+
+        assert "Story So Far" not in context.volatile
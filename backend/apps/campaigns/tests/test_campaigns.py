@@ -4,14 +4,22 @@ Tests for campaign models and API.
 Tests Campaign, TurnEvent, and CanonicalCampaignState.
 """
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.models import Campaign, CampaignHeadState, CanonicalCampaignState, TurnEvent
 from apps.campaigns.services.state_service import CampaignState, StateService
+from apps.campaigns.services.turn_engine import TurnPhase, TurnResult, TurnStreamEvent
 from apps.characters.models import CharacterSheet
+from apps.llm_config.encryption import encrypt_api_key
+from apps.llm_config.models import LlmEndpointConfig
 from apps.universes.models import Universe
 
 User = get_user_model()
@@ -356,6 +364,8 @@ class TestCampaignStateAPI:
         assert response.status_code == status.HTTP_200_OK
         assert "state" in response.data
         assert "character_state" in response.data
+        assert response.data["is_snapshot"] is True
+        assert response.data["replay_stats"]["snapshot_turns"] == [0]
 
     def test_get_state_not_found(self, authenticated_client):
         """Test 404 for nonexistent campaign state."""
@@ -365,6 +375,289 @@ class TestCampaignStateAPI:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.django_db
+class TestTurnAPI:
+    """Tests for turn submission API."""
+
+    @pytest.fixture
+    def llm_config(self, user):
+        return LlmEndpointConfig.objects.create(
+            user=user,
+            provider_name="openai",
+            api_key_encrypted=encrypt_api_key("sk-test"),
+            default_model="gpt-4o-mini",
+        )
+
+    def test_submit_turn(self, authenticated_client, campaign, llm_config):
+        """Test a blocking turn submission returns the turn result."""
+        result = TurnResult(success=True, phase=TurnPhase.PERSISTED, dm_text="You enter.")
+
+        with patch("apps.campaigns.views.TurnEngine.process_turn", return_value=result) as mock:
+            response = authenticated_client.post(
+                f"/api/campaigns/{campaign.id}/turn/",
+                {"user_input": "I enter the cave"},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["dm_text"] == "You enter."
+        assert mock.call_args.args[0].user_input == "I enter the cave"
+
+    def test_submit_turn_failure(self, authenticated_client, campaign, llm_config):
+        """Test a failed turn returns 502 with errors."""
+        result = TurnResult(success=False, phase=TurnPhase.FAILED, errors=["LLM error: boom"])
+
+        with patch("apps.campaigns.views.TurnEngine.process_turn", return_value=result):
+            response = authenticated_client.post(
+                f"/api/campaigns/{campaign.id}/turn/",
+                {"user_input": "I enter the cave"},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_502_BAD_GATEWAY
+        assert response.data["errors"] == ["LLM error: boom"]
+
+    def test_submit_turn_stream(self, authenticated_client, campaign, llm_config):
+        """Test a streamed turn returns server-sent events."""
+        events = [
+            TurnStreamEvent("token", {"stage": "proposal", "text": "You "}),
+            TurnStreamEvent("token", {"stage": "proposal", "text": "enter."}),
+            TurnStreamEvent("result", {"success": True}),
+        ]
+
+        with patch(
+            "apps.campaigns.views.TurnEngine.process_turn_stream", return_value=iter(events)
+        ):
+            response = authenticated_client.post(
+                f"/api/campaigns/{campaign.id}/turn/",
+                {"user_input": "I enter the cave", "stream": True},
+                format="json",
+            )
+            body = b"".join(response.streaming_content).decode()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        assert body.count("event: token") == 2
+        assert body.endswith('event: result\ndata: {"success": true}\n\n')
+
+    def test_submit_turn_without_llm_config(self, authenticated_client, campaign):
+        """Test turn submission requires an active LLM endpoint."""
+        response = authenticated_client.post(
+            f"/api/campaigns/{campaign.id}/turn/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_submit_turn_inactive_campaign(self, authenticated_client, campaign, llm_config):
+        """Test turns cannot be submitted to an ended campaign."""
+        campaign.status = "ended"
+        campaign.save()
+
+        response = authenticated_client.post(
+            f"/api/campaigns/{campaign.id}/turn/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_submit_turn_not_found(self, authenticated_client):
+        """Test 404 for nonexistent campaign."""
+        import uuid
+
+        response = authenticated_client.post(
+            f"/api/campaigns/{uuid.uuid4()}/turn/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestAsyncTurnAPI:
+    """Tests for the async turn submission endpoint."""
+
+    @pytest.fixture
+    def llm_config(self, user):
+        return LlmEndpointConfig.objects.create(
+            user=user,
+            provider_name="openai",
+            api_key_encrypted=encrypt_api_key("sk-test"),
+            default_model="gpt-4o-mini",
+        )
+
+    @pytest.fixture
+    def jwt_client(self, user):
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_submit_turn(self, jwt_client, campaign, llm_config):
+        """Test the async endpoint runs the AsyncTurnEngine."""
+        result = TurnResult(success=True, phase=TurnPhase.PERSISTED, dm_text="You enter.")
+
+        with patch(
+            "apps.campaigns.views.AsyncTurnEngine.process_turn",
+            AsyncMock(return_value=result),
+        ) as mock:
+            response = jwt_client.post(
+                f"/api/campaigns/{campaign.id}/turn/async/",
+                {"user_input": "I enter the cave"},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["dm_text"] == "You enter."
+        assert mock.await_args.args[0].campaign.id == campaign.id
+
+    def test_submit_turn_unauthenticated(self, api_client, campaign):
+        """Test a JWT is required."""
+        response = api_client.post(
+            f"/api/campaigns/{campaign.id}/turn/async/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_submit_turn_invalid_token(self, api_client, campaign):
+        """Test an invalid JWT is rejected."""
+        api_client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = api_client.post(
+            f"/api/campaigns/{campaign.id}/turn/async/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_submit_turn_not_found(self, jwt_client, llm_config):
+        """Test 404 for nonexistent campaign."""
+        import uuid
+
+        response = jwt_client.post(
+            f"/api/campaigns/{uuid.uuid4()}/turn/async/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_submit_turn_without_llm_config(self, jwt_client, campaign):
+        """Test turn submission requires an active LLM endpoint."""
+        response = jwt_client.post(
+            f"/api/campaigns/{campaign.id}/turn/async/",
+            {"user_input": "I enter the cave"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestTurnListAPI:
+    """Tests for the keyset-paginated turn history API."""
+
+    @pytest.fixture(autouse=True)
+    def locmem_cache(self, settings):
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+
+    @pytest.fixture
+    def turns(self, campaign):
+        return TurnEvent.objects.bulk_create(
+            [
+                TurnEvent(
+                    campaign=campaign,
+                    turn_index=i,
+                    user_input_text=f"Action {i}",
+                    llm_response_text=f"Narration {i}",
+                    canonical_state_hash="0" * 64,
+                )
+                for i in range(1, 8)
+            ]
+        )
+
+    def get(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return response.data
+
+    def test_pages_follow_cursor(self, authenticated_client, campaign, turns):
+        """Test walking next links returns every turn once, in order."""
+        data = self.get(authenticated_client, f"/api/campaigns/{campaign.id}/turns/", limit=3)
+        assert data["count"] == 7
+        assert data["previous"] is None
+        seen = [t["turn_index"] for t in data["results"]]
+        while data["next"]:
+            data = self.get(authenticated_client, data["next"])
+            seen += [t["turn_index"] for t in data["results"]]
+
+        assert seen == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_newest_first(self, authenticated_client, campaign, turns):
+        """Test order=desc pages from the latest turn back."""
+        url = f"/api/campaigns/{campaign.id}/turns/"
+        data = self.get(authenticated_client, url, limit=3, order="desc")
+        assert [t["turn_index"] for t in data["results"]] == [7, 6, 5]
+
+        data = self.get(authenticated_client, data["next"])
+        assert [t["turn_index"] for t in data["results"]] == [4, 3, 2]
+
+    def test_since_fetches_delta(self, authenticated_client, campaign, turns):
+        """Test since returns only turns after the given index."""
+        data = self.get(authenticated_client, f"/api/campaigns/{campaign.id}/turns/", since=5)
+        assert [t["turn_index"] for t in data["results"]] == [6, 7]
+        assert data["next"] is None
+
+    def test_view_modes(self, authenticated_client, campaign, turns):
+        """Test each view returns its serializer's fields."""
+        url = f"/api/campaigns/{campaign.id}/turns/"
+        compact = self.get(authenticated_client, url, view="compact")["results"][0]
+        summary = self.get(authenticated_client, url)["results"][0]
+        full = self.get(authenticated_client, url, view="full")["results"][0]
+
+        assert "llm_response_text" not in compact
+        assert summary["llm_response_text"] == "Narration 1"
+        assert "state_patch_json" not in summary
+        assert full["state_patch_json"] == {}
+
+        response = authenticated_client.get(url, {"view": "everything"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_compact_view_skips_narration_columns(self, authenticated_client, campaign, turns):
+        """Test the compact view does not load the narration or JSON columns."""
+        with CaptureQueriesContext(connection) as queries:
+            self.get(authenticated_client, f"/api/campaigns/{campaign.id}/turns/", view="compact")
+
+        turn_selects = [q["sql"] for q in queries if 'FROM "campaigns_turnevent"' in q["sql"]]
+        assert turn_selects
+        for sql in turn_selects:
+            assert "llm_response_text" not in sql
+            assert "state_patch_json" not in sql
+
+    def test_count_is_optional_and_tracks_rewinds(self, authenticated_client, campaign, turns):
+        """Test the cached count can be skipped and follows truncation."""
+        url = f"/api/campaigns/{campaign.id}/turns/"
+        assert "count" not in self.get(authenticated_client, url, count="false")
+        assert self.get(authenticated_client, url)["count"] == 7
+
+        TurnEvent.objects.filter(campaign=campaign, turn_index__gt=4).delete()
+
+        assert self.get(authenticated_client, url)["count"] == 4
+
+    def test_invalid_since(self, authenticated_client, campaign):
+        """Test a non-numeric since is rejected."""
+        response = authenticated_client.get(
+            f"/api/campaigns/{campaign.id}/turns/", {"since": "latest"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_other_users_campaign(self, api_client, other_user, campaign):
+        """Test another user's campaign is not found."""
+        api_client.force_authenticate(user=other_user)
+        response = api_client.get(f"/api/campaigns/{campaign.id}/turns/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.django_db
 class TestStateService:
     """Tests for StateService."""
@@ -425,3 +718,80 @@ class TestStateService:
 
         assert hash1 == hash2
         assert len(hash1) == 64  # SHA256 hex
+
+
+
+@pytest.mark.django_db
+class TestHeadState:
+    """Tests for the materialized campaign head state."""
+
+    @pytest.fixture
+    def state_service(self):
+        return StateService()
+
+    def _create_turn(self, campaign, turn_index, patch):
+        return TurnEvent.objects.create(
+            campaign=campaign,
+            turn_index=turn_index,
+            user_input_text=f"Action {turn_index}",
+            llm_response_text=f"Response {turn_index}",
+            state_patch_json=patch,
+            canonical_state_hash="0" * 64,
+            universe_time_after_turn={"year": 1000, "month": 1, "day": turn_index},
+        )
+
+    def test_current_state_backfills_head(self, state_service, campaign):
+        """Test the first read replays and materializes the head state."""
+        self._create_turn(campaign, 1, {"global_flags": {"met_king": True}})
+
+        state = state_service.get_current_state(campaign)
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.turn_index == 1
+        assert head.state_json["global_flags"] == {"met_king": True}
+        assert head.state_hash == state.compute_hash()
+
+    def test_current_state_reads_head_without_replay(self, state_service, campaign):
+        """Test reads come from the head state and never replay."""
+        state_service.update_head_state(campaign, state_service.get_initial_state(campaign))
+
+        with patch.object(StateService, "replay_to_turn") as replay:
+            state = state_service.get_current_state(campaign)
+
+        replay.assert_not_called()
+        assert state.turn_index == 0
+
+    def test_advance_state_does_not_mutate_input(self, state_service, campaign):
+        """Test advancing state leaves the previous state untouched."""
+        initial = state_service.get_initial_state(campaign)
+        turn = self._create_turn(campaign, 1, {"character": {"hp": {"current": 1}}})
+
+        new_state = state_service.advance_state(initial, turn)
+
+        assert new_state.turn_index == 1
+        assert new_state.character_state["hp"]["current"] == 1
+        assert initial.character_state["hp"]["current"] != 1
+
+    def test_verify_head_state(self, state_service, campaign):
+        """Test head verification against a full replay."""
+        self._create_turn(campaign, 1, {"global_flags": {"door_open": True}})
+        state_service.get_current_state(campaign)
+        assert state_service.verify_head_state(campaign) is True
+
+        CampaignHeadState.objects.filter(campaign=campaign).update(state_hash="tampered")
+        assert state_service.verify_head_state(campaign) is False
+
+    def test_persist_turn_writes_head(self, campaign):
+        """Test persisting a turn writes the head state in the same transaction."""
+        from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+
+        engine = TurnEngine(chroma_service=MagicMock())
+        current_state = engine.state_service.get_current_state(campaign)
+        request = TurnRequest(campaign=campaign, user_input="I wait", llm_config=MagicMock())
+
+        turn = engine._persist_turn(request, current_state, "Time passes.", {"patches": []}, [])
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert turn.turn_index == 1
+        assert head.turn_index == 1
+        assert engine.state_service.verify_head_state(campaign) is True
@@ -0,0 +1,211 @@
+"""
+Tests for token counting and context packing.
+
+Tests model family lookup, token counting/truncation, priority packing
+within a budget, and the budgeted, cache-friendly turn context.
+"""
+
+import math
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.campaigns.services.context_packer import (
+    PRIORITY_HARD_CANON,
+    PRIORITY_RECAP,
+    PRIORITY_SOFT_LORE,
+    PRIORITY_STATE,
+    ContextPacker,
+    ContextSection,
+)
+from apps.campaigns.services.prompt_builder import LoreInjection, PromptBuilder, TurnContext
+from apps.campaigns.services.turn_metrics import TurnMetrics
+from whispyrkeep.tokenizer import (
+    DEFAULT_FAMILY,
+    TokenCounter,
+    get_token_counter,
+    model_family,
+)
+
+WORDS = "The lantern flickers as the caravan winds through the pass. "
+
+
+@pytest.fixture
+def counter():
+    """Token counter for the default model family."""
+    return get_token_counter("gpt-4")
+
+
+class TestTokenizer:
+    """Tests for model families and TokenCounter."""
+
+    def test_model_family(self):
+        """Test models map to their family by prefix, ignoring provider prefixes."""
+        assert model_family("gpt-4o-mini").encoding == "o200k_base"
+        assert model_family("gpt-4-turbo").context_window == 128_000
+        assert model_family("gpt-4-0613").context_window == 8_192
+        assert model_family("openai/gpt-4o").name == "gpt-4o"
+        assert model_family("claude-sonnet-4-5").token_ratio > 1
+        assert model_family("llama-3-70b") is DEFAULT_FAMILY
+
+    def test_counter_cached_per_family(self):
+        """Test models of one family share a counter."""
+        assert get_token_counter("gpt-4o") is get_token_counter("gpt-4o-mini")
+        assert get_token_counter("gpt-4o") is not get_token_counter("gpt-4")
+
+    def test_count_and_truncate(self, counter):
+        """Test counts grow with text and truncation stays within the limit."""
+        text = WORDS * 20
+        tokens = counter.count(text)
+
+        assert counter.count("") == 0
+        assert counter.count(WORDS) < tokens
+        cut = counter.truncate(text, 25)
+        assert text.startswith(cut)
+        assert 0 < counter.count(cut) <= 25
+        assert counter.truncate(WORDS, tokens) == WORDS
+        assert counter.truncate(text, 0) == ""
+
+    def test_estimate_without_encoding(self, monkeypatch):
+        """Test the estimate is used when no encoding can be loaded."""
+        monkeypatch.setattr("whispyrkeep.tokenizer._load_encoding", lambda name: None)
+        counter = TokenCounter(model_family("claude-3-opus"))
+
+        assert not counter.exact
+        # 5 short pieces and a 10-letter word (3), scaled by Claude's ratio
+        assert counter.count("Roll for it, adventurer!") == math.ceil(8 * 1.2)
+        assert counter.count(counter.truncate(WORDS * 5, 10)) <= 10
+
+
+class TestContextPacker:
+    """Tests for ContextPacker."""
+
+    def sections(self, state_items=1, lore_items=10):
+        return [
+            ContextSection("state", PRIORITY_STATE, [WORDS * 3] * state_items, truncatable=True),
+            ContextSection("recap", PRIORITY_RECAP, [WORDS * 3], header="## Story So Far"),
+            ContextSection(
+                "hard_canon",
+                PRIORITY_HARD_CANON,
+                [f"- fact {i}" for i in range(3)],
+                header="## Facts",
+            ),
+            ContextSection(
+                "soft_lore",
+                PRIORITY_SOFT_LORE,
+                [f"- rumor {i}: {WORDS}" for i in range(lore_items)],
+                header="## Rumors",
+            ),
+        ]
+
+    def test_everything_fits(self, counter):
+        """Test a generous budget keeps every item, laid out in list order."""
+        packed = ContextPacker(counter, 10_000).pack(self.sections())
+
+        assert packed.dropped_items == 0
+        assert packed.tokens_used == counter.count(packed.text)
+        assert packed.text.index("lantern") < packed.text.index("## Story So Far")
+        assert packed.text.index("## Facts") < packed.text.index("## Rumors")
+
+    def test_fills_by_priority(self, counter):
+        """Test a tight budget drops soft lore first, then the recap."""
+        full = ContextPacker(counter, 10_000).pack(self.sections())
+        budget = full.tokens_used - counter.count(WORDS) * 3
+
+        packed = ContextPacker(counter, budget).pack(self.sections())
+        assert packed.tokens_used <= budget
+        assert packed.sections["hard_canon"] == (3, 3)
+        assert packed.sections["recap"] == (1, 1)
+        assert packed.sections["soft_lore"][0] < 10
+
+        fixed = ContextPacker(counter, 10_000).pack(self.sections(lore_items=0)).tokens_used
+        packed = ContextPacker(counter, fixed - 5).pack(self.sections())
+        assert packed.tokens_used <= fixed - 5
+        assert packed.sections["hard_canon"] == (3, 3)
+        assert packed.sections["state"] == (1, 1)
+        assert packed.sections["recap"] == (0, 1)
+        assert "## Story So Far" not in packed.text
+
+    def test_truncates_truncatable_section(self, counter):
+        """Test a section that does not fit is cut down rather than dropped."""
+        state = ContextSection("state", PRIORITY_STATE, [WORDS * 10], truncatable=True)
+        facts = ContextPacker(counter, 10_000).pack(self.sections()[2:3]).tokens_used
+        budget = facts + 60
+
+        packed = ContextPacker(counter, budget).pack([state, *self.sections()[1:]])
+
+        assert packed.tokens_used <= budget
+        assert packed.sections["state"] == (1, 1)
+        assert packed.sections["recap"] == (0, 1)
+        assert packed.text.startswith("The lantern")
+        assert WORDS * 10 not in packed.text
+
+    def test_max_item_tokens(self, counter):
+        """Test long items are capped to max_item_tokens."""
+        section = ContextSection("lore", PRIORITY_SOFT_LORE, [WORDS * 50], max_item_tokens=20)
+
+        packed = ContextPacker(counter, 10_000).pack([section])
+
+        assert counter.count(packed.text) <= 21
+
+
+@pytest.mark.django_db
+class TestBudgetedContext:
+    """Tests for the token budget in PromptBuilder."""
+
+    def test_context_budget(self, settings):
+        """Test the budget is the model's window less the prompt, input and reply."""
+        builder = PromptBuilder(chroma_service=MagicMock(), summary_service=MagicMock())
+        settings.LLM_CONTEXT_TOKEN_BUDGET = 12_000
+
+        assert builder.context_budget("gpt-4o") == 12_000
+        small = builder.context_budget("gpt-4", "I search the room.")
+        assert 0 < small < 8_192 - 2_048
+
+    def test_assemble_context_records_tokens(self, settings):
+        """Test the context is packed within budget and its tokens recorded."""
+        settings.LLM_CONTEXT_TOKEN_BUDGET = 300
+        builder = PromptBuilder(chroma_service=MagicMock(), summary_service=MagicMock())
+        lore = LoreInjection(
+            hard_canon_chunks=["The king is dead."],
+            soft_lore_chunks=[WORDS * 10 for _ in range(5)],
+        )
+        metrics = TurnMetrics()
+
+        context = builder.assemble_context(
+            "## Universe",
+            "## Campaign",
+            "### Current State",
+            lore,
+            story_recap="Earlier: a war.",
+            metrics=metrics,
+        )
+
+        counter = get_token_counter("gpt-4")
+        assert metrics.context_tokens == context.tokens_used
+        assert context.tokens_used == counter.count(context.stable) + counter.count(
+            context.volatile
+        )
+        assert metrics.context_tokens <= 300
+        assert context.stable == "## Universe\n\n## Campaign"
+        assert "The king is dead." in context.volatile
+        assert "## Story So Far\nEarlier: a war." in context.volatile
+        assert context.volatile.count("lantern") < 50
+
+    def test_proposal_messages_put_stable_context_first(self):
+        """Test the cacheable system prompt and setting precede per-turn context."""
+        builder = PromptBuilder(chroma_service=MagicMock(), summary_service=MagicMock())
+        context = TurnContext(stable="## Universe", volatile="### Current State")
+
+        messages = builder.build_proposal_messages(context, "I search the room.")
+
+        assert [(m.role, m.cache) for m in messages] == [
+            ("system", True),
+            ("system", True),
+            ("assistant", False),
+            ("user", False),
+        ]
+        assert messages[0].content == builder.build_system_prompt()
+        assert messages[1].content == "[Setting]\n## Universe"
+        assert messages[2].content == "[Context]\n### Current State"
+        assert messages[3].content == "I search the room."
@@ -0,0 +1,279 @@
+"""
+Tests for the dice log.
+
+Tests RollRecord/RollStats maintenance on persist and rewind, the rebuild
+from stored turns, and the dice log API.
+"""
+
+from io import StringIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.campaigns.models import Campaign, RollRecord, RollStats, TurnEvent
+from apps.campaigns.services.dice_log import DiceLogService, build_roll_records
+from apps.campaigns.services.llm_client import LLMClientConfig, LLMProvider
+from apps.campaigns.services.rewind_service import RewindService
+from apps.campaigns.services.turn_engine import RollResult, TurnEngine, TurnRequest
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="dice@example.com",
+        password="testpass123",
+        username="dice",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Dice Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Roller",
+        species="Human",
+        character_class="Rogue",
+        background="Criminal",
+        level=1,
+        ability_scores_json={"str": 10, "dex": 16, "con": 12, "int": 10, "wis": 12, "cha": 10},
+    )
+    return Campaign.objects.create(
+        user=user, universe=universe, character_sheet=character, title="Dice Campaign"
+    )
+
+
+def roll(roll_id, roll_type="ability_check", value=10, total=12, success=None, dc=None):
+    return {
+        "roll_id": roll_id,
+        "roll_type": roll_type,
+        "roll_value": value,
+        "modifier": total - value,
+        "total": total,
+        "success": success,
+        "dc": dc,
+        "advantage_state": "none",
+        "details": {},
+    }
+
+
+def make_turn(campaign, turn_index, rolls, specs) -> TurnEvent:
+    return TurnEvent.objects.create(
+        campaign=campaign,
+        turn_index=turn_index,
+        user_input_text=f"Action {turn_index}",
+        llm_response_text=f"Narration {turn_index}",
+        roll_spec_json={"roll_requests": specs},
+        roll_results_json={"results": rolls},
+        canonical_state_hash="0" * 64,
+    )
+
+
+@pytest.fixture
+def played(campaign):
+    """Three turns of rolls, recorded as they would be on persist."""
+    dice_log = DiceLogService()
+    turns = [
+        make_turn(
+            campaign,
+            1,
+            [roll("s1", value=20, total=23, success=True, dc=12), roll("d1", "damage_roll", 5, 5)],
+            [{"ability": "dex", "skill": "stealth", "dc": 12}, {"dice": "1d6"}],
+        ),
+        make_turn(
+            campaign,
+            2,
+            [roll("s2", value=1, total=4, success=False, dc=12)],
+            [{"ability": "dex", "dc": 12}],
+        ),
+        make_turn(
+            campaign,
+            3,
+            [roll("w1", "saving_throw", 11, 12, success=True, dc=10), roll("a1", "attack_roll")],
+            [{"ability": "wis", "dc": 10}, {}],
+        ),
+    ]
+    for turn in turns:
+        dice_log.record_turn(turn)
+    return turns
+
+
+def stats_rows(campaign) -> dict:
+    return {
+        (s.roll_type, s.ability): (
+            s.rolls,
+            s.checks,
+            s.successes,
+            s.criticals,
+            s.fumbles,
+            s.total_sum,
+        )
+        for s in RollStats.objects.filter(campaign=campaign)
+    }
+
+
+@pytest.mark.django_db
+class TestDiceLogService:
+    """Tests for DiceLogService."""
+
+    def test_build_records_from_turn(self, campaign):
+        """Test results are matched to their requests and crits are flagged."""
+        turn = make_turn(
+            campaign,
+            1,
+            [roll("s1", value=20, total=23, success=True, dc=12), roll("a1", "attack_roll", 1, 3)],
+            [{"ability": "dex", "skill": "stealth"}],
+        )
+
+        first, second = build_roll_records(turn, first_roll_number=7)
+
+        assert (first.roll_number, first.ability, first.skill) == (7, "dex", "stealth")
+        assert first.is_critical and not first.is_fumble
+        # No request to match: d20 rolls default to strength like the executor
+        assert (second.roll_number, second.ability) == (8, "str")
+        assert second.is_fumble
+
+    def test_record_turn_numbers_rolls_and_updates_stats(self, campaign, played):
+        """Test rolls are numbered across turns and folded into the stats."""
+        numbers = list(
+            RollRecord.objects.filter(campaign=campaign).values_list("roll_number", flat=True)
+        )
+        assert numbers == [1, 2, 3, 4, 5]
+
+        assert stats_rows(campaign) == {
+            ("ability_check", "dex"): (2, 2, 1, 1, 1, 27),
+            ("damage_roll", ""): (1, 0, 0, 0, 0, 5),
+            ("saving_throw", "wis"): (1, 1, 1, 0, 0, 12),
+            ("attack_roll", "str"): (1, 0, 0, 0, 0, 12),
+        }
+
+    def test_get_stats(self, campaign, played):
+        """Test the aggregates are summarized overall, by type and by ability."""
+        stats = DiceLogService().get_stats(campaign)
+
+        assert stats["rolls"] == 5
+        assert stats["criticals"] == 1
+        assert stats["fumbles"] == 1
+        assert stats["success_rate"] == round(2 / 3, 4)
+        assert stats["average_total"] == round(56 / 5, 2)
+        assert stats["by_ability"]["dex"]["success_rate"] == 0.5
+        assert stats["by_ability"]["wis"]["success_rate"] == 1.0
+        assert "" not in stats["by_ability"]
+        assert stats["by_roll_type"]["damage_roll"]["success_rate"] is None
+
+    def test_rewind_subtracts_rolls(self, campaign, played):
+        """Test rewinding removes the later turns' rolls from log and stats."""
+        service = RewindService()
+        service.lore_service = MagicMock()
+        service.lore_service.invalidate_turns_lore.return_value = 0
+
+        service.rewind_to_turn(campaign, 1)
+
+        assert RollRecord.objects.filter(campaign=campaign).count() == 2
+        rows = stats_rows(campaign)
+        assert rows[("ability_check", "dex")] == (1, 1, 1, 1, 0, 23)
+        assert rows[("saving_throw", "wis")] == (0, 0, 0, 0, 0, 0)
+        assert DiceLogService().get_stats(campaign)["rolls"] == 2
+
+        # Numbering continues from the last remaining roll
+        records = DiceLogService().record_turn(
+            make_turn(campaign, 2, [roll("p1", "saving_throw", 8, 8, False, 10)], [{}])
+        )
+        assert records[0].roll_number == 3
+
+    def test_rebuild_matches_incremental(self, campaign, played):
+        """Test rebuilding from turns reproduces the incrementally kept stats."""
+        before = stats_rows(campaign)
+        RollStats.objects.filter(campaign=campaign).update(rolls=99)
+
+        out = StringIO()
+        call_command("rebuild_dice_log", f"--campaign={campaign.id}", stdout=out)
+
+        assert stats_rows(campaign) == before
+        assert RollRecord.objects.filter(campaign=campaign).count() == 5
+        assert "Recorded 5 rolls" in out.getvalue()
+
+    def test_persist_turn_records_rolls(self, campaign):
+        """Test the turn engine writes the dice log with the turn."""
+        engine = TurnEngine()
+        request = TurnRequest(
+            campaign=campaign,
+            user_input="I sneak past.",
+            llm_config=LLMClientConfig(provider=LLMProvider.OPENAI, api_key="x", model="m"),
+        )
+        state = engine.state_service.get_initial_state(campaign)
+        dm_json = {"roll_requests": [{"id": "s1", "type": "ability_check", "ability": "dex"}]}
+        rolls = [RollResult("s1", "ability_check", 14, 3, 17, success=True, dc=12)]
+
+        turn = engine._persist_turn(request, state, "You sneak.", dm_json, rolls)
+
+        record = RollRecord.objects.get(turn=turn)
+        assert (record.roll_number, record.ability, record.total) == (1, "dex", 17)
+        assert stats_rows(campaign) == {("ability_check", "dex"): (1, 1, 1, 0, 0, 17)}
+
+
+@pytest.mark.django_db
+class TestDiceLogAPI:
+    """Tests for the dice log endpoint."""
+
+    @pytest.fixture
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def url(self, campaign):
+        return f"/api/campaigns/{campaign.id}/dice-log/"
+
+    def test_paginates_with_stats(self, client, campaign, played):
+        """Test the log pages by roll number and carries the stats."""
+        response = client.get(self.url(campaign), {"limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["roll_number"] for r in response.data["results"]] == [1, 2]
+        assert response.data["stats"]["rolls"] == 5
+
+        response = client.get(response.data["next"])
+        assert [r["roll_number"] for r in response.data["results"]] == [3, 4]
+
+    def test_filters(self, client, campaign, played):
+        """Test filtering by type, ability, outcome and turn."""
+        url = self.url(campaign)
+
+        def numbers(**params):
+            response = client.get(url, {"stats": "false", **params})
+            assert "stats" not in response.data
+            return [r["roll_number"] for r in response.data["results"]]
+
+        assert numbers(roll_type="ability_check") == [1, 3]
+        assert numbers(ability="wis") == [4]
+        assert numbers(success="false") == [3]
+        assert numbers(turn=3) == [4, 5]
+        assert numbers(order="desc", limit=2) == [5, 4]
+
+    def test_invalid_params(self, client, campaign):
+        """Test malformed filters are rejected."""
+        assert client.get(self.url(campaign), {"success": "yes"}).status_code == 400
+        assert client.get(self.url(campaign), {"turn": "last"}).status_code == 400
+
+    def test_other_users_campaign(self, campaign):
+        """Test another user's dice log is not found."""
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(email="x@example.com", password="pw123456", username="x")
+        )
+
+        response = client.get(self.url(campaign))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,384 @@
+"""
+Tests for the LLM client.
+
+Covers streaming chat completions over server-sent events, prompt-cache
+markers, the asyncio client and the shared HTTP connection pool.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from apps.campaigns.services.http_pool import HTTPClientPool, api_key_fingerprint
+from apps.campaigns.services.llm_client import (
+    AsyncLLMClient,
+    AuthenticationError,
+    LLMClient,
+    LLMClientConfig,
+    LLMError,
+    LLMProvider,
+    LLMResponse,
+    Message,
+)
+
+
+def _sse_body(events: list[dict], done: bool = True) -> bytes:
+    """Encode events as a server-sent event stream."""
+    lines = [f"data: {json.dumps(event)}\n\n" for event in events]
+    if done:
+        lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+def _openai_delta(content: str, finish_reason: str | None = None) -> dict:
+    return {"choices": [{"delta": {"content": content}, "finish_reason": finish_reason}]}
+
+
+def _make_client(handler, provider: LLMProvider = LLMProvider.OPENAI) -> LLMClient:
+    """Create a client whose HTTP transport is served by handler."""
+    config = LLMClientConfig(
+        provider=provider,
+        api_key="sk-test",
+        model="test-model",
+        max_retries=2,
+        initial_retry_delay=0,
+    )
+    client = LLMClient(config)
+    client._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.fixture
+def messages():
+    return [Message(role="user", content="I open the door")]
+
+
+class TestChatStream:
+    """Tests for LLMClient.chat_stream."""
+
+    def test_streams_openai_deltas(self, messages):
+        """Test OpenAI-style deltas are yielded in order."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            body = _sse_body(
+                [
+                    _openai_delta("The door "),
+                    _openai_delta("creaks open."),
+                    _openai_delta("", finish_reason="stop"),
+                    {"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 4}},
+                ]
+            )
+            return httpx.Response(200, content=body)
+
+        with _make_client(handler) as client:
+            chunks = list(client.chat_stream(messages))
+
+        assert "".join(c.content for c in chunks) == "The door creaks open."
+        assert chunks[2].finish_reason == "stop"
+        assert chunks[-1].usage["completion_tokens"] == 4
+        assert requests[0]["stream"] is True
+        assert requests[0]["stream_options"] == {"include_usage": True}
+
+    def test_streams_anthropic_events(self, messages):
+        """Test Anthropic-style events are translated into chunks."""
+
+        def handler(request):
+            body = _sse_body(
+                [
+                    {"type": "message_start", "message": {"usage": {"input_tokens": 12}}},
+                    {"type": "content_block_start", "index": 0},
+                    {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}},
+                    {"type": "message_delta", "delta": {"stop_reason": "end_turn"}},
+                    {"type": "message_stop"},
+                ],
+                done=False,
+            )
+            return httpx.Response(200, content=body)
+
+        with _make_client(handler, provider=LLMProvider.ANTHROPIC) as client:
+            chunks = list(client.chat_stream(messages))
+
+        assert [c.content for c in chunks] == ["", "Hi", ""]
+        assert chunks[0].usage["input_tokens"] == 12
+        assert chunks[-1].finish_reason == "end_turn"
+
+    def test_skips_malformed_events(self, messages):
+        """Test malformed event payloads are skipped rather than fatal."""
+
+        def handler(request):
+            body = b"data: {not json}\n\n" + _sse_body([_openai_delta("ok")])
+            return httpx.Response(200, content=body)
+
+        with _make_client(handler) as client:
+            chunks = list(client.chat_stream(messages))
+
+        assert [c.content for c in chunks] == ["ok"]
+
+    def test_retries_before_first_chunk(self, messages):
+        """Test server errors are retried while nothing has been yielded."""
+        attempts = []
+
+        def handler(request):
+            attempts.append(1)
+            if len(attempts) == 1:
+                return httpx.Response(503, json={"error": "unavailable"})
+            return httpx.Response(200, content=_sse_body([_openai_delta("done")]))
+
+        with _make_client(handler) as client:
+            chunks = list(client.chat_stream(messages))
+
+        assert len(attempts) == 2
+        assert chunks[0].content == "done"
+
+    def test_stream_error_event_raises(self, messages):
+        """Test an in-band error event raises LLMError."""
+
+        def handler(request):
+            body = _sse_body([{"type": "error", "error": {"message": "overloaded"}}], done=False)
+            return httpx.Response(200, content=body)
+
+        client = _make_client(handler, provider=LLMProvider.ANTHROPIC)
+        with client, pytest.raises(LLMError, match="overloaded"):
+            list(client.chat_stream(messages))
+
+
+class TestPromptCaching:
+    """Tests for prompt-cache markers and cached token reporting."""
+
+    @pytest.fixture
+    def cached_messages(self):
+        return [
+            Message(role="system", content="You are a DM.", cache=True),
+            Message(role="user", content="I open the door"),
+        ]
+
+    def _sent_messages(self, provider: LLMProvider, messages: list[Message]) -> list[dict]:
+        sent = {}
+
+        def handler(request):
+            sent.update(json.loads(request.content))
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        _make_client(handler, provider).chat(messages)
+        return sent["messages"]
+
+    def test_anthropic_marks_cached_messages(self, cached_messages):
+        """Test cacheable messages carry a cache breakpoint for Anthropic."""
+        system, user = self._sent_messages(LLMProvider.ANTHROPIC, cached_messages)
+
+        assert system["content"] == [
+            {"type": "text", "text": "You are a DM.", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert user == {"role": "user", "content": "I open the door"}
+
+    def test_openai_gets_plain_messages(self, cached_messages):
+        """Test OpenAI-style endpoints (automatic prefix caching) get no markers."""
+        system, _ = self._sent_messages(LLMProvider.OPENAI, cached_messages)
+
+        assert system == {"role": "system", "content": "You are a DM."}
+
+    def test_cached_tokens_from_usage(self):
+        """Test cache hits are read from OpenAI and Anthropic usage."""
+        openai = LLMResponse(
+            content="", model="m", usage={"prompt_tokens_details": {"cached_tokens": 1024}}
+        )
+        anthropic = LLMResponse(content="", model="m", usage={"cache_read_input_tokens": 900})
+
+        assert openai.cached_tokens == 1024
+        assert anthropic.cached_tokens == 900
+        assert LLMResponse(content="", model="m").cached_tokens == 0
+
+
+class TestAsyncLLMClient:
+    """Tests for AsyncLLMClient."""
+
+    def _make_client(self, handler, provider: LLMProvider = LLMProvider.OPENAI):
+        config = LLMClientConfig(
+            provider=provider,
+            api_key="sk-test",
+            model="test-model",
+            max_retries=2,
+            initial_retry_delay=0,
+        )
+        client = AsyncLLMClient(config)
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_chat(self, messages):
+        """Test a chat completion round trip."""
+
+        def handler(request):
+            assert request.headers["Authorization"] == "Bearer sk-test"
+            return httpx.Response(
+                200,
+                json={
+                    "model": "test-model",
+                    "choices": [{"message": {"content": "Hello"}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+                },
+            )
+
+        async def run():
+            async with self._make_client(handler) as client:
+                return await client.chat(messages)
+
+        response = asyncio.run(run())
+
+        assert response.content == "Hello"
+        assert response.output_tokens == 1
+
+    def test_chat_retries_server_error(self, messages):
+        """Test 5xx responses are retried."""
+        attempts = []
+
+        def handler(request):
+            attempts.append(1)
+            if len(attempts) < 3:
+                return httpx.Response(502, text="bad gateway")
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        async def run():
+            async with self._make_client(handler) as client:
+                return await client.chat(messages)
+
+        assert asyncio.run(run()).content == "ok"
+        assert len(attempts) == 3
+
+    def test_chat_authentication_error(self, messages):
+        """Test 401 responses raise without retrying."""
+
+        def handler(request):
+            return httpx.Response(401, json={"error": {"message": "bad key"}})
+
+        async def run():
+            async with self._make_client(handler) as client:
+                return await client.chat(messages)
+
+        with pytest.raises(AuthenticationError):
+            asyncio.run(run())
+
+    def test_chat_stream(self, messages):
+        """Test streamed deltas are yielded in order."""
+
+        def handler(request):
+            body = _sse_body([_openai_delta("Once "), _openai_delta("upon a time")])
+            return httpx.Response(200, content=body)
+
+        async def run():
+            async with self._make_client(handler) as client:
+                return [chunk.content async for chunk in client.chat_stream(messages)]
+
+        assert asyncio.run(run()) == ["Once ", "upon a time"]
+
+
+class TestHTTPClientPool:
+    """Tests for the shared LLM HTTP client pool."""
+
+    def test_clients_shared_per_endpoint_and_key(self):
+        """Test clients are reused per (base_url, key) and separated otherwise."""
+        pool = HTTPClientPool(http2=False)
+
+        a = pool.get_client("https://api.example.com/v1", "sk-one")
+        b = pool.get_client("https://api.example.com/v1", "sk-one")
+        c = pool.get_client("https://api.example.com/v1", "sk-two")
+        d = pool.get_client("https://other.example.com/v1", "sk-one")
+
+        assert a is b
+        assert a is not c
+        assert a is not d
+        pool.close_all()
+
+    def test_llm_clients_share_pooled_client(self):
+        """Test separate LLMClient instances reuse the same pooled connection."""
+        config = LLMClientConfig(provider=LLMProvider.OPENAI, api_key="sk-pool", model="m")
+
+        with LLMClient(config) as first:
+            http_client = first.http_client
+        with LLMClient(config) as second:
+            assert second.http_client is http_client
+
+        # Releasing an LLMClient does not close the shared pool
+        assert not http_client.is_closed
+
+    def test_idle_eviction(self):
+        """Test pools idle past the timeout are closed and replaced."""
+        pool = HTTPClientPool(idle_timeout=60, http2=False)
+        client = pool.get_client("https://api.example.com/v1", "sk-one")
+        pool.release(client)
+
+        for entry in pool._clients.values():
+            entry.last_used -= 120
+
+        assert pool.evict_idle() == 1
+        assert client.is_closed
+        assert pool.get_client("https://api.example.com/v1", "sk-one") is not client
+        pool.close_all()
+
+    def test_checked_out_pool_not_evicted(self):
+        """Test a pool serving a long stream is kept however long it has been out."""
+        pool = HTTPClientPool(idle_timeout=60, http2=False)
+        client = pool.get_client("https://api.example.com/v1", "sk-one")
+        (entry,) = pool._clients.values()
+        entry.last_used -= 120
+
+        assert pool.evict_idle() == 0
+
+        # Released after the stream: idle time counts from the release
+        pool.release(client)
+        assert pool.evict_idle() == 0
+        assert not client.is_closed
+        pool.close_all()
+
+    def test_async_clients_keyed_by_loop(self):
+        """Test async clients are shared within a loop but not across loops."""
+        pool = HTTPClientPool(http2=False)
+
+        async def get_pair():
+            return (
+                pool.get_async_client("https://api.example.com/v1", "sk-one"),
+                pool.get_async_client("https://api.example.com/v1", "sk-one"),
+            )
+
+        first, second = asyncio.run(get_pair())
+        third, _ = asyncio.run(get_pair())
+
+        assert first is second
+        assert third is not first
+        # The first loop is closed, so its pool has been evicted
+        assert pool.stats()["pool_count"] == 1
+
+    def test_stats(self):
+        """Test pool stats expose usage without the API key."""
+        pool = HTTPClientPool(max_connections=5, http2=False)
+        pool.get_client("https://api.example.com/v1", "sk-secret")
+        pool.get_client("https://api.example.com/v1", "sk-secret")
+
+        stats = pool.stats()
+
+        assert stats["limits"]["max_connections"] == 5
+        assert stats["pool_count"] == 1
+        assert stats["pools"][0]["checkouts"] == 2
+        assert "sk-secret" not in str(stats)
+        assert api_key_fingerprint("sk-secret") not in str(stats)
+        pool.close_all()
+
+    def test_stats_endpoint(self, api_client, user):
+        """Test the pool stats health endpoint."""
+        user.is_staff = True
+        user.save()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get("/health/llm-pool/")
+
+        assert response.status_code == 200
+        assert "pools" in response.json()
+
+    def test_stats_endpoint_admin_only(self, client, db):
+        """Test anonymous callers cannot list pooled endpoints."""
+        response = client.get("/health/llm-pool/")
+
+        assert response.status_code in (401, 403)
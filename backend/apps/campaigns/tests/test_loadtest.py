@@ -0,0 +1,227 @@
+"""
+Tests for the turn load-test tooling.
+
+Tests the fake OpenAI-compatible LLM server, the in-memory Chroma stand-in,
+and the load-test harness end to end.
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.campaigns.loadtest import (
+    FakeLLMConfig,
+    FakeLLMServer,
+    InMemoryChromaClient,
+    LoadTestConfig,
+    LoadTestHarness,
+    create_campaigns,
+    delete_campaigns,
+    percentile,
+)
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.llm_client import (
+    LLMClient,
+    LLMClientConfig,
+    LLMProvider,
+    Message,
+    ServerError,
+)
+from apps.lore.services.chroma_client import ChromaClientService
+
+PROPOSAL_MESSAGES = [Message(role="user", content="I look around.")]
+NARRATION_MESSAGES = [
+    Message(role="assistant", content="[Previous proposal]\nYou sneak.\n\n[Roll Results]\n- r1"),
+    Message(role="user", content="Based on these roll results, provide the final narrative."),
+]
+
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(FakeLLMConfig(seed=3)) as server:
+        yield server
+
+
+def client_config(server, **kwargs) -> LLMClientConfig:
+    return LLMClientConfig(
+        provider=LLMProvider.OPENAI,
+        api_key="fake",
+        model="fake-dm",
+        base_url=server.base_url,
+        max_retries=0,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def chroma():
+    client = InMemoryChromaClient()
+    return ChromaClientService(client=client, embedding_function=client.embedding_function)
+
+
+class TestFakeLLMServer:
+    """Tests for FakeLLMServer."""
+
+    def test_scripted_completion(self, server):
+        """Test a proposal request gets a scripted DM response with usage."""
+        with LLMClient(client_config(server)) as client:
+            response = client.chat(PROPOSAL_MESSAGES)
+
+        assert response.content.startswith("DM_TEXT:\n")
+        assert "DM_JSON:" in response.content
+        assert response.input_tokens > 0
+        assert response.output_tokens > 0
+        assert server.requests == 1
+
+    def test_narration_requests_get_narration(self, server):
+        """Test requests carrying roll results get a narration without rolls."""
+        with LLMClient(client_config(server)) as client:
+            response = client.chat(NARRATION_MESSAGES)
+
+        dm_json = json.loads(response.content.split("DM_JSON:\n", 1)[1])
+        assert "roll_requests" not in dm_json
+
+    def test_streamed_completion(self, server):
+        """Test streaming yields the same content plus a usage chunk."""
+        with LLMClient(client_config(server)) as client:
+            chunks = list(client.chat_stream(PROPOSAL_MESSAGES))
+
+        content = "".join(chunk.content for chunk in chunks)
+        assert content.startswith("DM_TEXT:\n")
+        assert any(chunk.usage.get("completion_tokens") for chunk in chunks)
+
+    def test_responses_are_deterministic(self):
+        """Test the same seed and request give the same response."""
+        contents = []
+        for _ in range(2):
+            with (
+                FakeLLMServer(FakeLLMConfig(seed=11)) as server,
+                LLMClient(client_config(server)) as client,
+            ):
+                contents.append(
+                    [
+                        client.chat([Message(role="user", content=f"Action {i}")]).content
+                        for i in range(5)
+                    ]
+                )
+
+        assert contents[0] == contents[1]
+
+    def test_error_injection(self):
+        """Test injected errors surface as provider errors."""
+        with (
+            FakeLLMServer(FakeLLMConfig(error_rate=1.0, error_status=503)) as server,
+            LLMClient(client_config(server)) as client,
+            pytest.raises(ServerError),
+        ):
+            client.chat(PROPOSAL_MESSAGES)
+
+        assert server.errors == 1
+
+
+class TestInMemoryChroma:
+    """Tests for InMemoryChromaClient through ChromaClientService."""
+
+    def test_query_ranks_by_overlap(self, chroma):
+        """Test the most similar document ranks first."""
+        chroma.add_documents_batch(
+            "u1",
+            [
+                {"id": "a", "text": "The dragon sleeps under the mountain."},
+                {"id": "b", "text": "The tavern serves cheap ale.", "chunk_type": "soft_lore"},
+            ],
+        )
+
+        result = chroma.query("u1", "Where does the dragon sleep?", top_k=2)
+
+        assert [r.chunk_id for r in result.results] == ["a", "b"]
+        assert result.results[0].score > result.results[1].score
+
+    def test_chunk_type_filter(self, chroma):
+        """Test where filters restrict results."""
+        chroma.add_document("u1", "a", "Canon ale.", chunk_type="hard_canon")
+        chroma.add_document("u1", "b", "Rumoured ale.", chunk_type="soft_lore")
+
+        result = chroma.query("u1", "ale", include_soft_lore=False)
+
+        assert [r.chunk_id for r in result.results] == ["a"]
+
+    def test_delete_by_source_and_stats(self, chroma):
+        """Test deleting by source_ref and counting documents."""
+        chroma.add_document("u1", "a", "One.", source_ref="turn-1")
+        chroma.add_document("u1", "b", "Two.", source_ref="turn-1")
+        chroma.add_document("u1", "c", "Three.", source_ref="turn-2")
+
+        assert chroma.delete_documents_by_source("u1", "turn-1") == 2
+        assert chroma.get_collection_stats("u1")["total_documents"] == 1
+        assert chroma.delete_collection("u1") is True
+
+
+class TestPercentile:
+    """Tests for the nearest-rank percentile."""
+
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+        assert percentile([7], 99) == 7
+
+
+# Harness workers use their own DB connections, so the data must be committed
+@pytest.mark.django_db(transaction=True)
+class TestLoadTestHarness:
+    """Tests for LoadTestHarness."""
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            LoadTestConfig(campaigns=2, turns_per_campaign=2, concurrency=1),
+            LoadTestConfig(campaigns=2, turns_per_campaign=2, concurrency=1, stream=True),
+            LoadTestConfig(campaigns=2, turns_per_campaign=2, engine="async"),
+        ],
+        ids=["sync", "stream", "async"],
+    )
+    def test_run(self, server, chroma, config):
+        """Test every campaign plays its turns and the report adds up."""
+        user, campaigns = create_campaigns(config.campaigns, chroma)
+
+        report = LoadTestHarness(config, client_config(server), chroma).run(campaigns)
+
+        summary = report.to_dict()
+        assert summary["turns"] == 4
+        assert summary["succeeded"] == 4, summary["errors"]
+        assert summary["throughput_turns_per_s"] > 0
+        assert 0 < summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
+        assert summary["output_tokens"] > 0
+        for campaign in campaigns:
+            assert campaign.turns.count() == 2
+
+        delete_campaigns(user)
+        assert not Campaign.objects.filter(user_id=user.id).exists()
+
+    def test_stream_requires_sync_engine(self):
+        """Test streaming is rejected for the async engine."""
+        with pytest.raises(ValueError):
+            LoadTestConfig(engine="async", stream=True)
+
+    def test_command(self):
+        """Test the management command reports a JSON summary."""
+        out = StringIO()
+        call_command(
+            "loadtest_turns",
+            "--campaigns=1",
+            "--turns=2",
+            "--latency-ms=0",
+            "--tokens-per-second=0",
+            "--json",
+            stdout=out,
+        )
+
+        summary = json.loads(out.getvalue())
+        assert summary["succeeded"] == 2
+        assert summary["llm_requests"] >= 2
+        assert not Campaign.objects.exists()
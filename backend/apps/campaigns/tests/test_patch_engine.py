@@ -0,0 +1,353 @@
+"""
+Tests for the JSON-pointer patch engine.
+
+Tests path compilation, patch operations, structural sharing, batched
+replay, and StateService integration.
+"""
+
+from io import StringIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.campaigns.models import Campaign, TurnEvent
+from apps.campaigns.services.patch_engine import PatchEngine, PatchError, compile_path
+from apps.campaigns.services.state_service import StateService
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="patches@example.com",
+        password="testpass123",
+        username="patches",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Patch Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Test Hero",
+        species="Human",
+        character_class="Fighter",
+        background="Soldier",
+        level=1,
+        ability_scores_json={"con": 12},
+    )
+    return Campaign.objects.create(
+        user=user,
+        universe=universe,
+        character_sheet=character,
+        title="Patch Campaign",
+    )
+
+
+@pytest.fixture
+def engine():
+    return PatchEngine()
+
+
+def sample_state():
+    return {
+        "turn_index": 0,
+        "character_state": {"hp": {"current": 10, "max": 10}, "conditions": ["prone"]},
+        "world_state": {"npcs": {"bob": {"attitude": "neutral"}}, "factions": {}},
+        "global_flags": {},
+        "universe_time": {},
+    }
+
+
+class TestCompilePath:
+    """Tests for compile_path."""
+
+    def test_maps_prompt_paths_to_sections(self):
+        """Test prompt vocabulary paths map onto state sections."""
+        assert compile_path("/party/player/hp/current").state_path == (
+            "character_state",
+            "hp",
+            "current",
+        )
+        assert compile_path("/world/global_flags/gate").state_path == ("global_flags", "gate")
+        assert compile_path("/world/npcs/bob/attitude").state_path == (
+            "world_state",
+            "npcs",
+            "bob",
+            "attitude",
+        )
+
+    def test_unescapes_tokens(self):
+        """Test RFC 6901 escapes are decoded."""
+        assert compile_path("/world/npcs/a~1b~0c").tokens == ("npcs", "a/b~c")
+
+    def test_compiled_once(self):
+        """Test repeated paths hit the cache."""
+        assert compile_path("/world/location_id") is compile_path("/world/location_id")
+
+    @pytest.mark.parametrize("path", ["party/player/hp", "/rules/srd", None])
+    def test_rejects_invalid_paths(self, path):
+        """Test malformed or out-of-state paths raise PatchError."""
+        with pytest.raises(PatchError):
+            compile_path(path)
+
+
+class TestPatchEngine:
+    """Tests for PatchEngine operations."""
+
+    def test_replace(self, engine):
+        """Test replace sets a nested value."""
+        state = engine.apply(
+            sample_state(), [{"op": "replace", "path": "/party/player/hp/current", "value": 3}]
+        )
+        assert state["character_state"]["hp"]["current"] == 3
+
+    def test_add_to_list(self, engine):
+        """Test add inserts into lists, with '-' appending."""
+        state = engine.apply(
+            sample_state(),
+            [
+                {"op": "add", "path": "/party/player/conditions/0", "value": "blinded"},
+                {"op": "add", "path": "/party/player/conditions/-", "value": "poisoned"},
+            ],
+        )
+        assert state["character_state"]["conditions"] == ["blinded", "prone", "poisoned"]
+
+    def test_remove(self, engine):
+        """Test remove deletes dict keys and list items."""
+        state = engine.apply(
+            sample_state(),
+            [
+                {"op": "remove", "path": "/world/npcs/bob"},
+                {"op": "remove", "path": "/party/player/conditions/0"},
+            ],
+        )
+        assert state["world_state"]["npcs"] == {}
+        assert state["character_state"]["conditions"] == []
+
+    def test_creates_missing_objects(self, engine):
+        """Test sparse worlds get intermediate objects created."""
+        state = engine.apply(
+            sample_state(), [{"op": "replace", "path": "/world/npcs/amy/status", "value": "dead"}]
+        )
+        assert state["world_state"]["npcs"]["amy"] == {"status": "dead"}
+
+    def test_advance_time_is_skipped(self, engine):
+        """Test advance_time patches do not address state by path."""
+        state = engine.apply(sample_state(), [{"op": "advance_time", "value": {"hours": 1}}])
+        assert state == sample_state()
+
+    def test_invalid_patches(self, engine):
+        """Test bad ops and list indices raise PatchError."""
+        with pytest.raises(PatchError):
+            engine.apply(sample_state(), [{"op": "move", "path": "/world/a"}])
+        with pytest.raises(PatchError):
+            engine.apply(sample_state(), [{"op": "replace", "path": "/world/a"}])
+        with pytest.raises(PatchError):
+            engine.apply(
+                sample_state(),
+                [{"op": "replace", "path": "/party/player/conditions/5", "value": "x"}],
+            )
+
+    def test_copy_on_write_shares_untouched(self, engine):
+        """Test the input is untouched and unpatched subtrees are shared."""
+        original = sample_state()
+
+        state = engine.apply(
+            original, [{"op": "replace", "path": "/world/npcs/bob/attitude", "value": "hostile"}]
+        )
+
+        assert original["world_state"]["npcs"]["bob"]["attitude"] == "neutral"
+        assert state["world_state"]["npcs"]["bob"]["attitude"] == "hostile"
+        assert state["character_state"] is original["character_state"]
+        assert state["world_state"]["factions"] is original["world_state"]["factions"]
+
+    def test_in_place(self, engine):
+        """Test in-place mode mutates the given state."""
+        state = sample_state()
+
+        result = engine.apply(
+            state,
+            [{"op": "replace", "path": "/world/global_flags/gate", "value": True}],
+            in_place=True,
+        )
+
+        assert result is state
+        assert state["global_flags"] == {"gate": True}
+
+    def test_values_are_not_aliased(self, engine):
+        """Test later patches never mutate an earlier patch's value."""
+        patches = [
+            {"op": "add", "path": "/world/npcs/amy", "value": {"attitude": "calm"}},
+            {"op": "replace", "path": "/world/npcs/amy/attitude", "value": "angry"},
+        ]
+
+        engine.apply(sample_state(), patches, in_place=True)
+
+        assert patches[0]["value"] == {"attitude": "calm"}
+
+    def test_apply_turn_legacy_merge(self, engine):
+        """Test legacy merge-patch turns are merged without mutating the input."""
+        original = sample_state()
+        turn = TurnEvent(turn_index=1, state_patch_json={"character": {"hp": {"current": 1}}})
+
+        state = engine.apply_turn(original, turn)
+
+        assert state["character_state"]["hp"] == {"current": 1, "max": 10}
+        assert original["character_state"]["hp"]["current"] == 10
+        assert state["turn_index"] == 1
+
+    def test_replay_batches_and_records_errors(self, engine):
+        """Test replay applies turns in order and skips failing ones."""
+        turns = [
+            TurnEvent(
+                turn_index=1,
+                state_patch_json={
+                    "patches": [{"op": "replace", "path": "/world/global_flags/a", "value": 1}]
+                },
+            ),
+            TurnEvent(turn_index=2, state_patch_json={"patches": [{"op": "bogus", "path": "/x"}]}),
+            TurnEvent(
+                turn_index=3,
+                state_patch_json={
+                    "patches": [{"op": "replace", "path": "/world/global_flags/b", "value": 2}]
+                },
+            ),
+        ]
+
+        result = engine.replay(sample_state(), turns)
+
+        assert result.turns_applied == 2
+        assert result.state["global_flags"] == {"a": 1, "b": 2}
+        assert len(result.errors) == 1
+        assert result.errors[0].startswith("Turn 2")
+
+    def test_replay_skips_failing_turn_whole(self, engine):
+        """Test a turn failing partway leaves none of its operations applied."""
+        original = sample_state()
+        turns = [
+            TurnEvent(
+                turn_index=1,
+                state_patch_json={
+                    "patches": [
+                        {"op": "replace", "path": "/world/global_flags/a", "value": 1},
+                        {"op": "remove", "path": "/party/player/conditions/5"},
+                    ]
+                },
+            ),
+        ]
+
+        result = engine.replay(original, turns)
+
+        assert result.turns_applied == 0
+        assert result.state["global_flags"] == {}
+        assert original["global_flags"] == {}
+
+    def test_legacy_merge_values_are_not_aliased(self, engine):
+        """Test merged values are copied, so patching the state leaves the turn intact."""
+        turn = TurnEvent(
+            turn_index=1, state_patch_json={"world": {"npcs": {"amy": {"attitude": "calm"}}}}
+        )
+
+        state = engine.apply_turn(sample_state(), turn)
+        engine.apply(
+            state,
+            [{"op": "replace", "path": "/world/npcs/amy/attitude", "value": "angry"}],
+            in_place=True,
+        )
+
+        assert turn.state_patch_json["world"]["npcs"]["amy"] == {"attitude": "calm"}
+
+
+@pytest.mark.django_db
+class TestStateServicePatches:
+    """Tests for patch-list turns in StateService."""
+
+    def _create_turn(self, campaign, turn_index, patches):
+        return TurnEvent.objects.create(
+            campaign=campaign,
+            turn_index=turn_index,
+            user_input_text="Act",
+            llm_response_text="Result",
+            state_patch_json={"patches": patches},
+            canonical_state_hash="0" * 64,
+        )
+
+    def test_replay_applies_patch_lists(self, campaign):
+        """Test replay applies the patches TurnEngine stores."""
+        service = StateService()
+        self._create_turn(
+            campaign, 1, [{"op": "replace", "path": "/party/player/hp/current", "value": 2}]
+        )
+        self._create_turn(
+            campaign, 2, [{"op": "add", "path": "/world/npcs/bob", "value": {"attitude": "wary"}}]
+        )
+
+        result = service.replay_to_turn(campaign)
+
+        assert result.success is True
+        assert result.state.character_state["hp"]["current"] == 2
+        assert result.state.world_state["npcs"]["bob"] == {"attitude": "wary"}
+
+    def test_advance_matches_replay(self, campaign):
+        """Test per-turn advance and batched replay agree."""
+        service = StateService()
+        state = service.get_initial_state(campaign)
+        for turn_index in range(1, 4):
+            turn = self._create_turn(
+                campaign,
+                turn_index,
+                [{"op": "replace", "path": f"/world/npcs/n{turn_index}/status", "value": "met"}],
+            )
+            state = service.advance_state(state, turn)
+
+        replayed = service.replay_to_turn(campaign).state
+
+        assert replayed.compute_hash() == state.compute_hash()
+
+    def test_persist_turn_applies_patches(self, campaign):
+        """Test persisted turns update the head state and keep hashes consistent."""
+        from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+
+        engine = TurnEngine(chroma_service=MagicMock())
+        current_state = engine.state_service.get_current_state(campaign)
+        request = TurnRequest(campaign=campaign, user_input="I rest", llm_config=MagicMock())
+        dm_json = {
+            "patches": [
+                {"op": "replace", "path": "/party/player/hp/current", "value": 1},
+                {"op": "replace", "path": "/world/global_flags/rested", "value": True},
+            ]
+        }
+
+        turn = engine._persist_turn(request, current_state, "You rest.", dm_json, [])
+
+        state = engine.state_service.get_current_state(campaign)
+        assert state.character_state["hp"]["current"] == 1
+        assert state.global_flags == {"rested": True}
+        assert engine.state_service.verify_state_hash(campaign, turn.turn_index) is True
+        assert engine.state_service.verify_head_state(campaign) is True
+
+
+class TestBenchmarkPatchesCommand:
+    """Tests for the benchmark_patches management command."""
+
+    def test_runs_and_states_match(self):
+        """Test a small benchmark run completes with matching final states."""
+        out = StringIO()
+
+        call_command(
+            "benchmark_patches", "--turns", "20", "--npcs", "10", "--repeat", "1", stdout=out
+        )
+
+        output = out.getvalue()
+        assert "replay: patch engine" in output
+        assert "Final states match" in output
@@ -0,0 +1,123 @@
+"""
+Tests for the rendered prompt cache.
+
+Tests cache hits and fingerprint misses, invalidation from save signals,
+and that the advancing universe time stays out of the cached prompt.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.prompt_builder import PromptBuilder, UniversePrompt
+from apps.campaigns.services.prompt_cache import cached_prompt, universe_prompt_key
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="prompts@example.com",
+        password="testpass123",
+        username="prompts",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(
+        user=user,
+        name="Cached Realm",
+        tone_profile_json={"grimdark_cozy": 0.4},
+        current_universe_time={"year": 12, "month": 3, "day": 4},
+    )
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Wren",
+        species="Human",
+        character_class="Rogue",
+        background="Urchin",
+        level=1,
+        ability_scores_json={"str": 10, "dex": 16, "con": 12, "int": 12, "wis": 10, "cha": 14},
+    )
+    return Campaign.objects.create(
+        user=user, universe=universe, character_sheet=character, title="Cached Campaign"
+    )
+
+
+@pytest.fixture
+def builder():
+    return PromptBuilder(chroma_service=MagicMock(), summary_service=MagicMock())
+
+
+@pytest.mark.django_db
+class TestPromptCache:
+    """Tests for cached universe prompts and campaign setups."""
+
+    def test_cached_prompt_fingerprint(self):
+        """Test a matching fingerprint is a hit and a changed one re-renders."""
+        render = MagicMock(side_effect=["first", "second"])
+
+        assert cached_prompt("prompt:test", "v1", render) == "first"
+        assert cached_prompt("prompt:test", "v1", render) == "first"
+        assert cached_prompt("prompt:test", "v2", render) == "second"
+        assert render.call_count == 2
+
+    def test_universe_prompt_rendered_once(self, campaign, builder):
+        """Test the universe prompt is served from the cache after the first build."""
+        universe = campaign.universe
+        first = builder.build_universe_prompt(universe)
+
+        with patch.object(UniversePrompt, "build") as build:
+            assert builder.build_universe_prompt(universe) == first
+        build.assert_not_called()
+
+    def test_universe_save_invalidates(self, campaign, builder):
+        """Test saving the universe drops and re-renders its prompt."""
+        universe = campaign.universe
+        builder.build_universe_prompt(universe)
+
+        universe.description = "A drowned kingdom."
+        universe.save()
+
+        assert cache.get(universe_prompt_key(universe.id)) is None
+        assert "A drowned kingdom." in builder.build_universe_prompt(universe)
+
+    def test_time_advance_keeps_universe_prompt(self, campaign, builder):
+        """Test the per-turn time save leaves the cached prompt in place."""
+        universe = campaign.universe
+        prompt = builder.build_universe_prompt(universe)
+
+        universe.current_universe_time = {"year": 12, "month": 3, "day": 5}
+        universe.save(update_fields=["current_universe_time"])
+
+        assert "Current Universe Time" not in prompt
+        assert cache.get(universe_prompt_key(universe.id)) is not None
+        progress = builder.build_campaign_progress(campaign, {})
+        assert "### Current Universe Time" in progress
+
+    def test_character_save_invalidates_campaign_setup(self, campaign, builder):
+        """Test leveling the character re-renders the campaign setup."""
+        assert "Level 1 Human Rogue" in builder.build_campaign_setup(campaign)
+
+        character = campaign.character_sheet
+        character.level = 2
+        character.save()
+        campaign = Campaign.objects.get(id=campaign.id)
+
+        assert "Level 2 Human Rogue" in builder.build_campaign_setup(campaign)
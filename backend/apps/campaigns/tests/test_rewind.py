@@ -12,10 +12,11 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.models import Campaign, CampaignHeadState, CanonicalCampaignState, TurnEvent
 from apps.campaigns.services.rewind_service import RewindService
 from apps.characters.models import CharacterSheet
-from apps.lore.models import LoreChunk
+from apps.lore.models import LoreChunk, VectorOutboxEntry
+from apps.lore.services.vector_outbox import VectorOutbox
 from apps.universes.models import Universe
 
 User = get_user_model()
@@ -222,7 +223,7 @@ class TestRewindServiceExecution:
     def test_rewind_deletes_turns_after_target(self, mock_lore_service, db, campaign_with_turns):
         """Test that rewind deletes all turns after target."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=2)
@@ -236,7 +237,7 @@ class TestRewindServiceExecution:
     def test_rewind_deletes_snapshots_after_target(self, mock_lore_service, db, campaign_with_turns):
         """Test that rewind deletes snapshots after target."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=1)
@@ -249,7 +250,7 @@ class TestRewindServiceExecution:
     def test_rewind_to_zero_deletes_all_turns(self, mock_lore_service, db, campaign_with_turns):
         """Test that rewinding to 0 deletes all turns."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=0)
@@ -263,19 +264,23 @@ class TestRewindServiceExecution:
         """Test that rewind calls lore invalidation for deleted turns."""
         campaign, turns = campaign_with_turns
         mock_instance = mock_lore_service.return_value
-        mock_instance.invalidate_turn_lore.return_value = 1
+        mock_instance.invalidate_turns_lore.return_value = 1
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=2)
 
         assert result.success
-        assert mock_instance.invalidate_turn_lore.call_count == 3  # Called for turns 3, 4, 5
+        # One batched call for turns 3, 4, 5
+        mock_instance.invalidate_turns_lore.assert_called_once()
+        _, turn_ids = mock_instance.invalidate_turns_lore.call_args.args
+        assert sorted(turn_ids) == sorted(str(turn.id) for turn in turns[2:])
+        assert result.lore_chunks_invalidated == 1
 
     @patch("apps.campaigns.services.rewind_service.LoreService")
     def test_rewind_returns_new_state(self, mock_lore_service, db, campaign_with_turns):
         """Test that rewind returns the new state after rewind."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=2)
@@ -285,6 +290,23 @@ class TestRewindServiceExecution:
         assert result.new_state.turn_index == 2
 
 
+    @patch("apps.campaigns.services.rewind_service.LoreService")
+    def test_rewind_resets_head_state(self, mock_lore_service, db, campaign_with_turns):
+        """Test that rewind moves the materialized head state to the target turn."""
+        campaign, turns = campaign_with_turns
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
+        CampaignHeadState.objects.create(
+            campaign=campaign, turn_index=5, state_json={"turn_index": 5}, state_hash="x"
+        )
+
+        service = RewindService()
+        result = service.rewind_to_turn(campaign, target_turn_index=2)
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.turn_index == 2
+        assert head.state_hash == result.new_state.compute_hash()
+        assert service.state_service.get_current_state(campaign).turn_index == 2
+
 class TestRewindServiceLoreIntegration:
     """Integration tests for rewind with actual lore service."""
 
@@ -308,6 +330,43 @@ class TestRewindServiceLoreIntegration:
         # Lore for turns 3, 4, 5 should be deleted
         assert LoreChunk.objects.filter(universe=campaign.universe).count() == 2
 
+    def test_rewind_batches_lore_invalidation(
+        self, db, campaign_with_lore, django_capture_on_commit_callbacks
+    ):
+        """Test rewind bumps the lore version once and defers ChromaDB cleanup."""
+        campaign, turns = campaign_with_lore
+        version = campaign.universe.canonical_lore_version
+
+        from apps.lore.services.lore_service import LoreService
+        lore_svc = LoreService()
+        lore_svc.chroma = MagicMock()
+
+        service = RewindService()
+        service.lore_service = lore_svc
+        rewound_chunks = {
+            str(pk)
+            for pk in LoreChunk.objects.filter(
+                source_ref__in=[str(turn.id) for turn in turns[2:]]
+            ).values_list("id", flat=True)
+        }
+        with (
+            patch.object(VectorOutbox, "schedule_drain") as schedule_drain,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            result = service.rewind_to_turn(campaign, target_turn_index=2)
+
+        assert result.lore_chunks_invalidated == 3
+        campaign.universe.refresh_from_db()
+        assert campaign.universe.canonical_lore_version == version + 1
+        # ChromaDB is not touched inside the rewind transaction
+        lore_svc.chroma.delete_documents_by_sources.assert_not_called()
+        lore_svc.chroma.delete_documents_by_source.assert_not_called()
+        schedule_drain.assert_called()
+        deletes = VectorOutboxEntry.objects.filter(
+            universe_id=campaign.universe.id, operation=VectorOutboxEntry.OP_DELETE
+        )
+        assert {entry.document_id for entry in deletes} == rewound_chunks
+
 
 # =============================================================================
 # API Endpoint Tests
@@ -330,7 +389,7 @@ class TestRewindEndpoint:
     def test_rewind_success(self, mock_lore_service, api_client, user, campaign_with_turns):
         """Test successful rewind via API."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         api_client.force_authenticate(user=user)
         response = api_client.post(
@@ -455,7 +514,7 @@ class TestRewindEdgeCases:
     def test_rewind_to_current_turn_no_op(self, mock_lore_service, db, campaign_with_turns):
         """Test rewinding to current turn is essentially a no-op."""
         campaign, turns = campaign_with_turns
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=5)
@@ -467,7 +526,7 @@ class TestRewindEdgeCases:
     @patch("apps.campaigns.services.rewind_service.LoreService")
     def test_rewind_empty_campaign(self, mock_lore_service, db, campaign):
         """Test rewinding campaign with no turns."""
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=0)
@@ -481,7 +540,7 @@ class TestRewindEdgeCases:
         campaign, turns = campaign_with_turns
         campaign.status = "paused"
         campaign.save()
-        mock_lore_service.return_value.invalidate_turn_lore.return_value = 0
+        mock_lore_service.return_value.invalidate_turns_lore.return_value = 0
 
         service = RewindService()
         result = service.rewind_to_turn(campaign, target_turn_index=2)
@@ -0,0 +1,232 @@
+"""
+Tests for delta-encoded, compressed snapshot storage.
+
+Tests the codec, keyframe/delta chaining in StateService, and the
+compact_snapshots management command.
+"""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.campaigns.models import Campaign, CanonicalCampaignState, TurnEvent
+from apps.campaigns.serializers import CanonicalStateSerializer
+from apps.campaigns.services.snapshot_codec import (
+    apply_diff,
+    compress_state,
+    decode_snapshot,
+    decompress_state,
+    diff_states,
+)
+from apps.campaigns.services.snapshot_policy import SnapshotPolicy
+from apps.campaigns.services.state_service import StateService
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="codec@example.com",
+        password="testpass123",
+        username="codec",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Codec Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Test Hero",
+        species="Human",
+        character_class="Fighter",
+        background="Soldier",
+        level=1,
+        ability_scores_json={"con": 12},
+    )
+    return Campaign.objects.create(
+        user=user,
+        universe=universe,
+        character_sheet=character,
+        title="Codec Campaign",
+    )
+
+
+@pytest.fixture
+def state_service():
+    """State service that snapshots every turn, with short keyframe chains."""
+    return StateService(
+        snapshot_policy=SnapshotPolicy(cost_threshold=1.0, keep_recent=100, keyframe_interval=3)
+    )
+
+
+def play_turns(state_service, campaign, count):
+    """Persist ``count`` turns that each add an NPC."""
+    state = state_service.get_current_state(campaign)
+    for _ in range(count):
+        turn_index = state.turn_index + 1
+        turn = TurnEvent.objects.create(
+            campaign=campaign,
+            turn_index=turn_index,
+            user_input_text=f"Action {turn_index}",
+            llm_response_text=f"Response {turn_index}",
+            state_patch_json={"world": {"npcs": {f"npc_{turn_index}": {"mood": "calm"}}}},
+            canonical_state_hash="0" * 64,
+        )
+        state = state_service.advance_state(state, turn)
+        state_service.record_turn(campaign, state, turn)
+    return state
+
+
+class TestSnapshotCodec:
+    """Tests for the diff and compression primitives."""
+
+    def test_diff_roundtrip(self):
+        """Test applying a diff reconstructs the target."""
+        base = {"world": {"npcs": {"bob": {"hp": 5}, "amy": {}}}, "flags": {"a": 1}, "t": [1]}
+        target = {"world": {"npcs": {"bob": {"hp": 3}, "cid": {}}}, "flags": {}, "t": [1, 2]}
+
+        ops = diff_states(base, target)
+
+        assert apply_diff(base, ops) == target
+        assert base["world"]["npcs"]["bob"]["hp"] == 5
+
+    def test_diff_is_structural(self):
+        """Test unchanged subtrees are not included in the diff."""
+        base = {"world": {"npcs": {f"npc_{i}": {"mood": "calm"} for i in range(50)}}}
+        target = {"world": {"npcs": {**base["world"]["npcs"], "new": {"mood": "angry"}}}}
+
+        assert diff_states(base, target) == [["set", ["world", "npcs", "new"], {"mood": "angry"}]]
+
+    def test_identical_states_have_empty_diff(self):
+        """Test no operations are produced for equal states."""
+        assert diff_states({"a": {"b": 1}}, {"a": {"b": 1}}) == []
+
+    def test_compression_roundtrip(self):
+        """Test compressed states decode to the original dict."""
+        state = {"world": {"npcs": {f"npc_{i}": {"mood": "calm"} for i in range(100)}}}
+
+        blob = compress_state(state)
+
+        assert decompress_state(blob) == state
+        assert len(blob) < len(str(state))
+
+    def test_unknown_operation(self):
+        """Test malformed diffs raise instead of silently corrupting state."""
+        with pytest.raises(ValueError):
+            apply_diff({}, [["move", ["a"], 1]])
+
+
+@pytest.mark.django_db
+class TestKeyframeSnapshots:
+    """Tests for keyframe/delta snapshots in StateService."""
+
+    def test_first_snapshot_is_compressed_keyframe(self, state_service, campaign):
+        """Test the first snapshot is a full zlib keyframe."""
+        state = state_service.get_initial_state(campaign)
+        snapshot = state_service.save_snapshot(campaign, state, force=True)
+
+        assert snapshot.is_keyframe is True
+        assert snapshot.encoding == "zlib"
+        assert snapshot.state_json is None
+        assert decode_snapshot(snapshot) == state.to_dict()
+
+    def test_intermediate_snapshots_are_deltas(self, state_service, campaign):
+        """Test snapshots between keyframes store diffs against their keyframe."""
+        state_service.save_snapshot(campaign, state_service.get_initial_state(campaign), force=True)
+        play_turns(state_service, campaign, 5)
+
+        snapshots = list(CanonicalCampaignState.objects.order_by("turn_index"))
+        assert [s.is_keyframe for s in snapshots] == [True, False, False, True, False, False]
+        assert snapshots[1].keyframe_id == snapshots[0].id
+        assert snapshots[4].keyframe_id == snapshots[3].id
+        assert len(snapshots[2].delta_json) == 3
+
+    def test_replay_from_delta(self, state_service, campaign):
+        """Test replay reconstructs state transparently from a delta snapshot."""
+        state_service.save_snapshot(campaign, state_service.get_initial_state(campaign), force=True)
+        final_state = play_turns(state_service, campaign, 2)
+
+        result = state_service.replay_to_turn(campaign, 2)
+
+        assert result.from_snapshot is True
+        assert result.turns_replayed == 0
+        assert result.state.compute_hash() == final_state.compute_hash()
+        assert state_service.verify_head_state(campaign) is True
+
+    def test_thinning_keeps_referenced_keyframes(self, campaign):
+        """Test a keyframe is not thinned while a retained delta depends on it."""
+        policy = SnapshotPolicy(
+            cost_threshold=1.0, keep_recent=1, keyframe_interval=1, max_delta_ratio=10.0
+        )
+        service = StateService(snapshot_policy=policy)
+        service.save_snapshot(campaign, service.get_initial_state(campaign), force=True)
+        play_turns(service, campaign, 5)
+        policy.keyframe_interval = 50
+        play_turns(service, campaign, 15)
+
+        keyframe = CanonicalCampaignState.objects.get(turn_index=5)
+        deltas = CanonicalCampaignState.objects.filter(is_keyframe=False)
+        assert keyframe.is_keyframe is True
+        assert deltas.exists()
+        assert set(deltas.values_list("keyframe_id", flat=True)) == {keyframe.id}
+        assert service.replay_to_turn(campaign, 20).success is True
+
+    def test_serializer_decodes_state(self, state_service, campaign):
+        """Test the snapshot serializer exposes the full decoded state."""
+        state_service.save_snapshot(campaign, state_service.get_initial_state(campaign), force=True)
+        state = play_turns(state_service, campaign, 1)
+
+        snapshot = CanonicalCampaignState.objects.get(turn_index=1)
+        data = CanonicalStateSerializer(snapshot).data
+
+        assert data["is_keyframe"] is False
+        assert data["state_json"] == state.to_dict()
+
+
+@pytest.mark.django_db
+class TestCompactSnapshotsCommand:
+    """Tests for the compact_snapshots management command."""
+
+    def _legacy_rows(self, state_service, campaign, count):
+        state = state_service.get_initial_state(campaign)
+        expected = {}
+        for turn_index in range(count):
+            state.turn_index = turn_index
+            state.global_flags = {f"flag_{turn_index}": True}
+            CanonicalCampaignState.objects.create(
+                campaign=campaign, turn_index=turn_index, state_json=state.to_dict()
+            )
+            expected[turn_index] = state.to_dict()
+        return expected
+
+    def test_converts_legacy_rows(self, campaign):
+        """Test uncompressed rows are rewritten without changing their content."""
+        expected = self._legacy_rows(StateService(), campaign, 4)
+        out = StringIO()
+
+        call_command("compact_snapshots", stdout=out)
+
+        snapshots = CanonicalCampaignState.objects.select_related("keyframe").order_by("turn_index")
+        assert snapshots[0].encoding == "zlib"
+        assert snapshots[0].state_json is None
+        assert any(not s.is_keyframe for s in snapshots)
+        for snapshot in snapshots:
+            assert decode_snapshot(snapshot) == expected[snapshot.turn_index]
+        assert "Converted 4 snapshots across 1 campaigns" in out.getvalue()
+
+    def test_dry_run(self, campaign):
+        """Test dry run leaves rows untouched."""
+        self._legacy_rows(StateService(), campaign, 2)
+
+        call_command("compact_snapshots", "--dry-run", stdout=StringIO())
+
+        assert not CanonicalCampaignState.objects.exclude(encoding="json").exists()
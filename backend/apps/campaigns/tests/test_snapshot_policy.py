@@ -0,0 +1,202 @@
+"""
+Tests for the cost-based snapshot policy.
+
+Tests scheduling, logarithmic thinning, and StateService integration.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.campaigns.models import Campaign, CampaignHeadState, CanonicalCampaignState, TurnEvent
+from apps.campaigns.services.snapshot_policy import ReplayCost, SnapshotPolicy, measure_turn
+from apps.campaigns.services.state_service import StateService
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="snapshots@example.com",
+        password="testpass123",
+        username="snapshots",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Snapshot Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Test Hero",
+        species="Human",
+        character_class="Fighter",
+        background="Soldier",
+        level=1,
+        ability_scores_json={"con": 12},
+    )
+    return Campaign.objects.create(
+        user=user,
+        universe=universe,
+        character_sheet=character,
+        title="Snapshot Campaign",
+    )
+
+
+def make_turn(campaign, turn_index, patch, save=True):
+    """Build (and by default persist) a turn event."""
+    turn = TurnEvent(
+        campaign=campaign,
+        turn_index=turn_index,
+        user_input_text=f"Action {turn_index}",
+        llm_response_text=f"Response {turn_index}",
+        state_patch_json=patch,
+        canonical_state_hash="0" * 64,
+    )
+    if save:
+        turn.save()
+    return turn
+
+
+class TestSnapshotPolicy:
+    """Tests for SnapshotPolicy scheduling and thinning."""
+
+    def test_measure_turn(self):
+        """Test per-turn cost counts bytes and merge operations."""
+        turn = make_turn(None, 1, {"world": {"npcs": {"bob": {"mood": "angry"}}}}, save=False)
+
+        cost = measure_turn(turn)
+
+        assert cost.turns == 1
+        assert cost.patch_bytes == len('{"world":{"npcs":{"bob":{"mood":"angry"}}}}')
+        assert cost.merge_ops == 3
+
+    def test_measure_turn_patch_list(self):
+        """Test each entry in a patches list counts as one operation."""
+        patch = {"patches": [{"op": "set", "path": "/a", "value": 1}] * 4}
+        turn = make_turn(None, 1, patch, save=False)
+
+        assert measure_turn(turn).merge_ops == 4
+
+    def test_small_patches_snapshot_by_turn_count(self):
+        """Test tiny patches only trigger a snapshot after many turns."""
+        policy = SnapshotPolicy(cost_threshold=10.0)
+
+        assert policy.should_snapshot(ReplayCost(turns=9, patch_bytes=100)) is False
+        assert policy.should_snapshot(ReplayCost(turns=10, patch_bytes=100)) is True
+
+    def test_large_patches_snapshot_early(self):
+        """Test heavy patches trigger a snapshot after few turns."""
+        policy = SnapshotPolicy(cost_threshold=10.0)
+
+        assert policy.should_snapshot(ReplayCost(turns=2, patch_bytes=16 * 1024)) is True
+
+    def test_max_turns_fallback(self):
+        """Test the turn ceiling applies even when weights make turns free."""
+        policy = SnapshotPolicy(turn_weight=0.0, max_turns=5)
+
+        assert policy.should_snapshot(ReplayCost(turns=5)) is True
+
+    def test_no_snapshot_without_turns(self):
+        """Test nothing is due when no turns were replayed."""
+        assert SnapshotPolicy().should_snapshot(ReplayCost()) is False
+
+    def test_thinning_is_logarithmic(self):
+        """Test retained snapshots grow with log(turns), keeping base and recent."""
+        policy = SnapshotPolicy(keep_recent=3)
+        snapshot_turns = list(range(0, 1001, 10))
+
+        stale = policy.snapshots_to_thin(snapshot_turns, head_turn=1000)
+        kept = sorted(set(snapshot_turns) - set(stale))
+
+        assert 0 in kept
+        assert kept[-3:] == [980, 990, 1000]
+        assert len(kept) <= 3 + 1 + (1000).bit_length()
+
+    def test_thinning_keeps_few_snapshots(self):
+        """Test nothing is thinned while under the recent limit."""
+        policy = SnapshotPolicy(keep_recent=3)
+
+        assert policy.snapshots_to_thin([0, 10, 20], head_turn=20) == []
+
+
+@pytest.mark.django_db
+class TestStateServiceSnapshots:
+    """Tests for cost-based snapshots in StateService."""
+
+    @pytest.fixture
+    def state_service(self):
+        return StateService(snapshot_policy=SnapshotPolicy(cost_threshold=3.0, keep_recent=2))
+
+    def _play(self, state_service, campaign, count, patch):
+        state = state_service.get_current_state(campaign)
+        for _ in range(count):
+            turn = make_turn(campaign, state.turn_index + 1, patch)
+            state = state_service.advance_state(state, turn)
+            state_service.record_turn(campaign, state, turn)
+        return state
+
+    def test_record_turn_accumulates_cost(self, state_service, campaign):
+        """Test the head tracks cost until a snapshot is due."""
+        self._play(state_service, campaign, 2, {"global_flags": {"a": True}})
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.turns_since_snapshot == 2
+        assert head.patch_bytes_since_snapshot > 0
+        assert not CanonicalCampaignState.objects.filter(campaign=campaign).exists()
+
+    def test_record_turn_snapshots_when_due(self, state_service, campaign):
+        """Test a snapshot is written and counters reset at the threshold."""
+        self._play(state_service, campaign, 3, {"global_flags": {"a": True}})
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.last_snapshot_turn == 3
+        assert head.turns_since_snapshot == 0
+        assert CanonicalCampaignState.objects.get(campaign=campaign).turn_index == 3
+
+    def test_heavy_patches_snapshot_sooner(self, state_service, campaign):
+        """Test large patches reach the threshold in fewer turns."""
+        self._play(state_service, campaign, 1, {"world": {"lore": "x" * 4096}})
+
+        assert CanonicalCampaignState.objects.filter(campaign=campaign, turn_index=1).exists()
+
+    def test_old_snapshots_are_thinned(self, state_service, campaign):
+        """Test snapshot storage stays bounded as turns accumulate."""
+        state_service.save_snapshot(campaign, state_service.get_initial_state(campaign), force=True)
+        self._play(state_service, campaign, 60, {"global_flags": {"a": True}})
+
+        snapshot_turns = sorted(
+            CanonicalCampaignState.objects.filter(campaign=campaign).values_list(
+                "turn_index", flat=True
+            )
+        )
+        assert snapshot_turns[0] == 0
+        assert snapshot_turns[-1] == 60
+        assert len(snapshot_turns) < 60 // 3
+        assert state_service.verify_head_state(campaign) is True
+
+    def test_replay_reports_cost(self, state_service, campaign):
+        """Test replay results carry the cost of the replayed turns."""
+        make_turn(campaign, 1, {"global_flags": {"a": True}})
+        make_turn(campaign, 2, {"global_flags": {"b": True}})
+
+        result = state_service.replay_to_turn(campaign)
+
+        assert result.cost.turns == 2
+        assert result.snapshot_turn_index == 0
+
+    def test_replay_stats(self, state_service, campaign):
+        """Test replay stats expose the counters and policy settings."""
+        self._play(state_service, campaign, 4, {"global_flags": {"a": True}})
+
+        stats = state_service.get_state_for_response(campaign)["replay_stats"]
+
+        assert stats["last_snapshot_turn"] == 3
+        assert stats["since_snapshot"]["turns"] == 1
+        assert stats["cost_threshold"] == 3.0
+        assert stats["snapshot_turns"] == [3]
@@ -0,0 +1,254 @@
+"""
+Tests for Merkle state hashing.
+
+Tests the hash tree, incremental updates, and turn-range verification.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.campaigns.models import Campaign, CampaignHeadState, TurnEvent
+from apps.campaigns.services.state_hash import StateHashTree, merge_paths
+from apps.campaigns.services.state_service import StateService
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="hashing@example.com",
+        password="testpass123",
+        username="hashing",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Hash Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Test Hero",
+        species="Human",
+        character_class="Fighter",
+        background="Soldier",
+        level=1,
+        ability_scores_json={"con": 12},
+    )
+    return Campaign.objects.create(
+        user=user,
+        universe=universe,
+        character_sheet=character,
+        title="Hash Campaign",
+    )
+
+
+def sample_state():
+    return {
+        "turn_index": 0,
+        "character_state": {"hp": {"current": 10, "max": 10}, "conditions": []},
+        "world_state": {
+            "npcs": {"bob": {"mood": "calm"}, "amy": {"mood": "wary"}},
+            "factions": {},
+            "weather": "rain",
+        },
+        "global_flags": {"met_king": False},
+    }
+
+
+class TestStateHashTree:
+    """Tests for StateHashTree."""
+
+    def test_build_is_deterministic(self):
+        """Test equal states hash equally regardless of key order."""
+        state = sample_state()
+        reordered = dict(reversed(list(state.items())))
+
+        assert StateHashTree.build(state).root_hash == StateHashTree.build(reordered).root_hash
+
+    def test_any_change_changes_root(self):
+        """Test a change to a nested entity changes the root hash."""
+        state = sample_state()
+        changed = sample_state()
+        changed["world_state"]["npcs"]["bob"]["mood"] = "angry"
+
+        assert StateHashTree.build(state).root_hash != StateHashTree.build(changed).root_hash
+
+    def test_incremental_update_matches_full_build(self):
+        """Test updating along touched paths gives the same root as a rebuild."""
+        state = sample_state()
+        tree = StateHashTree.build(state)
+
+        state["world_state"]["npcs"]["bob"]["mood"] = "angry"
+        state["world_state"]["npcs"]["cid"] = {"mood": "new"}
+        del state["world_state"]["npcs"]["amy"]
+        state["character_state"]["hp"]["current"] = 4
+        state["turn_index"] = 1
+        tree = tree.update(
+            state,
+            [
+                ("world_state", "npcs", "bob", "mood"),
+                ("world_state", "npcs", "cid"),
+                ("world_state", "npcs", "amy"),
+                ("character_state", "hp"),
+                ("turn_index",),
+            ],
+        )
+
+        assert tree.root_hash == StateHashTree.build(state).root_hash
+
+    def test_update_shares_untouched_subtrees(self):
+        """Test nodes off the touched path are reused, not rehashed."""
+        state = sample_state()
+        tree = StateHashTree.build(state)
+
+        state["global_flags"]["met_king"] = True
+        updated = tree.update(state, [("global_flags", "met_king")])
+
+        assert updated.to_dict()["c"]["world_state"] is tree.to_dict()["c"]["world_state"]
+
+    def test_sections_update_matches_full_build(self):
+        """Test a tree cut down to section hashes still updates correctly."""
+        state = sample_state()
+        sections = StateHashTree.build(state).sections()
+        assert sections.root_hash == StateHashTree.build(state).root_hash
+        assert sections.to_dict()["c"]["world_state"] == {
+            "h": StateHashTree.build(state).to_dict()["c"]["world_state"]["h"]
+        }
+
+        state["world_state"]["npcs"]["bob"]["mood"] = "angry"
+        updated = sections.update(state, [("world_state", "npcs", "bob", "mood")])
+
+        assert updated.root_hash == StateHashTree.build(state).root_hash
+
+    def test_diff_reports_changed_paths(self):
+        """Test diff narrows a mismatch down to the changed entity."""
+        state = sample_state()
+        changed = sample_state()
+        changed["world_state"]["npcs"]["bob"]["mood"] = "angry"
+
+        diff = StateHashTree.build(state).diff(StateHashTree.build(changed))
+
+        assert diff == [("world_state", "npcs", "bob")]
+
+    def test_roundtrip_through_json(self):
+        """Test trees survive storage as JSON."""
+        tree = StateHashTree.build(sample_state())
+
+        assert StateHashTree.from_dict(tree.to_dict()).root_hash == tree.root_hash
+
+    def test_merge_paths(self):
+        """Test merge paths stop at the tree's leaves."""
+        paths = merge_paths(
+            ("world_state",),
+            {"npcs": {"bob": {"mood": "angry"}}, "weather": {"kind": "snow"}},
+        )
+
+        assert paths == [("world_state", "npcs", "bob"), ("world_state", "weather")]
+
+
+@pytest.mark.django_db
+class TestTurnHashVerification:
+    """Tests for turn hash persistence and range verification."""
+
+    @pytest.fixture
+    def state_service(self):
+        return StateService()
+
+    def _play(self, state_service, campaign, patches):
+        state = state_service.get_current_state(campaign)
+        for patch in patches:
+            turn = TurnEvent(
+                campaign=campaign,
+                turn_index=state.turn_index + 1,
+                user_input_text="Act",
+                llm_response_text="Result",
+                state_patch_json=patch,
+            )
+            new_state = state_service.advance_state(state, turn)
+            tree = state_service.hash_turn(campaign, state, new_state, turn)
+            turn.canonical_state_hash = tree.root_hash
+            turn.save()
+            state_service.record_turn(campaign, new_state, turn, hash_tree=tree)
+            state = new_state
+        return state
+
+    def test_incremental_head_hash_matches_full_hash(self, state_service, campaign):
+        """Test the incrementally maintained head hash equals a full rehash."""
+        state = self._play(
+            state_service,
+            campaign,
+            [
+                {"world": {"npcs": {"bob": {"mood": "calm"}}}},
+                {"character": {"hp": {"current": 3}}},
+                {"global_flags": {"door_open": True}},
+            ],
+        )
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.state_hash == state.compute_hash()
+        assert state_service.verify_head_state(campaign) is True
+
+    def test_verify_turn_range(self, state_service, campaign):
+        """Test a range of valid turns verifies."""
+        self._play(state_service, campaign, [{"global_flags": {f"f{i}": True}} for i in range(5)])
+
+        result = state_service.verify_turn_range(campaign, 2, 4)
+
+        assert result.valid is True
+        assert result.turns_checked == 3
+        assert state_service.verify_state_hash(campaign, 5) is True
+
+    def test_verify_turn_range_detects_tampering(self, state_service, campaign):
+        """Test a rewritten patch is reported at the turn it changed."""
+        self._play(state_service, campaign, [{"global_flags": {f"f{i}": True}} for i in range(4)])
+        TurnEvent.objects.filter(campaign=campaign, turn_index=3).update(
+            state_patch_json={"global_flags": {"forged": True}}
+        )
+
+        result = state_service.verify_turn_range(campaign, 1)
+
+        assert result.valid is False
+        assert [m["turn_index"] for m in result.mismatches] == [3, 4]
+
+    def test_head_stores_section_hashes(self, state_service, campaign):
+        """Test the head keeps only the root and section hashes."""
+        self._play(state_service, campaign, [{"world": {"npcs": {"bob": {"mood": "calm"}}}}])
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert head.hash_tree["h"] == head.state_hash
+        assert all(set(node) == {"h"} for node in head.hash_tree["c"].values())
+
+    def test_verify_skips_turns_before_merkle_hashing(self, state_service, campaign):
+        """Test turns stored with the old hash format are replayed but not checked."""
+        self._play(state_service, campaign, [{"global_flags": {f"f{i}": True}} for i in range(3)])
+        TurnEvent.objects.filter(campaign=campaign, turn_index__lte=2).update(
+            canonical_state_hash="0" * 64, merkle_hash=False
+        )
+
+        result = state_service.verify_turn_range(campaign, 1)
+
+        assert result.valid is True
+        assert result.turns_checked == 1
+        assert result.turns_skipped == 2
+
+    def test_persist_turn_stores_state_hash(self, campaign):
+        """Test persisted turns carry the Merkle root of the state they produce."""
+        from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+
+        engine = TurnEngine(chroma_service=MagicMock())
+        current_state = engine.state_service.get_current_state(campaign)
+        request = TurnRequest(campaign=campaign, user_input="I wait", llm_config=MagicMock())
+
+        turn = engine._persist_turn(request, current_state, "Time passes.", {"patches": []}, [])
+
+        head = CampaignHeadState.objects.get(campaign=campaign)
+        assert turn.canonical_state_hash == head.state_hash
+        assert engine.state_service.verify_state_hash(campaign, turn.turn_index) is True
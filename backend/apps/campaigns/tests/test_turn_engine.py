@@ -4,12 +4,21 @@ Tests for the turn engine.
 Tickets: 8.2.1, 8.2.2, 8.2.3
 """
 
+import asyncio
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+from apps.campaigns.services.async_turn_engine import AsyncTurnEngine
+from apps.campaigns.services.llm_client import LLMResponse, LLMStreamChunk
+from apps.campaigns.services.state_service import CampaignState
 from apps.campaigns.services.turn_engine import (
+    DMTextStreamFilter,
     LLMResponseParser,
     MechanicsExecutor,
     RollResult,
+    TurnEngine,
     TurnPhase,
+    TurnRequest,
+    TurnStreamEvent,
 )
 
 
@@ -285,3 +294,260 @@ class TestRollResult:
         assert d["total"] == 13
         assert d["success"] is False
         assert d["dc"] == 15
+
+
+class TestDMTextStreamFilter:
+    """Tests for DMTextStreamFilter."""
+
+    RESPONSE = (
+        "DM_TEXT:\nThe tavern falls silent as you enter.\n\n"
+        'DM_JSON:\n{"roll_requests": [], "patches": []}'
+    )
+
+    def _feed_in_pieces(self, text: str, size: int) -> str:
+        text_filter = DMTextStreamFilter()
+        out = "".join(text_filter.feed(text[i:i + size]) for i in range(0, len(text), size))
+        return out + text_filter.flush()
+
+    def test_extracts_narration(self):
+        """Test narration is released and DM_JSON is withheld."""
+        assert self._feed_in_pieces(self.RESPONSE, 1000) == "The tavern falls silent as you enter."
+
+    def test_markers_split_across_deltas(self):
+        """Test markers split across deltas are still recognised."""
+        for size in (1, 2, 3, 5, 7):
+            out = self._feed_in_pieces(self.RESPONSE, size)
+            assert out == "The tavern falls silent as you enter."
+
+    def test_releases_text_incrementally(self):
+        """Test narration is released before the response completes."""
+        text_filter = DMTextStreamFilter()
+        assert text_filter.feed("DM_TEXT:\n") == ""
+        released = text_filter.feed("You draw your sword and step forward.")
+        assert released.startswith("You draw your sword")
+
+    def test_json_only_response(self):
+        """Test a response without DM_TEXT releases nothing."""
+        assert self._feed_in_pieces('DM_JSON:\n{"patches": []}', 4) == ""
+
+
+def _stream(text: str, size: int = 6):
+    """Build a fake chat_stream that yields text in small deltas."""
+
+    def fake_chat_stream(self, messages, temperature=None, max_tokens=None, **kwargs):
+        for i in range(0, len(text), size):
+            yield LLMStreamChunk(content=text[i:i + size])
+
+    return fake_chat_stream
+
+
+class TestProcessTurnStream:
+    """Tests for TurnEngine.process_turn_stream."""
+
+    def _make_engine(self):
+        state_service = MagicMock()
+        state_service.get_current_state.return_value = CampaignState(
+            campaign_id="c1", turn_index=0, character_state={"abilities": {"dex": 14}}
+        )
+        prompt_builder = MagicMock()
+        prompt_builder.build_system_prompt.return_value = "system"
+        prompt_builder.build_full_context.return_value = "context"
+        engine = TurnEngine(
+            state_service=state_service, prompt_builder=prompt_builder, mechanics_seed=1
+        )
+        engine._persist_turn = MagicMock(return_value=None)
+        return engine
+
+    def _make_request(self):
+        return TurnRequest(campaign=MagicMock(), user_input="I look around", llm_config=MagicMock())
+
+    def test_streams_tokens_then_result(self):
+        """Test narration tokens are streamed and the turn is persisted."""
+        engine = self._make_engine()
+        response = (
+            "DM_TEXT:\nDust drifts through the abandoned hall.\n\n"
+            'DM_JSON:\n{"roll_requests": [], "patches": [], "lore_deltas": []}'
+        )
+
+        with patch(
+            "apps.campaigns.services.turn_engine.LLMClient.chat_stream", _stream(response)
+        ):
+            events = list(engine.process_turn_stream(self._make_request()))
+
+        tokens = [e for e in events if e.event == "token"]
+        assert "".join(e.data["text"] for e in tokens) == "Dust drifts through the abandoned hall."
+        assert all(e.data["stage"] == "proposal" for e in tokens)
+        assert not any("DM_JSON" in e.data["text"] for e in tokens)
+
+        assert events[-1].event == "result"
+        assert events[-1].data["success"] is True
+        assert events[-1].data["phase"] == TurnPhase.PERSISTED.value
+        engine._persist_turn.assert_called_once()
+
+    def test_streams_final_narration_after_rolls(self):
+        """Test roll results are emitted and final narration is streamed."""
+        engine = self._make_engine()
+        responses = iter([
+            "DM_TEXT:\nYou try to sneak.\n\nDM_JSON:\n"
+            '{"roll_requests": [{"id": "r1", "type": "ability_check", "ability": "dex", '
+            '"dc": 10}], "patches": []}',
+            'DM_TEXT:\nThe guard never notices.\n\nDM_JSON:\n{"patches": []}',
+        ])
+
+        def fake_chat_stream(self, messages, temperature=None, max_tokens=None, **kwargs):
+            yield LLMStreamChunk(content=next(responses))
+
+        with patch(
+            "apps.campaigns.services.turn_engine.LLMClient.chat_stream", fake_chat_stream
+        ):
+            events = list(engine.process_turn_stream(self._make_request()))
+
+        kinds = [e.event for e in events]
+        assert kinds.index("rolls") < kinds.index("result")
+        final_tokens = [
+            e.data["text"] for e in events if e.event == "token" and e.data["stage"] == "final"
+        ]
+        assert "".join(final_tokens) == "The guard never notices."
+        assert events[-1].data["dm_text"] == "The guard never notices."
+
+    def test_unparseable_proposal_fails(self):
+        """Test a proposal without DM_TEXT ends in a failed result event."""
+        engine = self._make_engine()
+
+        with patch(
+            "apps.campaigns.services.turn_engine.LLMClient.chat_stream", _stream("no markers")
+        ):
+            events = list(engine.process_turn_stream(self._make_request()))
+
+        assert events[-1].event == "result"
+        assert events[-1].data["success"] is False
+        assert events[-1].data["phase"] == TurnPhase.FAILED.value
+        engine._persist_turn.assert_not_called()
+
+    def test_stream_event_to_sse(self):
+        """Test SSE formatting of stream events."""
+        event = TurnStreamEvent("token", {"stage": "proposal", "text": "Hi"})
+        assert event.to_sse() == 'event: token\ndata: {"stage": "proposal", "text": "Hi"}\n\n'
+
+
+class TestAsyncTurnEngine:
+    """Tests for AsyncTurnEngine."""
+
+    def _make_engine(self):
+        state_service = MagicMock()
+        state_service.get_current_state.return_value = CampaignState(
+            campaign_id="c1", turn_index=0, character_state={"abilities": {"dex": 14}}
+        )
+        prompt_builder = MagicMock()
+        prompt_builder.build_system_prompt.return_value = "system"
+        prompt_builder.build_universe_prompt.return_value = "universe"
+        prompt_builder.build_campaign_prompt.return_value = "campaign"
+        prompt_builder.abuild_lore_injection = AsyncMock(return_value="lore")
+        prompt_builder.assemble_context.return_value = "context"
+        engine = AsyncTurnEngine(
+            state_service=state_service, prompt_builder=prompt_builder, mechanics_seed=1
+        )
+        engine._persist_turn = MagicMock(return_value=None)
+        return engine
+
+    def _make_request(self):
+        return TurnRequest(campaign=MagicMock(), user_input="I look around", llm_config=MagicMock())
+
+    def test_process_turn(self):
+        """Test a turn is gathered, narrated and persisted."""
+        engine = self._make_engine()
+        response = LLMResponse(
+            content='DM_TEXT:\nThe hall is empty.\n\nDM_JSON:\n{"roll_requests": [], "patches": []}',
+            model="test-model",
+        )
+
+        with patch(
+            "apps.campaigns.services.async_turn_engine.AsyncLLMClient.chat",
+            AsyncMock(return_value=response),
+        ) as chat:
+            result = asyncio.run(engine.process_turn(self._make_request()))
+
+        assert result.success is True
+        assert result.phase == TurnPhase.PERSISTED
+        assert result.dm_text == "The hall is empty."
+        builder = engine.prompt_builder
+        builder.assemble_context.assert_called_once_with(
+            "universe",
+            builder.build_campaign_setup.return_value,
+            builder.build_campaign_progress.return_value,
+            "lore",
+            story_recap=builder.build_story_recap.return_value,
+            model=ANY,
+            user_input="I look around",
+            metrics=ANY,
+        )
+        builder.build_proposal_messages.assert_called_once_with("context", "I look around")
+        assert chat.call_args.args[0] is builder.build_proposal_messages.return_value
+        engine._persist_turn.assert_called_once()
+
+    def test_process_turn_with_rolls(self):
+        """Test final narration is requested after rolls."""
+        engine = self._make_engine()
+        responses = [
+            LLMResponse(
+                content="DM_TEXT:\nYou try to sneak.\n\nDM_JSON:\n"
+                '{"roll_requests": [{"id": "r1", "type": "ability_check", "ability": "dex", '
+                '"dc": 10}], "patches": []}',
+                model="test-model",
+            ),
+            LLMResponse(
+                content='DM_TEXT:\nNobody notices.\n\nDM_JSON:\n{"patches": []}',
+                model="test-model",
+            ),
+        ]
+
+        with patch(
+            "apps.campaigns.services.async_turn_engine.AsyncLLMClient.chat",
+            AsyncMock(side_effect=responses),
+        ) as chat:
+            result = asyncio.run(engine.process_turn(self._make_request()))
+
+        assert chat.await_count == 2
+        assert len(result.roll_results) == 1
+        assert result.dm_text == "Nobody notices."
+
+    def test_process_turn_repairs_invalid_output(self):
+        """Test invalid output is repaired through the shared repair steps."""
+        engine = self._make_engine()
+        responses = [
+            LLMResponse(
+                content="DM_TEXT:\nThe door bursts.\n\nDM_JSON:\n"
+                '{"roll_requests": [], "patches": [{"op": "explode", "path": "/door"}]}',
+                model="test-model",
+            ),
+            LLMResponse(
+                content='DM_TEXT:\nThe door creaks open.\n\nDM_JSON:\n{"patches": []}',
+                model="test-model",
+            ),
+        ]
+
+        with patch(
+            "apps.campaigns.services.async_turn_engine.AsyncLLMClient.chat",
+            AsyncMock(side_effect=responses),
+        ) as chat:
+            result = asyncio.run(engine.process_turn(self._make_request()))
+
+        assert chat.await_count == 2
+        assert result.success is True
+        assert result.dm_text == "The door creaks open."
+        assert result.metrics.llm_calls[-1].stage == "repair"
+        engine._persist_turn.assert_called_once()
+
+    def test_process_turn_unparseable_proposal(self):
+        """Test an unparseable proposal fails without persisting."""
+        engine = self._make_engine()
+
+        with patch(
+            "apps.campaigns.services.async_turn_engine.AsyncLLMClient.chat",
+            AsyncMock(return_value=LLMResponse(content="no markers", model="test-model")),
+        ):
+            result = asyncio.run(engine.process_turn(self._make_request()))
+
+        assert result.success is False
+        assert result.phase == TurnPhase.FAILED
+        engine._persist_turn.assert_not_called()
@@ -0,0 +1,323 @@
+"""
+Tests for turn metrics.
+
+Tests phase timing, token accounting, the Prometheus registry and
+/metrics/ endpoint, and metrics recording in the turn engines.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.campaigns.models import Campaign
+from apps.campaigns.services.async_turn_engine import AsyncTurnEngine
+from apps.campaigns.services.llm_client import LLMResponse, LLMStreamChunk
+from apps.campaigns.services.state_service import CampaignState, StateService
+from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+from apps.campaigns.services.turn_metrics import (
+    TURNS,
+    TurnMetrics,
+    cached_input_tokens,
+    usage_tokens,
+)
+from apps.characters.models import CharacterSheet
+from apps.universes.models import Universe
+from whispyrkeep.metrics import MetricsRegistry
+
+User = get_user_model()
+
+PROPOSAL = 'DM_TEXT:\nThe hall is empty.\n\nDM_JSON:\n{"roll_requests": [], "patches": []}'
+
+
+def _make_state_service():
+    state_service = MagicMock()
+    state_service.get_current_state.return_value = CampaignState(
+        campaign_id="c1", turn_index=0, character_state={"abilities": {"dex": 14}}
+    )
+    return state_service
+
+
+def _make_request():
+    return TurnRequest(campaign=MagicMock(), user_input="I look around", llm_config=MagicMock())
+
+
+class TestTurnMetrics:
+    """Tests for TurnMetrics."""
+
+    def test_nested_phases_are_exclusive(self):
+        """Test time in an inner phase is not counted again in the outer one."""
+        metrics = TurnMetrics()
+        start = time.perf_counter()
+        with metrics.phase("build_context"):
+            time.sleep(0.01)
+            with metrics.phase("lore_retrieval"):
+                time.sleep(0.02)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        assert metrics.phases_ms["lore_retrieval"] >= 20
+        assert metrics.phases_ms["build_context"] >= 10
+        assert sum(metrics.phases_ms.values()) <= wall_ms
+
+    def test_repeated_phase_accumulates(self):
+        """Test a phase entered twice records the sum of both."""
+        metrics = TurnMetrics()
+        metrics.add_phase("repair", 0.5)
+        metrics.add_phase("repair", 0.25)
+
+        assert metrics.phases_ms["repair"] == 750
+
+    def test_usage_tokens_formats(self):
+        """Test OpenAI and Anthropic usage dicts are both understood."""
+        assert usage_tokens({"prompt_tokens": 10, "completion_tokens": 3}) == (10, 3)
+        assert usage_tokens({"input_tokens": 7, "output_tokens": 2}) == (7, 2)
+        assert usage_tokens(None) == (0, 0)
+
+    def test_cached_input_tokens(self):
+        """Test prompt-cache hits are recorded, with Anthropic cache reads counted as input."""
+        metrics = TurnMetrics()
+        metrics.record_llm_call(
+            "proposal",
+            "m",
+            0.2,
+            {"prompt_tokens": 1500, "prompt_tokens_details": {"cached_tokens": 1024}},
+        )
+        metrics.record_llm_call(
+            "repair",
+            "m",
+            0.1,
+            {"input_tokens": 40, "cache_read_input_tokens": 900, "output_tokens": 5},
+        )
+
+        record = metrics.to_dict()
+        assert record["input_tokens"] == 1500 + 940
+        assert record["cached_input_tokens"] == 1024 + 900
+        assert cached_input_tokens(None) == 0
+
+    def test_to_dict_totals_tokens(self):
+        """Test the per-turn record sums tokens over all calls."""
+        metrics = TurnMetrics()
+        metrics.record_llm_call(
+            "proposal", "m", 0.2, {"prompt_tokens": 100, "completion_tokens": 20}
+        )
+        metrics.record_llm_call("repair", "m", 0.1, {"input_tokens": 50, "output_tokens": 5})
+
+        record = metrics.to_dict()
+        assert record["input_tokens"] == 150
+        assert record["output_tokens"] == 25
+        assert [call["stage"] for call in record["llm_calls"]] == ["proposal", "repair"]
+        assert record["llm_calls"][0]["duration_ms"] == 200
+
+    def test_observe_exports_to_registry(self):
+        """Test a finished turn increments the Prometheus counters."""
+        before = TURNS.value(outcome="failed")
+        TurnMetrics().observe(success=False)
+        assert TURNS.value(outcome="failed") == before + 1
+
+
+class TestMetricsRegistry:
+    """Tests for the Prometheus text registry."""
+
+    def test_render_counter_and_histogram(self):
+        """Test rendering in the Prometheus text exposition format."""
+        registry = MetricsRegistry()
+        counter = registry.counter("calls_total", "Calls.", ("stage",))
+        histogram = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(1, 5))
+        counter.inc(2, stage='a"b')
+        histogram.observe(0.5, stage="x")
+        histogram.observe(3, stage="x")
+
+        lines = registry.render().splitlines()
+        assert "# TYPE calls_total counter" in lines
+        assert 'calls_total{stage="a\\"b"} 2.0' in lines
+        assert 'latency_seconds_bucket{le="1.0",stage="x"} 1.0' in lines
+        assert 'latency_seconds_bucket{le="5.0",stage="x"} 2.0' in lines
+        assert 'latency_seconds_bucket{le="+Inf",stage="x"} 2.0' in lines
+        assert 'latency_seconds_sum{stage="x"} 3.5' in lines
+        assert 'latency_seconds_count{stage="x"} 2.0' in lines
+        assert counter.value(stage='a"b') == 2
+        assert histogram.count(stage="x") == 2
+
+    def test_labels_must_match(self):
+        """Test observing with the wrong labels is rejected."""
+        counter = MetricsRegistry().counter("calls_total", "Calls.", ("stage",))
+        with pytest.raises(ValueError):
+            counter.inc(model="x")
+
+    def test_reregistering_returns_same_metric(self):
+        """Test modules can share a metric by name, but not redefine it."""
+        registry = MetricsRegistry()
+        counter = registry.counter("calls_total", "Calls.", ("stage",))
+
+        assert registry.counter("calls_total", "Calls.", ("stage",)) is counter
+        with pytest.raises(ValueError):
+            registry.histogram("calls_total", "Calls.", ("stage",))
+
+    def test_multiprocess_render_aggregates_processes(self, tmp_path, monkeypatch):
+        """Test with a shared directory, render sums the values of every process."""
+        script = (
+            "from prometheus_client import Counter; "
+            "Counter('calls_total', 'Calls.', ('stage',)).labels(stage='x').inc(3)"
+        )
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", script], env=env, check=True)
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        lines = MetricsRegistry().render().splitlines()
+
+        assert 'calls_total{stage="x"} 6.0' in lines
+
+    def test_metrics_endpoint_with_token(self, settings):
+        """Test /metrics/ is served as Prometheus text to a scraper with the token."""
+        settings.METRICS_TOKEN = "scrape-secret"
+        TurnMetrics().observe(success=True)
+
+        response = APIClient().get("/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        assert 'whispyrkeep_turns_total{outcome="success"}' in response.content.decode()
+
+    def test_metrics_endpoint_restricted(self, settings):
+        """Test anonymous callers and wrong tokens are refused."""
+        settings.METRICS_TOKEN = "scrape-secret"
+        client = APIClient()
+
+        assert client.get("/metrics/").status_code == 403
+        assert client.get("/metrics/", HTTP_AUTHORIZATION="Bearer nope").status_code == 403
+
+        settings.METRICS_TOKEN = ""
+        assert client.get("/metrics/", HTTP_AUTHORIZATION="Bearer ").status_code == 403
+
+
+class TestEngineMetrics:
+    """Tests for metrics recorded by the turn engines."""
+
+    def _make_engine(self, engine_class=TurnEngine):
+        prompt_builder = MagicMock()
+        prompt_builder.build_system_prompt.return_value = "system"
+        prompt_builder.build_full_context.return_value = "context"
+        prompt_builder.build_universe_prompt.return_value = "universe"
+        prompt_builder.build_campaign_prompt.return_value = "campaign"
+        prompt_builder.abuild_lore_injection = AsyncMock(return_value="lore")
+        prompt_builder.assemble_context.return_value = "context"
+        engine = engine_class(
+            state_service=_make_state_service(), prompt_builder=prompt_builder, mechanics_seed=1
+        )
+        engine._persist_turn = MagicMock(return_value=None)
+        return engine
+
+    def test_process_turn_records_phases_and_tokens(self):
+        """Test a turn records its phases and the proposal call's usage."""
+        engine = self._make_engine()
+        response = LLMResponse(
+            content=PROPOSAL,
+            model="test-model",
+            usage={"prompt_tokens": 120, "completion_tokens": 30},
+        )
+
+        with patch("apps.campaigns.services.turn_engine.LLMClient.chat", return_value=response):
+            result = engine.process_turn(_make_request())
+
+        record = result.to_dict()["metrics"]
+        assert result.success is True
+        assert {"load_state", "build_context", "proposal", "validation", "persist"} <= set(
+            record["phases_ms"]
+        )
+        assert record["llm_calls"] == [
+            {
+                "stage": "proposal",
+                "model": "test-model",
+                "duration_ms": record["llm_calls"][0]["duration_ms"],
+                "input_tokens": 120,
+                "output_tokens": 30,
+                "cached_input_tokens": 0,
+            }
+        ]
+        # The metrics are handed to persistence for TurnEvent.metrics_json
+        assert engine._persist_turn.call_args.args[-1] is result.metrics
+
+    def test_streamed_turn_records_usage(self):
+        """Test usage reported in stream chunks is recorded."""
+        engine = self._make_engine()
+
+        def fake_chat_stream(self, messages, temperature=None, max_tokens=None, **kwargs):
+            yield LLMStreamChunk(content=PROPOSAL)
+            yield LLMStreamChunk(usage={"input_tokens": 80, "output_tokens": 12})
+
+        with patch("apps.campaigns.services.turn_engine.LLMClient.chat_stream", fake_chat_stream):
+            events = list(engine.process_turn_stream(_make_request()))
+
+        record = events[-1].data["metrics"]
+        assert record["input_tokens"] == 80
+        assert record["output_tokens"] == 12
+        assert record["llm_calls"][0]["stage"] == "proposal"
+
+    def test_async_turn_records_gathered_phases(self):
+        """Test the async engine times its concurrently gathered context phases."""
+        engine = self._make_engine(AsyncTurnEngine)
+        response = LLMResponse(content=PROPOSAL, model="test-model", usage={"input_tokens": 5})
+
+        with patch(
+            "apps.campaigns.services.async_turn_engine.AsyncLLMClient.chat",
+            AsyncMock(return_value=response),
+        ):
+            result = asyncio.run(engine.process_turn(_make_request()))
+
+        assert result.success is True
+        assert {"load_state", "lore_retrieval", "build_context", "proposal", "persist"} <= set(
+            result.metrics.phases_ms
+        )
+        assert result.metrics.input_tokens == 5
+
+    def test_llm_response_anthropic_usage(self):
+        """Test LLMResponse token properties read Anthropic usage keys."""
+        response = LLMResponse(content="", model="m", usage={"input_tokens": 9, "output_tokens": 4})
+
+        assert response.input_tokens == 9
+        assert response.output_tokens == 4
+        assert response.total_tokens == 13
+
+
+@pytest.mark.django_db
+class TestPersistedMetrics:
+    """Tests for TurnEvent.metrics_json."""
+
+    def test_persist_turn_stores_metrics(self):
+        """Test the per-turn record is stored on the TurnEvent."""
+        user = User.objects.create_user(
+            email="metrics@example.com", password="testpass123", username="metrics"
+        )
+        universe = Universe.objects.create(user=user, name="Metrics Universe")
+        character = CharacterSheet.objects.create(
+            user=user,
+            universe=universe,
+            name="Test Hero",
+            species="Human",
+            character_class="Fighter",
+            background="Soldier",
+            level=1,
+        )
+        campaign = Campaign.objects.create(
+            user=user, universe=universe, character_sheet=character, title="Metrics Campaign"
+        )
+        engine = TurnEngine(chroma_service=MagicMock())
+        state = StateService().get_current_state(campaign)
+        metrics = TurnMetrics()
+        metrics.record_llm_call("proposal", "m", 0.1, {"prompt_tokens": 40, "completion_tokens": 8})
+        request = TurnRequest(campaign=campaign, user_input="I wait", llm_config=MagicMock())
+
+        turn_event = engine._persist_turn(
+            request, state, "Time passes.", {"patches": []}, [], metrics
+        )
+
+        turn_event.refresh_from_db()
+        assert turn_event.metrics_json["input_tokens"] == 40
+        assert turn_event.metrics_json["llm_calls"][0]["stage"] == "proposal"
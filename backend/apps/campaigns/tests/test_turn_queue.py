@@ -0,0 +1,343 @@
+"""
+Tests for queued turns.
+
+Tests per-campaign job ordering, the turn_queue task, stale-state
+protection in turn persistence, and the queue/poll API.
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.campaigns.models import Campaign, TurnEvent, TurnJob
+from apps.campaigns.services.state_service import StateService
+from apps.campaigns.services.turn_engine import (
+    TurnConflictError,
+    TurnEngine,
+    TurnPhase,
+    TurnRequest,
+    TurnResult,
+)
+from apps.campaigns.services.turn_queue import TurnQueueService
+from apps.campaigns.tasks import process_turn_job
+from apps.characters.models import CharacterSheet
+from apps.llm_config.encryption import encrypt_api_key
+from apps.llm_config.models import LlmEndpointConfig
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+DELAY = "apps.campaigns.tasks.process_turn_job.delay"
+
+
+@pytest.fixture
+def user(db):
+    """Create test user."""
+    return User.objects.create_user(
+        email="queue@example.com",
+        password="testpass123",
+        username="queue",
+    )
+
+
+@pytest.fixture
+def campaign(user):
+    """Create test campaign."""
+    universe = Universe.objects.create(user=user, name="Queue Universe")
+    character = CharacterSheet.objects.create(
+        user=user,
+        universe=universe,
+        name="Test Hero",
+        species="Human",
+        character_class="Fighter",
+        background="Soldier",
+        level=1,
+        ability_scores_json={"con": 12},
+    )
+    return Campaign.objects.create(
+        user=user,
+        universe=universe,
+        character_sheet=character,
+        title="Queue Campaign",
+    )
+
+
+@pytest.fixture
+def llm_config(user):
+    return LlmEndpointConfig.objects.create(
+        user=user,
+        provider_name="openai",
+        api_key_encrypted=encrypt_api_key("sk-test"),
+        default_model="gpt-4o-mini",
+    )
+
+
+@pytest.fixture
+def engine():
+    return MagicMock(spec=TurnEngine)
+
+
+@pytest.fixture
+def service(engine):
+    return TurnQueueService(engine=engine)
+
+
+def make_job(campaign, llm_config, sequence, **kwargs):
+    return TurnJob.objects.create(
+        campaign=campaign,
+        sequence=sequence,
+        user_input=f"Action {sequence}",
+        llm_config=llm_config,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestTurnQueueService:
+    """Tests for TurnQueueService."""
+
+    def test_enqueue_numbers_and_dispatches(
+        self, service, campaign, llm_config, django_capture_on_commit_callbacks
+    ):
+        """Test jobs are numbered per campaign and dispatched after commit."""
+        with patch(DELAY) as delay, django_capture_on_commit_callbacks(execute=True):
+            first = service.enqueue(campaign, "I open the door", llm_config)
+            second = service.enqueue(campaign, "I step inside", llm_config)
+
+        assert (first.sequence, second.sequence) == (1, 2)
+        assert first.status == TurnJob.STATUS_PENDING
+        assert [c.args[0] for c in delay.call_args_list] == [str(first.id), str(second.id)]
+
+    def test_claim_waits_for_earlier_jobs(self, service, campaign, llm_config):
+        """Test a job is only claimed once earlier jobs have finished."""
+        first = make_job(campaign, llm_config, 1)
+        second = make_job(campaign, llm_config, 2)
+
+        assert service.claim(second.id) is None
+        assert service.claim(first.id).status == TurnJob.STATUS_PROCESSING
+        assert service.claim(first.id) is None
+        assert service.claim(second.id) is None
+
+        first.status = TurnJob.STATUS_COMPLETED
+        first.save()
+        assert service.claim(second.id).status == TurnJob.STATUS_PROCESSING
+
+    def test_claim_missing_job(self, service, db):
+        """Test claiming an unknown job is a no-op."""
+        import uuid
+
+        assert service.claim(uuid.uuid4()) is None
+
+    def test_stale_processing_job_expires(self, service, campaign, llm_config, settings):
+        """Test a job abandoned mid-turn stops blocking its campaign."""
+        settings.CAMPAIGN_TURN_JOB_TIMEOUT = 60
+        stale = make_job(
+            campaign,
+            llm_config,
+            1,
+            status=TurnJob.STATUS_PROCESSING,
+            started_at=timezone.now() - timedelta(minutes=5),
+        )
+        waiting = make_job(campaign, llm_config, 2)
+
+        assert service.claim(waiting.id) is not None
+
+        stale.refresh_from_db()
+        assert stale.status == TurnJob.STATUS_FAILED
+        assert stale.error_message == "Turn job timed out"
+
+    def test_expiry_dispatches_blocked_job(
+        self, service, campaign, llm_config, settings, django_capture_on_commit_callbacks
+    ):
+        """Test expiring a stale job dispatches the pending job it was blocking."""
+        settings.CAMPAIGN_TURN_JOB_TIMEOUT = 60
+        make_job(
+            campaign,
+            llm_config,
+            1,
+            status=TurnJob.STATUS_PROCESSING,
+            started_at=timezone.now() - timedelta(minutes=5),
+        )
+        blocked = make_job(campaign, llm_config, 2)
+        later = make_job(campaign, llm_config, 3)
+
+        with patch(DELAY) as delay, django_capture_on_commit_callbacks(execute=True):
+            assert service.claim(later.id) is None
+
+        delay.assert_called_once_with(str(blocked.id))
+
+    def test_sweep_expires_idle_campaigns(
+        self, service, campaign, llm_config, settings, django_capture_on_commit_callbacks
+    ):
+        """Test the periodic sweep unblocks a campaign with no new submissions."""
+        settings.CAMPAIGN_TURN_JOB_TIMEOUT = 60
+        stale = make_job(
+            campaign,
+            llm_config,
+            1,
+            status=TurnJob.STATUS_PROCESSING,
+            started_at=timezone.now() - timedelta(minutes=5),
+        )
+        blocked = make_job(campaign, llm_config, 2)
+
+        with patch(DELAY) as delay, django_capture_on_commit_callbacks(execute=True):
+            assert service.sweep_stale_jobs() == 1
+
+        stale.refresh_from_db()
+        assert stale.status == TurnJob.STATUS_FAILED
+        delay.assert_called_once_with(str(blocked.id))
+        assert service.sweep_stale_jobs() == 0
+
+    def test_run_records_result_and_dispatches_next(
+        self, service, engine, campaign, llm_config, django_capture_on_commit_callbacks
+    ):
+        """Test a finished job stores its TurnResult and hands off to the next job."""
+        first = make_job(campaign, llm_config, 1)
+        second = make_job(campaign, llm_config, 2)
+        turn_event = TurnEvent.objects.create(
+            campaign=campaign, turn_index=1, user_input_text="Action 1", llm_response_text="Ok"
+        )
+        engine.process_turn.return_value = TurnResult(
+            success=True, phase=TurnPhase.PERSISTED, dm_text="Ok", turn_event=turn_event
+        )
+
+        job = service.claim(first.id)
+        with patch(DELAY) as delay, django_capture_on_commit_callbacks(execute=True):
+            result = service.run(job)
+
+        first.refresh_from_db()
+        assert result.success is True
+        assert first.status == TurnJob.STATUS_COMPLETED
+        assert first.turn_event == turn_event
+        assert first.result_json["dm_text"] == "Ok"
+        assert engine.process_turn.call_args.args[0].user_input == "Action 1"
+        delay.assert_called_once_with(str(second.id))
+
+    def test_run_fails_for_inactive_campaign(self, service, engine, campaign, llm_config):
+        """Test a campaign ended after submission fails the job without an LLM call."""
+        job = service.claim(make_job(campaign, llm_config, 1).id)
+        campaign.status = "ended"
+        campaign.save()
+
+        result = service.run(job)
+
+        job.refresh_from_db()
+        assert result.success is False
+        assert job.status == TurnJob.STATUS_FAILED
+        assert "ended" in job.error_message
+        engine.process_turn.assert_not_called()
+
+    def test_task_processes_job(self, campaign, llm_config):
+        """Test the turn_queue task claims and runs a job."""
+        job = make_job(campaign, llm_config, 1)
+        result = TurnResult(success=False, phase=TurnPhase.FAILED, errors=["LLM error: boom"])
+
+        with patch(
+            "apps.campaigns.services.turn_queue.TurnEngine.process_turn", return_value=result
+        ):
+            outcome = process_turn_job(str(job.id))
+
+        job.refresh_from_db()
+        assert outcome["status"] == TurnJob.STATUS_FAILED
+        assert job.error_message == "LLM error: boom"
+
+    def test_task_skips_blocked_job(self, campaign, llm_config):
+        """Test the task leaves a job pending while an earlier one runs."""
+        make_job(campaign, llm_config, 1, status=TurnJob.STATUS_PROCESSING)
+        job = make_job(campaign, llm_config, 2, started_at=timezone.now())
+
+        outcome = process_turn_job(str(job.id))
+
+        job.refresh_from_db()
+        assert outcome["status"] == "not_claimed"
+        assert job.status == TurnJob.STATUS_PENDING
+
+
+@pytest.mark.django_db
+class TestPersistTurnConflict:
+    """Tests for stale-state protection in TurnEngine._persist_turn."""
+
+    def test_stale_state_is_rejected(self, campaign):
+        """Test a turn generated against an outdated state is not persisted."""
+        engine = TurnEngine(chroma_service=MagicMock())
+        stale_state = StateService().get_current_state(campaign)
+        TurnEvent.objects.create(
+            campaign=campaign, turn_index=1, user_input_text="Other", llm_response_text="Ok"
+        )
+        request = TurnRequest(campaign=campaign, user_input="I wait", llm_config=MagicMock())
+
+        with pytest.raises(TurnConflictError):
+            engine._persist_turn(request, stale_state, "Time passes.", {"patches": []}, [])
+
+        assert campaign.turns.count() == 1
+
+
+@pytest.mark.django_db
+class TestTurnJobAPI:
+    """Tests for queued turn submission and polling."""
+
+    @pytest.fixture
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_queue_turn(self, client, campaign, llm_config, django_capture_on_commit_callbacks):
+        """Test a queued turn returns 202 with a job to poll."""
+        with patch(DELAY) as delay, django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                f"/api/campaigns/{campaign.id}/turn/",
+                {"user_input": "I enter the cave", "queue": True},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = TurnJob.objects.get(id=response.data["job_id"])
+        assert job.user_input == "I enter the cave"
+        assert response.data["poll_url"] == f"/api/campaigns/{campaign.id}/turn-jobs/{job.id}/"
+        delay.assert_called_once_with(str(job.id))
+
+    def test_stream_and_queue_conflict(self, client, campaign, llm_config):
+        """Test stream and queue cannot be combined."""
+        response = client.post(
+            f"/api/campaigns/{campaign.id}/turn/",
+            {"user_input": "I enter the cave", "queue": True, "stream": True},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_poll_job(self, client, campaign, llm_config):
+        """Test polling returns the job's status and result."""
+        job = make_job(
+            campaign,
+            llm_config,
+            1,
+            status=TurnJob.STATUS_FAILED,
+            result_json={"success": False, "errors": ["LLM error: boom"]},
+        )
+
+        response = client.get(f"/api/campaigns/{campaign.id}/turn-jobs/{job.id}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "failed"
+        assert response.data["result"]["errors"] == ["LLM error: boom"]
+        assert response.data["turn_index"] is None
+
+    def test_poll_other_users_job(self, campaign, llm_config):
+        """Test jobs are only visible to the campaign owner."""
+        other = User.objects.create_user(
+            email="other-queue@example.com", password="testpass123", username="otherqueue"
+        )
+        client = APIClient()
+        client.force_authenticate(user=other)
+        job = make_job(campaign, llm_config, 1)
+
+        response = client.get(f"/api/campaigns/{campaign.id}/turn-jobs/{job.id}/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -4,13 +4,20 @@ Tests for the validation service.
 Ticket: 8.3.1
 """
 
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
 
 from apps.campaigns.services.validation import (
+    VALID_PATCH_PATHS,
+    VALUE_CHECKS,
     LLMOutputValidator,
     LoreDeltaValidator,
     PatchValidator,
     RollValidator,
     ValidationResult,
+    match_patch_path,
 )
 
 
@@ -276,6 +283,63 @@ class TestPatchValidator:
         assert result.valid is False
 
 
+    def test_npc_attitude_warning(self):
+        """Test unusual NPC attitudes warn without failing."""
+        validator = PatchValidator()
+        patch = {"op": "replace", "path": "/world/npcs/bob/attitude", "value": "smug"}
+
+        result = validator.validate_patch(patch)
+        assert result.valid is True
+        assert result.warnings == ["Unusual NPC attitude: smug"]
+
+    def test_value_checks_follow_template(self):
+        """Test value checks apply by matched template, not path suffix."""
+        validator = PatchValidator()
+        patch = {"op": "replace", "path": "/world/global_flags/status", "value": True}
+
+        result = validator.validate_patch(patch)
+        assert result.valid is True
+        assert result.warnings == []
+
+
+class TestMatchPatchPath:
+    """Tests for the combined patch path matcher."""
+
+    @pytest.mark.parametrize(
+        "path,template",
+        [
+            ("/party/player/hp/current", r"^/party/player/hp/current$"),
+            ("/party/player/conditions/2", r"^/party/player/conditions/\d+$"),
+            ("/world/quests/4/stage", r"^/world/quests/\d+/stage$"),
+            ("/world/npcs/bob/status", r"^/world/npcs/[^/]+/status$"),
+            ("/world/factions/guild/standing", r"^/world/factions/[^/]+/[^/]+$"),
+        ],
+    )
+    def test_returns_template(self, path, template):
+        """Test the matched VALID_PATCH_PATHS pattern is returned."""
+        assert match_patch_path(path) == template
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/invalid/path", "/party/player/hp", "/world/npcs/bob/status/extra", "party/player/hp"],
+    )
+    def test_rejects_disallowed(self, path):
+        """Test paths outside the allowed patterns do not match."""
+        assert match_patch_path(path) is None
+
+    def test_value_checks_keyed_by_templates(self):
+        """Test every value check is keyed by an allowed path pattern."""
+        assert set(VALUE_CHECKS) <= set(VALID_PATCH_PATHS)
+
+    def test_benchmark_command(self):
+        """Test the benchmark agrees with the per-pattern loop."""
+        out = StringIO()
+
+        call_command("benchmark_patch_validation", "--patches", "200", "--repeat", "1", stdout=out)
+
+        assert "Templates match" in out.getvalue()
+
+
 class TestLoreDeltaValidator:
     """Tests for LoreDeltaValidator."""
 
@@ -6,6 +6,12 @@ urlpatterns = [
     path("", views.CampaignListCreateView.as_view(), name="campaign_list"),
     path("<uuid:pk>/", views.CampaignDetailView.as_view(), name="campaign_detail"),
     path("<uuid:pk>/turn/", views.TurnView.as_view(), name="campaign_turn"),
+    path("<uuid:pk>/turn/async/", views.AsyncTurnView.as_view(), name="campaign_turn_async"),
+    path(
+        "<uuid:pk>/turn-jobs/<uuid:job_id>/",
+        views.TurnJobView.as_view(),
+        name="campaign_turn_job",
+    ),
     path("<uuid:pk>/turns/", views.TurnListView.as_view(), name="turn_list"),
     path("<uuid:pk>/state/", views.StateView.as_view(), name="campaign_state"),
     path("<uuid:pk>/dice-log/", views.DiceLogView.as_view(), name="dice_log"),
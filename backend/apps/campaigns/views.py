@@ -4,22 +4,51 @@ Campaign views - CRUD operations and state management.
 Based on SYSTEM_DESIGN.md Epic 7 requirements.
 """
 
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-
-from apps.campaigns.models import Campaign, TurnEvent
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from apps.campaigns.models import Campaign, RollRecord, TurnEvent, TurnJob
+from apps.campaigns.pagination import (
+    RollCursorPagination,
+    TurnCursorPagination,
+    cached_turn_count,
+)
 from apps.campaigns.serializers import (
     CampaignCreateSerializer,
     CampaignDetailSerializer,
     CampaignListSerializer,
     CampaignUpdateSerializer,
     RewindRequestSerializer,
+    RollRecordSerializer,
+    TurnEventCompactSerializer,
+    TurnEventSerializer,
     TurnEventSummarySerializer,
+    TurnJobSerializer,
+    TurnSubmitSerializer,
 )
+from apps.campaigns.services.async_turn_engine import AsyncTurnEngine
+from apps.campaigns.services.dice_log import DiceLogService
+from apps.campaigns.services.llm_client import LLMClientConfig
 from apps.campaigns.services.rewind_service import RewindService
 from apps.campaigns.services.state_service import StateService
+from apps.campaigns.services.turn_engine import TurnEngine, TurnRequest
+from apps.campaigns.services.turn_queue import TurnQueueService
+from apps.llm_config.models import LlmEndpointConfig
+
+logger = logging.getLogger(__name__)
 
 
 class CampaignListCreateView(APIView):
@@ -151,45 +180,256 @@ class CampaignDetailView(APIView):
 
 
 class TurnView(APIView):
-    """POST /api/campaigns/{id}/turn - Submit player turn."""
+    """
+    POST /api/campaigns/{id}/turn - Submit player turn.
+
+    With ``stream: true`` the response is a ``text/event-stream`` of
+    TurnStreamEvents: ``phase``, ``token`` (DM narration as it is generated),
+    ``rolls`` and a final ``result`` event carrying the full TurnResult.
+
+    With ``queue: true`` the turn is queued for the turn_queue worker and the
+    response is 202 with the TurnJob to poll at ``poll_url``.
+    """
 
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        """Submit a player turn - to be implemented in Epic 8."""
-        return Response(
-            {"detail": "Turn submission - to be implemented in Epic 8"},
-            status=status.HTTP_501_NOT_IMPLEMENTED,
+        """Submit a player turn."""
+        try:
+            campaign = Campaign.objects.select_related("universe").get(
+                id=pk, user=request.user
+            )
+        except Campaign.DoesNotExist:
+            return Response(
+                {"error": "Campaign not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if campaign.status != "active":
+            return Response(
+                {"error": f"Cannot submit turns to a {campaign.status} campaign"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = TurnSubmitSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        db_config = LlmEndpointConfig.objects.filter(
+            user=request.user,
+            is_active=True,
+        ).first()
+        if db_config is None:
+            return Response(
+                {"error": "No LLM endpoint configured"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if serializer.validated_data["queue"]:
+            job = TurnQueueService(engine=TurnEngine()).enqueue(
+                campaign, serializer.validated_data["user_input"], db_config
+            )
+            return Response(
+                {
+                    "job_id": str(job.id),
+                    "sequence": job.sequence,
+                    "status": job.status,
+                    "poll_url": f"/api/campaigns/{campaign.id}/turn-jobs/{job.id}/",
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        turn_request = TurnRequest(
+            campaign=campaign,
+            user_input=serializer.validated_data["user_input"],
+            llm_config=LLMClientConfig.from_endpoint_config(db_config),
         )
+        engine = TurnEngine()
+
+        if serializer.validated_data["stream"]:
+            events = (event.to_sse() for event in engine.process_turn_stream(turn_request))
+            response = StreamingHttpResponse(events, content_type="text/event-stream")
+            response["Cache-Control"] = "no-cache"
+            # Disable proxy buffering so tokens reach the client immediately
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        result = engine.process_turn(turn_request)
+        if not result.success:
+            logger.warning("Turn failed for campaign %s: %s", campaign.id, result.errors)
+            return Response(result.to_dict(), status=status.HTTP_502_BAD_GATEWAY)
+
+        return Response(result.to_dict(), status=status.HTTP_200_OK)
+
+
+class TurnJobView(APIView):
+    """
+    GET /api/campaigns/{id}/turn-jobs/{job_id} - Poll a queued turn.
+
+    ``result`` holds the TurnResult once ``status`` is completed or failed.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, job_id):
+        """Get the status of a queued turn."""
+        try:
+            job = TurnJob.objects.select_related("turn_event").get(
+                id=job_id, campaign_id=pk, campaign__user=request.user
+            )
+        except TurnJob.DoesNotExist:
+            return Response(
+                {"error": "Turn job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(TurnJobSerializer(job).data)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncTurnView(View):
+    """
+    POST /api/campaigns/{id}/turn/async - Submit player turn on the event loop.
+
+    Runs the AsyncTurnEngine, which gathers context and awaits the LLM without
+    holding a worker thread; serve it under ASGI (whispyrkeep.asgi). DRF views
+    are sync-only, so JWT authentication is done here directly. Streaming
+    stays on the TurnView endpoint.
+    """
+
+    async def post(self, request, pk):
+        """Submit a player turn."""
+        try:
+            auth = await sync_to_async(JWTAuthentication().authenticate)(request)
+        except (AuthenticationFailed, InvalidToken) as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+            return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+        if auth is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        user = auth[0]
+
+        try:
+            campaign = await Campaign.objects.select_related(
+                "universe", "character_sheet"
+            ).aget(id=pk, user=user)
+        except Campaign.DoesNotExist:
+            return JsonResponse(
+                {"error": "Campaign not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if campaign.status != "active":
+            return JsonResponse(
+                {"error": f"Cannot submit turns to a {campaign.status} campaign"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            data = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = TurnSubmitSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if serializer.validated_data["stream"]:
+            return JsonResponse(
+                {"error": "Streaming is served by the turn endpoint"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        db_config = await LlmEndpointConfig.objects.filter(
+            user=user,
+            is_active=True,
+        ).afirst()
+        if db_config is None:
+            return JsonResponse(
+                {"error": "No LLM endpoint configured"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        turn_request = TurnRequest(
+            campaign=campaign,
+            user_input=serializer.validated_data["user_input"],
+            llm_config=LLMClientConfig.from_endpoint_config(db_config),
+        )
+
+        result = await AsyncTurnEngine().process_turn(turn_request)
+        if not result.success:
+            logger.warning("Turn failed for campaign %s: %s", campaign.id, result.errors)
+            return JsonResponse(result.to_dict(), status=status.HTTP_502_BAD_GATEWAY)
+
+        return JsonResponse(result.to_dict(), status=status.HTTP_200_OK)
 
 
 class TurnListView(APIView):
-    """GET /api/campaigns/{id}/turns - Get turn history."""
+    """
+    GET /api/campaigns/{id}/turns - Get turn history.
+
+    Keyset-paginated on turn_index. Query params:
+    - limit: Page size (default 50, max 200)
+    - cursor: Opaque cursor from a previous page's next/previous link
+    - since: Only turns after this turn index, for clients that already
+      hold the history up to it
+    - order: "asc" (default) or "desc" for newest first
+    - view: "compact", "summary" (default) or "full"; only the columns the
+      chosen view serializes are loaded
+    - count: "false" to omit the (cached) total count
+    """
 
     permission_classes = [IsAuthenticated]
 
+    VIEW_SERIALIZERS = {
+        "compact": TurnEventCompactSerializer,
+        "summary": TurnEventSummarySerializer,
+        "full": TurnEventSerializer,
+    }
+
     def get(self, request, pk):
         """Get turn history for a campaign."""
         try:
-            campaign = Campaign.objects.get(id=pk, user=request.user)
+            campaign = Campaign.objects.only("id").get(id=pk, user=request.user)
         except Campaign.DoesNotExist:
             return Response(
                 {"error": "Campaign not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        turns = TurnEvent.objects.filter(campaign=campaign).order_by("turn_index")
-
-        # Pagination
-        limit = int(request.query_params.get("limit", 50))
-        offset = int(request.query_params.get("offset", 0))
-        turns = turns[offset:offset + limit]
+        view_mode = request.query_params.get("view", "summary")
+        serializer_class = self.VIEW_SERIALIZERS.get(view_mode)
+        if serializer_class is None:
+            return Response(
+                {"error": f"view must be one of: {', '.join(self.VIEW_SERIALIZERS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        serializer = TurnEventSummarySerializer(turns, many=True)
-        return Response({
-            "count": campaign.turns.count(),
+        turns = TurnEvent.objects.filter(campaign=campaign).only(*serializer_class.Meta.fields)
+
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                turns = turns.filter(turn_index__gt=int(since))
+            except ValueError:
+                return Response(
+                    {"error": "since must be a turn index"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        paginator = TurnCursorPagination()
+        page = paginator.paginate_queryset(turns, request, view=self)
+        serializer = serializer_class(page, many=True)
+
+        response = {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
             "results": serializer.data,
-        })
+        }
+        if request.query_params.get("count", "true").lower() != "false":
+            response = {"count": cached_turn_count(campaign), **response}
+        return Response(response)
 
 
 class StateView(APIView):
@@ -218,16 +458,64 @@ class StateView(APIView):
 
 
 class DiceLogView(APIView):
-    """GET /api/campaigns/{id}/dice-log - Get dice roll history."""
+    """
+    GET /api/campaigns/{id}/dice-log - Get dice roll history and statistics.
+
+    Keyset-paginated on the campaign's roll number. Query params:
+    - limit, cursor, order: As for the turn history
+    - roll_type, ability: Only rolls of this type / against this ability
+    - success: "true" or "false" for rolls made against a DC
+    - turn: Only rolls from this turn index
+    - stats: "false" to omit the precomputed statistics
+    """
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        """Get dice roll history - to be implemented in Epic 8."""
-        return Response(
-            {"detail": "Dice log - to be implemented in Epic 8"},
-            status=status.HTTP_501_NOT_IMPLEMENTED,
-        )
+        """Get dice roll history for a campaign."""
+        try:
+            campaign = Campaign.objects.only("id").get(id=pk, user=request.user)
+        except Campaign.DoesNotExist:
+            return Response(
+                {"error": "Campaign not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        params = request.query_params
+        rolls = RollRecord.objects.filter(campaign=campaign)
+        for field_name in ("roll_type", "ability"):
+            if params.get(field_name):
+                rolls = rolls.filter(**{field_name: params[field_name]})
+
+        success = params.get("success")
+        if success is not None:
+            if success not in ("true", "false"):
+                return Response(
+                    {"error": "success must be true or false"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            rolls = rolls.filter(success=success == "true")
+
+        turn = params.get("turn")
+        if turn is not None:
+            try:
+                rolls = rolls.filter(turn_index=int(turn))
+            except ValueError:
+                return Response(
+                    {"error": "turn must be a turn index"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        paginator = RollCursorPagination()
+        page = paginator.paginate_queryset(rolls, request, view=self)
+        response = {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": RollRecordSerializer(page, many=True).data,
+        }
+        if params.get("stats", "true").lower() != "false":
+            response["stats"] = DiceLogService().get_stats(campaign)
+        return Response(response)
 
 
 class RewindView(APIView):
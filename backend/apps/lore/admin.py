@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from apps.lore.models import LoreChunk
+from apps.lore.models import LoreChunk, VectorOutboxEntry
 
 
 @admin.register(LoreChunk)
@@ -13,3 +13,13 @@ class LoreChunkAdmin(admin.ModelAdmin):
     list_filter = ("chunk_type", "is_compacted", "created_at")
     search_fields = ("text", "universe__name", "source_ref")
     readonly_fields = ("id", "created_at")
+
+
+@admin.register(VectorOutboxEntry)
+class VectorOutboxEntryAdmin(admin.ModelAdmin):
+    """Admin for pending ChromaDB writes."""
+
+    list_display = ("operation", "document_id", "universe_id", "status", "attempts", "created_at")
+    list_filter = ("operation", "status")
+    search_fields = ("document_id", "universe_id")
+    readonly_fields = ("created_at",)
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lore", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VectorOutboxEntry",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("universe_id", models.UUIDField(db_index=True)),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[("add", "Add"), ("upsert", "Upsert"), ("delete", "Delete")],
+                        max_length=10,
+                    ),
+                ),
+                ("document_id", models.CharField(help_text="ChromaDB document id", max_length=100)),
+                (
+                    "payload_json",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="text, chunk_type, source_ref, tags, time_range (add/upsert only)",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Retry backoff: not drained before this time",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Vector Outbox Entry",
+                "verbose_name_plural": "Vector Outbox Entries",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(fields=["status", "id"], name="lore_vector_status_456a27_idx")
+                ],
+            },
+        ),
+    ]
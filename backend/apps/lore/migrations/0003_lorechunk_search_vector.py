@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("lore", "0002_vector_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lorechunk",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector("text", config="english"),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lorechunk",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="lore_chunk_search_gin"
+            ),
+        ),
+    ]
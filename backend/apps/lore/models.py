@@ -7,6 +7,8 @@ To be fully implemented in Epic 5.
 
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 
@@ -43,10 +45,73 @@ class LoreChunk(models.Model):
         related_name="superseded_by",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Full-text index of text, for lexical lore search (see lexical_index)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Lore Chunk"
         verbose_name_plural = "Lore Chunks"
+        indexes = [GinIndex(fields=["search_vector"], name="lore_chunk_search_gin")]
 
     def __str__(self):
         return f"{self.chunk_type}: {self.text[:50]}..."
+
+
+class VectorOutboxEntry(models.Model):
+    """
+    A pending ChromaDB write, recorded in the same transaction as the lore change.
+
+    Entries are drained into ChromaDB by the lore worker (see
+    apps.lore.services.vector_outbox), so embedding latency never extends
+    a database transaction and a rolled-back transaction leaves no vectors.
+    """
+
+    OP_ADD = "add"
+    OP_UPSERT = "upsert"
+    OP_DELETE = "delete"
+
+    OPERATION_CHOICES = [
+        (OP_ADD, "Add"),
+        (OP_UPSERT, "Upsert"),
+        (OP_DELETE, "Delete"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # Auto-increment so entries drain in the order they were written
+    id = models.BigAutoField(primary_key=True)
+    # Not a foreign key: deletes must still reach ChromaDB after the universe row is gone
+    universe_id = models.UUIDField(db_index=True)
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    document_id = models.CharField(max_length=100, help_text="ChromaDB document id")
+    payload_json = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="text, chunk_type, source_ref, tags, time_range (add/upsert only)",
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(
+        null=True, blank=True, help_text="Retry backoff: not drained before this time"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Vector Outbox Entry"
+        verbose_name_plural = "Vector Outbox Entries"
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "id"])]
+
+    def __str__(self):
+        return f"{self.operation} {self.document_id} ({self.status})"
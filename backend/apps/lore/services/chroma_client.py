@@ -7,18 +7,59 @@ Based on SYSTEM_DESIGN.md:
 - Per-universe vector collections
 - Hard canon vs soft lore separation
 - Supports both embedding and querying
+- Mixed retrieval: hard canon and soft lore come from one query with
+  per-type quotas split on the client, embedding the query text once
+- Query results can be cached per lore version (see LoreRetrievalCache);
+  every write through the service invalidates the universe's cached results
+- Collections rank by cosine distance in every backend (see COSINE_SPACE)
+- One ChromaDB client per server per process, shared by every service
+  instance, with collection handles cached so operations skip the
+  get_or_create_collection round trip (see ChromaConnection)
+- Hybrid retrieval (LORE_RETRIEVAL_MODE=hybrid): mixed retrievals also run
+  a full-text search over the lore chunks and fuse both rankings (see
+  lexical_index)
+- The store behind the client is pluggable (LORE_VECTOR_BACKEND): a ChromaDB
+  server, a local NumPy index per universe, or local until a universe
+  outgrows it (see vector_store)
 """
 
 import hashlib
 import logging
-from dataclasses import dataclass, field
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import cache
 
 import chromadb
+import httpx
 from chromadb.config import Settings as ChromaSettings
+from chromadb.utils import embedding_functions
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.lore.services.retrieval_cache import LoreRetrievalCache
+from apps.lore.services.vector_store import (
+    COSINE_SPACE,
+    CollectionNotFoundError,
+    LocalVectorStore,
+    TieredVectorStore,
+    VectorCollection,
+    VectorStore,
+)
 
 logger = logging.getLogger(__name__)
 
+LORE_CHUNK_TYPES = ("hard_canon", "soft_lore")
+
+# Mixed retrievals ask for this many times the combined quotas, so one chunk
+# type rarely crowds the other out of the candidate set
+MIXED_CANDIDATE_FACTOR = 2
+
+# Smoothing constant from the original RRF paper; damps the weight of the
+# very top ranks so neither ranking dominates
+RRF_K = 60
+
 
 @dataclass
 class LoreSearchResult:
@@ -41,6 +82,188 @@ class LoreQueryResult:
     total_results: int
 
 
+def reciprocal_rank_fusion(
+    rankings: list[list[LoreSearchResult]], k: int = RRF_K
+) -> list[LoreSearchResult]:
+    """
+    Fuse result rankings by reciprocal rank.
+
+    Each result scores the sum of 1 / (k + rank) over the rankings it
+    appears in (rank starting at 1); results are returned best first with
+    that score. A result found by several rankings keeps its first
+    ranking's fields.
+    """
+    fused: dict[str, LoreSearchResult] = {}
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            fused.setdefault(result.chunk_id, result)
+            scores[result.chunk_id] = scores.get(result.chunk_id, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(fused, key=lambda chunk_id: -scores[chunk_id])
+    return [replace(fused[chunk_id], score=scores[chunk_id]) for chunk_id in ordered]
+
+
+@dataclass
+class LoreRetrieval:
+    """Hard canon and soft lore results from one mixed retrieval."""
+
+    hard_canon: LoreQueryResult
+    soft_lore: LoreQueryResult
+
+
+def is_collection_not_found(error: Exception) -> bool:
+    """Whether an error says the collection no longer exists (deleted or recreated)."""
+    if isinstance(error, CollectionNotFoundError):
+        return True
+    # chromadb raises InvalidCollectionException (0.5) or NotFoundError (0.6)
+    return type(error).__name__ in ("InvalidCollectionException", "NotFoundError") or (
+        "does not exist" in str(error)
+    )
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Whether an error means the store could not be reached, rather than a bad request."""
+    return isinstance(error, (ConnectionError, TimeoutError, httpx.TransportError))
+
+
+class CachedCollection:
+    """
+    A cached collection handle that refetches the collection once if it is gone.
+
+    Another process may delete and recreate a universe's collection (e.g.
+    rebuild_universe_embeddings_task), leaving this handle pointing at the
+    old collection id; the first operation that fails because of it fetches
+    the current collection and is retried on it.
+    """
+
+    def __init__(self, client: VectorStore, name: str, metadata: dict):
+        self.client = client
+        self.name = name
+        self.metadata = metadata
+        self.collection = client.get_or_create_collection(name=name, metadata=metadata)
+
+    def _call(self, method: str, *args, **kwargs):
+        try:
+            return getattr(self.collection, method)(*args, **kwargs)
+        except Exception as e:
+            if not is_collection_not_found(e):
+                raise
+            logger.info(f"Collection {self.name} was recreated; refetching its handle")
+            self.collection = self.client.get_or_create_collection(
+                name=self.name, metadata=self.metadata
+            )
+            return getattr(self.collection, method)(*args, **kwargs)
+
+    def count(self) -> int:
+        return self._call("count")
+
+    def add(self, *args, **kwargs) -> None:
+        return self._call("add", *args, **kwargs)
+
+    def upsert(self, *args, **kwargs) -> None:
+        return self._call("upsert", *args, **kwargs)
+
+    def get(self, *args, **kwargs) -> dict:
+        return self._call("get", *args, **kwargs)
+
+    def query(self, *args, **kwargs) -> dict:
+        return self._call("query", *args, **kwargs)
+
+    def delete(self, *args, **kwargs) -> None:
+        return self._call("delete", *args, **kwargs)
+
+
+class ChromaConnection:
+    """
+    A vector store client and its cached per-universe collection handles.
+
+    A collection handle is fetched (or the collection created) on first use
+    and reused after that; delete_collection drops it. A collection deleted
+    or recreated by another process (a rebuild) is noticed by the handle on
+    its next failing operation, which refetches it (see CachedCollection).
+
+    Usage:
+        connection = get_chroma_connection(chroma_url)
+        collection = connection.get_or_create_collection(name, metadata)
+    """
+
+    def __init__(self, client: VectorStore):
+        """Initialize with a Chroma-compatible client."""
+        self.client = client
+        self._collections: dict[str, CachedCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, metadata: dict) -> CachedCollection:
+        """Get a cached collection handle, fetching or creating it on a miss."""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = CachedCollection(self.client, name, metadata)
+            with self._lock:
+                collection = self._collections.setdefault(name, collection)
+        return collection
+
+    def delete_collection(self, name: str) -> None:
+        """Delete a collection and drop its cached handle."""
+        with self._lock:
+            self._collections.pop(name, None)
+        self.client.delete_collection(name)
+
+
+def _http_client(chroma_url: str) -> chromadb.HttpClient:
+    return chromadb.HttpClient(
+        host=chroma_url.replace("http://", "").replace("https://", "").split(":")[0],
+        port=int(chroma_url.split(":")[-1]),
+        settings=ChromaSettings(
+            anonymized_telemetry=False,
+        ),
+    )
+
+
+def _vector_store(backend: str, chroma_url: str) -> VectorStore:
+    """Build the vector store a LORE_VECTOR_BACKEND value selects."""
+    if backend == "chroma":
+        return _http_client(chroma_url)
+    local = LocalVectorStore(settings.LORE_LOCAL_INDEX_DIR, _default_embedding_function())
+    if backend == "local":
+        return local
+    if backend == "auto":
+        return TieredVectorStore(
+            local, _http_client(chroma_url), settings.LORE_LOCAL_INDEX_MAX_DOCUMENTS
+        )
+    raise ImproperlyConfigured(f"Unknown LORE_VECTOR_BACKEND: {backend!r}")
+
+
+_connections: dict[tuple[str, str], ChromaConnection] = {}
+_connections_lock = threading.Lock()
+_connections_pid = os.getpid()
+
+
+def get_chroma_connection(chroma_url: str) -> ChromaConnection:
+    """
+    Get the process-wide connection to the configured vector store.
+
+    Connections inherited from a parent process are dropped after a fork
+    (gunicorn/celery prefork workers), since their sockets would be shared.
+    """
+    global _connections_pid
+    backend = getattr(settings, "LORE_VECTOR_BACKEND", "chroma")
+    key = (backend, chroma_url)
+    with _connections_lock:
+        if os.getpid() != _connections_pid:
+            _connections.clear()
+            _connections_pid = os.getpid()
+        connection = _connections.get(key)
+        if connection is None:
+            connection = _connections[key] = ChromaConnection(_vector_store(backend, chroma_url))
+        return connection
+
+
+@cache
+def _default_embedding_function():
+    # Loads an ONNX model; share one per process
+    return embedding_functions.DefaultEmbeddingFunction()
+
+
 class ChromaClientService:
     """
     Service for interacting with ChromaDB.
@@ -51,30 +274,73 @@ class ChromaClientService:
         service = ChromaClientService()
         service.add_document(universe_id, document_id, text, chunk_type="hard_canon")
         results = service.query(universe_id, "What is the history of...", top_k=5)
+        lore = service.query_lore(universe_id, "Who rules...", hard_canon_k=5, soft_lore_k=3)
     """
 
-    def __init__(self, chroma_url: str | None = None):
+    def __init__(
+        self,
+        chroma_url: str | None = None,
+        client=None,
+        retrieval_cache: LoreRetrievalCache | None = None,
+        embedding_function=None,
+        lexical_index=None,
+    ):
         """
         Initialize ChromaDB client.
 
         Args:
             chroma_url: Optional URL override for ChromaDB server
+            client: Optional pre-built Chroma-compatible client (e.g. the
+                in-memory stand-in used for load testing); by default the
+                process-wide client for LORE_VECTOR_BACKEND and chroma_url
+                is shared
+            retrieval_cache: Optional query result cache override
+            embedding_function: Optional override for the function query
+                embeddings are computed with; it must match the one the
+                collections embed documents with (Chroma's default)
+            lexical_index: Optional full-text index for hybrid retrieval;
+                by default one is used when LORE_RETRIEVAL_MODE is "hybrid"
         """
         self.chroma_url = chroma_url or getattr(settings, "CHROMA_URL", "http://localhost:8001")
-        self._client = None
+        self._connection = ChromaConnection(client) if client is not None else None
+        self.retrieval_cache = retrieval_cache or LoreRetrievalCache()
+        self._embedding_function = embedding_function
+        if lexical_index is None and getattr(settings, "LORE_RETRIEVAL_MODE", "") == "hybrid":
+            from apps.lore.services.lexical_index import LexicalLoreIndex
+
+            lexical_index = LexicalLoreIndex()
+        self.lexical_index = lexical_index
 
     @property
-    def client(self) -> chromadb.HttpClient:
-        """Get or create ChromaDB client (lazy initialization)."""
-        if self._client is None:
-            self._client = chromadb.HttpClient(
-                host=self.chroma_url.replace("http://", "").replace("https://", "").split(":")[0],
-                port=int(self.chroma_url.split(":")[-1]),
-                settings=ChromaSettings(
-                    anonymized_telemetry=False,
-                ),
-            )
-        return self._client
+    def connection(self) -> ChromaConnection:
+        """Get the ChromaDB connection (lazy initialization)."""
+        if self._connection is None:
+            self._connection = get_chroma_connection(self.chroma_url)
+        return self._connection
+
+    @property
+    def client(self) -> VectorStore:
+        """Get the vector store client."""
+        return self.connection.client
+
+    @property
+    def embedding_function(self):
+        """Get the query embedding function (lazy initialization)."""
+        if self._embedding_function is None:
+            self._embedding_function = _default_embedding_function()
+        return self._embedding_function
+
+    def embed_query(self, query_text: str) -> list[float]:
+        """
+        Embed query text, e.g. once for several queries.
+
+        Args:
+            query_text: The query text
+
+        Returns:
+            The query embedding
+        """
+        return [float(x) for x in self.embedding_function([query_text])[0]]
 
     def _get_collection_name(self, universe_id: str) -> str:
         """
@@ -91,20 +357,22 @@ class ChromaClientService:
         hash_suffix = hashlib.md5(str(universe_id).encode()).hexdigest()[:12]
         return f"universe_{hash_suffix}"
 
-    def get_or_create_collection(self, universe_id: str) -> chromadb.Collection:
+    def get_or_create_collection(self, universe_id: str) -> VectorCollection:
         """
         Get or create a collection for a universe.
 
+        The handle is cached, so only the first call per universe reaches
+        the server.
+
         Args:
             universe_id: UUID of the universe
 
         Returns:
             ChromaDB collection
         """
-        collection_name = self._get_collection_name(universe_id)
-        return self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"universe_id": str(universe_id)},
+        return self.connection.get_or_create_collection(
+            self._get_collection_name(universe_id),
+            {"universe_id": str(universe_id), **COSINE_SPACE},
         )
 
     def add_document(
@@ -153,6 +421,7 @@ class ChromaClientService:
             documents=[text],
             metadatas=[metadata],
         )
+        self.retrieval_cache.invalidate(universe_id)
 
         logger.info(f"Added document {document_id} to universe {universe_id}")
         return str(document_id)
@@ -177,6 +446,50 @@ class ChromaClientService:
 
         collection = self.get_or_create_collection(universe_id)
 
+        ids, texts, metadatas = self._batch_columns(documents)
+        collection.add(
+            ids=ids,
+            documents=texts,
+            metadatas=metadatas,
+        )
+        self.retrieval_cache.invalidate(universe_id)
+
+        logger.info(f"Added {len(documents)} documents to universe {universe_id}")
+        return ids
+
+    def upsert_documents_batch(
+        self,
+        universe_id: str,
+        documents: list[dict],
+    ) -> list[str]:
+        """
+        Add or replace multiple documents/chunks in a batch.
+
+        Args:
+            universe_id: UUID of the universe
+            documents: Same format as add_documents_batch
+
+        Returns:
+            List of document IDs
+        """
+        if not documents:
+            return []
+
+        collection = self.get_or_create_collection(universe_id)
+
+        ids, texts, metadatas = self._batch_columns(documents)
+        collection.upsert(
+            ids=ids,
+            documents=texts,
+            metadatas=metadatas,
+        )
+        self.retrieval_cache.invalidate(universe_id)
+
+        logger.info(f"Upserted {len(documents)} documents in universe {universe_id}")
+        return ids
+
+    def _batch_columns(self, documents: list[dict]) -> tuple[list[str], list[str], list[dict]]:
+        """Split batch document dicts into ChromaDB id, text and metadata columns."""
         ids = []
         texts = []
         metadatas = []
@@ -203,14 +516,7 @@ class ChromaClientService:
 
             metadatas.append(metadata)
 
-        collection.add(
-            ids=ids,
-            documents=texts,
-            metadatas=metadatas,
-        )
-
-        logger.info(f"Added {len(documents)} documents to universe {universe_id}")
-        return ids
+        return ids, texts, metadatas
 
     def query(
         self,
@@ -219,6 +525,7 @@ class ChromaClientService:
         top_k: int = 5,
         chunk_type: str | None = None,
         include_soft_lore: bool = True,
+        lore_version: int | None = None,
     ) -> LoreQueryResult:
         """
         Query the universe collection for relevant lore.
@@ -229,12 +536,12 @@ class ChromaClientService:
             top_k: Maximum number of results to return
             chunk_type: Optional filter for chunk type (hard_canon or soft_lore)
             include_soft_lore: If False, only return hard_canon chunks
+            lore_version: The universe's canonical_lore_version; when given,
+                the result is served from and stored in the retrieval cache
 
         Returns:
             LoreQueryResult with matching chunks
         """
-        collection = self.get_or_create_collection(universe_id)
-
         # Build where filter
         where_filter = None
         if chunk_type:
@@ -242,11 +549,19 @@ class ChromaClientService:
         elif not include_soft_lore:
             where_filter = {"chunk_type": "hard_canon"}
 
+        def run() -> LoreQueryResult:
+            return self._query(universe_id, query_text, top_k, where_filter)
+
         try:
-            results = collection.query(
-                query_texts=[query_text],
-                n_results=top_k,
-                where=where_filter,
+            if lore_version is None:
+                return run()
+            return self.retrieval_cache.get_or_query(
+                universe_id,
+                lore_version,
+                where_filter["chunk_type"] if where_filter else "all",
+                query_text,
+                top_k,
+                run,
             )
         except Exception as e:
             logger.error(f"ChromaDB query failed: {e}")
@@ -256,6 +571,183 @@ class ChromaClientService:
                 total_results=0,
             )
 
+    def query_lore(
+        self,
+        universe_id: str,
+        query_text: str,
+        hard_canon_k: int = 5,
+        soft_lore_k: int = 5,
+        query_embedding: list[float] | None = None,
+        lore_version: int | None = None,
+    ) -> LoreRetrieval:
+        """
+        Query hard canon and soft lore together.
+
+        The query is embedded once and Chroma returns the union of candidates
+        in one round trip; results are split by chunk type and cut to each
+        quota here. Only when the candidates came back full and one type is
+        still short is that type topped up with a second, filtered query
+        reusing the same embedding.
+
+        With a lexical index (hybrid retrieval), a full-text search runs
+        alongside and each type's vector and lexical rankings are fused by
+        reciprocal rank before the quota cut; scores are then RRF scores.
+
+        Args:
+            universe_id: UUID of the universe
+            query_text: The query text to search for
+            hard_canon_k: Maximum number of hard canon results
+            soft_lore_k: Maximum number of soft lore results (0 for none)
+            query_embedding: Optional precomputed embedding of query_text
+                (see embed_query); computed here if not given
+            lore_version: The universe's canonical_lore_version; when given,
+                the result is served from and stored in the retrieval cache
+
+        Returns:
+            LoreRetrieval with the hard canon and soft lore results
+        """
+        quotas = {"hard_canon": hard_canon_k, "soft_lore": soft_lore_k}
+        mode = "hybrid" if self.lexical_index is not None else "mixed"
+
+        def run() -> LoreRetrieval:
+            return self._query_lore(universe_id, query_text, quotas, query_embedding)
+
+        try:
+            if lore_version is None:
+                return run()
+            return self.retrieval_cache.get_or_query(
+                universe_id,
+                lore_version,
+                mode,
+                query_text,
+                f"{hard_canon_k}+{soft_lore_k}",
+                run,
+            )
+        except Exception as e:
+            logger.error(f"ChromaDB query failed: {e}")
+            return LoreRetrieval(
+                hard_canon=self._query_result([], query_text),
+                soft_lore=self._query_result([], query_text),
+            )
+
+    def _query_lore(
+        self,
+        universe_id: str,
+        query_text: str,
+        quotas: dict[str, int],
+        query_embedding: list[float] | None,
+    ) -> LoreRetrieval:
+        """Run a mixed (or hybrid) query (errors propagate)."""
+        by_type: dict[str, list[LoreSearchResult]] = {chunk_type: [] for chunk_type in quotas}
+        wanted = [chunk_type for chunk_type in LORE_CHUNK_TYPES if quotas[chunk_type] > 0]
+
+        if wanted and self.lexical_index is None:
+            candidates = self._vector_candidates(
+                universe_id, query_text, quotas, wanted, query_embedding
+            )
+            for chunk_type in wanted:
+                by_type[chunk_type] = candidates[chunk_type][: quotas[chunk_type]]
+        elif wanted:
+            # Vector search in a worker thread, full-text search on this one
+            # (it uses this thread's database connection)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                vector = pool.submit(
+                    self._vector_candidates,
+                    universe_id,
+                    query_text,
+                    quotas,
+                    wanted,
+                    query_embedding,
+                )
+                lexical = self.lexical_index.search(
+                    universe_id,
+                    query_text,
+                    wanted,
+                    sum(quotas[chunk_type] for chunk_type in wanted) * MIXED_CANDIDATE_FACTOR,
+                )
+                candidates = vector.result()
+            for chunk_type in wanted:
+                by_type[chunk_type] = reciprocal_rank_fusion(
+                    [
+                        candidates[chunk_type],
+                        [result for result in lexical if result.chunk_type == chunk_type],
+                    ]
+                )[: quotas[chunk_type]]
+
+        return LoreRetrieval(
+            hard_canon=self._query_result(by_type["hard_canon"], query_text),
+            soft_lore=self._query_result(by_type["soft_lore"], query_text),
+        )
+
+    def _vector_candidates(
+        self,
+        universe_id: str,
+        query_text: str,
+        quotas: dict[str, int],
+        wanted: list[str],
+        query_embedding: list[float] | None,
+    ) -> dict[str, list[LoreSearchResult]]:
+        """Get vector search candidates of each wanted chunk type, best first."""
+        if query_embedding is None:
+            query_embedding = self.embed_query(query_text)
+
+        by_type: dict[str, list[LoreSearchResult]] = {chunk_type: [] for chunk_type in wanted}
+        n_results = sum(quotas[chunk_type] for chunk_type in wanted) * MIXED_CANDIDATE_FACTOR
+        candidates = self._query(
+            universe_id,
+            query_text,
+            n_results,
+            {"chunk_type": {"$in": wanted}},
+            query_embedding=query_embedding,
+        )
+        for result in candidates.results:
+            if result.chunk_type in by_type:
+                by_type[result.chunk_type].append(result)
+
+        if candidates.total_results == n_results:
+            for chunk_type in wanted:
+                if len(by_type[chunk_type]) < quotas[chunk_type]:
+                    by_type[chunk_type] = self._query(
+                        universe_id,
+                        query_text,
+                        quotas[chunk_type],
+                        {"chunk_type": chunk_type},
+                        query_embedding=query_embedding,
+                    ).results
+
+        return by_type
+
+    @staticmethod
+    def _query_result(results: list[LoreSearchResult], query_text: str) -> LoreQueryResult:
+        return LoreQueryResult(
+            results=results,
+            query_text=query_text,
+            total_results=len(results),
+        )
+
+    def _query(
+        self,
+        universe_id: str,
+        query_text: str,
+        top_k: int,
+        where_filter: dict | None,
+        query_embedding: list[float] | None = None,
+    ) -> LoreQueryResult:
+        """Run a query against the collection (errors propagate)."""
+        collection = self.get_or_create_collection(universe_id)
+        if query_embedding is not None:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k,
+                where=where_filter,
+            )
+        else:
+            results = collection.query(
+                query_texts=[query_text],
+                n_results=top_k,
+                where=where_filter,
+            )
+
         # Parse results
         search_results = []
         if results and results["ids"] and results["ids"][0]:
@@ -282,11 +774,7 @@ class ChromaClientService:
                     )
                 )
 
-        return LoreQueryResult(
-            results=search_results,
-            query_text=query_text,
-            total_results=len(search_results),
-        )
+        return self._query_result(search_results, query_text)
 
     def delete_document(self, universe_id: str, document_id: str) -> bool:
         """
@@ -302,12 +790,30 @@ class ChromaClientService:
         try:
             collection = self.get_or_create_collection(universe_id)
             collection.delete(ids=[str(document_id)])
+            self.retrieval_cache.invalidate(universe_id)
             logger.info(f"Deleted document {document_id} from universe {universe_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete document: {e}")
             return False
 
+    def delete_documents(self, universe_id: str, document_ids: list[str]) -> None:
+        """
+        Delete documents by ID in one call.
+
+        Unlike delete_document, errors propagate so callers can retry.
+
+        Args:
+            universe_id: UUID of the universe
+            document_ids: IDs of the documents to delete
+        """
+        if not document_ids:
+            return
+        collection = self.get_or_create_collection(universe_id)
+        collection.delete(ids=[str(document_id) for document_id in document_ids])
+        self.retrieval_cache.invalidate(universe_id)
+        logger.info(f"Deleted {len(document_ids)} documents from universe {universe_id}")
+
     def delete_documents_by_source(self, universe_id: str, source_ref: str) -> int:
         """
         Delete all documents with a given source reference.
@@ -329,6 +835,7 @@ class ChromaClientService:
 
             if results and results["ids"]:
                 collection.delete(ids=results["ids"])
+                self.retrieval_cache.invalidate(universe_id)
                 count = len(results["ids"])
                 logger.info(
                     f"Deleted {count} documents with source_ref {source_ref} "
@@ -341,6 +848,34 @@ class ChromaClientService:
             logger.error(f"Failed to delete documents by source: {e}")
             return 0
 
+    def delete_documents_by_sources(self, universe_id: str, source_refs: list[str]) -> bool:
+        """
+        Delete all documents whose source reference is in ``source_refs``.
+
+        Uses a single ``$in`` delete rather than a get and delete per source.
+
+        Args:
+            universe_id: UUID of the universe
+            source_refs: Source references to match
+
+        Returns:
+            True if deleted successfully
+        """
+        if not source_refs:
+            return True
+
+        try:
+            collection = self.get_or_create_collection(universe_id)
+            collection.delete(where={"source_ref": {"$in": [str(ref) for ref in source_refs]}})
+            self.retrieval_cache.invalidate(universe_id)
+            logger.info(
+                f"Deleted documents for {len(source_refs)} source refs from universe {universe_id}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents by sources: {e}")
+            return False
+
     def delete_collection(self, universe_id: str) -> bool:
         """
         Delete the entire collection for a universe.
@@ -353,7 +888,8 @@ class ChromaClientService:
         """
         try:
             collection_name = self._get_collection_name(universe_id)
-            self.client.delete_collection(collection_name)
+            self.connection.delete_collection(collection_name)
+            self.retrieval_cache.invalidate(universe_id)
             logger.info(f"Deleted collection for universe {universe_id}")
             return True
         except Exception as e:
@@ -18,6 +18,7 @@ from django.utils import timezone
 
 from apps.lore.models import LoreChunk
 from apps.lore.services.chroma_client import ChromaClientService
+from apps.lore.services.vector_outbox import VectorOutbox
 from apps.universes.models import Universe, UniverseHardCanonDoc
 
 logger = logging.getLogger(__name__)
@@ -52,6 +53,7 @@ class CompactionService:
     def __init__(self):
         """Initialize compaction service."""
         self.chroma = ChromaClientService()
+        self.outbox = VectorOutbox(self.chroma)
 
     def compact_soft_lore(
         self,
@@ -75,8 +77,6 @@ class CompactionService:
         Returns:
             CompactionResult with operation details
         """
-        errors = []
-
         # Find old, uncompacted soft lore chunks
         cutoff_date = timezone.now() - timedelta(days=min_age_days)
         chunks_to_compact = LoreChunk.objects.filter(
@@ -128,28 +128,11 @@ class CompactionService:
                             chunk.save()
                             compacted_count += 1
 
-                        # Update ChromaDB
-                        try:
-                            # Remove old embeddings
-                            for chunk in source_chunks:
-                                self.chroma.delete_document(
-                                    str(universe.id),
-                                    str(chunk.id),
-                                )
-
-                            # Add new embedding
-                            self.chroma.add_document(
-                                str(universe.id),
-                                str(new_chunk.id),
-                                summarized_text,
-                                chunk_type="soft_lore",
-                                source_ref=source_ref,
-                                tags=new_chunk.tags_json,
-                                time_range=new_chunk.time_range_json,
-                            )
-                        except Exception as e:
-                            logger.error(f"ChromaDB update failed during compaction: {e}")
-                            errors.append(f"Embedding update failed: {str(e)}")
+                        # Swap the embeddings once this transaction commits
+                        self.outbox.delete_documents(
+                            universe.id, [str(chunk.id) for chunk in source_chunks]
+                        )
+                        self.outbox.add_documents(universe.id, [self._chroma_doc(new_chunk)])
                     else:
                         # If summarization fails, just mark as compacted
                         for chunk in source_chunks:
@@ -165,7 +148,6 @@ class CompactionService:
                     success=True,
                     chunks_compacted=compacted_count,
                     chunks_removed=removed_count,
-                    errors=errors,
                 )
 
         except Exception as e:
@@ -241,26 +223,13 @@ class CompactionService:
                     is_compacted=True,
                 )
 
-                # Mark old chunks as compacted
+                # Mark old chunks as compacted and link to new chunk
                 old_chunk_ids = [str(c.id) for c in chunks]
-                chunks.update(is_compacted=True)
-
-                # Update ChromaDB
-                try:
-                    for chunk_id in old_chunk_ids:
-                        self.chroma.delete_document(str(universe.id), chunk_id)
-
-                    self.chroma.add_document(
-                        str(universe.id),
-                        str(new_chunk.id),
-                        summarized_text,
-                        chunk_type="hard_canon",
-                        source_ref=str(doc.id),
-                        tags=new_chunk.tags_json,
-                        time_range=new_chunk.time_range_json,
-                    )
-                except Exception as e:
-                    logger.error(f"ChromaDB update failed: {e}")
+                chunks.update(is_compacted=True, supersedes_chunk=new_chunk)
+
+                # Swap the embeddings once this transaction commits
+                self.outbox.delete_documents(universe.id, old_chunk_ids)
+                self.outbox.add_documents(universe.id, [self._chroma_doc(new_chunk)])
 
                 # Update lore version
                 universe.canonical_lore_version += 1
@@ -279,6 +248,17 @@ class CompactionService:
                 errors=[f"Compaction failed: {str(e)}"],
             )
 
+    def _chroma_doc(self, chunk: LoreChunk) -> dict:
+        """ChromaDB batch document for a lore chunk."""
+        return {
+            "id": str(chunk.id),
+            "text": chunk.text,
+            "chunk_type": chunk.chunk_type,
+            "source_ref": chunk.source_ref,
+            "tags": chunk.tags_json,
+            "time_range": chunk.time_range_json,
+        }
+
     def _summarize_chunks(
         self,
         chunks: list[LoreChunk],
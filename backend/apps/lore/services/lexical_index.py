@@ -0,0 +1,101 @@
+"""
+Lexical Lore Index.
+
+Full-text search over LoreChunk.text (a generated Postgres tsvector column
+with a GIN index), used next to vector search in hybrid retrieval:
+- Embeddings blur exact proper nouns (NPC and place names); lexical
+  matching does not, so names the player types reach the prompt
+- Any query word can match (terms are OR-ed), ranked by ts_rank
+- ChromaClientService combines its ranking with the vector search's by
+  reciprocal-rank fusion, which needs only ranks, not comparable scores
+
+Only live chunks are searched: chunks superseded by a compaction summary
+are removed from the vector store, so they are left out here too.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+from apps.lore.models import LoreChunk
+from apps.lore.services.chroma_client import LoreSearchResult
+
+# Most distinct query words searched for
+MAX_QUERY_TERMS = 32
+
+_WORD_RE = re.compile(r"\w{2,}")
+
+
+def lexical_query(query_text: str) -> SearchQuery | None:
+    """
+    Build a full-text query matching any word of the query text.
+
+    Returns None when the text has no searchable words.
+    """
+    terms = []
+    for word in _WORD_RE.findall(query_text.casefold()):
+        # "or" is an operator in websearch syntax
+        if word != "or" and word not in terms:
+            terms.append(word)
+    if not terms:
+        return None
+    return SearchQuery(
+        " or ".join(terms[:MAX_QUERY_TERMS]), search_type="websearch", config="english"
+    )
+
+
+class LexicalLoreIndex:
+    """
+    Full-text search over a universe's lore chunks.
+
+    Usage:
+        index = LexicalLoreIndex()
+        results = index.search(universe_id, "Where is Aldric?", ["hard_canon"], top_k=5)
+    """
+
+    def search(
+        self,
+        universe_id: str,
+        query_text: str,
+        chunk_types: list[str],
+        top_k: int,
+    ) -> list[LoreSearchResult]:
+        """
+        Search a universe's live lore chunks.
+
+        Args:
+            universe_id: UUID of the universe
+            query_text: The query text
+            chunk_types: Chunk types to search
+            top_k: Maximum number of results
+
+        Returns:
+            Matching chunks, best first, scored by ts_rank
+        """
+        query = lexical_query(query_text)
+        if query is None or not chunk_types or top_k <= 0:
+            return []
+
+        chunks = (
+            LoreChunk.objects.filter(
+                universe_id=universe_id,
+                chunk_type__in=chunk_types,
+                supersedes_chunk__isnull=True,
+                search_vector=query,
+            )
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "id")
+            .only("id", "chunk_type", "source_ref", "text")[:top_k]
+        )
+        return [
+            LoreSearchResult(
+                chunk_id=str(chunk.id),
+                text=chunk.text,
+                chunk_type=chunk.chunk_type,
+                source_ref=chunk.source_ref,
+                score=chunk.rank,
+                metadata={"chunk_type": chunk.chunk_type, "source_ref": chunk.source_ref},
+            )
+            for chunk in chunks
+        ]
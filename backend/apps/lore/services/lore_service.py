@@ -14,12 +14,15 @@ import hashlib
 import logging
 from dataclasses import dataclass, field
 
+from django.conf import settings
 from django.db import transaction
 
 from apps.lore.models import LoreChunk
 from apps.lore.services.chroma_client import ChromaClientService
 from apps.lore.services.chunking import ChunkingService, LoreDeltaChunker
+from apps.lore.services.vector_outbox import VectorOutbox
 from apps.universes.models import Universe, UniverseHardCanonDoc
+from whispyrkeep.tokenizer import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +66,7 @@ class LoreService:
     def __init__(self):
         """Initialize lore service."""
         self.chroma = ChromaClientService()
+        self.outbox = VectorOutbox(self.chroma)
         self.chunker = ChunkingService()
         self.delta_chunker = LoreDeltaChunker()
 
@@ -81,7 +85,7 @@ class LoreService:
         Creates:
         1. UniverseHardCanonDoc in Postgres
         2. LoreChunk records in Postgres
-        3. Vector embeddings in ChromaDB
+        3. Vector outbox entries, embedded into ChromaDB after commit
 
         Args:
             universe: The universe to add the document to
@@ -94,7 +98,6 @@ class LoreService:
         Returns:
             LoreIngestionResult with operation details
         """
-        errors = []
         tags = tags or []
 
         # Validate input
@@ -156,7 +159,7 @@ class LoreService:
                     lore_chunks.append(lore_chunk)
 
                     chroma_docs.append({
-                        "id": chunk.id,
+                        "id": str(lore_chunk.id),
                         "text": chunk.text,
                         "chunk_type": "hard_canon",
                         "source_ref": str(doc.id),
@@ -167,17 +170,8 @@ class LoreService:
                 # Bulk create lore chunks
                 LoreChunk.objects.bulk_create(lore_chunks)
 
-                # Add to ChromaDB
-                if chroma_docs:
-                    try:
-                        self.chroma.add_documents_batch(
-                            str(universe.id),
-                            chroma_docs,
-                        )
-                    except Exception as e:
-                        logger.error(f"ChromaDB ingestion failed: {e}")
-                        errors.append(f"Vector embedding failed: {str(e)}")
-                        # Don't fail the whole operation - Postgres data is saved
+                # Queue embeddings; they reach ChromaDB only if this commits
+                self.outbox.add_documents(universe.id, chroma_docs)
 
                 # Increment universe lore version
                 universe.canonical_lore_version += 1
@@ -187,7 +181,6 @@ class LoreService:
                     success=True,
                     document_id=str(doc.id),
                     chunks_created=len(chunks),
-                    errors=errors,
                 )
 
         except Exception as e:
@@ -220,8 +213,6 @@ class LoreService:
                 chunks_created=0,
             )
 
-        errors = []
-
         try:
             with transaction.atomic():
                 # Process deltas into chunks
@@ -253,7 +244,7 @@ class LoreService:
                     lore_chunks.append(lore_chunk)
 
                     chroma_docs.append({
-                        "id": chunk.id,
+                        "id": str(lore_chunk.id),
                         "text": chunk.text,
                         "chunk_type": "soft_lore",
                         "source_ref": turn_id,
@@ -264,16 +255,8 @@ class LoreService:
                 # Bulk create
                 LoreChunk.objects.bulk_create(lore_chunks)
 
-                # Add to ChromaDB
-                if chroma_docs:
-                    try:
-                        self.chroma.add_documents_batch(
-                            str(universe.id),
-                            chroma_docs,
-                        )
-                    except Exception as e:
-                        logger.error(f"ChromaDB soft lore ingestion failed: {e}")
-                        errors.append(f"Vector embedding failed: {str(e)}")
+                # Queue embeddings; they reach ChromaDB only if this commits
+                self.outbox.add_documents(universe.id, chroma_docs)
 
                 # Increment lore version
                 universe.canonical_lore_version += 1
@@ -282,7 +265,6 @@ class LoreService:
                 return LoreIngestionResult(
                     success=True,
                     chunks_created=len(chunks),
-                    errors=errors,
                 )
 
         except Exception as e:
@@ -317,12 +299,14 @@ class LoreService:
         soft_lore_chunks = []
 
         if prioritize_hard_canon:
-            # Get hard canon first
-            hard_canon_result = self.chroma.query(
+            # Hard canon first, soft lore fills the remaining slots; both come
+            # from one retrieval
+            retrieval = self.chroma.query_lore(
                 str(universe.id),
                 query,
-                top_k=max_chunks,
-                chunk_type="hard_canon",
+                hard_canon_k=max_chunks,
+                soft_lore_k=max_chunks if include_soft_lore else 0,
+                lore_version=universe.canonical_lore_version,
             )
             hard_canon_chunks = [
                 {
@@ -331,28 +315,18 @@ class LoreService:
                     "score": r.score,
                     "type": "hard_canon",
                 }
-                for r in hard_canon_result.results
+                for r in retrieval.hard_canon.results
+            ]
+            remaining = max_chunks - len(hard_canon_chunks)
+            soft_lore_chunks = [
+                {
+                    "text": r.text,
+                    "source": r.source_ref,
+                    "score": r.score,
+                    "type": "soft_lore",
+                }
+                for r in retrieval.soft_lore.results[:remaining]
             ]
-
-            # Fill remaining with soft lore if requested
-            if include_soft_lore:
-                remaining = max_chunks - len(hard_canon_chunks)
-                if remaining > 0:
-                    soft_result = self.chroma.query(
-                        str(universe.id),
-                        query,
-                        top_k=remaining,
-                        chunk_type="soft_lore",
-                    )
-                    soft_lore_chunks = [
-                        {
-                            "text": r.text,
-                            "source": r.source_ref,
-                            "score": r.score,
-                            "type": "soft_lore",
-                        }
-                        for r in soft_result.results
-                    ]
         else:
             # Mixed retrieval
             result = self.chroma.query(
@@ -360,6 +334,7 @@ class LoreService:
                 query,
                 top_k=max_chunks,
                 include_soft_lore=include_soft_lore,
+                lore_version=universe.canonical_lore_version,
             )
 
             for r in result.results:
@@ -374,9 +349,11 @@ class LoreService:
                 else:
                     soft_lore_chunks.append(chunk_data)
 
-        # Estimate token count (rough approximation: 4 chars per token)
-        total_chars = sum(len(c["text"]) for c in hard_canon_chunks + soft_lore_chunks)
-        estimated_tokens = total_chars // 4
+        # Count tokens as the default model's tokenizer would
+        counter = get_token_counter(settings.LLM_DEFAULT_MODEL)
+        estimated_tokens = sum(
+            counter.count(c["text"]) for c in hard_canon_chunks + soft_lore_chunks
+        )
 
         return LoreInjectionContext(
             hard_canon_chunks=hard_canon_chunks,
@@ -400,22 +377,44 @@ class LoreService:
         Returns:
             Number of chunks invalidated
         """
-        # Delete from Postgres
-        deleted_count, _ = LoreChunk.objects.filter(
-            universe=universe,
-            source_ref=turn_id,
-        ).delete()
+        return self.invalidate_turns_lore(universe, [turn_id])
 
-        # Delete from ChromaDB
-        try:
-            self.chroma.delete_documents_by_source(
-                str(universe.id),
-                turn_id,
-            )
-        except Exception as e:
-            logger.error(f"Failed to delete turn lore from ChromaDB: {e}")
+    def invalidate_turns_lore(
+        self,
+        universe: Universe,
+        turn_ids: list[str],
+    ) -> int:
+        """
+        Invalidate lore from a batch of turns (for rewind).
+
+        One Postgres delete and at most one lore version bump, however many
+        turns are invalidated. The matching vectors are deleted through the
+        vector outbox in the same transaction, so a rewind never waits on
+        ChromaDB while holding its locks, and an add still pending in the
+        outbox for a rewound chunk is cancelled rather than applied after
+        the delete.
+
+        Args:
+            universe: The universe
+            turn_ids: IDs of the turns to invalidate
+
+        Returns:
+            Number of chunks invalidated
+        """
+        turn_ids = [str(turn_id) for turn_id in turn_ids]
+        if not turn_ids:
+            return 0
+
+        with transaction.atomic():
+            chunks = LoreChunk.objects.filter(universe=universe, source_ref__in=turn_ids)
+            chunk_ids = [str(chunk_id) for chunk_id in chunks.values_list("id", flat=True)]
+            if not chunk_ids:
+                return 0
+
+            # Delete from Postgres, and from ChromaDB once this commits
+            deleted_count, _ = chunks.delete()
+            self.outbox.delete_documents(universe.id, chunk_ids)
 
-        if deleted_count > 0:
             universe.canonical_lore_version += 1
             universe.save(update_fields=["canonical_lore_version"])
 
@@ -0,0 +1,144 @@
+"""
+Lore Retrieval Cache.
+
+Caches ChromaDB query results in the shared Django cache (Redis), keyed by
+universe, lore version, chunk type, top_k and a hash of the normalized
+query text, so a player repeating similar inputs in the same place does
+not pay for an embedding and vector search every turn:
+- Universe.canonical_lore_version is bumped on every lore mutation, so a
+  bump moves lookups to fresh keys and the old entries age out
+- The vector outbox applies ChromaDB writes after that bump commits, so
+  every write also bumps a per-universe generation kept in the cache;
+  results cached before a write lands are never served after it
+- Entries expire after LORE_RETRIEVAL_CACHE_TTL, and under memory pressure
+  Redis evicts the least recently used expiring keys (volatile-lru)
+- Hits and misses are counted in the metrics registry
+"""
+
+import hashlib
+import logging
+import re
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from whispyrkeep.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_LOOKUPS = registry.counter(
+    "whispyrkeep_lore_retrieval_cache_total",
+    "Lore retrieval cache lookups, by result (hit, miss, bypass).",
+    ("result",),
+)
+
+# Generations outlive any entry cached under them
+GENERATION_TTL = 7 * 24 * 3600
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_query(query_text: str) -> str:
+    """Case-fold the query and reduce punctuation and spacing to single spaces."""
+    return _NON_WORD_RE.sub(" ", query_text.casefold()).strip()
+
+
+class LoreRetrievalCache:
+    """
+    Read-through cache of lore query results.
+
+    Usage:
+        cache = LoreRetrievalCache()
+        result = cache.get_or_query(
+            universe_id, lore_version, "hard_canon", query_text, 5, run_query
+        )
+        cache.invalidate(universe_id)  # after writing to the collection
+    """
+
+    def __init__(self, ttl: int | None = None):
+        """Initialize the cache (ttl defaults to LORE_RETRIEVAL_CACHE_TTL)."""
+        self.ttl = ttl if ttl is not None else settings.LORE_RETRIEVAL_CACHE_TTL
+
+    @staticmethod
+    def _generation_key(universe_id) -> str:
+        return f"lore:retrieval_gen:{universe_id}"
+
+    @staticmethod
+    def _result_key(
+        universe_id,
+        lore_version: int,
+        generation: int,
+        chunk_type: str,
+        query_text: str,
+        top_k: int | str,
+    ) -> str:
+        query_hash = hashlib.sha256(normalize_query(query_text).encode()).hexdigest()[:32]
+        return (
+            f"lore:retrieval:{universe_id}:{lore_version}.{generation}:"
+            f"{chunk_type}:{top_k}:{query_hash}"
+        )
+
+    def get_or_query(
+        self,
+        universe_id,
+        lore_version: int,
+        chunk_type: str,
+        query_text: str,
+        top_k: int | str,
+        run: Callable,
+    ):
+        """
+        Get a cached query result, running the query on a miss.
+
+        Args:
+            universe_id: UUID of the universe
+            lore_version: The universe's canonical_lore_version
+            chunk_type: Chunk type filter the query runs with ("all" if none,
+                "mixed" for a split hard canon and soft lore retrieval)
+            query_text: The query text
+            top_k: Maximum number of results (or the per-type quotas)
+            run: Runs the query; its result is cached (exceptions propagate
+                and nothing is cached)
+
+        Returns:
+            The query result
+        """
+        if self.ttl <= 0:
+            RETRIEVAL_LOOKUPS.inc(result="bypass")
+            return run()
+
+        try:
+            generation = cache.get(self._generation_key(universe_id), 0)
+            key = self._result_key(
+                universe_id, lore_version, generation, chunk_type, query_text, top_k
+            )
+            result = cache.get(key)
+        except Exception as e:
+            logger.debug(f"Lore retrieval cache unavailable: {e}")
+            RETRIEVAL_LOOKUPS.inc(result="bypass")
+            return run()
+
+        if result is not None:
+            RETRIEVAL_LOOKUPS.inc(result="hit")
+            return result
+
+        RETRIEVAL_LOOKUPS.inc(result="miss")
+        result = run()
+        try:
+            cache.set(key, result, self.ttl)
+        except Exception as e:
+            logger.debug(f"Lore retrieval cache unavailable: {e}")
+        return result
+
+    def invalidate(self, universe_id) -> None:
+        """Stop serving a universe's cached results (call after any collection write)."""
+        key = self._generation_key(universe_id)
+        try:
+            if not cache.add(key, 1, GENERATION_TTL):
+                cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            cache.set(key, 1, GENERATION_TTL)
+        except Exception as e:
+            logger.warning(f"Could not invalidate lore retrieval cache for {universe_id}: {e}")
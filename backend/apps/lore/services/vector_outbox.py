@@ -0,0 +1,407 @@
+"""
+Vector Outbox.
+
+Transactional outbox for ChromaDB writes. Lore changes record the vector
+operations they need as VectorOutboxEntry rows in the same transaction as
+their LoreChunk rows; drain_vector_outbox_task applies them afterwards:
+- A rolled-back transaction leaves no vectors behind
+- ChromaDB latency never holds a database transaction open
+- Operations on the same document within a batch are coalesced, so an
+  add followed by a delete never reaches ChromaDB at all
+- Entries are claimed with a short row-locking transaction and leased
+  (available_at) while ChromaDB is called, so no lock or transaction is
+  held across network calls; a worker that dies mid-drain leaves its
+  entries to be retried once the lease runs out
+- Failed writes are retried with exponential backoff, then parked as failed;
+  a batch rejected by ChromaDB is retried document by document, so one bad
+  document only holds back itself, while a batch that cannot reach ChromaDB
+  backs off the rest of the drain without further calls
+- Entries waiting out a backoff are not selected for draining, so they
+  never block other universes' writes
+- Drain lag and outcomes are exported to the metrics registry; stats()
+  reports the backlog from the database for /health/vector-outbox/
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef, Q
+from django.utils import timezone
+
+from apps.lore.models import VectorOutboxEntry
+from apps.lore.services.chroma_client import ChromaClientService, is_connection_error
+from whispyrkeep.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_ENTRIES = registry.counter(
+    "whispyrkeep_vector_outbox_entries_total",
+    "Vector outbox entries drained, by result (applied, coalesced, retried, failed).",
+    ("result",),
+)
+OUTBOX_LAG = registry.histogram(
+    "whispyrkeep_vector_outbox_lag_seconds",
+    "Time from enqueueing a vector operation to applying it in ChromaDB.",
+    ("operation",),
+)
+OUTBOX_PENDING = registry.gauge(
+    "whispyrkeep_vector_outbox_pending", "Pending vector outbox entries after the last drain."
+)
+OUTBOX_OLDEST = registry.gauge(
+    "whispyrkeep_vector_outbox_oldest_pending_seconds",
+    "Age of the oldest pending vector outbox entry after the last drain.",
+)
+
+ADD = VectorOutboxEntry.OP_ADD
+UPSERT = VectorOutboxEntry.OP_UPSERT
+DELETE = VectorOutboxEntry.OP_DELETE
+
+
+@dataclass
+class VectorOp:
+    """The net effect of one or more outbox entries on a single document."""
+
+    universe_id: str
+    document_id: str
+    operation: str
+    payload: dict
+    entries: list[VectorOutboxEntry] = field(default_factory=list)
+
+    def to_document(self) -> dict:
+        """Document dict in ChromaClientService batch format."""
+        return {"id": self.document_id, **self.payload}
+
+
+def _fold(current: tuple[str, dict] | None, operation: str, payload: dict):
+    """
+    Combine the net operation so far with the next one for the same document.
+
+    Follows ChromaDB semantics: add ignores an existing id, upsert replaces.
+
+    Returns:
+        (operation, payload), or None when the operations cancel out
+    """
+    if current is None:
+        return operation, payload
+    previous, previous_payload = current
+
+    if operation == DELETE:
+        # A document added in this batch never reached ChromaDB: skip both
+        return None if previous == ADD else (DELETE, {})
+    if previous == DELETE:
+        # Deleted then re-added: the new content replaces whatever was there
+        return UPSERT, payload
+    if operation == ADD:
+        # The document already exists by now, so a second add is ignored
+        return current
+    # upsert after add or upsert: the latest content wins
+    return UPSERT, payload
+
+
+def coalesce(entries: list[VectorOutboxEntry]) -> tuple[list[VectorOp], list[VectorOutboxEntry]]:
+    """
+    Reduce outbox entries to one net operation per document.
+
+    Args:
+        entries: Entries in drain (id) order
+
+    Returns:
+        Tuple of (operations to apply, entries that cancelled out)
+    """
+    by_document: dict[tuple[str, str], list[VectorOutboxEntry]] = {}
+    for entry in entries:
+        key = (str(entry.universe_id), entry.document_id)
+        by_document.setdefault(key, []).append(entry)
+
+    ops = []
+    cancelled = []
+    for (universe_id, document_id), document_entries in by_document.items():
+        net = None
+        for entry in document_entries:
+            net = _fold(net, entry.operation, entry.payload_json)
+        if net is None:
+            cancelled.extend(document_entries)
+        else:
+            operation, payload = net
+            ops.append(VectorOp(universe_id, document_id, operation, payload, document_entries))
+    return ops, cancelled
+
+
+@dataclass
+class DrainResult:
+    """Outcome of draining the outbox."""
+
+    applied: int = 0
+    coalesced: int = 0
+    retried: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def merge(self, other: "DrainResult") -> None:
+        self.applied += other.applied
+        self.coalesced += other.coalesced
+        self.retried += other.retried
+        self.failed += other.failed
+        self.errors.extend(other.errors)
+
+    def to_dict(self) -> dict:
+        return {
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "retried": self.retried,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+class VectorOutbox:
+    """
+    Records vector operations transactionally and drains them into ChromaDB.
+
+    Usage:
+        outbox = VectorOutbox()
+        with transaction.atomic():
+            LoreChunk.objects.bulk_create(chunks)
+            outbox.add_documents(universe.id, chroma_docs)
+        # after commit, drain_vector_outbox_task runs:
+        outbox.drain()
+    """
+
+    BATCH_SIZE = 500
+    MAX_BATCHES = 20
+    MAX_ATTEMPTS = 8
+    RETRY_BASE_DELAY = 5  # seconds; doubles per attempt
+    MAX_RETRY_DELAY = 600
+    CLAIM_TIMEOUT = 300  # seconds a drain may hold claimed entries
+
+    def __init__(self, chroma_service: ChromaClientService | None = None):
+        """Initialize the outbox."""
+        self.chroma = chroma_service or ChromaClientService()
+
+    # Enqueueing (call inside the transaction that changes the lore)
+
+    def add_documents(self, universe_id, documents: list[dict]) -> None:
+        """Queue documents (ChromaClientService batch format) to be added."""
+        self._enqueue(universe_id, ADD, documents)
+
+    def upsert_documents(self, universe_id, documents: list[dict]) -> None:
+        """Queue documents to be added or replaced."""
+        self._enqueue(universe_id, UPSERT, documents)
+
+    def delete_documents(self, universe_id, document_ids: list[str]) -> None:
+        """Queue documents to be deleted."""
+        self._enqueue(universe_id, DELETE, [{"id": document_id} for document_id in document_ids])
+
+    def _enqueue(self, universe_id, operation: str, documents: list[dict]) -> None:
+        if not documents:
+            return
+        VectorOutboxEntry.objects.bulk_create(
+            [
+                VectorOutboxEntry(
+                    universe_id=universe_id,
+                    operation=operation,
+                    document_id=str(doc["id"]),
+                    payload_json={key: value for key, value in doc.items() if key != "id"},
+                )
+                for doc in documents
+            ]
+        )
+        transaction.on_commit(self.schedule_drain)
+
+    @staticmethod
+    def schedule_drain(countdown: float | None = None) -> None:
+        """Ask the lore worker to drain the outbox."""
+        from apps.lore.tasks import drain_vector_outbox_task
+
+        drain_vector_outbox_task.apply_async(countdown=countdown)
+
+    # Draining (lore worker)
+
+    def drain(self, batch_size: int | None = None, max_batches: int | None = None) -> DrainResult:
+        """
+        Apply pending entries to ChromaDB, a batch at a time.
+
+        Args:
+            batch_size: Entries per batch (default BATCH_SIZE)
+            max_batches: Stop after this many batches (default MAX_BATCHES)
+
+        Returns:
+            DrainResult totals
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        result = DrainResult()
+        for _ in range(max_batches or self.MAX_BATCHES):
+            batch, selected, reachable = self._drain_batch(batch_size)
+            result.merge(batch)
+            if selected < batch_size or not reachable:
+                break
+
+        stats = self.stats()
+        OUTBOX_PENDING.set(stats["pending"])
+        OUTBOX_OLDEST.set(stats["oldest_pending_seconds"])
+        return result
+
+    def _drain_batch(self, batch_size: int) -> tuple[DrainResult, int, bool]:
+        """
+        Drain one batch.
+
+        Returns:
+            Tuple of (result, entries selected, whether ChromaDB was reachable)
+        """
+        result = DrainResult()
+        now = timezone.now()
+        ops, selected = self._claim_batch(batch_size, now, result)
+
+        key = lambda op: (op.universe_id, op.operation)  # noqa: E731
+        groups = [
+            (universe_id, operation, list(group))
+            for (universe_id, operation), group in groupby(sorted(ops, key=key), key=key)
+        ]
+        for index, (universe_id, operation, group) in enumerate(groups):
+            error = self._apply(universe_id, operation, group, now, result)
+            if error is not None:
+                # ChromaDB is down: back off the rest without calling it again
+                rest = [
+                    entry
+                    for *_, later in groups[index + 1 :]
+                    for op in later
+                    for entry in op.entries
+                ]
+                self._retry_later(rest, str(error), now, result)
+                return result, selected, False
+
+        return result, selected, True
+
+    def _claim_batch(self, batch_size: int, now, result: DrainResult) -> tuple[list[VectorOp], int]:
+        """
+        Select, coalesce and lease a batch of due entries.
+
+        Returns:
+            Tuple of (operations to apply, entries selected)
+        """
+        pending = VectorOutboxEntry.objects.filter(status=VectorOutboxEntry.STATUS_PENDING)
+        # A document waiting out a retry (or leased to a drain) holds back its
+        # later entries too, so operations on it are never applied out of order
+        waiting_earlier = pending.filter(
+            universe_id=OuterRef("universe_id"),
+            document_id=OuterRef("document_id"),
+            id__lt=OuterRef("id"),
+            available_at__gt=now,
+        )
+
+        # Lock only outbox rows, skipping any another worker is claiming, and
+        # only until the batch is leased; ChromaDB is called after commit
+        with transaction.atomic():
+            entries = list(
+                pending.select_for_update(skip_locked=True)
+                .filter(Q(available_at__isnull=True) | Q(available_at__lte=now))
+                .exclude(Exists(waiting_earlier))
+                .order_by("id")[:batch_size]
+            )
+            if not entries:
+                return [], 0
+
+            ops, cancelled = coalesce(entries)
+            if cancelled:
+                VectorOutboxEntry.objects.filter(id__in=[e.id for e in cancelled]).delete()
+                result.coalesced = len(cancelled)
+                OUTBOX_ENTRIES.inc(len(cancelled), result="coalesced")
+
+            VectorOutboxEntry.objects.filter(
+                id__in=[entry.id for op in ops for entry in op.entries]
+            ).update(available_at=now + timedelta(seconds=self.CLAIM_TIMEOUT))
+
+        return ops, len(entries)
+
+    def _apply(
+        self,
+        universe_id: str,
+        operation: str,
+        ops: list[VectorOp],
+        now,
+        result: DrainResult,
+    ) -> Exception | None:
+        """
+        Apply one universe's operations of one kind in a single ChromaDB call.
+
+        If ChromaDB rejects the call, each document is retried on its own so
+        that only the ones that keep failing are backed off. If it cannot be
+        reached, the whole group is backed off.
+
+        Returns:
+            The error if ChromaDB could not be reached, else None
+        """
+        entries = [entry for op in ops for entry in op.entries]
+        try:
+            if operation == DELETE:
+                self.chroma.delete_documents(universe_id, [op.document_id for op in ops])
+            elif operation == UPSERT:
+                self.chroma.upsert_documents_batch(universe_id, [op.to_document() for op in ops])
+            else:
+                self.chroma.add_documents_batch(universe_id, [op.to_document() for op in ops])
+        except Exception as e:
+            unreachable = is_connection_error(e)
+            if len(ops) > 1 and not unreachable:
+                for op in ops:
+                    self._apply(universe_id, operation, [op], now, result)
+                return None
+            target = ops[0].document_id if len(ops) == 1 else f"{len(ops)} documents"
+            logger.warning(
+                f"Vector outbox {operation} of {target} failed for universe {universe_id}: {e}"
+            )
+            result.errors.append(f"{operation} {universe_id}/{target}: {e}")
+            self._retry_later(entries, str(e), now, result)
+            return e if unreachable else None
+
+        VectorOutboxEntry.objects.filter(id__in=[entry.id for entry in entries]).delete()
+        result.applied += len(entries)
+        OUTBOX_ENTRIES.inc(len(entries), result="applied")
+        for entry in entries:
+            OUTBOX_LAG.observe((now - entry.created_at).total_seconds(), operation=operation)
+        return None
+
+    def _retry_later(self, entries: list[VectorOutboxEntry], error: str, now, result) -> None:
+        """Back off failed entries, parking them once they run out of attempts."""
+        retried = failed = 0
+        for entry in entries:
+            entry.attempts += 1
+            entry.last_error = error[:2000]
+            if entry.attempts >= self.MAX_ATTEMPTS:
+                entry.status = VectorOutboxEntry.STATUS_FAILED
+                failed += 1
+            else:
+                delay = min(self.RETRY_BASE_DELAY * 2 ** (entry.attempts - 1), self.MAX_RETRY_DELAY)
+                entry.available_at = now + timedelta(seconds=delay)
+                retried += 1
+            entry.save(update_fields=["attempts", "last_error", "status", "available_at"])
+        result.retried += retried
+        result.failed += failed
+        OUTBOX_ENTRIES.inc(retried, result="retried")
+        OUTBOX_ENTRIES.inc(failed, result="failed")
+
+    def next_retry_delay(self) -> float | None:
+        """Seconds until the earliest backed-off entry may be retried (None if none wait)."""
+        next_at = VectorOutboxEntry.objects.filter(
+            status=VectorOutboxEntry.STATUS_PENDING,
+            available_at__isnull=False,
+        ).aggregate(next_at=Min("available_at"))["next_at"]
+        if next_at is None:
+            return None
+        return max((next_at - timezone.now()).total_seconds(), 0.0)
+
+    def stats(self) -> dict:
+        """Backlog of the outbox, read from the database (valid across workers)."""
+        pending = VectorOutboxEntry.objects.filter(status=VectorOutboxEntry.STATUS_PENDING)
+        oldest = pending.aggregate(oldest=Min("created_at"))["oldest"]
+        return {
+            "pending": pending.count(),
+            "failed": VectorOutboxEntry.objects.filter(
+                status=VectorOutboxEntry.STATUS_FAILED
+            ).count(),
+            "oldest_pending_seconds": (
+                round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0
+            ),
+        }
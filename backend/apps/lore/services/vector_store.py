@@ -0,0 +1,556 @@
+"""
+Vector Store Backends.
+
+ChromaClientService talks to its vector store through the subset of the
+chromadb client and collection API it uses (see VectorStore and
+VectorCollection), so the store behind it is pluggable. Backends, chosen by
+LORE_VECTOR_BACKEND:
+- chroma: a ChromaDB server (chromadb.HttpClient)
+- local: LocalVectorStore, in process; each universe's embeddings are a
+  NumPy matrix on disk, memory-mapped and searched by brute-force cosine
+  top-k. Needs no vector server, and a few hundred chunks answer in
+  microseconds
+- auto: TieredVectorStore; universes start local and are moved to the
+  ChromaDB server once they outgrow LORE_LOCAL_INDEX_MAX_DOCUMENTS
+
+Local collections live in one directory each under LORE_LOCAL_INDEX_DIR,
+which every process serving a universe must share. Writes take a file lock
+and replace the index files atomically; readers notice the new files and
+remap them.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections.abc import Callable
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORDS_FILE = "records.json"
+LOCK_FILE = ".lock"
+
+_COLLECTION_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{3,63}$")
+
+# Documents copied per call when a collection is moved to the server
+PROMOTION_BATCH_SIZE = 500
+
+# Local collections rank by cosine distance; server collections are created
+# in the same space (Chroma defaults to L2), so a universe's distances and
+# ranking keep their meaning when it moves to the server
+COSINE_SPACE = {"hnsw:space": "cosine"}
+
+
+class VectorCollection(Protocol):
+    """The collection API ChromaClientService uses."""
+
+    def count(self) -> int: ...
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None: ...
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None: ...
+
+    def get(self, ids=None, where=None, limit=None, include=None) -> dict: ...
+
+    def query(
+        self, query_texts=None, query_embeddings=None, n_results=10, where=None, include=None
+    ) -> dict: ...
+
+    def delete(self, ids=None, where=None) -> None: ...
+
+
+class VectorStore(Protocol):
+    """The client API ChromaClientService uses."""
+
+    def get_or_create_collection(
+        self, name: str, metadata: dict | None = None
+    ) -> VectorCollection: ...
+
+    def delete_collection(self, name: str) -> None: ...
+
+
+def matches_where(metadata: dict, where: dict | None) -> bool:
+    """Evaluate a Chroma ``where`` filter against a document's metadata."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class CollectionNotFoundError(ValueError):
+    """The collection does not exist (deleted, or moved by TieredVectorStore)."""
+
+
+@dataclass(frozen=True)
+class _Index:
+    """One generation of a local collection, swapped whole on reload."""
+
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict]
+    embeddings: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "_Index":
+        return cls([], [], [], np.zeros((0, 0), dtype=np.float32))
+
+
+class LocalCollection:
+    """
+    A Chroma-compatible collection stored as files in one directory.
+
+    records.json holds the ids, documents and metadatas and names the
+    embeddings file, a float32 matrix of unit rows in .npy format that is
+    memory-mapped for queries. Distances are cosine distances, as in a
+    Chroma collection with ``hnsw:space`` cosine.
+    """
+
+    def __init__(self, path: Path, name: str, embedding_function: Callable):
+        self.path = path
+        self.name = name
+        self.embedding_function = embedding_function
+        self.metadata: dict = {}
+        self._index = _Index.empty()
+        self._loaded_stat: tuple | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def records_path(self) -> Path:
+        return self.path / RECORDS_FILE
+
+    def exists(self) -> bool:
+        return self.records_path.exists()
+
+    def _load(self) -> _Index:
+        """Get the current index, remapping it if a writer replaced it since the last load."""
+        try:
+            return self._load_current()
+        except FileNotFoundError:
+            # Writers replaced the index twice between reading records.json
+            # and mapping its embeddings file; read the newest generation
+            return self._load_current()
+
+    def _load_current(self) -> _Index:
+        try:
+            stat = self.records_path.stat()
+            current = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            current = None
+
+        with self._lock:
+            if current == self._loaded_stat:
+                return self._index
+            index = _Index.empty()
+            if current is not None:
+                records = json.loads(self.records_path.read_text())
+                self.metadata = records.get("metadata", {})
+                embeddings = index.embeddings
+                if records.get("embeddings_file"):
+                    embeddings = np.load(self.path / records["embeddings_file"], mmap_mode="r")
+                index = _Index(
+                    records["ids"], records["documents"], records["metadatas"], embeddings
+                )
+            self._index = index
+            self._loaded_stat = current
+            return index
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writers across processes; raises if the collection is gone."""
+        try:
+            lock_file = open(self.path / LOCK_FILE, "a")  # noqa: SIM115 - closed below
+        except FileNotFoundError:
+            raise CollectionNotFoundError(f"Collection {self.name} does not exist.") from None
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if not self.exists():
+                    raise CollectionNotFoundError(f"Collection {self.name} does not exist.")
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, ids, documents, metadatas, embeddings: np.ndarray) -> None:
+        """Write a new index generation and switch readers to it (under the write lock)."""
+        try:
+            previous = json.loads(self.records_path.read_text()).get("embeddings_file")
+        except FileNotFoundError:
+            previous = None
+
+        embeddings_file = None
+        if ids:
+            embeddings_file = f"embeddings.{uuid.uuid4().hex}.npy"
+            np.save(self.path / embeddings_file, embeddings.astype(np.float32))
+
+        records = {
+            "metadata": self.metadata,
+            "ids": ids,
+            "documents": documents,
+            "metadatas": metadatas,
+            "embeddings_file": embeddings_file,
+        }
+        tmp_path = self.path / f"{RECORDS_FILE}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_text(json.dumps(records))
+        os.replace(tmp_path, self.records_path)
+
+        # The previous generation stays until the next write, for readers
+        # that read the old records.json but have not mapped its file yet;
+        # older ones go (readers still mapping them keep them until remap)
+        keep = {embeddings_file, previous}
+        for stale in self.path.glob("embeddings.*.npy"):
+            if stale.name not in keep:
+                stale.unlink(missing_ok=True)
+
+    def create(self, metadata: dict | None) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if not self.exists():
+                    self.metadata = metadata or {}
+                    self._write([], [], [], np.zeros((0, 0), dtype=np.float32))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _embed(self, documents: list[str], embeddings) -> np.ndarray:
+        if embeddings is None:
+            embeddings = self.embedding_function(documents)
+        return _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+    def count(self) -> int:
+        return len(self._load().ids)
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        self._put(ids, documents, metadatas, embeddings, replace=False)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        self._put(ids, documents, metadatas, embeddings, replace=True)
+
+    def _put(self, ids, documents, metadatas, embeddings, replace: bool) -> None:
+        documents = documents or [""] * len(ids)
+        metadatas = metadatas or [{}] * len(ids)
+        # Embed outside the lock; it is the slow part
+        vectors = self._embed(documents, embeddings)
+
+        with self._write_lock():
+            index = self._load()
+            all_ids = list(index.ids)
+            all_documents = list(index.documents)
+            all_metadatas = list(index.metadatas)
+            matrix = np.array(index.embeddings, dtype=np.float32)
+            if not all_ids:
+                matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            positions = {doc_id: i for i, doc_id in enumerate(all_ids)}
+            new_rows = []
+
+            for doc_id, text, metadata, vector in zip(
+                ids, documents, metadatas, vectors, strict=True
+            ):
+                doc_id = str(doc_id)
+                if doc_id in positions:
+                    # chromadb ignores adds of existing ids
+                    if replace:
+                        i = positions[doc_id]
+                        all_documents[i] = text
+                        all_metadatas[i] = dict(metadata or {})
+                        matrix[i] = vector
+                    continue
+                positions[doc_id] = len(all_ids)
+                all_ids.append(doc_id)
+                all_documents.append(text)
+                all_metadatas.append(dict(metadata or {}))
+                new_rows.append(vector)
+
+            if new_rows:
+                matrix = np.vstack([matrix, np.stack(new_rows)])
+            self._write(all_ids, all_documents, all_metadatas, matrix)
+
+    @staticmethod
+    def _select(index: _Index, ids=None, where=None) -> list[int]:
+        wanted = {str(doc_id) for doc_id in ids} if ids is not None else None
+        return [
+            i
+            for i, doc_id in enumerate(index.ids)
+            if (wanted is None or doc_id in wanted) and matches_where(index.metadatas[i], where)
+        ]
+
+    def get(self, ids=None, where=None, limit=None, include=None) -> dict:
+        index = self._load()
+        rows = self._select(index, ids, where)[:limit]
+        result = {
+            "ids": [index.ids[i] for i in rows],
+            "documents": [index.documents[i] for i in rows],
+            "metadatas": [index.metadatas[i] for i in rows],
+        }
+        if include and "embeddings" in include:
+            result["embeddings"] = [index.embeddings[i].tolist() for i in rows]
+        return result
+
+    def query(
+        self, query_texts=None, query_embeddings=None, n_results=10, where=None, include=None
+    ) -> dict:
+        if query_embeddings is None:
+            query_embeddings = self.embedding_function(query_texts)
+        queries = _normalize_rows(np.asarray(query_embeddings, dtype=np.float32))
+
+        index = self._load()
+        rows = np.asarray(self._select(index, where=where), dtype=np.intp)
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query in queries:
+            top: list[tuple[int, float]] = []
+            if len(rows) and n_results > 0:
+                similarities = index.embeddings[rows] @ query
+                k = min(n_results, len(rows))
+                best = np.argpartition(-similarities, k - 1)[:k]
+                best = best[np.argsort(-similarities[best], kind="stable")]
+                top = [(int(rows[j]), float(1.0 - similarities[j])) for j in best]
+            result["ids"].append([index.ids[i] for i, _ in top])
+            result["documents"].append([index.documents[i] for i, _ in top])
+            result["metadatas"].append([index.metadatas[i] for i, _ in top])
+            result["distances"].append([distance for _, distance in top])
+        return result
+
+    def delete(self, ids=None, where=None) -> None:
+        with self._write_lock():
+            index = self._load()
+            doomed = set(self._select(index, ids, where))
+            if not doomed:
+                return
+            keep = [i for i in range(len(index.ids)) if i not in doomed]
+            self._write(
+                [index.ids[i] for i in keep],
+                [index.documents[i] for i in keep],
+                [index.metadatas[i] for i in keep],
+                np.asarray(index.embeddings)[keep],
+            )
+
+
+class LocalVectorStore:
+    """
+    A Chroma-compatible client whose collections are local NumPy indexes.
+
+    Usage:
+        store = LocalVectorStore(settings.LORE_LOCAL_INDEX_DIR, embedding_function)
+        service = ChromaClientService(client=store)
+    """
+
+    def __init__(self, root: str | Path, embedding_function: Callable):
+        self.root = Path(root)
+        self.embedding_function = embedding_function
+        self._collections: dict[str, LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def _collection(self, name: str) -> LocalCollection:
+        if not _COLLECTION_NAME_RE.match(name):
+            raise ValueError(f"Invalid collection name: {name}")
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = LocalCollection(
+                    self.root / name, name, self.embedding_function
+                )
+            return collection
+
+    def heartbeat(self) -> int:
+        return 0
+
+    def has_collection(self, name: str) -> bool:
+        return self._collection(name).exists()
+
+    def get_or_create_collection(self, name: str, metadata: dict | None = None):
+        collection = self._collection(name)
+        if not collection.exists():
+            collection.create(metadata)
+        return collection
+
+    def get_collection(self, name: str) -> LocalCollection:
+        collection = self._collection(name)
+        if not collection.exists():
+            raise CollectionNotFoundError(f"Collection {name} does not exist.")
+        return collection
+
+    def list_collections(self) -> list[LocalCollection]:
+        if not self.root.exists():
+            return []
+        return [
+            self._collection(path.name)
+            for path in sorted(self.root.iterdir())
+            if (path / RECORDS_FILE).exists()
+        ]
+
+    def delete_collection(self, name: str) -> None:
+        collection = self.get_collection(name)
+        with collection._write_lock():
+            (collection.records_path).unlink()
+        shutil.rmtree(collection.path, ignore_errors=True)
+
+
+class TieredCollection:
+    """
+    A collection kept locally while small and on the server once large.
+
+    Each operation goes to wherever the collection lives now, so processes
+    follow a move made by another process.
+    """
+
+    def __init__(self, store: "TieredVectorStore", name: str, metadata: dict | None):
+        self.store = store
+        self.name = name
+        self.metadata = metadata
+        self._remote = None
+
+    def _target(self):
+        if self.store.local.has_collection(self.name):
+            return self.store.local.get_collection(self.name)
+        if self._remote is None:
+            self._remote = self.store.remote.get_or_create_collection(
+                name=self.name, metadata={**(self.metadata or {}), **COSINE_SPACE}
+            )
+        return self._remote
+
+    def _call(self, method: str, **kwargs):
+        target = self._target()
+        try:
+            return target, getattr(target, method)(**kwargs)
+        except CollectionNotFoundError:
+            # Moved to the server while we were looking
+            target = self._target()
+            return target, getattr(target, method)(**kwargs)
+
+    def count(self) -> int:
+        return self._call("count")[1]
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        target, _ = self._call(
+            "add", ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+        )
+        self._maybe_promote(target)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        target, _ = self._call(
+            "upsert", ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+        )
+        self._maybe_promote(target)
+
+    def get(self, ids=None, where=None, limit=None, include=None) -> dict:
+        return self._call("get", ids=ids, where=where, limit=limit, include=include)[1]
+
+    def query(
+        self, query_texts=None, query_embeddings=None, n_results=10, where=None, include=None
+    ) -> dict:
+        kwargs = {"n_results": n_results, "where": where}
+        if query_embeddings is not None:
+            kwargs["query_embeddings"] = query_embeddings
+        else:
+            kwargs["query_texts"] = query_texts
+        return self._call("query", **kwargs)[1]
+
+    def delete(self, ids=None, where=None) -> None:
+        self._call("delete", ids=ids, where=where)
+
+    def _maybe_promote(self, target) -> None:
+        if not isinstance(target, LocalCollection):
+            return
+        if target.count() > self.store.max_local_documents:
+            # Another process may have moved it first
+            with suppress(CollectionNotFoundError):
+                self.store.promote(self.name, self.metadata)
+
+
+class TieredVectorStore:
+    """
+    Chroma-compatible client picking a backend per universe by size.
+
+    New collections are created locally. A collection that grows past
+    max_local_documents is copied to the server, embeddings included, and
+    its local index removed. Collections that already exist on the server
+    stay there.
+
+    Usage:
+        store = TieredVectorStore(local_store, chromadb.HttpClient(...), 2000)
+    """
+
+    def __init__(self, local: LocalVectorStore, remote, max_local_documents: int):
+        self.local = local
+        self.remote = remote
+        self.max_local_documents = max_local_documents
+
+    def heartbeat(self) -> int:
+        return self.remote.heartbeat()
+
+    def get_or_create_collection(self, name: str, metadata: dict | None = None):
+        if not self.local.has_collection(name) and not self._on_remote(name):
+            self.local.get_or_create_collection(name, metadata)
+        return TieredCollection(self, name, metadata)
+
+    def _on_remote(self, name: str) -> bool:
+        try:
+            self.remote.get_collection(name)
+        except Exception as e:
+            # chromadb raises ValueError (or its own error type in later
+            # versions) for a missing collection
+            if isinstance(e, ValueError) or "does not exist" in str(e):
+                return False
+            raise
+        return True
+
+    def promote(self, name: str, metadata: dict | None) -> None:
+        """Copy a local collection to the server and remove the local index."""
+        local = self.local.get_collection(name)
+        with local._write_lock():
+            records = local.get(include=["embeddings"])
+            remote = self.remote.get_or_create_collection(
+                name=name, metadata={**(metadata or {}), **COSINE_SPACE}
+            )
+            for start in range(0, len(records["ids"]), PROMOTION_BATCH_SIZE):
+                end = start + PROMOTION_BATCH_SIZE
+                remote.upsert(
+                    ids=records["ids"][start:end],
+                    documents=records["documents"][start:end],
+                    metadatas=records["metadatas"][start:end],
+                    embeddings=records["embeddings"][start:end],
+                )
+            local.records_path.unlink()
+        shutil.rmtree(local.path, ignore_errors=True)
+        logger.info(f"Moved collection {name} ({len(records['ids'])} documents) to ChromaDB")
+
+    def delete_collection(self, name: str) -> None:
+        if self.local.has_collection(name):
+            self.local.delete_collection(name)
+        else:
+            self.remote.delete_collection(name)
@@ -336,3 +336,27 @@ def rebuild_universe_embeddings_task(
         "success": True,
         "embedded_count": total_embedded,
     }
+
+
+@shared_task(bind=True)
+def drain_vector_outbox_task(self):
+    """
+    Apply pending vector outbox entries to ChromaDB.
+
+    Dispatched when a transaction that enqueued vector operations commits.
+    If entries are waiting out a retry backoff, the task schedules itself
+    again for when the earliest of them becomes due.
+
+    Returns:
+        Dict with drain results
+    """
+    from apps.lore.services.vector_outbox import VectorOutbox
+
+    outbox = VectorOutbox()
+    result = outbox.drain()
+
+    retry_in = outbox.next_retry_delay()
+    if retry_in is not None:
+        outbox.schedule_drain(countdown=retry_in)
+
+    return result.to_dict()
@@ -0,0 +1,115 @@
+"""
+Tests for the shared ChromaDB connection.
+
+Tests that collection handles are fetched once and dropped on delete, and
+that services share one client per server within a process.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.lore.services import chroma_client
+from apps.lore.services.chroma_client import ChromaClientService, get_chroma_connection
+
+UNIVERSE_ID = "5a4b3c2d-1e0f-4a9b-8c7d-6e5f4a3b2c1d"
+
+
+@pytest.fixture
+def client():
+    """A Chroma client whose collection has no documents."""
+    client = MagicMock()
+    client.get_or_create_collection.return_value.get.return_value = {"ids": []}
+    return client
+
+
+@pytest.fixture
+def chroma(client):
+    return ChromaClientService(client=client, retrieval_cache=MagicMock())
+
+
+@pytest.fixture
+def connections():
+    """Isolate the process-wide connection registry."""
+    with (
+        patch.dict(chroma_client._connections, clear=True),
+        patch.object(chroma_client, "_connections_pid", os.getpid()),
+    ):
+        yield chroma_client._connections
+
+
+class TestChromaConnection:
+    """Tests for ChromaConnection and get_chroma_connection."""
+
+    def test_collection_handle_cached(self, chroma, client):
+        """Test only the first operation on a universe fetches its collection."""
+        chroma.add_document(UNIVERSE_ID, "c1", "The keep stands.")
+        chroma.query(UNIVERSE_ID, "keep")
+        chroma.get_collection_stats(UNIVERSE_ID)
+
+        client.get_or_create_collection.assert_called_once()
+
+    def test_delete_collection_drops_handle(self, chroma, client):
+        """Test a deleted collection is fetched (recreated) again on next use."""
+        chroma.get_collection_stats(UNIVERSE_ID)
+        assert chroma.delete_collection(UNIVERSE_ID) is True
+        chroma.get_collection_stats(UNIVERSE_ID)
+
+        client.delete_collection.assert_called_once()
+        assert client.get_or_create_collection.call_count == 2
+
+    def test_collections_use_cosine_space(self, chroma, client):
+        """Test server collections rank by cosine distance, like local ones."""
+        chroma.get_collection_stats(UNIVERSE_ID)
+
+        metadata = client.get_or_create_collection.call_args.kwargs["metadata"]
+        assert metadata == {"universe_id": UNIVERSE_ID, "hnsw:space": "cosine"}
+
+    def test_services_share_client(self, connections):
+        """Test services for the same server share one client and its handles."""
+        with patch.object(chroma_client, "_http_client") as http_client:
+            first = ChromaClientService(chroma_url="http://chroma:8000")
+            second = ChromaClientService(chroma_url="http://chroma:8000")
+            other = ChromaClientService(chroma_url="http://other:8000")
+
+            first.get_collection_stats(UNIVERSE_ID)
+            second.get_collection_stats(UNIVERSE_ID)
+
+            assert first.connection is second.connection
+            assert other.connection is not first.connection
+        assert http_client.call_count == 2
+        http_client.return_value.get_or_create_collection.assert_called_once()
+
+    def test_connections_reset_after_fork(self, connections):
+        """Test a forked worker builds its own client."""
+        with patch.object(chroma_client, "_http_client"):
+            parent = get_chroma_connection("http://chroma:8000")
+            with patch.object(chroma_client.os, "getpid", return_value=-1):
+                child = get_chroma_connection("http://chroma:8000")
+
+        assert child is not parent
+
+    def test_recreated_collection_refetched(self, chroma, client):
+        """Test a handle to a collection recreated elsewhere is refetched and retried."""
+        stale = MagicMock()
+        stale.count.side_effect = ValueError("Collection abc does not exist.")
+        current = MagicMock()
+        current.count.return_value = 3
+        client.get_or_create_collection.side_effect = [stale, current]
+
+        assert chroma.get_collection_stats(UNIVERSE_ID)["total_documents"] == 3
+        assert chroma.get_collection_stats(UNIVERSE_ID)["total_documents"] == 3
+
+        assert client.get_or_create_collection.call_count == 2
+        stale.count.assert_called_once()
+
+    def test_other_errors_not_retried(self, chroma, client):
+        """Test failures other than a missing collection propagate as before."""
+        collection = client.get_or_create_collection.return_value
+        collection.delete.side_effect = ConnectionError("chroma down")
+
+        with pytest.raises(ConnectionError):
+            chroma.delete_documents(UNIVERSE_ID, ["c1"])
+
+        client.get_or_create_collection.assert_called_once()
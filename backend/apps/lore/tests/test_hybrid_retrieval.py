@@ -0,0 +1,153 @@
+"""
+Tests for hybrid lore retrieval.
+
+Tests the full-text lore index, reciprocal-rank fusion, and that hybrid
+retrieval surfaces exact names the vector search missed.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.campaigns.services.prompt_builder import PromptBuilder
+from apps.lore.models import LoreChunk
+from apps.lore.services.chroma_client import (
+    ChromaClientService,
+    LoreSearchResult,
+    reciprocal_rank_fusion,
+)
+from apps.lore.services.lexical_index import LexicalLoreIndex, lexical_query
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def universe(db):
+    """Create test universe."""
+    user = User.objects.create_user(
+        email="hybrid@example.com",
+        password="testpass123",
+        username="hybrid",
+    )
+    return Universe.objects.create(user=user, name="Emberfall")
+
+
+@pytest.fixture
+def chunks(universe):
+    """Lore chunks, one naming an NPC."""
+    return {
+        name: LoreChunk.objects.create(
+            universe=universe, chunk_type=chunk_type, source_ref="doc1", text=text
+        )
+        for name, chunk_type, text in [
+            ("aldric", "hard_canon", "Aldric the smith forges blades in Emberfall."),
+            ("forge", "hard_canon", "The great forge burns day and night."),
+            ("rumour", "soft_lore", "Some say the forge was lit by a dragon."),
+        ]
+    }
+
+
+def result(chunk_id: str, chunk_type: str = "hard_canon") -> LoreSearchResult:
+    return LoreSearchResult(
+        chunk_id=chunk_id, text=chunk_id, chunk_type=chunk_type, source_ref="", score=0.0
+    )
+
+
+class TestReciprocalRankFusion:
+    """Tests for reciprocal_rank_fusion."""
+
+    def test_agreement_ranks_first(self):
+        """Test a result found by both rankings beats results found by one."""
+        fused = reciprocal_rank_fusion(
+            [[result("a"), result("b")], [result("c"), result("b")]], k=60
+        )
+
+        assert [r.chunk_id for r in fused] == ["b", "a", "c"]
+        assert fused[0].score == pytest.approx(2 / 62)
+
+    def test_lexical_query(self):
+        """Test queries OR their words and text without words is not searched."""
+        assert lexical_query("?!") is None
+        assert lexical_query("Where is Aldric or Brenna?") is not None
+
+
+@pytest.mark.django_db
+class TestLexicalLoreIndex:
+    """Tests for LexicalLoreIndex."""
+
+    def test_finds_proper_noun(self, universe, chunks):
+        """Test an exact name matches its chunk."""
+        results = LexicalLoreIndex().search(
+            str(universe.id), "Where is Aldric?", ["hard_canon", "soft_lore"], top_k=5
+        )
+
+        assert [r.chunk_id for r in results] == [str(chunks["aldric"].id)]
+
+    def test_filters_type_and_superseded(self, universe, chunks):
+        """Test chunk type filters apply and superseded chunks are left out."""
+        summary = LoreChunk.objects.create(
+            universe=universe, chunk_type="soft_lore", source_ref="doc1", text="A forge tale."
+        )
+        chunks["rumour"].supersedes_chunk = summary
+        chunks["rumour"].save()
+
+        results = LexicalLoreIndex().search(str(universe.id), "forge", ["soft_lore"], top_k=5)
+
+        assert [r.chunk_id for r in results] == [str(summary.id)]
+
+
+@pytest.mark.django_db
+class TestHybridRetrieval:
+    """Tests for ChromaClientService.query_lore with a lexical index."""
+
+    @pytest.fixture
+    def chroma(self, chunks):
+        """A service whose vector search only finds the forge chunk."""
+        collection = MagicMock()
+        forge = chunks["forge"]
+        collection.query.return_value = {
+            "ids": [[str(forge.id)]],
+            "documents": [[forge.text]],
+            "metadatas": [[{"chunk_type": "hard_canon", "source_ref": "doc1"}]],
+            "distances": [[0.4]],
+        }
+        client = MagicMock()
+        client.get_or_create_collection.return_value = collection
+        return ChromaClientService(
+            client=client,
+            retrieval_cache=MagicMock(),
+            embedding_function=MagicMock(return_value=[[0.0]]),
+            lexical_index=LexicalLoreIndex(),
+        )
+
+    def test_surfaces_name_missed_by_vectors(self, chroma, universe, chunks):
+        """Test a named NPC reaches the results though vector search missed it."""
+        retrieval = chroma.query_lore(
+            str(universe.id), "Ask Aldric about the forge", hard_canon_k=2, soft_lore_k=1
+        )
+
+        hard_canon = [r.chunk_id for r in retrieval.hard_canon.results]
+        assert hard_canon == [str(chunks["forge"].id), str(chunks["aldric"].id)]
+        assert [r.chunk_id for r in retrieval.soft_lore.results] == [str(chunks["rumour"].id)]
+
+    def test_vector_mode_by_default(self, settings):
+        """Test hybrid retrieval is off unless LORE_RETRIEVAL_MODE enables it."""
+        settings.LORE_RETRIEVAL_MODE = "vector"
+        assert ChromaClientService(client=MagicMock()).lexical_index is None
+
+        settings.LORE_RETRIEVAL_MODE = "hybrid"
+        assert isinstance(ChromaClientService(client=MagicMock()).lexical_index, LexicalLoreIndex)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_async_injection_closes_worker_connection(self, chroma, universe, chunks):
+        """Test the executor thread's database connection is closed after the query."""
+        builder = PromptBuilder(chroma_service=chroma)
+
+        with patch("apps.campaigns.services.prompt_builder.connections") as connections:
+            lore = asyncio.run(builder.abuild_lore_injection(str(universe.id), "Aldric", top_k=2))
+
+        assert len(lore.hard_canon_chunks) == 2
+        connections.close_all.assert_called_once()
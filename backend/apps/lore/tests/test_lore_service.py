@@ -9,7 +9,7 @@ from unittest.mock import MagicMock
 import pytest
 from django.contrib.auth import get_user_model
 
-from apps.lore.models import LoreChunk
+from apps.lore.models import LoreChunk, VectorOutboxEntry
 from apps.lore.services.lore_service import LoreService
 from apps.universes.models import Universe, UniverseHardCanonDoc
 
@@ -44,6 +44,9 @@ def lore_service():
     service.chroma = MagicMock()
     service.chroma.add_documents_batch.return_value = []
     service.chroma.query.return_value = MagicMock(results=[])
+    service.chroma.query_lore.return_value = MagicMock(
+        hard_canon=MagicMock(results=[]), soft_lore=MagicMock(results=[])
+    )
     return service
 
 
@@ -231,6 +234,45 @@ class TestLoreInvalidation:
         assert count == 1
         assert not LoreChunk.objects.filter(source_ref="turn_to_rewind").exists()
 
+    def test_invalidate_turns_lore_batch(self, lore_service, universe):
+        """Test a batch of turns is invalidated with one version bump and queued deletes."""
+        for turn_id in ("turn_a", "turn_b", "turn_c"):
+            lore_service.process_turn_lore_deltas(
+                universe=universe,
+                turn_id=turn_id,
+                lore_deltas=[{"text": f"Event from {turn_id}."}],
+            )
+        rewound = {
+            str(pk)
+            for pk in LoreChunk.objects.filter(source_ref__in=["turn_a", "turn_b"]).values_list(
+                "id", flat=True
+            )
+        }
+        universe.refresh_from_db()
+        version = universe.canonical_lore_version
+
+        count = lore_service.invalidate_turns_lore(universe, ["turn_a", "turn_b"])
+
+        assert count == 2
+        assert list(LoreChunk.objects.values_list("source_ref", flat=True)) == ["turn_c"]
+        universe.refresh_from_db()
+        assert universe.canonical_lore_version == version + 1
+        deletes = VectorOutboxEntry.objects.filter(operation=VectorOutboxEntry.OP_DELETE)
+        assert {entry.document_id for entry in deletes} == rewound
+        lore_service.chroma.delete_documents_by_sources.assert_not_called()
+
+    def test_invalidate_turn_without_lore(self, lore_service, universe):
+        """Test invalidating a turn with no lore changes nothing."""
+        version = universe.canonical_lore_version
+
+        assert lore_service.invalidate_turn_lore(universe=universe, turn_id="turn_x") == 0
+
+        universe.refresh_from_db()
+        assert universe.canonical_lore_version == version
+        assert not VectorOutboxEntry.objects.filter(
+            operation=VectorOutboxEntry.OP_DELETE
+        ).exists()
+
 
 @pytest.mark.django_db
 class TestLoreStats:
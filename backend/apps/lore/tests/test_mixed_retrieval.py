@@ -0,0 +1,119 @@
+"""
+Tests for mixed lore retrieval.
+
+Tests that hard canon and soft lore come from one query split by quota,
+that a crowded-out type is topped up, and that a precomputed query
+embedding is reused.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.campaigns.loadtest import InMemoryChromaClient
+from apps.lore.services.chroma_client import ChromaClientService
+from apps.lore.services.retrieval_cache import LoreRetrievalCache
+
+UNIVERSE_ID = "0c9e5a4b-3d2f-4e1a-8b7c-6d5e4f3a2b1c"
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+
+
+@pytest.fixture
+def client():
+    return InMemoryChromaClient()
+
+
+@pytest.fixture
+def chroma(client):
+    return ChromaClientService(
+        client=client,
+        retrieval_cache=LoreRetrievalCache(ttl=60),
+        embedding_function=MagicMock(wraps=client.embedding_function),
+    )
+
+
+@pytest.fixture
+def collection(chroma):
+    collection = chroma.get_or_create_collection(UNIVERSE_ID)
+    with patch.object(collection, "query", wraps=collection.query):
+        yield collection
+
+
+def add_chunks(chroma, chunk_type: str, texts: list[str]) -> None:
+    chroma.add_documents_batch(
+        UNIVERSE_ID,
+        [
+            {"id": f"{chunk_type}-{i}", "text": text, "chunk_type": chunk_type}
+            for i, text in enumerate(texts)
+        ],
+    )
+
+
+class TestMixedRetrieval:
+    """Tests for ChromaClientService.query_lore."""
+
+    def test_one_query_split_by_quota(self, chroma, collection):
+        """Test both chunk types come from a single query, cut to their quotas."""
+        add_chunks(chroma, "hard_canon", ["The dragon is old.", "The dragon is red.", "Salt."])
+        add_chunks(chroma, "soft_lore", ["Dragon rumours.", "Dragon songs.", "Dragon bones."])
+
+        retrieval = chroma.query_lore(UNIVERSE_ID, "dragon", hard_canon_k=2, soft_lore_k=1)
+
+        assert [r.chunk_id for r in retrieval.hard_canon.results] == [
+            "hard_canon-0",
+            "hard_canon-1",
+        ]
+        assert len(retrieval.soft_lore.results) == 1
+        assert retrieval.soft_lore.results[0].chunk_type == "soft_lore"
+        assert collection.query.call_count == 1
+        assert chroma.embedding_function.call_count == 1
+
+    def test_crowded_out_type_topped_up(self, chroma, collection):
+        """Test a type missing from a full candidate set gets a filtered follow-up query."""
+        add_chunks(chroma, "soft_lore", [f"The dragon sleeps {i}." for i in range(6)])
+        add_chunks(chroma, "hard_canon", ["The harbour tax is two coins."])
+
+        retrieval = chroma.query_lore(UNIVERSE_ID, "dragon sleeps", hard_canon_k=1, soft_lore_k=1)
+
+        assert [r.chunk_id for r in retrieval.hard_canon.results] == ["hard_canon-0"]
+        assert len(retrieval.soft_lore.results) == 1
+        assert collection.query.call_count == 2
+        assert chroma.embedding_function.call_count == 1
+
+    def test_precomputed_embedding_reused(self, chroma, collection):
+        """Test a caller-supplied embedding is queried with as is."""
+        add_chunks(chroma, "hard_canon", ["The keep has three towers."])
+        embedding = chroma.embed_query("keep towers")
+        chroma.embedding_function.reset_mock()
+
+        retrieval = chroma.query_lore(UNIVERSE_ID, "keep towers", query_embedding=embedding)
+
+        assert len(retrieval.hard_canon.results) == 1
+        chroma.embedding_function.assert_not_called()
+        assert collection.query.call_args.kwargs["query_embeddings"] == [embedding]
+
+    def test_no_soft_lore_quota(self, chroma, collection):
+        """Test a zero quota leaves that type out of the query."""
+        add_chunks(chroma, "hard_canon", ["Canon ale."])
+        add_chunks(chroma, "soft_lore", ["Rumoured ale."])
+
+        retrieval = chroma.query_lore(UNIVERSE_ID, "ale", soft_lore_k=0)
+
+        assert retrieval.soft_lore.results == []
+        assert collection.query.call_args.kwargs["where"] == {"chunk_type": {"$in": ["hard_canon"]}}
+
+    def test_cached_per_lore_version(self, chroma, collection):
+        """Test a repeated mixed retrieval is served from the retrieval cache."""
+        add_chunks(chroma, "hard_canon", ["The keep has three towers."])
+
+        first = chroma.query_lore(UNIVERSE_ID, "keep", lore_version=2)
+        second = chroma.query_lore(UNIVERSE_ID, "Keep?", lore_version=2)
+
+        assert collection.query.call_count == 1
+        assert second.hard_canon.results[0].text == first.hard_canon.results[0].text
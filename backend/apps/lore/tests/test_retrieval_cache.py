@@ -0,0 +1,97 @@
+"""
+Tests for the lore retrieval cache.
+
+Tests cache hits on repeated queries, invalidation through the lore
+version and collection writes, and that failed queries are not cached.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+
+from apps.lore.services.chroma_client import ChromaClientService
+from apps.lore.services.retrieval_cache import (
+    RETRIEVAL_LOOKUPS,
+    LoreRetrievalCache,
+    normalize_query,
+)
+
+UNIVERSE_ID = "6b1f6f3e-1c2d-4f5e-9a8b-7c6d5e4f3a2b"
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+
+
+@pytest.fixture
+def collection():
+    """A Chroma collection returning one hit."""
+    collection = MagicMock()
+    collection.query.return_value = {
+        "ids": [["c1"]],
+        "documents": [["The king is dead."]],
+        "metadatas": [[{"chunk_type": "hard_canon", "source_ref": "doc1"}]],
+        "distances": [[0.25]],
+    }
+    return collection
+
+
+@pytest.fixture
+def chroma(collection):
+    client = MagicMock()
+    client.get_or_create_collection.return_value = collection
+    return ChromaClientService(client=client, retrieval_cache=LoreRetrievalCache(ttl=60))
+
+
+class TestLoreRetrievalCache:
+    """Tests for cached ChromaClientService queries."""
+
+    def test_normalize_query(self):
+        """Test case, punctuation and spacing do not change the normalized query."""
+        assert normalize_query("  Who rules   the Keep?! ") == "who rules the keep"
+
+    def test_repeated_query_hits_cache(self, chroma, collection):
+        """Test a similar query at the same lore version is served from the cache."""
+        hits = RETRIEVAL_LOOKUPS.value(result="hit")
+
+        first = chroma.query(UNIVERSE_ID, "Who rules the keep?", lore_version=3)
+        second = chroma.query(UNIVERSE_ID, "who rules  the keep", lore_version=3)
+
+        assert collection.query.call_count == 1
+        assert second.results[0].text == first.results[0].text == "The king is dead."
+        assert RETRIEVAL_LOOKUPS.value(result="hit") == hits + 1
+
+    def test_key_includes_type_top_k_and_version(self, chroma, collection):
+        """Test a different chunk type, top_k or lore version misses."""
+        chroma.query(UNIVERSE_ID, "keep", chunk_type="hard_canon", lore_version=3)
+        chroma.query(UNIVERSE_ID, "keep", chunk_type="soft_lore", lore_version=3)
+        chroma.query(UNIVERSE_ID, "keep", chunk_type="hard_canon", top_k=8, lore_version=3)
+        chroma.query(UNIVERSE_ID, "keep", chunk_type="hard_canon", lore_version=4)
+
+        assert collection.query.call_count == 4
+
+    def test_write_invalidates(self, chroma, collection):
+        """Test a collection write (e.g. a drained outbox entry) drops cached results."""
+        chroma.query(UNIVERSE_ID, "keep", lore_version=3)
+        chroma.upsert_documents_batch(UNIVERSE_ID, [{"id": "c2", "text": "A new heir."}])
+        chroma.query(UNIVERSE_ID, "keep", lore_version=3)
+
+        assert collection.query.call_count == 2
+
+    def test_uncached_without_version(self, chroma, collection):
+        """Test queries without a lore version bypass the cache."""
+        chroma.query(UNIVERSE_ID, "keep")
+        chroma.query(UNIVERSE_ID, "keep")
+
+        assert collection.query.call_count == 2
+
+    def test_failed_query_not_cached(self, chroma, collection):
+        """Test a failed query returns no results and is retried next time."""
+        hit = collection.query.return_value
+        collection.query.side_effect = [ConnectionError("chroma down"), hit]
+
+        assert chroma.query(UNIVERSE_ID, "keep", lore_version=3).results == []
+        assert len(chroma.query(UNIVERSE_ID, "keep", lore_version=3).results) == 1
@@ -0,0 +1,346 @@
+"""
+Tests for the vector outbox.
+
+Tests enqueueing inside transactions, coalescing, draining into ChromaDB,
+retry backoff, and the lore services writing through the outbox.
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.campaigns.loadtest import InMemoryChromaClient
+from apps.lore.models import LoreChunk, VectorOutboxEntry
+from apps.lore.services.chroma_client import ChromaClientService
+from apps.lore.services.compaction import CompactionService
+from apps.lore.services.lore_service import LoreService
+from apps.lore.services.vector_outbox import VectorOutbox, coalesce
+from apps.universes.models import Universe
+
+User = get_user_model()
+
+
+@pytest.fixture
+def universe(db):
+    """Create test universe."""
+    user = User.objects.create_user(
+        email="outbox@example.com",
+        password="testpass123",
+        username="outbox",
+    )
+    return Universe.objects.create(user=user, name="Outbox Universe")
+
+
+@pytest.fixture
+def chroma():
+    return ChromaClientService(client=InMemoryChromaClient())
+
+
+@pytest.fixture
+def outbox(chroma):
+    return VectorOutbox(chroma)
+
+
+def doc(doc_id: str, text: str = "The old mill burned down.") -> dict:
+    return {"id": doc_id, "text": text, "chunk_type": "soft_lore", "source_ref": "turn-1"}
+
+
+def stored_ids(chroma, universe) -> set[str]:
+    return set(chroma.get_or_create_collection(str(universe.id)).get()["ids"])
+
+
+class TestCoalesce:
+    """Tests for folding entries on the same document."""
+
+    def entries(self, *ops):
+        return [
+            VectorOutboxEntry(
+                id=i,
+                universe_id="00000000-0000-0000-0000-000000000001",
+                document_id="d1",
+                operation=op,
+                payload_json={"text": str(i)},
+            )
+            for i, op in enumerate(ops)
+        ]
+
+    @pytest.mark.parametrize(
+        "ops,expected",
+        [
+            (["add", "delete"], None),
+            (["add", "delete", "add"], ("add", "2")),
+            (["upsert", "delete"], ("delete", None)),
+            (["delete", "add"], ("upsert", "1")),
+            (["add", "upsert"], ("upsert", "1")),
+            (["add", "add"], ("add", "0")),
+            (["delete", "delete"], ("delete", None)),
+        ],
+    )
+    def test_fold(self, ops, expected):
+        """Test each sequence collapses to its net effect."""
+        entries = self.entries(*ops)
+
+        applied, cancelled = coalesce(entries)
+
+        if expected is None:
+            assert applied == []
+            assert cancelled == entries
+        else:
+            assert len(applied) == 1
+            assert applied[0].operation == expected[0]
+            assert applied[0].payload.get("text") == expected[1]
+            assert applied[0].entries == entries
+            assert cancelled == []
+
+
+@pytest.mark.django_db
+class TestVectorOutbox:
+    """Tests for VectorOutbox."""
+
+    def test_enqueue_schedules_drain_on_commit(
+        self, outbox, universe, django_capture_on_commit_callbacks
+    ):
+        """Test entries are written now and the drain waits for commit."""
+        with (
+            patch.object(VectorOutbox, "schedule_drain") as schedule,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            outbox.add_documents(universe.id, [doc("a"), doc("b")])
+            assert VectorOutboxEntry.objects.count() == 2
+            schedule.assert_not_called()
+
+        schedule.assert_called_once()
+
+    def test_rollback_discards_entries(self, outbox, universe):
+        """Test a rolled-back transaction leaves nothing to apply."""
+        with pytest.raises(RuntimeError), transaction.atomic():
+            outbox.add_documents(universe.id, [doc("a")])
+            raise RuntimeError("boom")
+
+        assert not VectorOutboxEntry.objects.exists()
+
+    def test_drain_applies_and_clears(self, outbox, chroma, universe):
+        """Test drained operations reach ChromaDB and leave the outbox."""
+        outbox.add_documents(universe.id, [doc("a"), doc("b"), doc("c")])
+        outbox.delete_documents(universe.id, ["b"])
+        outbox.upsert_documents(universe.id, [doc("a", "The mill was rebuilt.")])
+
+        result = outbox.drain()
+
+        assert result.coalesced == 2
+        assert result.applied == 3
+        assert stored_ids(chroma, universe) == {"a", "c"}
+        assert chroma.get_or_create_collection(str(universe.id)).get(ids=["a"])["documents"] == [
+            "The mill was rebuilt."
+        ]
+        assert not VectorOutboxEntry.objects.exists()
+        assert outbox.stats() == {"pending": 0, "failed": 0, "oldest_pending_seconds": 0}
+
+    def test_delete_of_applied_document(self, outbox, chroma, universe):
+        """Test a delete enqueued after a drain removes the stored vector."""
+        outbox.add_documents(universe.id, [doc("a")])
+        outbox.drain()
+
+        outbox.delete_documents(universe.id, ["a"])
+        outbox.drain()
+
+        assert stored_ids(chroma, universe) == set()
+
+    def test_failure_backs_off_then_retries(self, universe):
+        """Test failed writes are kept with a growing delay and retried when due."""
+        chroma = MagicMock()
+        chroma.add_documents_batch.side_effect = ConnectionError("chroma down")
+        outbox = VectorOutbox(chroma)
+        outbox.add_documents(universe.id, [doc("a")])
+
+        result = outbox.drain()
+
+        assert result.retried == 1
+        entry = VectorOutboxEntry.objects.get()
+        assert entry.attempts == 1
+        assert entry.last_error == "chroma down"
+        assert entry.available_at > timezone.now()
+        assert 0 < outbox.next_retry_delay() <= VectorOutbox.RETRY_BASE_DELAY
+
+        # Not due yet: later entries for the same document wait behind it
+        outbox.delete_documents(universe.id, ["a"])
+        result = outbox.drain()
+        assert result.applied == result.coalesced == 0
+        assert chroma.add_documents_batch.call_count == 1
+        chroma.delete_documents.assert_not_called()
+
+        # Once due, the add and delete collapse and nothing is written
+        VectorOutboxEntry.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+        result = outbox.drain()
+        assert result.coalesced == 2
+        assert not VectorOutboxEntry.objects.exists()
+        chroma.delete_documents.assert_not_called()
+
+    def test_backed_off_entries_do_not_block_others(self, outbox, chroma, universe):
+        """Test a full batch of entries waiting on a retry does not stall later writes."""
+        outbox.add_documents(universe.id, [doc("a"), doc("b")])
+        VectorOutboxEntry.objects.update(
+            attempts=1, available_at=timezone.now() + timedelta(minutes=5)
+        )
+        outbox.add_documents(universe.id, [doc("c")])
+
+        result = outbox.drain(batch_size=2)
+
+        assert result.applied == 1
+        assert stored_ids(chroma, universe) == {"c"}
+
+    def test_bad_document_only_parks_itself(self, universe):
+        """Test a failing batch is retried per document and only the bad one backs off."""
+        chroma = MagicMock()
+
+        def add_batch(universe_id, documents):
+            if any(document["id"] == "bad" for document in documents):
+                raise ValueError("bad metadata")
+
+        chroma.add_documents_batch.side_effect = add_batch
+        outbox = VectorOutbox(chroma)
+        outbox.add_documents(universe.id, [doc("a"), doc("bad"), doc("b")])
+
+        result = outbox.drain()
+
+        assert result.applied == 2
+        assert result.retried == 1
+        assert list(VectorOutboxEntry.objects.values_list("document_id", flat=True)) == ["bad"]
+
+    def test_unreachable_store_backs_off_whole_drain(self, universe):
+        """Test a connection failure is not retried per document or per group."""
+        chroma = MagicMock()
+        chroma.add_documents_batch.side_effect = ConnectionError("chroma down")
+        outbox = VectorOutbox(chroma)
+        outbox.add_documents(universe.id, [doc("a"), doc("b"), doc("c")])
+        outbox.delete_documents(universe.id, ["x"])
+
+        result = outbox.drain()
+
+        assert result.retried == 4
+        chroma.add_documents_batch.assert_called_once()
+        chroma.delete_documents.assert_not_called()
+        assert all(e.attempts == 1 for e in VectorOutboxEntry.objects.all())
+
+    def test_claimed_entries_are_leased(self, universe):
+        """Test entries being applied are not selected by a concurrent drain."""
+        chroma = MagicMock()
+        outbox = VectorOutbox(chroma)
+        outbox.add_documents(universe.id, [doc("a")])
+
+        def add_batch(universe_id, documents):
+            # Another worker drains while this one is calling ChromaDB
+            assert VectorOutbox(MagicMock()).drain().applied == 0
+
+        chroma.add_documents_batch.side_effect = add_batch
+
+        assert outbox.drain().applied == 1
+        assert not VectorOutboxEntry.objects.exists()
+
+    def test_gives_up_after_max_attempts(self, universe):
+        """Test entries are parked as failed once out of attempts."""
+        chroma = MagicMock()
+        chroma.delete_documents.side_effect = ConnectionError("chroma down")
+        outbox = VectorOutbox(chroma)
+        outbox.delete_documents(universe.id, ["a"])
+        VectorOutboxEntry.objects.update(attempts=VectorOutbox.MAX_ATTEMPTS - 1)
+
+        result = outbox.drain()
+
+        assert result.failed == 1
+        assert VectorOutboxEntry.objects.get().status == VectorOutboxEntry.STATUS_FAILED
+        assert outbox.stats()["failed"] == 1
+        assert outbox.next_retry_delay() is None
+
+    def test_health_endpoint(self, client, outbox, universe):
+        """Test the backlog is reported from the database."""
+        outbox.add_documents(universe.id, [doc("a")])
+
+        response = client.get("/health/vector-outbox/")
+
+        assert response.status_code == 200
+        assert response.json()["pending"] == 1
+
+
+@pytest.mark.django_db
+class TestServicesUseOutbox:
+    """Tests that lore services write vectors through the outbox."""
+
+    def test_ingest_hard_canon_enqueues_chunk_ids(self, universe):
+        """Test ingestion queues one add per LoreChunk, keyed by its id."""
+        service = LoreService()
+        service.chroma = MagicMock()
+
+        result = service.ingest_hard_canon(
+            universe=universe,
+            title="Mill",
+            raw_text="The old mill stands by the river. " * 20,
+        )
+
+        assert result.success
+        service.chroma.add_documents_batch.assert_not_called()
+        chunk_ids = {str(pk) for pk in LoreChunk.objects.values_list("id", flat=True)}
+        entries = VectorOutboxEntry.objects.all()
+        assert {e.document_id for e in entries} == chunk_ids
+        assert {e.operation for e in entries} == {VectorOutboxEntry.OP_ADD}
+
+    def test_turn_deltas_drain_into_chroma(self, universe, chroma):
+        """Test soft lore from a turn is searchable after the outbox drains."""
+        service = LoreService()
+        service.process_turn_lore_deltas(
+            universe,
+            "turn-7",
+            [{"type": "soft_lore", "text": "Wolves hunt on the north road.", "tags": []}],
+        )
+
+        VectorOutbox(chroma).drain()
+
+        chunk = LoreChunk.objects.get(source_ref="turn-7")
+        assert stored_ids(chroma, universe) == {str(chunk.id)}
+
+    def test_rewind_cancels_backed_off_add(self, universe):
+        """Test a rewound turn's add that is still retrying never reaches ChromaDB."""
+        chroma = MagicMock()
+        chroma.add_documents_batch.side_effect = ConnectionError("chroma down")
+        service = LoreService()
+        service.outbox = VectorOutbox(chroma)
+        service.process_turn_lore_deltas(
+            universe, "turn-9", [{"type": "soft_lore", "text": "The bridge fell.", "tags": []}]
+        )
+        service.outbox.drain()
+        chroma.add_documents_batch.assert_called_once()
+        chroma.reset_mock(side_effect=True)
+
+        service.invalidate_turns_lore(universe, ["turn-9"])
+        VectorOutboxEntry.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+        result = service.outbox.drain()
+
+        assert result.coalesced == 2
+        chroma.add_documents_batch.assert_not_called()
+        chroma.delete_documents.assert_not_called()
+        assert not VectorOutboxEntry.objects.exists()
+
+    def test_compaction_swaps_vectors(self, universe, chroma):
+        """Test compaction replaces the old vectors with the summary's."""
+        old = LoreChunk.objects.create(
+            universe=universe,
+            chunk_type="soft_lore",
+            source_ref="turn-1",
+            text="The mill burned. Nobody knows who set the fire.",
+        )
+        LoreChunk.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=30))
+        outbox = VectorOutbox(chroma)
+        outbox.add_documents(universe.id, [{"id": str(old.id), "text": old.text}])
+        outbox.drain()
+
+        result = CompactionService().compact_soft_lore(universe)
+        outbox.drain()
+
+        assert result.success
+        summary = LoreChunk.objects.get(source_ref="turn-1", supersedes_chunk__isnull=True)
+        assert summary.id != old.id
+        assert stored_ids(chroma, universe) == {str(summary.id)}
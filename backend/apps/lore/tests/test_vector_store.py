@@ -0,0 +1,164 @@
+"""
+Tests for the vector store backends.
+
+Tests the local NumPy index (ranking, filters, upserts and deletes, and
+readers picking up another writer's changes) and moving a universe from
+the local index to the server once it outgrows it.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.campaigns.loadtest import HashingEmbeddingFunction, InMemoryChromaClient
+from apps.lore.services.chroma_client import ChromaClientService
+from apps.lore.services.vector_store import (
+    CollectionNotFoundError,
+    LocalVectorStore,
+    TieredVectorStore,
+)
+
+NAME = "universe_0123456789ab"
+
+
+@pytest.fixture
+def embed():
+    return HashingEmbeddingFunction()
+
+
+@pytest.fixture
+def store(tmp_path, embed):
+    return LocalVectorStore(tmp_path, embed)
+
+
+@pytest.fixture
+def collection(store):
+    collection = store.get_or_create_collection(NAME, {"universe_id": "u1"})
+    collection.add(
+        ids=["a", "b", "c"],
+        documents=[
+            "The dragon sleeps under the mountain.",
+            "The tavern serves cheap ale.",
+            "A rumour says the dragon is awake.",
+        ],
+        metadatas=[
+            {"chunk_type": "hard_canon"},
+            {"chunk_type": "hard_canon"},
+            {"chunk_type": "soft_lore"},
+        ],
+    )
+    return collection
+
+
+class TestLocalVectorStore:
+    """Tests for LocalVectorStore and LocalCollection."""
+
+    def test_query_ranks_by_cosine(self, collection):
+        """Test the most similar documents come first, with cosine distances."""
+        result = collection.query(query_texts=["Where does the dragon sleep?"], n_results=2)
+
+        assert result["ids"] == [["a", "c"]]
+        assert 0 <= result["distances"][0][0] < result["distances"][0][1] <= 1
+
+    def test_query_embeddings_and_where(self, collection, embed):
+        """Test precomputed embeddings and chunk type filters."""
+        result = collection.query(
+            query_embeddings=embed(["dragon"]),
+            n_results=5,
+            where={"chunk_type": {"$in": ["soft_lore"]}},
+        )
+
+        assert result["ids"] == [["c"]]
+
+    def test_upsert_add_and_delete(self, collection):
+        """Test upserts replace, adds of existing ids are ignored and deletes apply."""
+        collection.upsert(ids=["b"], documents=["The tavern is closed."], metadatas=[{}])
+        collection.add(ids=["a"], documents=["Ignored."], metadatas=[{}])
+        collection.delete(where={"chunk_type": "soft_lore"})
+
+        stored = collection.get()
+        assert stored["ids"] == ["a", "b"]
+        assert stored["documents"][1] == "The tavern is closed."
+        assert collection.count() == 2
+
+    def test_other_process_sees_writes(self, tmp_path, embed, collection):
+        """Test a second store on the same directory reads the latest index."""
+        other = LocalVectorStore(tmp_path, embed).get_collection(NAME)
+        assert other.count() == 3
+
+        collection.delete(ids=["a"])
+
+        assert other.count() == 2
+        assert other.query(query_texts=["dragon sleeps"], n_results=1)["ids"] == [["c"]]
+
+    def test_previous_generation_kept_for_readers(self, tmp_path, collection):
+        """Test a reader that read the old records can still map its embeddings."""
+        old_file = json.loads((tmp_path / NAME / "records.json").read_text())["embeddings_file"]
+
+        collection.delete(ids=["a"])
+        assert (tmp_path / NAME / old_file).exists()
+
+        collection.delete(ids=["b"])
+        assert not (tmp_path / NAME / old_file).exists()
+        assert len(list((tmp_path / NAME).glob("embeddings.*.npy"))) == 2
+
+    def test_delete_collection(self, store, collection):
+        """Test a deleted collection is gone and rejects writes."""
+        store.delete_collection(NAME)
+
+        assert not store.has_collection(NAME)
+        with pytest.raises(CollectionNotFoundError):
+            collection.add(ids=["d"], documents=["Too late."])
+
+    def test_service_on_local_store(self, store, embed):
+        """Test ChromaClientService runs on the local store."""
+        chroma = ChromaClientService(
+            client=store, retrieval_cache=MagicMock(), embedding_function=embed
+        )
+        chroma.add_document("u1", "a", "Canon ale.", chunk_type="hard_canon")
+        chroma.add_document("u1", "b", "Rumoured ale.", chunk_type="soft_lore")
+
+        retrieval = chroma.query_lore("u1", "ale", hard_canon_k=1, soft_lore_k=1)
+
+        assert [r.chunk_id for r in retrieval.hard_canon.results] == ["a"]
+        assert [r.chunk_id for r in retrieval.soft_lore.results] == ["b"]
+
+
+class TestTieredVectorStore:
+    """Tests for TieredVectorStore."""
+
+    @pytest.fixture
+    def remote(self, embed):
+        return InMemoryChromaClient(embedding_function=embed)
+
+    @pytest.fixture
+    def tiered(self, store, remote):
+        return TieredVectorStore(store, remote, max_local_documents=2)
+
+    def test_new_collection_starts_local(self, tiered, store, remote):
+        """Test a new universe is indexed locally."""
+        tiered.get_or_create_collection(NAME).add(ids=["a"], documents=["One."])
+
+        assert store.has_collection(NAME)
+        assert remote.list_collections() == []
+
+    def test_promotes_past_threshold(self, tiered, store, remote):
+        """Test a universe that outgrows the local index moves to the server."""
+        collection = tiered.get_or_create_collection(NAME)
+        collection.add(ids=["a", "b"], documents=["The dragon.", "The tavern."])
+        collection.add(ids=["c"], documents=["The dragon wakes."])
+
+        assert not store.has_collection(NAME)
+        assert remote.get_collection(NAME).count() == 3
+        assert remote.get_collection(NAME).metadata["hnsw:space"] == "cosine"
+        assert collection.query(query_texts=["dragon"], n_results=1)["ids"] == [["a"]]
+
+    def test_existing_remote_collection_stays(self, tiered, store, remote):
+        """Test universes already on the server are not shadowed locally."""
+        remote.get_or_create_collection(NAME).add(ids=["a"], documents=["Old lore."])
+
+        collection = tiered.get_or_create_collection(NAME)
+
+        assert not store.has_collection(NAME)
+        assert collection.get()["ids"] == ["a"]
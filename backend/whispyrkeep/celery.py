@@ -5,6 +5,7 @@ Handles async tasks for:
 - Lore embedding and compaction
 - Universe pre-generation
 - Export rendering
+- Queued campaign turns
 """
 
 import os
@@ -4,12 +4,14 @@ Health check views for WhispyrKeep.
 Provides endpoints to verify service connectivity:
 - /health/ - Basic health check
 - /health/ready/ - Readiness check (DB, Redis, ChromaDB)
+- /health/llm-pool/ - LLM HTTP connection pool stats for this worker (admins only)
+- /health/vector-outbox/ - ChromaDB write backlog (pending, failed, lag)
 """
 
 from django.db import connection
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 
 
 @api_view(["GET"])
@@ -47,6 +49,35 @@ def readiness_check(request):
     return JsonResponse(status, status=200 if all_ok else 503)
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def llm_pool_stats(request):
+    """
+    LLM HTTP connection pool statistics for the serving worker process.
+
+    Admins only: pools are listed by base URL, which may be a user's
+    private endpoint.
+
+    GET /health/llm-pool/
+    """
+    from apps.campaigns.services.http_pool import get_http_pool
+
+    return JsonResponse(get_http_pool().stats())
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def vector_outbox_stats(request):
+    """
+    Backlog of vector writes waiting to be applied to ChromaDB.
+
+    GET /health/vector-outbox/
+    """
+    from apps.lore.services.vector_outbox import VectorOutbox
+
+    return JsonResponse(VectorOutbox().stats())
+
+
 def check_database():
     """Check PostgreSQL connectivity."""
     try:
@@ -0,0 +1,187 @@
+"""
+Prometheus metrics for WhispyrKeep.
+
+Counters, gauges and histograms backed by prometheus_client, rendered in the
+Prometheus text exposition format:
+- /metrics/ - Metrics of every process sharing PROMETHEUS_MULTIPROC_DIR
+
+With PROMETHEUS_MULTIPROC_DIR set to a directory shared by the web workers
+and the Celery workers, each process writes its values there and /metrics/
+aggregates all of them: counters are totals over every process (including
+turns played on the turn_queue workers), whichever web worker serves the
+scrape. Empty the directory when all of those processes are restarted.
+Without it, values are those of the serving process only (development and
+tests).
+
+/metrics/ requires a staff session or the METRICS_TOKEN bearer token.
+"""
+
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client import Counter as PrometheusCounter
+from prometheus_client import Gauge as PrometheusGauge
+from prometheus_client import Histogram as PrometheusHistogram
+from prometheus_client.multiprocess import MultiProcessCollector
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import BasePermission, IsAdminUser
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; spans fast DB work up to slow multi-call LLM turns
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def multiprocess_dir() -> str | None:
+    """The directory processes share metric values through, if configured."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+class Metric:
+    """Base for labelled metrics; wraps a prometheus_client metric."""
+
+    def __init__(self, metric, name: str, labelnames: tuple[str, ...]):
+        self.metric = metric
+        self.name = name
+        self.labelnames = tuple(labelnames)
+
+    def _child(self, labels: dict):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return self.metric.labels(**labels) if self.labelnames else self.metric
+
+    def _sample(self, sample_name: str, labels: dict) -> float:
+        """This process's value of one sample (e.g. ``<name>_count``) for a label set."""
+        self._child(labels)
+        labels = {name: str(value) for name, value in labels.items()}
+        for family in self.metric.collect():
+            for sample in family.samples:
+                if sample.name == sample_name and sample.labels == labels:
+                    return sample.value
+        return 0
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._child(labels).inc(amount)
+
+    def value(self, **labels) -> float:
+        # prometheus_client names the sample <name>_total, with or without the suffix
+        return self._sample(self.name.removesuffix("_total") + "_total", labels)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    def set(self, value: float, **labels) -> None:
+        self._child(labels).set(value)
+
+    def value(self, **labels) -> float:
+        return self._sample(self.name, labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    def observe(self, value: float, **labels) -> None:
+        self._child(labels).observe(value)
+
+    def count(self, **labels) -> int:
+        return int(self._sample(self.name + "_count", labels))
+
+    def sum(self, **labels) -> float:
+        return self._sample(self.name + "_sum", labels)
+
+
+class MetricsRegistry:
+    """Named metrics, registered once per process."""
+
+    def __init__(self):
+        self.collector_registry = CollectorRegistry()
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, factory, name: str, documentation: str, labelnames, **kwargs):
+        labelnames = tuple(labelnames)
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                wrapped = factory(
+                    name, documentation, labelnames, registry=self.collector_registry, **kwargs
+                )
+                metric = self._metrics[name] = cls(wrapped, name, labelnames)
+            elif not isinstance(metric, cls) or metric.labelnames != labelnames:
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, PrometheusCounter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames=(), multiprocess_mode="mostrecent"
+    ) -> Gauge:
+        """
+        Get or create a gauge.
+
+        multiprocess_mode says how the values processes set are combined;
+        by default the most recently set value wins.
+        """
+        return self._register(
+            Gauge,
+            PrometheusGauge,
+            name,
+            documentation,
+            labelnames,
+            multiprocess_mode=multiprocess_mode,
+        )
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(
+            Histogram, PrometheusHistogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        if multiprocess_dir():
+            collector_registry = CollectorRegistry()
+            MultiProcessCollector(collector_registry)
+        else:
+            collector_registry = self.collector_registry
+        return generate_latest(collector_registry).decode()
+
+
+registry = MetricsRegistry()
+
+
+class HasMetricsToken(BasePermission):
+    """Allows requests bearing the METRICS_TOKEN (for Prometheus scrapers)."""
+
+    def has_permission(self, request, view):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        return bool(token) and constant_time_compare(header, f"Bearer {token}")
+
+
+@api_view(["GET"])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAdminUser | HasMetricsToken])
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+
+    GET /metrics/
+    """
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -85,6 +85,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "whispyrkeep.wsgi.application"
+ASGI_APPLICATION = "whispyrkeep.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
@@ -169,14 +170,74 @@ CELERY_TIMEZONE = "UTC"
 CELERY_TASK_ROUTES = {
     "apps.lore.tasks.*": {"queue": "lore_embed_queue"},
     "apps.exports.tasks.*": {"queue": "export_queue"},
+    # Summaries are background work; keep them off the turn queue
+    "apps.campaigns.tasks.update_campaign_summary_task": {"queue": "summary_queue"},
+    "apps.campaigns.tasks.*": {"queue": "turn_queue"},
+}
+
+# Bearer token Prometheus scrapes /metrics/ with (staff sessions need none);
+# set PROMETHEUS_MULTIPROC_DIR (environment only) to aggregate all processes
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Queued turns: seconds before a processing turn job is considered dead
+CAMPAIGN_TURN_JOB_TIMEOUT = int(os.getenv("CAMPAIGN_TURN_JOB_TIMEOUT", "300"))
+
+# Periodic tasks (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    "sweep-stale-turn-jobs": {
+        "task": "apps.campaigns.tasks.sweep_stale_turn_jobs_task",
+        "schedule": 60.0,
+    },
 }
 
 # ChromaDB Configuration
 CHROMA_URL = os.getenv("CHROMA_URL", "http://localhost:8001")
 
+# Lore vector store: "chroma" (the ChromaDB server), "local" (a NumPy index
+# per universe under LORE_LOCAL_INDEX_DIR, no server needed) or "auto"
+# (local until a universe has more than LORE_LOCAL_INDEX_MAX_DOCUMENTS chunks)
+LORE_VECTOR_BACKEND = os.getenv("LORE_VECTOR_BACKEND", "chroma")
+LORE_LOCAL_INDEX_DIR = os.getenv("LORE_LOCAL_INDEX_DIR", str(BASE_DIR / "lore_index"))
+LORE_LOCAL_INDEX_MAX_DOCUMENTS = int(os.getenv("LORE_LOCAL_INDEX_MAX_DOCUMENTS", "2000"))
+
+# Seconds a cached lore query result is kept (0 disables the cache); lore
+# changes invalidate it sooner through canonical_lore_version
+LORE_RETRIEVAL_CACHE_TTL = int(os.getenv("LORE_RETRIEVAL_CACHE_TTL", "900"))
+
+# Lore retrieval: "vector" (embedding search only) or "hybrid" (embedding and
+# Postgres full-text search, fused by reciprocal rank; better recall of
+# exact names, so LORE_INJECTION_TOP_K can be lower)
+LORE_RETRIEVAL_MODE = os.getenv("LORE_RETRIEVAL_MODE", "vector")
+
+# Lore chunks of each type (hard canon, soft lore) retrieved for a turn
+LORE_INJECTION_TOP_K = int(os.getenv("LORE_INJECTION_TOP_K", "5"))
+
 # LLM Configuration
 LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gpt-4")
 
+# Most tokens of context (universe, campaign, recap, lore) sent with a turn,
+# even when the model's context window would allow more
+LLM_CONTEXT_TOKEN_BUDGET = int(os.getenv("LLM_CONTEXT_TOKEN_BUDGET", "12000"))
+
+# LLM HTTP connection pools (one per endpoint + API key, per worker process)
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+LLM_HTTP_POOL_IDLE_TIMEOUT = float(os.getenv("LLM_HTTP_POOL_IDLE_TIMEOUT", "300"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "True").lower() in ("true", "1", "yes")
+
+# Campaign state snapshots: snapshot once the weighted replay cost since the
+# last snapshot (turns, patch KB, merge ops) reaches the threshold
+CAMPAIGN_SNAPSHOT_COST_THRESHOLD = float(os.getenv("CAMPAIGN_SNAPSHOT_COST_THRESHOLD", "10"))
+CAMPAIGN_SNAPSHOT_TURN_WEIGHT = float(os.getenv("CAMPAIGN_SNAPSHOT_TURN_WEIGHT", "1.0"))
+CAMPAIGN_SNAPSHOT_KB_WEIGHT = float(os.getenv("CAMPAIGN_SNAPSHOT_KB_WEIGHT", "1.0"))
+CAMPAIGN_SNAPSHOT_OP_WEIGHT = float(os.getenv("CAMPAIGN_SNAPSHOT_OP_WEIGHT", "0.1"))
+CAMPAIGN_SNAPSHOT_MAX_TURNS = int(os.getenv("CAMPAIGN_SNAPSHOT_MAX_TURNS", "100"))
+CAMPAIGN_SNAPSHOT_KEEP_RECENT = int(os.getenv("CAMPAIGN_SNAPSHOT_KEEP_RECENT", "3"))
+# Every Nth snapshot is a full compressed keyframe; the rest are diffs
+CAMPAIGN_SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("CAMPAIGN_SNAPSHOT_KEYFRAME_INTERVAL", "8"))
+CAMPAIGN_SNAPSHOT_MAX_DELTA_RATIO = float(os.getenv("CAMPAIGN_SNAPSHOT_MAX_DELTA_RATIO", "0.5"))
+
 # Security - KMS for API key encryption
 KMS_SECRET = os.getenv("KMS_SECRET", "dev-kms-secret-change-in-production")
 
@@ -0,0 +1,150 @@
+"""
+Token counting for LLM prompt budgets.
+
+Counts with a local BPE tokenizer (tiktoken) so prompt budgets are measured
+in the units providers bill and limit by. Each model family maps to an
+encoding and a context window; counters are built once per family and
+cached for the life of the process.
+
+Anthropic does not publish a local tokenizer, so Claude models are counted
+with cl100k_base scaled up by a safety ratio. Without tiktoken (or its
+encoding files), counts fall back to a conservative estimate.
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass
+from functools import cache
+
+logger = logging.getLogger(__name__)
+
+# Pieces a BPE tokenizer rarely merges across: words, digit runs, punctuation
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+@dataclass(frozen=True)
+class ModelFamily:
+    """Tokenizer and context window shared by a family of models."""
+
+    name: str
+    encoding: str
+    context_window: int
+    # Multiplier for families counted with a stand-in encoding
+    token_ratio: float = 1.0
+
+
+# Matched by model name prefix, first match wins (so longer prefixes go first)
+MODEL_FAMILIES = (
+    ModelFamily("gpt-5", "o200k_base", 400_000),
+    ModelFamily("gpt-4.1", "o200k_base", 1_047_576),
+    ModelFamily("gpt-4o", "o200k_base", 128_000),
+    ModelFamily("o1", "o200k_base", 200_000),
+    ModelFamily("o3", "o200k_base", 200_000),
+    ModelFamily("o4", "o200k_base", 200_000),
+    ModelFamily("gpt-4-turbo", "cl100k_base", 128_000),
+    ModelFamily("gpt-4", "cl100k_base", 8_192),
+    ModelFamily("gpt-3.5", "cl100k_base", 16_385),
+    ModelFamily("claude", "cl100k_base", 200_000, token_ratio=1.2),
+)
+
+# Unknown (e.g. local) models: assume a small window
+DEFAULT_FAMILY = ModelFamily("default", "cl100k_base", 8_192, token_ratio=1.1)
+
+
+def model_family(model: str) -> ModelFamily:
+    """Find the family for a model name (provider prefixes like "openai/" are ignored)."""
+    name = model.lower().rsplit("/", 1)[-1]
+    for family in MODEL_FAMILIES:
+        if name.startswith(family.name):
+            return family
+    return DEFAULT_FAMILY
+
+
+class TokenCounter:
+    """
+    Counts and truncates text in a model family's tokens.
+
+    Usage:
+        counter = get_token_counter("gpt-4o")
+        counter.count("Hello there")
+        counter.truncate(long_text, 200)
+    """
+
+    def __init__(self, family: ModelFamily):
+        """Initialize the counter, loading the family's encoding if available."""
+        self.family = family
+        self._encoding = _load_encoding(family.encoding)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the BPE encoding rather than the estimate."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count the tokens in text."""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            tokens = len(self._encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = _estimate_tokens(text)
+        return math.ceil(tokens * self.family.token_ratio)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            keep = int(max_tokens / self.family.token_ratio)
+            # Decoding can re-merge across the cut; back off until it fits
+            while keep > 0:
+                cut = self._encoding.decode(tokens[:keep])
+                if self.count(cut) <= max_tokens:
+                    return cut
+                keep -= 1
+            return ""
+
+        # Binary search the longest prefix within the estimate
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Conservative BPE estimate: a token per short word, one per 4 chars of longer ones."""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PIECE_RE.findall(text))
+
+
+@cache
+def _load_encoding(name: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed; estimating token counts")
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        # The encoding files are fetched on first use unless cached locally
+        logger.warning(f"Could not load {name} encoding, estimating token counts: {e}")
+        return None
+
+
+@cache
+def _counter_for(family: ModelFamily) -> TokenCounter:
+    return TokenCounter(family)
+
+
+def get_token_counter(model: str) -> TokenCounter:
+    """Get the (cached) token counter for a model's family."""
+    return _counter_for(model_family(model))
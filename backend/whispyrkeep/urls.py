@@ -8,12 +8,22 @@ from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from whispyrkeep.health import health_check, readiness_check
+from whispyrkeep.health import (
+    health_check,
+    llm_pool_stats,
+    readiness_check,
+    vector_outbox_stats,
+)
+from whispyrkeep.metrics import metrics_view
 
 urlpatterns = [
     # Health checks (unauthenticated)
     path("health/", health_check, name="health_check"),
     path("health/ready/", readiness_check, name="readiness_check"),
+    path("health/llm-pool/", llm_pool_stats, name="llm_pool_stats"),
+    path("health/vector-outbox/", vector_outbox_stats, name="vector_outbox_stats"),
+    # Prometheus scrape endpoint (staff session or METRICS_TOKEN)
+    path("metrics/", metrics_view, name="metrics"),
     # Admin
     path("admin/", admin.site.urls),
     # JWT Authentication